@@ -24,17 +24,23 @@ NumStreams=1
 DeviceDetect="CPU"
 DeviceClassify="CPU"
 BatchSize=1
+NumProcesses=1
 
 Duration=120
 Taskset="none"
 Concurrent=false
+EarlyStop=false
+PoolContainer=""
+PowerMonitor=true
+ModelCache=""
+SharedDecode=false
 
 # Help message
 usage()
 {
 echo "
 Usage:
-benchmark_edge_pipelines.sh -p <Pipeline Config (light,medium,heavy)> -n <Num Streams (#)> -b <Batch Size (#)> -d <DetectDevice> -c <Classify Device> -i <Test Duration (sec)> -t <Taskset Core List> --concurrent
+benchmark_edge_pipelines.sh -p <Pipeline Config (light,medium,heavy)> -n <Num Streams (#)> -b <Batch Size (#)> -d <DetectDevice> -c <Classify Device> -i <Test Duration (sec)> -t <Taskset Core List> -P <Num Processes (#)> --concurrent --early-stop --pool <Container> --no-power --model-cache[=<dir>] --shared-decode --tune=<settings>
 
 Taskset Options:
   -t \"0,1,2\"       : Comma-separated core list
@@ -44,6 +50,25 @@ Taskset Options:
   -t lpecore       : Use LP-E-cores only
   -t nopin         : No core pinning (default)
 
+Run Options:
+  -P <processes>   : Pack the streams into this many gst-launch processes (default: 1); streams
+                     of one process share the inference instances (model-instance-id) and
+                     batch across each other. With --concurrent: processes per device
+  --concurrent     : Split streams across the detect and classify devices
+  --early-stop     : Stop once the average FPS converges (or is clearly below target)
+                     instead of always running the full duration
+  --pool <name>    : Run in an already started warm container via docker exec
+                     (see utils/warm_pool_sweep.sh) instead of a fresh docker run
+  --model-cache    : Reuse compiled models from the content-addressed cache in
+                     results/.model_cache (or --model-cache=<dir>), see utils/model_cache.py
+  --shared-decode  : Decode the video once per process and feed the streams through a tee
+                     instead of one decoder per stream
+  --tune=<list>    : Comma-separated [DEVICE.]KEY=VALUE inference settings, KEY one of nireq,
+                     num-streams, inference-interval, batch, queue-size
+                     (e.g. --tune=GPU.nireq=4,GPU.num-streams=1), see utils/pipeline_builder.py
+  --no-power       : Skip package power sampling (runs sharing the package at the
+                     same time, see utils/sweep_scheduler.py)
+
 Example:
 benchmark_edge_pipelines.sh -p light -n 8 -b 8 -d GPU -c NPU -i 120 -t \"6-9\" --concurrent
 benchmark_edge_pipelines.sh -p heavy -n 4 -b 1 -d GPU -c NPU -i 120 -t ecore
@@ -53,7 +78,7 @@ benchmark_edge_pipelines.sh -p heavy -n 4 -b 1 -d GPU -c NPU -i 120 -t ecore
 # Command line argument parser
 argparse()
 {
-while getopts "hp:n:b:d:c:i:t:-:" arg; do
+while getopts "hp:n:b:d:c:i:t:P:-:" arg; do
     case $arg in
 	p)
 	PipelineConfig=${OPTARG}
@@ -76,11 +101,39 @@ while getopts "hp:n:b:d:c:i:t:-:" arg; do
 	t)
 	Taskset=${OPTARG}
 	;;
+	P)
+	NumProcesses=${OPTARG}
+	;;
 	-)
 	case "${OPTARG}" in
 	    concurrent)
 	    Concurrent=true
 	    ;;
+	    early-stop)
+	    EarlyStop=true
+	    ;;
+	    pool)
+	    PoolContainer="${!OPTIND}"; OPTIND=$((OPTIND + 1))
+	    [[ -n "${PoolContainer}" ]] || { echo "[ Error ] --pool requires a container name"; usage; exit 1; }
+	    ;;
+	    pool=*)
+	    PoolContainer="${OPTARG#pool=}"
+	    ;;
+	    no-power)
+	    PowerMonitor=false
+	    ;;
+	    model-cache)
+	    ModelCache="${basedir}/results/.model_cache"
+	    ;;
+	    model-cache=*)
+	    ModelCache="${OPTARG#model-cache=}"
+	    ;;
+	    shared-decode)
+	    SharedDecode=true
+	    ;;
+	    tune=*)
+	    export PIPELINE_TUNING="${OPTARG#tune=}"
+	    ;;
 	    *)
 	    echo "[ Error ] Unknown option --${OPTARG}"
 	    usage; exit 1
@@ -133,18 +186,72 @@ Cores="$(parse_core_pinning "${Taskset}")"
 is_posint() { [[ "$1" =~ ^[1-9][0-9]*$ ]]; }
 is_posint "${NumStreams}" || { echo "[ Error ] -n must be a positive integer"; exit 1; }
 is_posint "${BatchSize}"  || { echo "[ Error ] -b must be a positive integer"; exit 1; }
+is_posint "${NumProcesses}" || { echo "[ Error ] -P must be a positive integer"; exit 1; }
 is_posint "${Duration}"   || { echo "[ Error ] -i must be a positive integer (seconds)"; exit 1; }
 
+if [[ -n "${PoolContainer}" ]] && ! docker exec "${PoolContainer}" true >/dev/null 2>&1; then
+    echo "[ Error ] Pool container ${PoolContainer} is not running"; exit 1
+fi
+
 validate_assets "${PipelineConfig}" "${basedir}/pipelines" || { echo "[ Error ] Validation failed."; exit 1; }
 
-# Construct GStreamer pipeline
-DecodePipe="$(construct_decode "${PipelineConfig}")"
+# Compiled model cache: one entry per inference element, mounted into the container
+ModelCacheMount="/home/dlstreamer/model_cache"
+if [[ -n "${ModelCache}" ]]; then
+    mkdir -p "${ModelCache}" && ModelCache="$(realpath "${ModelCache}")"
+    export MODEL_CACHE_HOST="${ModelCache}" MODEL_CACHE_DIR="${ModelCacheMount}"
+fi
+
+# Construct GStreamer pipelines (utils/pipeline_builder.py)
+LaunchArgs=()
+if [[ "${SharedDecode}" == true ]]; then
+    LaunchArgs+=( --shared-decode )
+fi
 
-# Build pipeline commands
+# Build pipeline commands: the streams of a device pipeline are packed into -P
+# gst-launch processes, each run in its own container (or exec in the pool container)
 Commands=()
+CommandContainers=()
+CommandTemplates=()
 PipelineTemplates=()
 PipelineDescriptions=()
 
+if [[ "${Concurrent}" == true && "${DeviceDetect}" != "${DeviceClassify}" ]]; then
+    ContainerBase="e2e-edge-pipeline-${Timestamp}-$$"
+    DeviceTag="${DeviceDetect}-${DeviceClassify}-Concurrent"
+else
+    if [[ "${DeviceDetect}" == "${DeviceClassify}" ]]; then
+        DeviceName="${DeviceDetect}-Only"
+        DeviceTag="${DeviceDetect}-Only"
+    else
+        DeviceName="${DeviceDetect}-${DeviceClassify}-Split"
+        DeviceTag="${DeviceDetect}-${DeviceClassify}-Split"
+    fi
+    ContainerBase="e2e-edge-pipeline-${DeviceName}-${Timestamp}-$$"
+fi
+
+# add_pipeline <detect device> <classify device> <streams> <container name> <description>
+add_pipeline()
+{
+    local detect="$1" classify="$2" streams="$3" container="$4" description="$5"
+    local processes=$(( NumProcesses < streams ? NumProcesses : streams ))
+    local proc proc_streams
+    PipelineTemplates+=("$(construct_launch "${PipelineConfig}" "${detect}" "${classify}" "${BatchSize}" 1 "${LaunchArgs[@]}")") || exit 1
+    for (( proc = 0; proc < processes; proc++ )); do
+        # Spread the remainder over the first processes
+        proc_streams=$(( streams / processes + (proc < streams % processes ? 1 : 0) ))
+        Commands+=("$(construct_launch "${PipelineConfig}" "${detect}" "${classify}" "${BatchSize}" "${proc_streams}" "${LaunchArgs[@]}")") || exit 1
+        CommandTemplates+=($(( ${#PipelineTemplates[@]} - 1 )))
+        if [[ ${processes} -gt 1 ]]; then
+            CommandContainers+=("${container}-p${proc}")
+            PipelineDescriptions+=("${description} (process $((proc + 1))/${processes}: ${proc_streams} streams)")
+        else
+            CommandContainers+=("${container}")
+            PipelineDescriptions+=("${description}")
+        fi
+    done
+}
+
 if [[ "${Concurrent}" == true && "${DeviceDetect}" != "${DeviceClassify}" ]]; then
     # If concurrent, then split streams based off of Detect/Classify devices
     DetectStreams=$(( (NumStreams + 1) / 2 ))  # Round up
@@ -152,78 +259,47 @@ if [[ "${Concurrent}" == true && "${DeviceDetect}" != "${DeviceClassify}" ]]; th
     
     if [[ ${DetectStreams} -gt 0 ]]; then
         # Build device-1 pipeline (using DeviceDetect for both detect and classify)
-        DetectPipeOnly="$(construct_detection "${PipelineConfig}" "${DeviceDetect}" "${BatchSize}")"
-        ClassifyPipeOnly="$(construct_classification "${PipelineConfig}" "${DeviceDetect}" "${BatchSize}")"
-        DetectLaunch="${DecodePipe} ! queue ! ${DetectPipeOnly} ! queue ! gvatrack tracking-type=1 config=tracking_per_class=false ! queue ! ${ClassifyPipeOnly} ! queue ! gvafpscounter starting-frame=2000 ! fakesink sync=false async=false"
-        
-        DetectCommand=""
-        for i in $(seq 1 "${DetectStreams}"); do
-            DetectCommand="${DetectCommand} ${DetectLaunch}"
-        done
-        Commands+=("${DetectCommand}")
-
-        PipelineTemplates+=("${DetectLaunch}")
-        PipelineDescriptions+=("${DetectStreams} streams using ${DeviceDetect} for both detection and classification")
+        add_pipeline "${DeviceDetect}" "${DeviceDetect}" "${DetectStreams}" "${ContainerBase}-${DeviceDetect}" \
+            "${DetectStreams} streams using ${DeviceDetect} for both detection and classification"
     fi
     
     if [[ ${ClassifyStreams} -gt 0 ]]; then
         # Build device-2 pipeline (using DeviceClassify for both detect and classify)
-        DetectPipeOnly="$(construct_detection "${PipelineConfig}" "${DeviceClassify}" "${BatchSize}")"
-        ClassifyPipeOnly="$(construct_classification "${PipelineConfig}" "${DeviceClassify}" "${BatchSize}")"
-        ClassifyLaunch="${DecodePipe} ! queue ! ${DetectPipeOnly} ! queue ! gvatrack tracking-type=1 config=tracking_per_class=false ! queue ! ${ClassifyPipeOnly} ! queue ! gvafpscounter starting-frame=2000 ! fakesink sync=false async=false"
-        
-        ClassifyCommand=""
-        for i in $(seq 1 "${ClassifyStreams}"); do
-            ClassifyCommand="${ClassifyCommand} ${ClassifyLaunch}"
-        done
-        Commands+=("${ClassifyCommand}")
-
-        PipelineTemplates+=("${ClassifyLaunch}")
-        PipelineDescriptions+=("${ClassifyStreams} streams using ${DeviceClassify} for both detection and classification")
+        add_pipeline "${DeviceClassify}" "${DeviceClassify}" "${ClassifyStreams}" "${ContainerBase}-${DeviceClassify}" \
+            "${ClassifyStreams} streams using ${DeviceClassify} for both detection and classification"
     fi
 else
     # Otherwise, use the default pipeline template
-    DetectPipe="$(construct_detection "${PipelineConfig}" "${DeviceDetect}" "${BatchSize}")"
-    ClassifyPipe="$(construct_classification "${PipelineConfig}" "${DeviceClassify}" "${BatchSize}")"
-    Launch="${DecodePipe} ! queue ! ${DetectPipe} ! queue ! gvatrack tracking-type=1 config=tracking_per_class=false ! queue ! ${ClassifyPipe} ! queue ! gvafpscounter starting-frame=2000 ! fakesink sync=false async=false"
-
-    Command=""
-    for i in $(seq 1 "${NumStreams}"); do
-        Command="${Command} ${Launch}"
-    done
-    Commands=("${Command}")
-
-    PipelineTemplates=("${Launch}")
-    PipelineDescriptions=("${NumStreams} streams using ${DeviceDetect} for detection and ${DeviceClassify} for classification")
+    add_pipeline "${DeviceDetect}" "${DeviceClassify}" "${NumStreams}" "${ContainerBase}" \
+        "${NumStreams} streams using ${DeviceDetect} for detection and ${DeviceClassify} for classification"
 fi
 
-# Generate container names for all containers
-if [[ "${Concurrent}" == true && "${DeviceDetect}" != "${DeviceClassify}" ]]; then
-    ContainerBase="e2e-edge-pipeline-${Timestamp}-$$"
-    DeviceTag="${DeviceDetect}-${DeviceClassify}-Concurrent"
-else
-    if [[ "${DeviceDetect}" == "${DeviceClassify}" ]]; then
-        DeviceName="${DeviceDetect}-Only"
-        DeviceTag="${DeviceDetect}-Only"
-    else
-        DeviceName="${DeviceDetect}-${DeviceClassify}-Split"
-        DeviceTag="${DeviceDetect}-${DeviceClassify}-Split"
-    fi
-    ContainerBase="e2e-edge-pipeline-${DeviceName}-${Timestamp}-$$"
+# Runs packed into several processes are a configuration of their own in the report
+DeviceConfiguration="${DeviceTag}"
+ProcessTag=""
+if [[ ${#Commands[@]} -gt ${#PipelineTemplates[@]} ]]; then
+    DeviceConfiguration="${DeviceTag} (${NumProcesses} processes)"
+    ProcessTag="_P${NumProcesses}"
 fi
 
 ResultsDir="${basedir}/results/${DeviceTag}"
 mkdir -p "${ResultsDir}"
-Filename="e2e-edge-pipeline_${PipelineConfig}_${NumStreams}Str_${DeviceDetect}-Det_${DeviceClassify}-Class_BS${BatchSize}_${Timestamp}"
+Filename="e2e-edge-pipeline_${PipelineConfig}_${NumStreams}Str_${DeviceDetect}-Det_${DeviceClassify}-Class_BS${BatchSize}${ProcessTag}_${Timestamp}"
 
 # Power monitoring
+# Sample the whole run; the timestamped series is integrated over the
+# gvafpscounter averaging window (after starting-frame) in the summary
 PowerPID=""
 PowerLogFile="${ResultsDir}/${Filename}_power.log"
-PowerDelay=$(bc <<< "scale=0; ${Duration} / 4")
-PowerDuration=$(bc <<< "scale=0; ${Duration} / 2")
-
-if [[ -x "${basedir}/utils/get_package_power.sh" ]]; then
-    "${basedir}/utils/get_package_power.sh" -s 1 -i "${PowerDuration}" -d "${PowerDelay}" > "${PowerLogFile}" 2>&1 &
+PowerSeriesFile="${ResultsDir}/${Filename}_power_series.csv"
+PowerDelay=0
+# The sampler starts before the containers and is killed once the pipelines
+# finish; the margin only bounds it if the driver dies without cleanup
+PowerStartupMargin=600
+PowerDuration=$((Duration + PowerStartupMargin))
+
+if [[ "${PowerMonitor}" == true && -x "${basedir}/utils/get_package_power.sh" ]]; then
+    "${basedir}/utils/get_package_power.sh" -s 1 -i "${PowerDuration}" -d "${PowerDelay}" -o "${PowerSeriesFile}" > "${PowerLogFile}" 2>&1 &
     PowerPID=$!
     sleep 0.5
     if kill -0 "${PowerPID}" 2>/dev/null; then
@@ -234,50 +310,57 @@ if [[ -x "${basedir}/utils/get_package_power.sh" ]]; then
     fi
 fi
 
-docker ps -aq --filter "name=e2e-edge-pipeline-*-${Timestamp}" 2>/dev/null | xargs -r docker rm -f >/dev/null 2>&1 || true
+if [[ -n "${PoolContainer}" ]]; then
+    # Devices, mounts and core pinning were set up when the warm container was started
+    ContainerBase="${PoolContainer}"
+else
+    docker ps -aq --filter "name=e2e-edge-pipeline-*-${Timestamp}" 2>/dev/null | xargs -r docker rm -f >/dev/null 2>&1 || true
+
+    # Configure Docker launch command
+    DockerCommand=(
+        docker run --rm --init
+        -v "${basedir}/pipelines:/home/dlstreamer/pipelines"
+        --env ONEDNN_VERBOSE=0
+        --env OPENCV_OCL_RUNTIME=""
+    )
+    if [[ -n "${ModelCache}" ]]; then
+        DockerCommand+=( -v "${ModelCache}:${ModelCacheMount}" )
+    fi
 
-# Configure Docker launch command
-DockerCommand=(
-    docker run --rm --init
-    -v "${basedir}/pipelines:/home/dlstreamer/pipelines"
-    --env ONEDNN_VERBOSE=0
-    --env OPENCV_OCL_RUNTIME=""
-)
+    # /dev/dri (GPU/VA) and /dev/accel (NPU)
+    mapfile -t DeviceArgs < <(docker_device_args /dev/dri 'render*'; docker_device_args /dev/accel 'accel*')
+    DockerCommand+=( "${DeviceArgs[@]}" )
 
-# /dev/dri (GPU/VA)
-if [[ -d /dev/dri ]]; then
-    DockerCommand+=( --device /dev/dri )
-    declare -A _seen_gid_dri=()
-    if compgen -G "/dev/dri/render*" >/dev/null; then
-        for n in /dev/dri/render*; do
-	    gid="$(stat -c '%g' "$n" 2>/dev/null || true)"
-	    [[ -n "${gid}" && -z "${_seen_gid_dri[$gid]:-}" ]] && {
-	        DockerCommand+=( --group-add "${gid}" )
-	        _seen_gid_dri["$gid"]=1
-	    }
-	done
+    # Core pinning for workload scheduling
+    if [[ -n "${Cores}" && "${Cores}" != "NO_PIN" ]]; then
+        DockerCommand+=( --cpuset-cpus "${Cores}" )
     fi
 fi
 
-# /dev/accel (NPU)
-if [[ -e /dev/accel ]]; then
-    DockerCommand+=( --device /dev/accel )
-    declare -A _seen_gid_accel=()
-    if compgen -G "/dev/accel/accel*" >/dev/null; then
-	for n in /dev/accel/accel*; do
-	    gid="$(stat -c '%g' "$n" 2>/dev/null || true)"
-	    [[ -n "${gid}" && -z "${_seen_gid_accel[$gid]:-}" ]] && {
-		DockerCommand+=( --group-add "${gid}" )
-	        _seen_gid_accel["$gid"]=1
-	    }
-        done
+stop_containers() {
+    if [[ -n "${PoolContainer}" ]]; then
+        # Warm container: stop the pipelines, keep the container for the next run
+        docker exec "${PoolContainer}" pkill -TERM -f gst-launch-1.0 >/dev/null 2>&1 || true
+    else
+        docker stop -t 2 "${CommandContainers[@]}" >/dev/null 2>&1 || true
     fi
-fi
+}
 
-# Core pinning for workload scheduling
-if [[ -n "${Cores}" && "${Cores}" != "NO_PIN" ]]; then
-    DockerCommand+=( --cpuset-cpus "${Cores}" )
-fi
+# Resident memory of the run's gst-launch processes, sampled from the host (docker top)
+# every 2 seconds as "<elapsed s> <MiB>" lines; the peak is reported in the summary
+MemoryLogFile="${ResultsDir}/${Filename}_memory.log"
+MemoryPID=""
+sample_memory()
+{
+    local containers=("${CommandContainers[@]}") elapsed=0
+    [[ -n "${PoolContainer}" ]] && containers=("${PoolContainer}")
+    while sleep 2; do
+        elapsed=$((elapsed + 2))
+        for container in "${containers[@]}"; do
+            docker top "${container}" -eo rss,comm 2>/dev/null
+        done | awk -v t="${elapsed}" '$2 ~ /^gst-launch/ { kb += $1 } END { printf("%d %.1f\n", t, kb / 1024) }'
+    done > "${MemoryLogFile}"
+}
 
 cleanup() {
 
@@ -285,38 +368,80 @@ cleanup() {
         kill "${PowerPID}" 2>/dev/null || true
         wait "${PowerPID}" 2>/dev/null || true
     fi
+    if [[ -n "${MemoryPID:-}" ]]; then
+        kill "${MemoryPID}" 2>/dev/null || true
+    fi
     
-    if [[ ${#Commands[@]} -gt 1 ]]; then
-        ContainerName1="${ContainerBase}-${DeviceDetect}"
-        ContainerName2="${ContainerBase}-${DeviceClassify}"
-        docker stop -t 2 "${ContainerName1}" >/dev/null 2>&1 || true
-        docker stop -t 2 "${ContainerName2}" >/dev/null 2>&1 || true
+    stop_containers
+}
+trap cleanup INT TERM EXIT
+
+# Follow the logs live (--early-stop) and stop the containers once the FPS has
+# converged or is clearly below target; the measured run length replaces Duration
+EarlyStopReason=""
+monitor_early_stop()
+{
+    local result verdict clock wall
+    local pid_args=()
+    for pid in "${RunPids[@]}"; do
+        pid_args+=(--pid "${pid}")
+    done
+
+    result=$(python3 "${basedir}/utils/fps_monitor.py" --streams "${NumStreams}" \
+        --target "$(LC_ALL=C awk -v f="${TARGET_FPS}" -v m="${ERROR_MARGIN}" 'BEGIN { print f * m }')" \
+        --max-seconds "${Duration}" "${pid_args[@]}" "${MonitorLogs[@]}") || true
+    read -r verdict clock wall _ <<< "${result}"
+
+    if [[ "${verdict}" == "converged" || "${verdict}" == "below" ]]; then
+        EarlyStopReason="${verdict}"
+        echo "[ Info ] Early stop (${verdict}) after ${clock}s of FPS averaging"
+        stop_containers
+        Duration="$(LC_ALL=C awk -v w="${wall}" 'BEGIN { printf("%d", w + 0.5) }')"
+    fi
+}
+
+# Launch prefix for one gst-launch process: a fresh container, or an exec into
+# the warm pool container (the timeout runs inside so it stops the pipeline itself)
+run_command()
+{
+    if [[ -n "${PoolContainer}" ]]; then
+        RunCommand=(docker exec "${PoolContainer}" timeout --preserve-status "${Duration}s")
     else
-        ContainerName="${ContainerBase}"
-        docker stop -t 2 "${ContainerName}" >/dev/null 2>&1 || true
+        RunCommand=(timeout --preserve-status "${Duration}s" "${DockerCommand[@]}" --name "$1" intel/dlstreamer:latest)
     fi
 }
-trap cleanup INT TERM EXIT
+
+# Report which inference elements load a compiled blob and which compile this run
+ModelCacheState="NA"
+if [[ -n "${ModelCache}" ]]; then
+    mapfile -t CacheKeys < <(printf '%s\n' "${PipelineTemplates[@]}" | grep -o "CACHE_DIR=${ModelCacheMount}/[0-9a-f]*" | sed 's|.*/||' | sort -u)
+    ModelCacheState="$(python3 "${basedir}/utils/model_cache.py" check "${ModelCache}" "${CacheKeys[@]}")" || ModelCacheState="NA"
+    echo "[ Info ] Model Cache: ${ModelCacheState} (${ModelCache})"
+fi
+
+sample_memory &
+MemoryPID=$!
 
 LogFiles=()
+RunPids=()
 if [[ ${#Commands[@]} -gt 1 ]]; then
-    DeviceNames=("${DeviceDetect}" "${DeviceClassify}")
     for i in "${!Commands[@]}"; do
-        ContainerName="${ContainerBase}-${DeviceNames[$i]}"
+        ContainerName="${PoolContainer:-${CommandContainers[$i]}}"
         LogFile="${ResultsDir}/${Filename}_part${i}.log"
         LogFiles+=("${LogFile}")
         
         echo "[ Info ] Running pipeline ${i}: ${PipelineDescriptions[$i]}"
         echo "[ Info ] Container: ${ContainerName}"
         echo ""
-        echo "[ Info ] Pipeline Template: ${PipelineTemplates[$i]}"
-        ThisDockerCommand=("${DockerCommand[@]}" --name "${ContainerName}" intel/dlstreamer:latest)
+        echo "[ Info ] Pipeline Template: ${PipelineTemplates[${CommandTemplates[$i]}]}"
+        run_command "${ContainerName}"
         
         # Run the pipelines
 	# shellcheck disable=SC2086
-        timeout --preserve-status "${Duration}s" "${ThisDockerCommand[@]}" gst-launch-1.0 ${Commands[$i]} 2>&1 | grep --line-buffered -v "longjmp causes uninitialized stack frame" | tee "${LogFile}" &
+        "${RunCommand[@]}" gst-launch-1.0 ${Commands[$i]} 2>&1 | grep --line-buffered -v "longjmp causes uninitialized stack frame" | tee "${LogFile}" &
+        RunPids+=($!)
     done
-    wait
+    MonitorLogs=("${LogFiles[@]}")
 else
     ContainerName="${ContainerBase}"
     LogFile="${ResultsDir}/${Filename}.log"
@@ -325,16 +450,33 @@ else
     echo "[ Info ] Container: ${ContainerName}"
     echo ""
     echo "[ Info ] Pipeline Template: ${PipelineTemplates[0]}"
-    ThisDockerCommand=("${DockerCommand[@]}" --name "${ContainerName}" intel/dlstreamer:latest)
+    run_command "${ContainerName}"
     
     # Run the pipelines
     # shellcheck disable=SC2086
     sleep 1
-    timeout --preserve-status "${Duration}s" "${ThisDockerCommand[@]}" gst-launch-1.0 ${Commands[0]} 2>&1 | grep --line-buffered -v "longjmp causes uninitialized stack frame" | tee "${LogFile}"
+    if [[ "${EarlyStop}" == true ]]; then
+        # shellcheck disable=SC2086
+        "${RunCommand[@]}" gst-launch-1.0 ${Commands[0]} 2>&1 | grep --line-buffered -v "longjmp causes uninitialized stack frame" | tee "${LogFile}" &
+        RunPids+=($!)
+        MonitorLogs=("${LogFile}")
+    else
+        "${RunCommand[@]}" gst-launch-1.0 ${Commands[0]} 2>&1 | grep --line-buffered -v "longjmp causes uninitialized stack frame" | tee "${LogFile}"
+    fi
+fi
+
+if [[ "${EarlyStop}" == true && ${#RunPids[@]} -gt 0 ]]; then
+    monitor_early_stop
+fi
+if [[ ${#RunPids[@]} -gt 0 ]]; then
+    wait "${RunPids[@]}"
 fi
 
-# Combine all log files into a single log for analysis in concurrent mode
-if [[ "${Concurrent}" == true && ${#LogFiles[@]} -gt 1 ]]; then
+kill "${MemoryPID}" 2>/dev/null || true
+MemoryPID=""
+
+# Combine all log files into a single log for analysis (concurrent mode, several processes)
+if [[ ${#LogFiles[@]} -gt 1 ]]; then
     cat "${LogFiles[@]}" > "${ResultsDir}/${Filename}.log"
 fi
 
@@ -348,21 +490,23 @@ echo "================="
 Throughput=$(grep 'FpsCounter' "${ResultsDir}/${Filename}.log" | grep 'average' | tail -n1 | sed 's/.*total=//' | cut -d' ' -f1)
 
 # Process power metrics if available
-AvgPower="NA"
+# The log spans the whole run (container start-up and compilation included), so
+# its mean is only printed; Avg Power, FPS/W and energy use the FPS window below
+RunPower="NA"
 if [[ -n "${PowerPID:-}" ]]; then
     kill "${PowerPID}" 2>/dev/null || true
     wait "${PowerPID}" 2>/dev/null || true
     if [[ -f "${PowerLogFile}" ]] && grep -q "W$" "${PowerLogFile}" 2>/dev/null; then
-        AvgPower=$(grep -oP '\d+\.\d+(?= W)' "${PowerLogFile}" | \
+        RunPower=$(grep -oP '\d+\.\d+(?= W)' "${PowerLogFile}" | \
             awk '{sum+=$1; count++} END {if(count>0) printf "%.2f", sum/count; else print "NA"}')
-        if [[ "${AvgPower}" != "NA" ]]; then
-            echo "[ Info ] Average Power: ${AvgPower} W"
+        if [[ "${RunPower}" != "NA" ]]; then
+            echo "[ Info ] Average Power (whole run): ${RunPower} W"
         fi
     fi
 fi
 
-# Add up throughputs from all parts if using concurrent mode
-if [[ "${Concurrent}" == true && ${#LogFiles[@]} -gt 1 ]]; then
+# Add up throughputs from all parts (concurrent mode, several processes)
+if [[ ${#LogFiles[@]} -gt 1 ]]; then
     TotalThroughput=0
     for LogFile in "${LogFiles[@]}"; do
         PartThroughput=$(grep 'FpsCounter' "${LogFile}" | grep 'average' | tail -n1 | sed 's/.*total=//' | cut -d' ' -f1)
@@ -386,6 +530,60 @@ else
     TheoreticalStreams="NA"
 fi
 
+# Peak resident memory of all gst-launch processes
+PeakMemory="NA"
+if [[ -s "${MemoryLogFile}" ]]; then
+    PeakMemory=$(awk '$2 > peak { peak = $2 } END { if (peak > 0) printf("%.1f", peak); else print "NA" }' "${MemoryLogFile}")
+fi
+if [[ "${PeakMemory}" != "NA" ]]; then
+    echo "[ Info ] Peak Memory: ${PeakMemory} MiB over ${#Commands[@]} processes ($(LC_ALL=C awk -v m="${PeakMemory}" \
+        -v p="${#Commands[@]}" -v n="${NumStreams}" 'BEGIN { printf("%.1f MiB/process, %.1f MiB/stream", m / p, m / n) }'))"
+fi
+
+# One log per process: per-stream statistics and the energy window need the individual logs
+if [[ ${#LogFiles[@]} -gt 1 ]]; then
+    FpsLogs=("${LogFiles[@]}")
+else
+    FpsLogs=("${ResultsDir}/${Filename}.log")
+fi
+
+# Per-stream FPS distribution, starvation and time below target
+read -r StreamMin StreamP5 StreamMedian StreamP95 StarvedStreams TimeBelowTarget < <(
+    python3 "${basedir}/utils/fps_analytics.py" "${FpsLogs[@]}" --target "${TARGET_FPS}" \
+        --series-csv "${ResultsDir}/${Filename}_fps_series.csv" 2>/dev/null || true)
+: "${StreamMin:=NA}" "${StreamP5:=NA}" "${StreamMedian:=NA}" "${StreamP95:=NA}" "${StarvedStreams:=NA}" "${TimeBelowTarget:=NA}"
+if [[ "${StreamMin}" != "NA" ]]; then
+    echo "[ Info ] Per-Stream FPS (min/p5/median/p95): ${StreamMin} / ${StreamP5} / ${StreamMedian} / ${StreamP95} fps"
+    echo "[ Info ] Starved Streams: ${StarvedStreams}, Max Time Below ${TARGET_FPS} fps: ${TimeBelowTarget} s"
+fi
+
+# Energy accounting over the FPS measurement window
+# Only samples inside the window count: a series that covers part of it gives the
+# window's average power without energy, and no series (legacy collector) gives NA
+AvgPower="NA"
+Energy="NA"
+EnergyPerFrame="NA"
+EnergyPerStreamHour="NA"
+if [[ "${RunPower}" != "NA" && "${Throughput}" != "NA" ]]; then
+    if [[ -f "${PowerSeriesFile}" ]] && read -r WinEnergy WinSeconds WinPower WinFrames WinPerFrame WinPerStreamHour < <(
+            python3 "${basedir}/utils/energy_window.py" "${PowerSeriesFile}" "${FpsLogs[@]}" --streams "${NumStreams}" 2>/dev/null) \
+            && [[ "${WinPower}" != "NA" ]]; then
+        AvgPower="${WinPower}"
+        Energy="${WinEnergy}"
+        EnergyPerFrame="${WinPerFrame}"
+        EnergyPerStreamHour="${WinPerStreamHour}"
+    fi
+    if [[ "${Energy}" != "NA" ]]; then
+        echo "[ Info ] FPS Window Energy: ${Energy} J over ${WinSeconds} s (${WinFrames} frames, avg ${AvgPower} W)"
+        echo "[ Info ] Energy per Frame: ${EnergyPerFrame} J/frame"
+        echo "[ Info ] Energy per Stream-Hour: ${EnergyPerStreamHour} J"
+    elif [[ "${AvgPower}" != "NA" ]]; then
+        echo "[ Warning ] Power series covers only part of the FPS window; energy not reported (avg ${AvgPower} W over the covered samples)"
+    else
+        echo "[ Warning ] No timestamped power samples inside the FPS window; power and energy reported as NA"
+    fi
+fi
+
 # Calculate power efficiency if power data available
 Efficiency="NA"
 if [[ "${AvgPower}" != "NA" && "${Throughput}" != "NA" ]]; then
@@ -395,56 +593,53 @@ if [[ "${AvgPower}" != "NA" && "${Throughput}" != "NA" ]]; then
 fi
 echo -e "\n\n"
 
-# Save results to a CSV file
-csv_escape() { printf '%s' "$1" | sed 's/"/""/g'; }
-
-if [[ ${#Commands[@]} -gt 1 ]]; then
-    # Multiple pipelines in concurrent mode
-    CSVLabels="Timestamp,System,Duration (s),Cores Pinned,Pipeline Config,Detect Device,Classify Device,Batch,Throughput (fps),Throughput per Stream (fps/#),Theoretical Stream Density (@${TARGET_FPS}fps±5%),Measured Stream Density (#),Concurrent Mode,Device Configuration,Avg Power (W),Efficiency (FPS/W),Pipeline1,Pipeline2"
-    
-    printf '%s\n' "${CSVLabels}" > "${ResultsDir}/${Filename}.csv"
-    printf '"%s","%s","%s","%s","%s","%s","%s","%s","%s","%s","%s","%s","%s","%s","%s","%s","%s","%s"\n' \
-        "$(csv_escape "${Timestamp}")" \
-        "$(csv_escape "${System}")" \
-        "$(csv_escape "${Duration}")" \
-        "$(csv_escape "${Cores}")" \
-        "$(csv_escape "${PipelineConfig}")" \
-        "$(csv_escape "${DeviceDetect}")" \
-        "$(csv_escape "${DeviceClassify}")" \
-        "$(csv_escape "${BatchSize}")" \
-        "$(csv_escape "${Throughput}")" \
-        "$(csv_escape "${ThroughputPerStream}")" \
-        "$(csv_escape "${TheoreticalStreams}")" \
-        "$(csv_escape "${NumStreams}")" \
-        "$(csv_escape "${Concurrent}")" \
-        "$(csv_escape "${DeviceTag}")" \
-        "$(csv_escape "${AvgPower}")" \
-        "$(csv_escape "${Efficiency}")" \
-        "$(csv_escape "${PipelineTemplates[0]}")" \
-        "$(csv_escape "${PipelineTemplates[1]}")" \
-        >> "${ResultsDir}/${Filename}.csv"
+# Record the run in the results store (utils/results_store.py), which also renders the one-row CSV
+StoreArgs=(
+    run.timestamp="${Timestamp}"
+    run.system="${System}"
+    run.duration_s="${Duration}"
+    config.profile="${PipelineConfig}"
+    config.detect="${DeviceDetect}"
+    config.classify="${DeviceClassify}"
+    config.batch="${BatchSize}"
+    config.concurrent="${Concurrent}"
+    config.device_config="${DeviceConfiguration}"
+    config.cores="${Cores}"
+    config.processes="${#Commands[@]}"
+    config.model_cache="${ModelCacheState}"
+    config.target_fps="${TARGET_FPS}"
+    config.early_stop="${EarlyStopReason}"
+    throughput.total_fps="${Throughput}"
+    throughput.per_stream_fps="${ThroughputPerStream}"
+    throughput.streams="${NumStreams}"
+    throughput.theoretical_streams="${TheoreticalStreams}"
+    throughput.min_stream_fps="${StreamMin}"
+    throughput.p5_stream_fps="${StreamP5}"
+    throughput.median_stream_fps="${StreamMedian}"
+    throughput.p95_stream_fps="${StreamP95}"
+    throughput.starved_streams="${StarvedStreams}"
+    throughput.time_below_target_s="${TimeBelowTarget}"
+    power.avg_w="${AvgPower}"
+    power.efficiency_fps_per_w="${Efficiency}"
+    power.energy_j="${Energy}"
+    power.energy_per_frame_j="${EnergyPerFrame}"
+    power.energy_per_stream_hour_j="${EnergyPerStreamHour}"
+    memory.peak_mib="${PeakMemory}"
+    telemetry.csv="${ResultsDir}/${Filename}.csv"
+    telemetry.log="${ResultsDir}/${Filename}.log"
+)
+for Template in "${PipelineTemplates[@]}"; do
+    StoreArgs+=( config.pipelines+="${Template}" )
+done
+[[ -s "${ResultsDir}/${Filename}_fps_series.csv" ]] && StoreArgs+=( throughput.series="${ResultsDir}/${Filename}_fps_series.csv" )
+[[ -s "${PowerSeriesFile}" ]] && StoreArgs+=( power.series="${PowerSeriesFile}" )
+[[ -s "${PowerLogFile}" ]] && StoreArgs+=( telemetry.power_log="${PowerLogFile}" )
+[[ -s "${MemoryLogFile}" ]] && StoreArgs+=( telemetry.memory_log="${MemoryLogFile}" )
+
+if RunId=$(python3 "${basedir}/utils/results_store.py" record --driver edge-pipeline \
+        --csv "${ResultsDir}/${Filename}.csv" "${StoreArgs[@]}"); then
+    echo "[ Info ] Recorded run ${RunId} in the results store"
 else
-    # Not concurrent mode
-    CSVLabels="Timestamp,System,Duration (s),Cores Pinned,Pipeline Config,Detect Device,Classify Device,Batch,Throughput (fps),Throughput per Stream (fps/#),Theoretical Stream Density (@${TARGET_FPS}fps±5%),Measured Stream Density (#),Concurrent Mode,Device Configuration,Avg Power (W),Efficiency (FPS/W),Pipeline"
-    
-    printf '%s\n' "${CSVLabels}" > "${ResultsDir}/${Filename}.csv"
-    printf '"%s","%s","%s","%s","%s","%s","%s","%s","%s","%s","%s","%s","%s","%s","%s","%s","%s"\n' \
-        "$(csv_escape "${Timestamp}")" \
-        "$(csv_escape "${System}")" \
-        "$(csv_escape "${Duration}")" \
-        "$(csv_escape "${Cores}")" \
-        "$(csv_escape "${PipelineConfig}")" \
-        "$(csv_escape "${DeviceDetect}")" \
-        "$(csv_escape "${DeviceClassify}")" \
-        "$(csv_escape "${BatchSize}")" \
-        "$(csv_escape "${Throughput}")" \
-        "$(csv_escape "${ThroughputPerStream}")" \
-        "$(csv_escape "${TheoreticalStreams}")" \
-        "$(csv_escape "${NumStreams}")" \
-        "$(csv_escape "${Concurrent}")" \
-        "$(csv_escape "${DeviceTag}")" \
-        "$(csv_escape "${AvgPower}")" \
-        "$(csv_escape "${Efficiency}")" \
-        "$(csv_escape "${PipelineTemplates[0]}")" \
-        >> "${ResultsDir}/${Filename}.csv"
+    echo "[ Error ] Could not record the run in the results store"
+    exit 1
 fi
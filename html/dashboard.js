@@ -10,8 +10,11 @@ class PipelineDashboard {
   constructor() {
     this.summary = [];
     this.rawData = [];
+    this.rawManifest = null; // compact data.json: raw rows live in chunk files
+    this.rawChunksLoaded = 0;
     this.systemInfo = null;
-    this.bestConfigMode = 'performance'; // 'performance' or 'efficiency'
+    this.regression = null;
+    this.bestConfigMode = 'performance'; // 'performance', 'efficiency' or 'energy'
     this.charts = {
       throughput: null,
       theoretical: null,
@@ -36,9 +39,11 @@ class PipelineDashboard {
     try {
       await this.loadData();
       await this.loadSystemInfo();
+      await this.loadRegression();
       this.updateDashboardTitle();
       this.setupToggleListeners();
       this.renderTable();
+      this.renderRegressionPanel();
       this.renderCharts();
       this.renderSystemInfo();
       this.renderRawData();
@@ -48,24 +53,21 @@ class PipelineDashboard {
   }
 
   setupToggleListeners() {
-    const performanceBtn = document.getElementById('togglePerformance');
-    const efficiencyBtn = document.getElementById('toggleEfficiency');
+    const buttons = {
+      performance: document.getElementById('togglePerformance'),
+      efficiency: document.getElementById('toggleEfficiency'),
+      energy: document.getElementById('toggleEnergy')
+    };
     
-    if (performanceBtn && efficiencyBtn) {
-      performanceBtn.addEventListener('click', () => {
-        this.bestConfigMode = 'performance';
-        performanceBtn.classList.add('active');
-        efficiencyBtn.classList.remove('active');
+    Object.entries(buttons).forEach(([mode, btn]) => {
+      if (!btn) return;
+      btn.addEventListener('click', () => {
+        this.bestConfigMode = mode;
+        Object.values(buttons).forEach(other => other && other.classList.remove('active'));
+        btn.classList.add('active');
         this.updateBestConfigDisplay();
       });
-      
-      efficiencyBtn.addEventListener('click', () => {
-        this.bestConfigMode = 'efficiency';
-        efficiencyBtn.classList.add('active');
-        performanceBtn.classList.remove('active');
-        this.updateBestConfigDisplay();
-      });
-    }
+    });
   }
 
   async loadData() {
@@ -75,7 +77,12 @@ class PipelineDashboard {
       if (response.ok) {
         const data = await response.json();
         this.summary = data.summary || [];
-        this.rawData = data.raw || [];
+        if (Array.isArray(data.raw)) {
+          this.rawData = data.raw;
+        } else if (data.raw && data.raw.chunks) {
+          // Compact format: raw chunks are fetched when the raw data section is opened
+          this.rawManifest = data.raw;
+        }
       } else {
         // Fallback to embedded data if available
         if (typeof SUMMARY !== 'undefined' && typeof RAW !== 'undefined') {
@@ -107,6 +114,65 @@ class PipelineDashboard {
     }
   }
 
+  async loadRegression() {
+    try {
+      const response = await fetch('regression.json');
+      if (response.ok) {
+        this.regression = await response.json();
+      }
+    } catch (error) {
+      console.warn('Failed to load regression report:', error.message);
+    }
+  }
+
+  renderRegressionPanel() {
+    const panel = document.getElementById('regressionPanel');
+    const content = document.getElementById('regressionContent');
+    if (!panel || !content || !this.regression) return;
+
+    const report = this.regression;
+    const order = { regression: 0, inconclusive: 1, missing: 2, improvement: 3, new: 4, ok: 5, insufficient: 6 };
+    const groups = (report.groups || [])
+      .filter(g => g.status !== 'ok')
+      .sort((a, b) => (order[a.status] ?? 9) - (order[b.status] ?? 9));
+
+    const statusClass = {
+      regression: 'status-error',
+      inconclusive: 'status-warning',
+      missing: 'status-warning',
+      improvement: 'status-success'
+    };
+
+    const rows = groups.map(g => {
+      const metrics = Object.entries(g.metrics || {})
+        .filter(([, m]) => m.change_pct != null)
+        .map(([name, m]) => `${name} ${m.change_pct > 0 ? '+' : ''}${m.change_pct}% <span class="stat-note">(p=${m.p_value}, n=${m.baseline_n}→${m.candidate_n})</span>`)
+        .join('<br>');
+      return `
+        <tr>
+          <td><span class="${statusClass[g.status] || ''}">${g.status}</span></td>
+          <td>${g.config}</td>
+          <td>${g.device_config}</td>
+          <td>${g.batch}</td>
+          <td>${metrics || '—'}</td>
+        </tr>
+      `;
+    }).join('');
+
+    const headline = report.regressions > 0
+      ? `<span class="status-error">${report.regressions} regression(s)</span>`
+      : '<span class="status-success">No regressions</span>';
+    content.innerHTML = `
+      <p>${headline} against baseline <strong>${report.baseline}</strong>
+        (threshold ${report.threshold_pct}%, α=${report.alpha}, generated ${report.generated})</p>
+      ${rows ? `<div class="table-container"><table>
+        <thead><tr><th>Status</th><th>Config</th><th>Device Configuration</th><th>Batch</th><th>Change</th></tr></thead>
+        <tbody>${rows}</tbody>
+      </table></div>` : ''}
+    `;
+    panel.style.display = 'block';
+  }
+
   updateDashboardTitle() {
     const titleElement = document.getElementById('dashboardTitle');
     if (titleElement && this.systemInfo && this.systemInfo.system && this.systemInfo.system.name) {
@@ -130,12 +196,27 @@ class PipelineDashboard {
     const bestConfigs = this.getBestConfigurations();
 
     const rows = this.summary.map(record => {
+      const thrStats = record.stats && record.stats.throughput;
+      const fpsTitle = thrStats && thrStats.n > 1
+        ? ` title="median ${thrStats.median}, CV ${(thrStats.cv * 100).toFixed(1)}%, 95% CI ${thrStats.ci_low}–${thrStats.ci_high}"`
+        : '';
+      const spread = thrStats && thrStats.n > 1
+        ? ` <span class="stat-note">±${parseFloat(thrStats.stddev).toFixed(2)}</span>`
+        : '';
       const fps = record.avg_throughput 
-        ? `<span class="status-success">${parseFloat(record.avg_throughput).toFixed(2)}</span>`
+        ? `<span class="${record.stable === false && thrStats && thrStats.n > 1 ? 'status-warning' : 'status-success'}"${fpsTitle}>${parseFloat(record.avg_throughput).toFixed(2)}</span>${spread}`
         : '<span class="status-error">Failed</span>';
       
+      const runs = record.outliers
+        ? `${record.runs} <span class="stat-note" title="Excluded: ${(record.outlier_runs || []).join(', ')}">(${record.outliers} outlier${record.outliers > 1 ? 's' : ''})</span>`
+        : `${record.runs}`;
+      
+      const starved = (record.starved_runs || []).length;
+      const tail = record.min_stream_fps != null
+        ? ` <span class="${starved ? 'stat-note status-warning' : 'stat-note'}" title="Worst stream ${record.min_stream_fps} fps, p5 ${record.p5_stream_fps ?? 'N/A'} fps${starved ? `; starved stream in: ${record.starved_runs.join(', ')}` : ''}">min ${parseFloat(record.min_stream_fps).toFixed(1)}/stream</span>`
+        : '';
       const streams = record.theoretical_streams 
-        ? `<span class="status-success">${record.theoretical_streams}</span>`
+        ? `<span class="status-success">${record.theoretical_streams}</span>${tail}`
         : '<span class="status-error">N/A</span>';
       
       const power = record.avg_power && record.avg_power !== 'NA'
@@ -146,6 +227,10 @@ class PipelineDashboard {
         ? `${parseFloat(record.efficiency).toFixed(2)}`
         : 'N/A';
 
+      const energy = record.energy_per_frame != null
+        ? `${parseFloat(record.energy_per_frame).toFixed(4)}`
+        : 'N/A';
+
       const configName = record.config.charAt(0).toUpperCase() + record.config.slice(1).toLowerCase();
       const isBest = bestConfigs[record.config] === record;
       const configCell = isBest 
@@ -160,11 +245,12 @@ class PipelineDashboard {
           <td>${configCell}</td>
           <td>${deviceConfig}</td>
           <td>${record.batch}</td>
-          <td>${record.runs}</td>
+          <td>${runs}</td>
           <td>${fps}</td>
           <td>${streams}</td>
           <td>${power}</td>
           <td>${efficiency}</td>
+          <td>${energy}</td>
         </tr>
       `;
     }).join('');
@@ -193,7 +279,12 @@ class PipelineDashboard {
       const records = configGroups[configType];
       if (records.length > 0) {
         bestConfigs[configType] = records.reduce((best, current) => {
-          if (mode === 'efficiency') {
+          if (mode === 'energy') {
+            // Lowest energy cost (J/frame); records without energy data never win
+            if (current.energy_per_frame == null) return best;
+            if (best.energy_per_frame == null) return current;
+            return current.energy_per_frame < best.energy_per_frame ? current : best;
+          } else if (mode === 'efficiency') {
             // Best efficiency (FPS/W)
             const bestEff = best.efficiency || 0;
             const currentEff = current.efficiency || 0;
@@ -220,7 +311,19 @@ class PipelineDashboard {
       const configName = configType.charAt(0).toUpperCase() + configType.slice(1).toLowerCase();
       const deviceConfig = record.device_config || `${record.detect}/${record.classify}`;
       
-      if (mode === 'efficiency') {
+      if (mode === 'energy') {
+        if (record.energy_per_frame == null) return '';
+        return `
+          <div class="best-config-item efficiency-mode">
+            <div class="best-config-header">${configName} - Lowest Energy</div>
+            <div class="best-config-details">
+              ${deviceConfig} Batch ${record.batch}: 
+              <strong>${parseFloat(record.energy_per_frame).toFixed(4)} J/frame</strong> 
+              (${Math.round(record.energy_per_stream_hour)} J per stream-hour @ ${parseFloat(record.avg_power).toFixed(2)} W)
+            </div>
+          </div>
+        `;
+      } else if (mode === 'efficiency') {
         if (!record.efficiency || record.efficiency === 'NA') return '';
         return `
           <div class="best-config-item efficiency-mode">
@@ -450,6 +553,43 @@ class PipelineDashboard {
     };
   }
 
+  createErrorBarPlugin(statKey) {
+    return {
+      id: 'errorBarPlugin',
+      afterDatasetsDraw: (chart) => {
+        const meta = chart.getDatasetMeta(0);
+        if (!meta || !meta.data || !this.validData) return;
+        
+        const yScale = chart.scales.y;
+        const ctx = chart.ctx;
+        ctx.save();
+        ctx.strokeStyle = '#ddd';
+        ctx.lineWidth = 1;
+        
+        meta.data.forEach((bar, i) => {
+          const record = this.validData[i];
+          const stats = record && record.stats && record.stats[statKey];
+          if (!stats || stats.ci_low == null || stats.ci_high == null) return;
+          
+          // Whisker spanning the bootstrap confidence interval of the mean
+          const yLow = yScale.getPixelForValue(stats.ci_low);
+          const yHigh = yScale.getPixelForValue(stats.ci_high);
+          const cap = Math.min(6, bar.width / 4);
+          ctx.beginPath();
+          ctx.moveTo(bar.x, yLow);
+          ctx.lineTo(bar.x, yHigh);
+          ctx.moveTo(bar.x - cap, yLow);
+          ctx.lineTo(bar.x + cap, yLow);
+          ctx.moveTo(bar.x - cap, yHigh);
+          ctx.lineTo(bar.x + cap, yHigh);
+          ctx.stroke();
+        });
+        
+        ctx.restore();
+      }
+    };
+  }
+
   createValueLabelPlugin() {
     return {
       id: 'valueLabelPlugin',
@@ -606,7 +746,7 @@ class PipelineDashboard {
           }]
         },
         options: throughputOptions,
-        plugins: [this.createGroupLabelPlugin(), this.createValueLabelPlugin()]
+        plugins: [this.createGroupLabelPlugin(), this.createErrorBarPlugin('throughput'), this.createValueLabelPlugin()]
       });
     }
 
@@ -629,7 +769,7 @@ class PipelineDashboard {
           }]
         },
         options: efficiencyOptions,
-        plugins: [this.createGroupLabelPlugin(), this.createValueLabelPlugin()]
+        plugins: [this.createGroupLabelPlugin(), this.createErrorBarPlugin('efficiency'), this.createValueLabelPlugin()]
       });
     }
 
@@ -675,7 +815,7 @@ class PipelineDashboard {
           }]
         },
         options: powerOptions,
-        plugins: [this.createGroupLabelPlugin(), this.createValueLabelPlugin()]
+        plugins: [this.createGroupLabelPlugin(), this.createErrorBarPlugin('power'), this.createValueLabelPlugin()]
       });
     }
 
@@ -797,9 +937,80 @@ class PipelineDashboard {
 
   renderRawData() {
     const rawDump = document.getElementById('rawDump');
-    if (rawDump && this.rawData.length > 0) {
-      rawDump.textContent = JSON.stringify(this.rawData, null, 2);
+    if (!rawDump) return;
+    
+    if (!this.rawManifest) {
+      if (this.rawData.length > 0) {
+        rawDump.textContent = JSON.stringify(this.rawData, null, 2);
+      }
+      return;
+    }
+    
+    const details = rawDump.closest('details');
+    const loadMoreBtn = document.getElementById('rawLoadMore');
+    const chunks = this.rawManifest.chunks;
+    let loading = false;
+    
+    const showNextChunk = async () => {
+      if (loading || this.rawChunksLoaded >= chunks.length) return;
+      loading = true;
+      try {
+        const rows = await this.fetchRawChunk(chunks[this.rawChunksLoaded]);
+        this.rawData.push(...rows);
+        this.rawChunksLoaded++;
+        rawDump.textContent = JSON.stringify(this.rawData, null, 2);
+      } catch (error) {
+        rawDump.textContent = `Failed to load raw data: ${error.message}`;
+      } finally {
+        loading = false;
+      }
+      if (loadMoreBtn) {
+        const remaining = this.rawManifest.count - this.rawData.length;
+        loadMoreBtn.style.display = this.rawChunksLoaded < chunks.length ? 'inline-block' : 'none';
+        loadMoreBtn.textContent = `Load more (${remaining} remaining)`;
+      }
+    };
+    
+    if (details) {
+      details.addEventListener('toggle', () => {
+        if (details.open && this.rawChunksLoaded === 0) showNextChunk();
+      });
+    }
+    if (loadMoreBtn) {
+      loadMoreBtn.addEventListener('click', showNextChunk);
+    }
+  }
+
+  async fetchRawChunk(chunk) {
+    const response = await fetch(chunk.file);
+    if (!response.ok) {
+      throw new Error(`${chunk.file}: HTTP ${response.status}`);
+    }
+    
+    // Gzipped chunks are served as plain files; skip decompression if the server already did it
+    const bytes = new Uint8Array(await response.arrayBuffer());
+    let text;
+    if (bytes[0] === 0x1f && bytes[1] === 0x8b) {
+      const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+      text = await new Response(stream).text();
+    } else {
+      text = new TextDecoder().decode(bytes);
+    }
+    return this.decodeColumnar(JSON.parse(text));
+  }
+
+  decodeColumnar(chunk) {
+    const { columns, pipelines, data } = chunk;
+    const count = columns.length ? data[columns[0]].length : 0;
+    const rows = [];
+    for (let i = 0; i < count; i++) {
+      const row = {};
+      columns.forEach(name => {
+        row[name] = name === 'pipeline' ? pipelines[data[name][i]] : data[name][i];
+      });
+      rows.push(row);
     }
+    return rows;
   }
 
   renderSystemInfo() {
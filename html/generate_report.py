@@ -2,19 +2,55 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from __future__ import annotations
+import argparse
 import csv
+import gzip
 import json
+import os
+import random
 import re
-from dataclasses import dataclass, asdict
+import sqlite3
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, fields
 from collections import defaultdict
 from pathlib import Path
-from statistics import mean
+from statistics import NormalDist, fmean, mean, median, stdev
+
+import regression
 
 ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "utils"))
+import results_store  # noqa: E402
+
 RESULTS = ROOT / "results"
+STORE_DRIVER = "edge-pipeline"
 HTML_DIR = Path(__file__).resolve().parent
 DATA_JSON = HTML_DIR / "data.json"
-CSV_PATTERN = re.compile(r"e2e-edge-pipeline_.*\.csv$")
+RAW_CHUNK_PREFIX = "data_raw_"
+RAW_CHUNK_ROWS = 5000
+CSV_PATTERN = re.compile(r"e2e-edge-pipeline_.*(?<!_power_series)(?<!_fps_series)\.csv$")
+CACHE_DB = RESULTS / ".report_cache.sqlite"
+BASELINES_DIR = RESULTS / "baselines"
+REGRESSION_JSON = HTML_DIR / "regression.json"
+PARALLEL_THRESHOLD = 64
+
+# Per-group statistics: Record field -> (stats key, rounding digits)
+STATS_METRICS = {
+    "throughput": ("throughput", 2),
+    "avg_power": ("power", 2),
+    "efficiency": ("efficiency", 2),
+    "energy_per_frame": ("energy_per_frame", 4),
+    "min_stream_fps": ("min_stream_fps", 2),
+    "peak_memory": ("peak_memory", 1),
+}
+MAD_THRESHOLD = 3.5          # modified z-score above which a run is flagged (Iglewicz & Hoaglin)
+BOOTSTRAP_RESAMPLES = 1000
+BOOTSTRAP_MAX_RUNS = 200     # larger groups use the normal approximation (CLT) instead
+CONFIDENCE = 0.95
+STABLE_MIN_RUNS = 3
+STABLE_MAX_CV = 0.05         # throughput CV at or below which a group is considered stable
 
 @dataclass
 class Record:
@@ -34,6 +70,18 @@ class Record:
     device_config: str | None = None
     avg_power: float | None = None
     efficiency: float | None = None
+    energy: float | None = None
+    energy_per_frame: float | None = None
+    energy_per_stream_hour: float | None = None
+    min_stream_fps: float | None = None
+    p5_stream_fps: float | None = None
+    median_stream_fps: float | None = None
+    p95_stream_fps: float | None = None
+    starved_streams: float | None = None
+    time_below_target: float | None = None
+    model_cache: str | None = None
+    processes: float | None = None
+    peak_memory: float | None = None
 
 
 def parse_float(value: str | None) -> float | None:
@@ -41,81 +89,418 @@ def parse_float(value: str | None) -> float | None:
     return float(value) if value and value.upper() != 'NA' else None
 
 
-def read_csvs():
-    """Read all CSV benchmark files from device-specific subdirectories and return parsed records."""
-    records: list[Record] = []
-    if not RESULTS.exists():
-        return records
+def parse_csv_file(path: str) -> Record | None:
+    """Parse one benchmark CSV (header + single data row) into a Record."""
+    with open(path, "r", newline="") as fh:
+        rows = list(csv.reader(fh))
+    if len(rows) < 2:
+        return None
+    
+    # Create dict by zipping header with data row
+    res_dict = dict(zip(rows[0], rows[1]))
+    
+    # Build pipeline string based on available columns
+    if "Pipeline1" in res_dict and "Pipeline2" in res_dict:
+        pipeline_data = f"Pipeline1: {res_dict['Pipeline1']}... | Pipeline2: {res_dict['Pipeline2']}..."
+    elif "Pipeline1" in res_dict:
+        pipeline_data = res_dict["Pipeline1"]
+    else:
+        pipeline_data = res_dict.get("Pipeline", "")
+    
+    return Record(
+        timestamp=res_dict.get("Timestamp", ""),
+        system=res_dict.get("System", ""),
+        duration=res_dict.get("Duration (s)", ""),
+        cores=res_dict.get("Cores Pinned", ""),
+        config=res_dict.get("Pipeline Config", ""),
+        detect=res_dict.get("Detect Device", ""),
+        classify=res_dict.get("Classify Device", ""),
+        batch=res_dict.get("Batch", ""),
+        throughput=parse_float(res_dict.get("Throughput (fps)")),
+        per_stream=parse_float(res_dict.get("Throughput per Stream (fps/#)")),
+        theoretical=res_dict.get("Theoretical Stream Density (@30fps±5%)", ""),
+        streams=res_dict.get("Measured Stream Density (#)", ""),
+        pipeline=pipeline_data,
+        device_config=res_dict.get("Device Configuration"),
+        avg_power=parse_float(res_dict.get("Avg Power (W)")),
+        efficiency=parse_float(res_dict.get("Efficiency (FPS/W)")),
+        energy=parse_float(res_dict.get("Energy (J)")),
+        energy_per_frame=parse_float(res_dict.get("Energy per Frame (J)")),
+        energy_per_stream_hour=parse_float(res_dict.get("Energy per Stream-Hour (J)")),
+        min_stream_fps=parse_float(res_dict.get("Min Stream FPS")),
+        p5_stream_fps=parse_float(res_dict.get("P5 Stream FPS")),
+        median_stream_fps=parse_float(res_dict.get("Median Stream FPS")),
+        p95_stream_fps=parse_float(res_dict.get("P95 Stream FPS")),
+        starved_streams=parse_float(res_dict.get("Starved Streams (#)")),
+        time_below_target=parse_float(res_dict.get("Max Time Below Target (s)")),
+        model_cache=res_dict.get("Model Cache"),
+        processes=parse_float(res_dict.get("Processes")),
+        peak_memory=parse_float(res_dict.get("Peak Memory (MiB)")),
+    )
+
+
+def record_from_store(entry: dict) -> Record:
+    """Build a Record from one edge pipeline run of the results store."""
+    def get(key):
+        return results_store.get_field(entry, key)
+    
+    def text(key):
+        value = get(key)
+        return "" if value is None else results_store.csv_value(value)
     
-    # Scan all subdirectories in results/
-    for devconfig_dir in RESULTS.iterdir():
-        if not devconfig_dir.is_dir():
+    def number(key):
+        value = get(key)
+        return float(value) if value is not None else None
+    
+    pipelines = get("config.pipelines") or []
+    if len(pipelines) > 1:
+        pipeline_data = " | ".join(f"Pipeline{i}: {p}..." for i, p in enumerate(pipelines, start=1))
+    else:
+        pipeline_data = pipelines[0] if pipelines else ""
+    
+    return Record(
+        timestamp=text("run.timestamp"),
+        system=text("run.system"),
+        duration=text("run.duration_s"),
+        cores=text("config.cores"),
+        config=text("config.profile"),
+        detect=text("config.detect"),
+        classify=text("config.classify"),
+        batch=text("config.batch"),
+        throughput=number("throughput.total_fps"),
+        per_stream=number("throughput.per_stream_fps"),
+        theoretical=text("throughput.theoretical_streams"),
+        streams=text("throughput.streams"),
+        pipeline=pipeline_data,
+        device_config=get("config.device_config"),
+        avg_power=number("power.avg_w"),
+        efficiency=number("power.efficiency_fps_per_w"),
+        energy=number("power.energy_j"),
+        energy_per_frame=number("power.energy_per_frame_j"),
+        energy_per_stream_hour=number("power.energy_per_stream_hour_j"),
+        min_stream_fps=number("throughput.min_stream_fps"),
+        p5_stream_fps=number("throughput.p5_stream_fps"),
+        median_stream_fps=number("throughput.median_stream_fps"),
+        p95_stream_fps=number("throughput.p95_stream_fps"),
+        starved_streams=number("throughput.starved_streams"),
+        time_below_target=number("throughput.time_below_target_s"),
+        model_cache=get("config.model_cache"),
+        processes=number("config.processes"),
+        peak_memory=number("memory.peak_mib"),
+    )
+
+
+STORE_HEAD_BYTES = 4096
+
+
+def store_head(store: str, offset: int) -> int:
+    """Checksum of the first bytes of the store, to notice a rewritten file."""
+    with open(store, "rb") as f:
+        return zlib.crc32(f.read(min(offset, STORE_HEAD_BYTES)))
+
+
+def read_store(use_cache: bool = True) -> tuple[list[Record], set[str]]:
+    """Edge pipeline runs of the results store, and the CSVs rendered from them.
+
+    With the cache, only records appended since the last run are parsed; a store
+    that shrank or was replaced is read again from the start.
+    """
+    store = os.path.abspath(results_store.default_store())
+    if not os.path.exists(store):
+        return [], set()
+
+    cache = IngestCache(CACHE_DB) if use_cache and RESULTS.exists() else None
+    rows: list[tuple[str, str | None]] = []
+    offset = 0
+    if cache:
+        state, rows = cache.load_store(store)
+        st = os.stat(store)
+        if state and state[0] == st.st_ino and state[2] <= st.st_size and state[1] == store_head(store, state[2]):
+            offset = state[2]
+        else:
+            rows = []
+    reset = offset == 0
+
+    entries, end = results_store.scan(store, driver=STORE_DRIVER, offset=offset)
+    new_rows = []
+    for entry in entries:
+        csv_path = results_store.get_field(entry, "telemetry.csv")
+        if csv_path:
+            csv_path = os.path.realpath(results_store.resolve_path(store, csv_path))
+        new_rows.append((json.dumps(asdict(record_from_store(entry))), csv_path))
+    if cache:
+        st = os.stat(store)
+        cache.update_store(store, (st.st_ino, store_head(store, end), end), new_rows, reset)
+        cache.close()
+
+    rows = rows + new_rows
+    records = [Record(**json.loads(record)) for record, _ in rows]
+    rendered = {csv_path for _, csv_path in rows if csv_path}
+    if records:
+        print(f"[ Info ] Read {len(records)} records from the results store {store} "
+              f"({len(new_rows)} new, {len(rows) - len(new_rows)} from cache)")
+    return records, rendered
+
+
+def _parse_worker(path: str) -> tuple[str, dict | None, str | None]:
+    """Process-pool entry point: returns (path, record fields, error)."""
+    try:
+        rec = parse_csv_file(path)
+        return path, asdict(rec) if rec else None, None
+    except Exception as e:
+        return path, None, str(e)
+
+
+class IngestCache:
+    """SQLite sidecar mapping each results CSV (path, mtime, size) to its parsed Record.
+
+    Files whose stat matches the cached entry are not re-read; entries for deleted
+    files are pruned. The schema version is tied to the Record fields, so adding a
+    column invalidates the cache instead of serving stale records.
+
+    The append-only results store is cached by byte offset: only lines appended
+    since the last run are parsed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.version = zlib.crc32(",".join(f.name for f in fields(Record)).encode()) & 0x7FFFFFFF
+        self.conn = sqlite3.connect(str(path))
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != self.version:
+            self.conn.execute("DROP TABLE IF EXISTS files")
+            self.conn.execute("DROP TABLE IF EXISTS store")
+            self.conn.execute("DROP TABLE IF EXISTS store_records")
+            self.conn.execute(f"PRAGMA user_version = {self.version}")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, record TEXT)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS store ("
+            "path TEXT PRIMARY KEY, inode INTEGER, head INTEGER, offset INTEGER)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS store_records ("
+            "path TEXT, seq INTEGER, record TEXT, csv TEXT, PRIMARY KEY (path, seq))"
+        )
+
+    def load_store(self, path: str) -> tuple[tuple[int, int, int] | None, list[tuple[str, str | None]]]:
+        """(inode, head checksum, offset) of the cached scan of a store and its records."""
+        state = self.conn.execute("SELECT inode, head, offset FROM store WHERE path = ?", (path,)).fetchone()
+        rows = self.conn.execute("SELECT record, csv FROM store_records WHERE path = ? ORDER BY seq", (path,)).fetchall()
+        return state, rows
+
+    def update_store(self, path: str, state: tuple[int, int, int], rows: list[tuple[str, str | None]], reset: bool):
+        with self.conn:
+            if reset:
+                self.conn.execute("DELETE FROM store_records WHERE path = ?", (path,))
+            first = self.conn.execute("SELECT COUNT(*) FROM store_records WHERE path = ?", (path,)).fetchone()[0]
+            self.conn.executemany("INSERT INTO store_records VALUES (?, ?, ?, ?)",
+                                  [(path, first + i, record, csv) for i, (record, csv) in enumerate(rows)])
+            self.conn.execute("INSERT OR REPLACE INTO store VALUES (?, ?, ?, ?)", (path, *state))
+
+    def load(self) -> dict[str, tuple[int, int, str | None]]:
+        return {path: (mtime_ns, size, record)
+                for path, mtime_ns, size, record in self.conn.execute("SELECT * FROM files")}
+
+    def update(self, rows: list[tuple[str, int, int, str | None]], removed: list[str]):
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", rows)
+            self.conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed])
+
+    def close(self):
+        self.conn.close()
+
+
+def scan_results() -> list[tuple[str, int, int]]:
+    """List (path, mtime_ns, size) of every results CSV in device-specific subdirectories."""
+    found = []
+    for devconfig_dir in sorted(os.scandir(RESULTS), key=lambda e: e.name):
+        if not devconfig_dir.is_dir() or devconfig_dir.path == str(BASELINES_DIR):
             continue
-            
+        
         print(f"[ Info ] Scanning {devconfig_dir.name}/ for results files...")
         
-        for res_file in devconfig_dir.iterdir():
-            if not res_file.is_file() or not CSV_PATTERN.search(res_file.name):
+        for entry in os.scandir(devconfig_dir.path):
+            if not entry.is_file() or not CSV_PATTERN.search(entry.name):
                 continue
-                
-            try:
-                with res_file.open("r", newline="") as fh:
-                    rows = list(csv.reader(fh))
-                    if len(rows) < 2:
-                        continue
-                    
-                    # Create dict by zipping header with data row
-                    res_dict = dict(zip(rows[0], rows[1]))
-                    
-                    # Build pipeline string based on available columns
-                    if "Pipeline1" in res_dict and "Pipeline2" in res_dict:
-                        pipeline_data = f"Pipeline1: {res_dict['Pipeline1']}... | Pipeline2: {res_dict['Pipeline2']}..."
-                    elif "Pipeline1" in res_dict:
-                        pipeline_data = res_dict["Pipeline1"]
-                    else:
-                        pipeline_data = res_dict.get("Pipeline", "")
-                    
-                    rec = Record(
-                        timestamp=res_dict.get("Timestamp", ""),
-                        system=res_dict.get("System", ""),
-                        duration=res_dict.get("Duration (s)", ""),
-                        cores=res_dict.get("Cores Pinned", ""),
-                        config=res_dict.get("Pipeline Config", ""),
-                        detect=res_dict.get("Detect Device", ""),
-                        classify=res_dict.get("Classify Device", ""),
-                        batch=res_dict.get("Batch", ""),
-                        throughput=parse_float(res_dict.get("Throughput (fps)")),
-                        per_stream=parse_float(res_dict.get("Throughput per Stream (fps/#)")),
-                        theoretical=res_dict.get("Theoretical Stream Density (@30fps±5%)", ""),
-                        streams=res_dict.get("Measured Stream Density (#)", ""),
-                        pipeline=pipeline_data,
-                        device_config=res_dict.get("Device Configuration"),
-                        avg_power=parse_float(res_dict.get("Avg Power (W)")),
-                        efficiency=parse_float(res_dict.get("Efficiency (FPS/W)")),
-                    )
-                    records.append(rec)
-            except Exception as e:
-                print(f"[ Warning ] Failed to parse {res_file.name}: {e}")
+            st = entry.stat()
+            found.append((entry.path, st.st_mtime_ns, st.st_size))
+    found.sort()
+    return found
+
+
+def read_csvs(use_cache: bool = True, jobs: int | None = None, skip: set[str] = frozenset()):
+    """Read all CSV benchmark files from device-specific subdirectories and return parsed records.
+    
+    Only files that are new or changed since the last run (by mtime and size) are
+    parsed, in parallel across a process pool; everything else comes from CACHE_DB.
+    Files in skip (rendered from results store records) are left out.
+    """
+    records: list[Record] = []
+    if not RESULTS.exists():
+        return records
+    
+    files = [f for f in scan_results() if os.path.realpath(f[0]) not in skip]
+    cache = IngestCache(CACHE_DB) if use_cache else None
+    cached = cache.load() if cache else {}
+    
+    stale = [path for path, mtime_ns, size in files
+             if cached.get(path, (None, None))[:2] != (mtime_ns, size)]
+    
+    stale_set = set(stale)
+    parsed: dict[str, dict | None] = {}
+    if stale:
+        # Pool start-up costs more than parsing a handful of files
+        if len(stale) < PARALLEL_THRESHOLD or jobs == 1:
+            results = list(map(_parse_worker, stale))
+        else:
+            workers = jobs or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_parse_worker, stale, chunksize=max(1, len(stale) // (4 * workers))))
+        for path, fields_dict, error in results:
+            if error:
+                print(f"[ Warning ] Failed to parse {Path(path).name}: {error}")
                 continue
+            parsed[path] = fields_dict
+    
+    stats = {path: (mtime_ns, size) for path, mtime_ns, size in files}
+    for path, _, _ in files:
+        if path in parsed:
+            fields_dict = parsed[path]
+        elif path in cached and path not in stale_set:
+            fields_dict = json.loads(cached[path][2]) if cached[path][2] else None
+        else:
+            continue  # failed to parse; retried next time
+        if fields_dict:
+            records.append(Record(**fields_dict))
     
+    if cache:
+        cache.update(
+            [(path, *stats[path], json.dumps(parsed[path]) if parsed[path] else None) for path in parsed],
+            [path for path in cached if path not in stats],
+        )
+        cache.close()
+    
+    print(f"[ Info ] Parsed {len(parsed)} new or changed files, {len(files) - len(stale)} from cache")
     return records
 
 
+def read_results(use_cache: bool = True, jobs: int | None = None) -> list[Record]:
+    """Runs of the results store, plus legacy CSVs recorded before the store existed."""
+    records, rendered = read_store(use_cache=use_cache)
+    return records + read_csvs(use_cache=use_cache, jobs=jobs, skip=rendered)
+
+
+def mad_outliers(values: list[float]) -> list[bool]:
+    """Flag values whose modified z-score (median/MAD based) exceeds MAD_THRESHOLD."""
+    if len(values) < 3:
+        return [False] * len(values)
+    med = median(values)
+    deviations = [abs(v - med) for v in values]
+    mad = median(deviations)
+    if mad > 0:
+        scale = mad / 0.6745
+    else:
+        # More than half the runs are identical: fall back to the mean absolute deviation
+        scale = fmean(deviations) * 1.253314
+    if scale == 0:
+        return [False] * len(values)
+    return [d / scale > MAD_THRESHOLD for d in deviations]
+
+
+def bootstrap_ci(values: list[float], rng: random.Random) -> tuple[float | None, float | None]:
+    """Percentile bootstrap confidence interval of the mean (normal approximation for large groups)."""
+    n = len(values)
+    if n < 2:
+        return None, None
+    if n > BOOTSTRAP_MAX_RUNS:
+        half_width = NormalDist().inv_cdf(0.5 + CONFIDENCE / 2) * stdev(values) / n ** 0.5
+        avg = fmean(values)
+        return avg - half_width, avg + half_width
+    means = sorted(fmean(rng.choices(values, k=n)) for _ in range(BOOTSTRAP_RESAMPLES))
+    tail = (1 - CONFIDENCE) / 2
+    return means[int(tail * BOOTSTRAP_RESAMPLES)], means[int((1 - tail) * BOOTSTRAP_RESAMPLES) - 1]
+
+
+def describe(values: list[float], rng: random.Random, digits: int) -> dict | None:
+    """Mean, median, spread and bootstrap CI of one metric within a group."""
+    if not values:
+        return None
+    avg = fmean(values)
+    sd = stdev(values) if len(values) > 1 else 0.0
+    ci_low, ci_high = bootstrap_ci(values, rng)
+    
+    def rnd(v):
+        return round(v, digits) if v is not None else None
+    
+    return {
+        "n": len(values),
+        "mean": rnd(avg),
+        "median": rnd(median(values)),
+        "stddev": rnd(sd),
+        "cv": round(sd / avg, 4) if avg else None,
+        "ci_low": rnd(ci_low),
+        "ci_high": rnd(ci_high),
+    }
+
+
+def group_key(r: Record) -> tuple[str, str, str]:
+    """(config, device configuration, batch) a record is aggregated under."""
+    # Use device_config for grouping if available, otherwise fall back to detect/classify
+    if r.device_config:
+        return (r.config, r.device_config, r.batch)
+    return (r.config, f"{r.detect}-{r.classify}", r.batch)
+
+
+def group_samples(records: list[Record]) -> dict[str, dict[str, list[float]]]:
+    """Per-group metric samples for the regression engine, keyed "config|device_config|batch"."""
+    samples: dict[str, dict[str, list[float]]] = defaultdict(lambda: {m: [] for m in regression.METRICS})
+    for r in records:
+        entry = samples["|".join(group_key(r))]
+        for metric in regression.METRICS:
+            value = getattr(r, metric)
+            if value is not None:
+                entry[metric].append(value)
+    return dict(samples)
+
+
 def aggregate(records: list[Record]):
-    """Aggregate records by configuration groups."""
+    """Aggregate records by configuration groups.
+    
+    Runs whose throughput is a MAD outlier within their group (e.g. a thermally
+    throttled run) are flagged and left out of the averages; per-metric spread and
+    bootstrap confidence intervals are exported under "stats".
+    """
     groups = defaultdict(list)
     for r in records:
-        # Use device_config for grouping if available, otherwise fall back to detect/classify
-        if r.device_config:
-            key = (r.config, r.device_config, r.batch)
-        else:
-            key = (r.config, f"{r.detect}-{r.classify}", r.batch)
-        groups[key].append(r)
+        groups[group_key(r)].append(r)
         
     summary: list[dict] = []
     for key, recs in groups.items():
         cfg, device_desc, batch = key
         
+        # Reject throughput outliers before averaging
+        measured = [r for r in recs if r.throughput is not None]
+        flags = mad_outliers([r.throughput for r in measured])
+        outliers = [r for r, flagged in zip(measured, flags) if flagged]
+        if outliers:
+            recs = [r for r in recs if all(r is not o for o in outliers)]
+        
+        # Seeded per group so data.json is reproducible
+        rng = random.Random(f"{cfg}|{device_desc}|{batch}") # nosec B311
+        stats = {
+            name: describe([getattr(r, field) for r in recs if getattr(r, field) is not None], rng, digits)
+            for field, (name, digits) in STATS_METRICS.items()
+        }
+        thr_stats = stats["throughput"]
+        stable = bool(
+            thr_stats
+            and thr_stats["n"] >= STABLE_MIN_RUNS
+            and thr_stats["cv"] is not None
+            and thr_stats["cv"] <= STABLE_MAX_CV
+        )
+        
         # Calculate average throughput
         thr = [r.throughput for r in recs if r.throughput is not None]
         
@@ -123,6 +508,18 @@ def aggregate(records: list[Record]):
         pwr = [r.avg_power for r in recs if r.avg_power is not None]
         eff = [r.efficiency for r in recs if r.efficiency is not None]
         
+        # Calculate average energy cost
+        jpf = [r.energy_per_frame for r in recs if r.energy_per_frame is not None]
+        jsh = [r.energy_per_stream_hour for r in recs if r.energy_per_stream_hour is not None]
+        
+        # Per-stream tail: worst stream across runs and runs that starved a stream
+        min_stream = [r.min_stream_fps for r in recs if r.min_stream_fps is not None]
+        p5_stream = [r.p5_stream_fps for r in recs if r.p5_stream_fps is not None]
+        starved_runs = [r.timestamp for r in recs if r.starved_streams]
+        
+        # Peak resident memory of the gst-launch processes
+        mem = [r.peak_memory for r in recs if r.peak_memory is not None]
+        
         # Parse theoretical streams (numeric if possible)
         theo_vals: list[float] = []
         for r2 in recs:
@@ -141,13 +538,33 @@ def aggregate(records: list[Record]):
             "detect": first_rec.detect,
             "classify": first_rec.classify,
             "batch": batch,
-            "runs": len(recs),
+            "runs": len(recs) + len(outliers),
             "avg_throughput": round(mean(thr), 2) if thr else None,
             "theoretical_streams": int(round(mean(theo_vals))) if theo_vals else None,
             "avg_power": round(mean(pwr), 2) if pwr else None,
             "efficiency": round(mean(eff), 2) if eff else None,
+            "energy_per_frame": round(mean(jpf), 4) if jpf else None,
+            "energy_per_stream_hour": round(mean(jsh)) if jsh else None,
+            "energy_rank": None,
+            "min_stream_fps": round(min(min_stream), 2) if min_stream else None,
+            "p5_stream_fps": round(mean(p5_stream), 2) if p5_stream else None,
+            "starved_runs": starved_runs,
+            "peak_memory": round(mean(mem), 1) if mem else None,
+            "outliers": len(outliers),
+            "outlier_runs": [r.timestamp for r in outliers],
+            "stable": stable,
+            "stats": stats,
         })
         
+    # Rank configurations within each pipeline config by energy cost (1 = fewest J/frame)
+    by_config = defaultdict(list)
+    for entry in summary:
+        if entry["energy_per_frame"] is not None:
+            by_config[entry["config"]].append(entry)
+    for entries in by_config.values():
+        for rank, entry in enumerate(sorted(entries, key=lambda e: e["energy_per_frame"]), start=1):
+            entry["energy_rank"] = rank
+        
     # Custom config order: light, medium, heavy
     order_map = {"light": 0, "medium": 1, "heavy": 2}
     summary.sort(key=lambda x: (
@@ -159,34 +576,156 @@ def aggregate(records: list[Record]):
     return summary
 
 
-def write_data_json(summary, raw_records):
-    """Write the aggregated data to JSON file for the dashboard."""
+def columnar_raw(raw_records: list[Record]) -> dict:
+    """Column-oriented raw records with pipeline strings moved into a lookup table."""
+    columns = [f.name for f in fields(Record)]
+    pipelines: dict[str, int] = {}
+    data: dict[str, list] = {name: [] for name in columns}
+    for rec in raw_records:
+        for name in columns:
+            value = getattr(rec, name)
+            if name == "pipeline":
+                value = pipelines.setdefault(value, len(pipelines))
+            data[name].append(value)
+    return {"columns": columns, "pipelines": list(pipelines), "data": data}
+
+
+def write_json(path: Path, obj, compress: bool = False, indent: int | None = None):
+    separators = None if indent else (",", ":")
+    payload = json.dumps(obj, indent=indent, separators=separators).encode("utf-8")
+    if compress:
+        # mtime=0 keeps the output byte-identical across regenerations
+        payload = gzip.compress(payload, mtime=0)
+    path.write_bytes(payload)
+
+
+def write_data_json(summary, raw_records, compact: bool = True, chunk_rows: int = RAW_CHUNK_ROWS,
+                    compress: bool = False):
+    """Write the aggregated data to JSON file for the dashboard.
+    
+    compact=False keeps the original layout (row objects, indented). The compact
+    layout stores raw records column-wise in separate chunk files listed in
+    data.json, so the dashboard can render the summary first and fetch raw rows
+    only when they are shown.
+    """
+    timestamp = str(Path(RESULTS).stat().st_mtime) if RESULTS.exists() else None
+    
+    # Drop chunks from a previous run; their count may differ
+    for old in HTML_DIR.glob(f"{RAW_CHUNK_PREFIX}*.json*"):
+        old.unlink()
+    
+    if not compact:
+        data = {
+            "summary": summary,
+            "raw": [asdict(r) for r in raw_records],
+            "generated": "Generated by generate_report.py",
+            "timestamp": timestamp
+        }
+        write_json(DATA_JSON, data, indent=2)
+        return
+    
+    chunks = []
+    for start in range(0, len(raw_records), chunk_rows):
+        name = f"{RAW_CHUNK_PREFIX}{len(chunks)}.json" + (".gz" if compress else "")
+        write_json(HTML_DIR / name, columnar_raw(raw_records[start:start + chunk_rows]), compress=compress)
+        chunks.append({"file": name, "rows": min(chunk_rows, len(raw_records) - start)})
+    
     data = {
+        "format": 2,
         "summary": summary,
-        "raw": [asdict(r) for r in raw_records],
+        "raw": {"count": len(raw_records), "chunks": chunks},
         "generated": "Generated by generate_report.py",
-        "timestamp": str(Path(RESULTS).stat().st_mtime) if RESULTS.exists() else None
+        "timestamp": timestamp
     }
+    write_json(DATA_JSON, data)
+
+
+def check_regressions(records: list[Record], args) -> int:
+    """Compare candidate runs against the selected baseline; returns the number of regressions."""
+    if args.baseline:
+        path = BASELINES_DIR / f"{args.baseline}.json"
+        if not path.exists():
+            print(f"[ Error ] Baseline not found: {path}")
+            return -1
+        stored = regression.load_baseline(path)
+        baseline = stored["groups"]
+        # Only runs recorded after the baseline snapshot are candidates
+        candidates = [r for r in records if r.timestamp > stored.get("latest_timestamp", "")]
+        label = f"tag:{args.baseline}"
+    else:
+        baseline = group_samples([r for r in records if r.timestamp < args.baseline_before])
+        candidates = [r for r in records if r.timestamp >= args.baseline_before]
+        label = f"before:{args.baseline_before}"
     
-    with DATA_JSON.open('w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    if not candidates:
+        print(f"[ Warning ] No runs newer than baseline {label}; nothing to compare")
+        return 0
+    
+    threshold = args.threshold / 100
+    results = regression.compare(baseline, group_samples(candidates), threshold, args.alpha)
+    report = regression.write_report(REGRESSION_JSON, label, results, threshold, args.alpha)
+    
+    for entry in results:
+        for metric, res in entry.get("metrics", {}).items():
+            if res["status"] == "regression":
+                print(f"[ Warning ] Regression: {entry['config']} {entry['device_config']} BS{entry['batch']} "
+                      f"{metric} {res['change_pct']:+.1f}% (p={res['p_value']})")
+    print(f"[ Info ] Regression report ({label}): {report['regressions']} regression(s) in "
+          f"{len(results)} groups -> {REGRESSION_JSON}")
+    return report["regressions"]
 
 
 def main():
     """Main execution function."""
-    records = read_csvs()
+    parser = argparse.ArgumentParser(description="Generate dashboard data.json from the results store and benchmark CSV results")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse the results store and every legacy CSV, and leave the ingestion cache untouched")
+    parser.add_argument("--jobs", type=int, default=None, help="Parser processes for new/changed legacy CSVs (default: CPU count)")
+    parser.add_argument("--legacy-json", action="store_true", help="Write the original row-oriented, indented data.json")
+    parser.add_argument("--gzip", action="store_true", help="Gzip the raw data chunks (served as-is, decompressed in the browser)")
+    parser.add_argument("--chunk-rows", type=int, default=RAW_CHUNK_ROWS, help=f"Raw records per chunk file (default: {RAW_CHUNK_ROWS})")
+    parser.add_argument("--save-baseline", metavar="TAG", help="Store the current results as baseline TAG under results/baselines/")
+    baseline_group = parser.add_mutually_exclusive_group()
+    baseline_group.add_argument("--baseline", metavar="TAG", help="Compare runs recorded after baseline TAG against it")
+    baseline_group.add_argument("--baseline-before", metavar="TIMESTAMP",
+                                help="Compare runs at/after TIMESTAMP (YYYYmmdd-HHMMSS) against the runs before it")
+    parser.add_argument("--threshold", type=float, default=5.0, help="Minimum median drop in percent to report (default: 5)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Significance level of the Mann-Whitney test (default: 0.05)")
+    args = parser.parse_args()
+    
+    records = read_results(use_cache=not args.no_cache, jobs=args.jobs)
     if not records:
-        print("[ Error ] No benchmark CSV files found in results/. Run benchmarks first.")
+        print("[ Error ] No benchmark results found in results/. Run benchmarks first.")
         return 1
         
     summary = aggregate(records)
-    write_data_json(summary, records)
+    write_data_json(summary, records, compact=not args.legacy_json,
+                    chunk_rows=max(1, args.chunk_rows), compress=args.gzip)
+    
+    for entry in summary:
+        if entry["energy_rank"] == 1:
+            print(f"[ Info ] Lowest energy ({entry['config']}): {entry['device_config']} BS{entry['batch']} "
+                  f"at {entry['energy_per_frame']} J/frame")
     
     print(f"[ Info ] Generated data file: {DATA_JSON}")
     print(f"[ Info ] Dashboard ready at: {HTML_DIR / 'index.html'}")
     print(f"[ Info ] Processed {len(records)} records into {len(summary)} summary entries")
     
-    return 0
+    status = 0
+    if args.baseline or args.baseline_before:
+        regressions = check_regressions(records, args)
+        if regressions < 0:
+            status = 1
+        elif regressions > 0:
+            # Distinct exit code so CI can gate on regressions
+            status = 2
+    
+    if args.save_baseline:
+        path = BASELINES_DIR / f"{args.save_baseline}.json"
+        regression.save_baseline(path, args.save_baseline, group_samples(records),
+                                 max(r.timestamp for r in records))
+        print(f"[ Info ] Saved baseline '{args.save_baseline}': {path}")
+    
+    return status
 
 
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+# SPDX-FileCopyrightText: (C) 2024 - 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""Baseline store and regression comparison for generate_report.py.
+
+A baseline is a snapshot of per-group samples (throughput and efficiency of every
+run, keyed by "config|device_config|batch") saved under results/baselines/. A
+comparison tests each group of the candidate runs against the baseline with a
+one-sided Mann-Whitney U test and flags a regression when the median dropped by
+at least the threshold and the drop is significant.
+"""
+
+from __future__ import annotations
+import json
+import time
+from itertools import groupby
+from math import comb, sqrt
+from pathlib import Path
+from statistics import NormalDist, median
+
+# Higher is better for every compared metric
+METRICS = ("throughput", "efficiency")
+EXACT_MAX_PAIRS = 2500       # n1*n2 up to which the exact U distribution is used
+
+
+def save_baseline(path: Path, tag: str, samples: dict[str, dict[str, list[float]]], latest_timestamp: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "tag": tag,
+        "created": time.strftime("%Y%m%d-%H%M%S"),
+        "latest_timestamp": latest_timestamp,
+        "groups": samples,
+    }
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def load_baseline(path: Path) -> dict:
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _u_statistic(candidate: list[float], baseline: list[float]) -> tuple[float, bool]:
+    """Mann-Whitney U of candidate vs baseline from mid-ranks, and whether ties occurred."""
+    pooled = sorted([(v, 0) for v in candidate] + [(v, 1) for v in baseline])
+    rank_sum = 0.0
+    ties = False
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        if j > i:
+            ties = True
+        mid_rank = (i + j) / 2 + 1
+        rank_sum += mid_rank * sum(1 for _, side in pooled[i:j + 1] if side == 0)
+        i = j + 1
+    n1 = len(candidate)
+    return rank_sum - n1 * (n1 + 1) / 2, ties
+
+
+def _exact_cdf(u: float, n1: int, n2: int) -> float:
+    """P(U <= u) under H0 without ties.
+
+    f(i, j, k), the number of orderings of i candidate and j baseline values with
+    U == k, satisfies f(i, j, k) = f(i-1, j, k-j) + f(i, j-1, k) depending on
+    whether the largest value is a candidate or a baseline one.
+    """
+    prev = [[1] for _ in range(n2 + 1)]  # i == 0: U is always 0
+    for i in range(1, n1 + 1):
+        cur = [[1]]  # j == 0: U is always 0
+        for j in range(1, n2 + 1):
+            row = [0] * (i * j + 1)
+            for k, count in enumerate(prev[j]):
+                row[k + j] += count
+            for k, count in enumerate(cur[j - 1]):
+                row[k] += count
+            cur.append(row)
+        prev = cur
+    return sum(prev[n2][: int(u) + 1]) / comb(n1 + n2, n1)
+
+
+def mann_whitney_less(candidate: list[float], baseline: list[float]) -> float:
+    """One-sided p-value for H1: candidate values tend to be smaller than baseline values."""
+    n1, n2 = len(candidate), len(baseline)
+    u, ties = _u_statistic(candidate, baseline)
+    if not ties and n1 * n2 <= EXACT_MAX_PAIRS:
+        return _exact_cdf(u, n1, n2)
+
+    # Normal approximation with tie correction and continuity correction
+    values = sorted(candidate + baseline)
+    n = n1 + n2
+    tie_term = sum(t ** 3 - t for t in (len(list(group)) for _, group in groupby(values)))
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u + 0.5 - n1 * n2 / 2) / sqrt(variance)
+    return NormalDist().cdf(z)
+
+
+def compare_metric(candidate: list[float], baseline: list[float], threshold: float, alpha: float) -> dict:
+    """Compare one metric of one group; threshold is a fraction (0.05 == 5%)."""
+    if not candidate or not baseline:
+        return {"status": "insufficient", "baseline_n": len(baseline), "candidate_n": len(candidate)}
+    base_med, cand_med = median(baseline), median(candidate)
+    change = (cand_med - base_med) / base_med if base_med else 0.0
+    p_lower = mann_whitney_less(candidate, baseline)
+    p_higher = mann_whitney_less(baseline, candidate)
+    if change <= -threshold and p_lower < alpha:
+        status = "regression"
+    elif change >= threshold and p_higher < alpha:
+        status = "improvement"
+    elif abs(change) >= threshold:
+        status = "inconclusive"  # large change, but too few runs to be significant
+    else:
+        status = "ok"
+    return {
+        "status": status,
+        "baseline_median": round(base_med, 4),
+        "candidate_median": round(cand_med, 4),
+        "change_pct": round(change * 100, 2),
+        "p_value": round(p_lower if change < 0 else p_higher, 4),
+        "baseline_n": len(baseline),
+        "candidate_n": len(candidate),
+    }
+
+
+def compare(baseline: dict[str, dict[str, list[float]]], candidate: dict[str, dict[str, list[float]]],
+            threshold: float, alpha: float) -> list[dict]:
+    """Compare every group present in either sample set."""
+    results = []
+    for key in sorted(set(baseline) | set(candidate)):
+        config, device_config, batch = key.split("|")
+        entry = {"config": config, "device_config": device_config, "batch": batch}
+        if key not in baseline:
+            entry["status"] = "new"
+        elif key not in candidate:
+            entry["status"] = "missing"
+        else:
+            metrics = {m: compare_metric(candidate[key].get(m, []), baseline[key].get(m, []), threshold, alpha)
+                       for m in METRICS}
+            entry["metrics"] = metrics
+            statuses = [r["status"] for r in metrics.values()]
+            entry["status"] = next((s for s in ("regression", "inconclusive", "improvement", "ok")
+                                    if s in statuses), "insufficient")
+        results.append(entry)
+    return results
+
+
+def write_report(path: Path, baseline_label: str, results: list[dict], threshold: float, alpha: float) -> dict:
+    report = {
+        "baseline": baseline_label,
+        "generated": time.strftime("%Y%m%d-%H%M%S"),
+        "threshold_pct": round(threshold * 100, 2),
+        "alpha": alpha,
+        "regressions": sum(1 for r in results if r["status"] == "regression"),
+        "groups": results,
+    }
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
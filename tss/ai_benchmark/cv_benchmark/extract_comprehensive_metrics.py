@@ -1,15 +1,20 @@
 #!/usr/bin/env python3
 """
 综合性能和显存指标提取脚本
-从日志文件和gpu_metrics.csv中提取所有指标
+优先从结果库(results/results.jsonl, run_model_benchmark.sh 写入)读取指标,
+旧的结果目录(没有结果库记录)则从日志文件和gpu_metrics.csv中提取
 """
 
 import os
 import re
 import csv
+import sys
 from pathlib import Path
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'utils'))
+import results_store  # noqa: E402
+
 def parse_log_file(log_file):
     """解析日志文件提取性能数据"""
     data = []
@@ -87,10 +92,50 @@ def extract_vram_from_gpu_metrics(csv_file):
         'avg': peak_vram  # 直接使用峰值，不计算平均
     }
 
+def load_store_records(benchmark_dir):
+    """从结果库读取该benchmark目录下各模型/batch size的记录"""
+    store = results_store.default_store()
+    root = os.path.realpath(benchmark_dir)
+    performance_data = {}
+    vram_data = {}
+    
+    for record in results_store.read(store, driver='cv-model'):
+        batch_dir = results_store.get_field(record, 'telemetry.results_dir')
+        if not batch_dir or os.path.dirname(os.path.realpath(results_store.resolve_path(store, batch_dir))) != root:
+            continue
+        fps = results_store.get_field(record, 'throughput.total_fps')
+        median = results_store.get_field(record, 'latency.median')
+        if fps is None or median is None:
+            continue
+        
+        # 同一目录重复记录时以最新的为准
+        key = (results_store.get_field(record, 'config.model'), int(results_store.get_field(record, 'config.batch')))
+        performance_data[key] = {
+            'model': key[0],
+            'batch_size': key[1],
+            'fps': fps,
+            'latency_median': median,
+            'latency_avg': results_store.get_field(record, 'latency.mean') or 0.0,
+            'latency_min': results_store.get_field(record, 'latency.min') or 0.0,
+            'latency_max': results_store.get_field(record, 'latency.max') or 0.0
+        }
+        peak_vram = results_store.get_field(record, 'memory.peak_vram_mib')
+        if peak_vram is not None:
+            vram_data[key] = {'peak': peak_vram, 'min': peak_vram, 'avg': peak_vram}
+    
+    return performance_data, vram_data
+
 def process_benchmark_directory(benchmark_dir):
     """处理benchmark目录，提取所有数据"""
     benchmark_dir = Path(benchmark_dir)
     
+    performance_data, vram_data = load_store_records(benchmark_dir)
+    if performance_data:
+        print(f"Read from results store: {results_store.default_store()}")
+        print(f"\nFound {len(performance_data)} performance records")
+        print(f"Found {len(vram_data)} VRAM records")
+        return performance_data, vram_data
+    
     # 收集性能数据
     performance_data = {}
     for log_file in benchmark_dir.glob('*.log'):
@@ -205,6 +205,56 @@ docker run -d \
 echo -e "${YELLOW}[INFO]${NC} Container created successfully"
 echo ""
 
+RESULTS_STORE_TOOL="$(cd "$(dirname "$0")/../../../utils" && pwd)/results_store.py"
+
+# Throughput and latency of benchmark_app output, one or more processes:
+# prints "<total fps> <median> <average> <min> <max>" (latency in ms, NA if missing)
+benchmark_app_stats() {
+    awk '
+        function after(label,   i) { for (i = 1; i < NF; i++) if ($i == label) return $(i + 1) + 0; return 0 }
+        /Throughput:/ { fps += after("Throughput:"); runs++ }
+        /Median:/     { median += after("Median:"); medians++ }
+        /Average:/    { mean += after("Average:"); means++ }
+        /Min:/        { v = after("Min:"); if (mins++ == 0 || v < min) min = v }
+        /Max:/        { v = after("Max:"); if (maxs++ == 0 || v > max) max = v }
+        END {
+            printf("%s %s %s %s %s\n",
+                runs ? sprintf("%.2f", fps) : "NA",
+                medians ? sprintf("%.2f", median / medians) : "NA",
+                means ? sprintf("%.2f", mean / means) : "NA",
+                mins ? sprintf("%.2f", min) : "NA",
+                maxs ? sprintf("%.2f", max) : "NA")
+        }' "$@"
+}
+
+# Append one batch size of a model to the shared results store (utils/results_store.py):
+# record_batch <model path> <batch size> <batch results dir> <benchmark_app log> [<log> ...] ("-" reads stdin)
+record_batch() {
+    local model_path="$1" bs="$2" batch_dir="$3"
+    shift 3
+    local fps median mean min max run_id
+    read -r fps median mean min max < <(benchmark_app_stats "$@")
+    if ! command -v python3 >/dev/null 2>&1 || [[ ! -f "${RESULTS_STORE_TOOL}" ]]; then
+        return 0
+    fi
+    if run_id=$(python3 "${RESULTS_STORE_TOOL}" record --driver cv-model --gpu-metrics "${batch_dir}/gpu_metrics.csv" \
+            run.timestamp="${TIMESTAMP}" \
+            config.model="$(basename "${model_path}" .xml)" \
+            config.model_path="${model_path}" \
+            config.device="${DEVICE}" \
+            config.batch="${bs}" \
+            config.processes="${NUM_PROCESSES}" \
+            config.input_size="${INPUT_SIZE}" \
+            throughput.total_fps="${fps}" \
+            latency.unit=ms latency.median="${median}" latency.mean="${mean}" latency.min="${min}" latency.max="${max}" \
+            telemetry.results_dir="${batch_dir}" \
+            telemetry.log="${RESULTS_DIR}/$(basename "${model_path}" .xml).log"); then
+        echo "  Recorded run ${run_id} in the results store"
+    else
+        echo -e "${YELLOW}[WARNING]${NC} Could not record batch size ${bs} in the results store"
+    fi
+}
+
 # Function to test a single model
 test_model() {
     local model_path=$1
@@ -273,6 +323,7 @@ test_model() {
             fi
             
             # Run benchmark_app in container
+            local log_offset=$(stat -c %s "${log_file}")
             docker exec "${CONTAINER_NAME}" bash -c \
                 "benchmark_app -m ${model_path} --batch_size ${bs} -d ${DEVICE} -hint throughput -shape [${bs},3,${INPUT_SIZE},${INPUT_SIZE}]" \
                 >> "${log_file}" 2>&1
@@ -283,6 +334,9 @@ test_model() {
                 wait "${gpu_monitor_pid}" 2>/dev/null || true
             fi
             
+            # This batch size's output is what the model log gained during the run
+            tail -c +$((log_offset + 1)) "${log_file}" | record_batch "${model_path}" "${bs}" "${batch_results_dir}" -
+            
             echo "" >> "${log_file}"
             sleep 5
         done
@@ -349,6 +403,8 @@ test_model() {
                 wait "${gpu_monitor_pid}" 2>/dev/null || true
             fi
             
+            record_batch "${model_path}" "${bs}" "${batch_results_dir}" "${process_logs[@]}"
+            
             # Merge all process logs into main log file
             {
                 echo ""
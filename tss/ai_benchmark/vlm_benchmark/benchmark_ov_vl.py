@@ -11,6 +11,8 @@ from pathlib import Path
 import numpy as np
 from openvino import get_version
 import cv2
+import hashlib
+import os
 import time
 
 def read_image(path: str) -> Tensor:
@@ -32,41 +34,200 @@ def read_images(path: str) -> list[Tensor]:
         return [read_image(str(file)) for file in sorted(entry.iterdir())]
     return [read_image(path)]
 
-def read_video(path: str, num_frames: int = 8) -> Tensor:
-    """
+# Gap (in frames) above which read_video seeks instead of grabbing the frames in between
+SEEK_GAP = 32
+
+_frame_cache = {}
 
+def sample_indices(total_num_frames: int, fps: float, num_frames: int, interval: float = None) -> list[int]:
+    """
     Args:
-        path: The path to the video.
-        num_frames: Number of frames sampled from the video.
+        total_num_frames: Frame count reported by the container.
+        fps: Frame rate of the video.
+        num_frames: Number of frames to sample (upper bound with interval).
+        interval: Sample one frame every `interval` seconds instead of spreading num_frames over the clip.
 
-    Returns: the ov.Tensor containing the video.
+    Returns: sorted unique frame indices.
 
     """
-    cap = cv2.VideoCapture(path)
+    if interval:
+        step = max(interval * fps, 1)
+        indices = np.arange(0, total_num_frames, step)[:num_frames]
+    else:
+        indices = np.arange(0, total_num_frames, total_num_frames / num_frames)
+    return sorted(set(indices.astype(int).tolist()))
 
-    frames = []
+def decode_frames(path: str, num_frames: int, interval: float = None) -> np.ndarray:
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError(f'Cannot open video: {path}')
     total_num_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    indices = np.arange(0, total_num_frames, total_num_frames / num_frames).astype(int)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    indices = sample_indices(total_num_frames, fps, num_frames, interval)
 
-    idx = 0
-    while cap.isOpened():
+    # Walk a cursor over the sorted targets: grab() short gaps without converting the frames, seek long ones
+    frames = []
+    position = 0
+    for target in indices:
+        if target - position > SEEK_GAP:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+            position = target
+        while position < target and cap.grab():
+            position += 1
         ret, frame = cap.read()
         if not ret:
             break
-        if idx in indices:
-            frames.append(np.array(frame))
-        idx += 1
-
+        frames.append(frame)
+        position += 1
     cap.release()
-    assert idx == total_num_frames, "Frame count mismatch: expected {}, got {}".format(total_num_frames, idx)
 
-    return Tensor(frames)
+    if not frames:
+        raise RuntimeError(f'No frames decoded from video: {path}')
+    if len(frames) < len(indices):
+        print(f"Warning: {path}: decoded {len(frames)} of {len(indices)} sampled frames (frame count {total_num_frames})")
+    return np.stack(frames)
+
+def read_video(path: str, num_frames: int = 8, interval: float = None, cache_dir: str = None) -> Tensor:
+    """
+
+    Args:
+        path: The path to the video.
+        num_frames: Number of frames sampled from the video.
+        interval: Sample one frame every `interval` seconds, at most num_frames frames.
+        cache_dir: Directory keeping the sampled frames across runs.
+
+    Returns: the ov.Tensor containing the video.
+
+    """
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|{num_frames}|{interval}"
+    if key not in _frame_cache:
+        cache_file = None
+        if cache_dir:
+            cache_file = os.path.join(cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.npy')
+        if cache_file and os.path.exists(cache_file):
+            frames = np.load(cache_file)
+        else:
+            frames = decode_frames(path, num_frames, interval)
+            if cache_file:
+                os.makedirs(cache_dir, exist_ok=True)
+                np.save(cache_file + '.tmp.npy', frames)
+                os.replace(cache_file + '.tmp.npy', cache_file)
+        _frame_cache[key] = frames
+    return Tensor(_frame_cache[key])
 
-def read_videos(path: str) -> list[Tensor]:
+def read_videos(path: str, num_frames: int = 8, interval: float = None, cache_dir: str = None) -> list[Tensor]:
     entry = Path(path)
     if entry.is_dir():
-        return [read_video(str(file)) for file in sorted(entry.iterdir())]
-    return [read_video(path)]
+        return [read_video(str(file), num_frames, interval, cache_dir) for file in sorted(entry.iterdir())]
+    return [read_video(path, num_frames, interval, cache_dir)]
+
+def parse_list(value: str, name: str) -> list[int]:
+    """Comma-separated positive integers; 'max' stands for sys.maxsize."""
+    try:
+        values = [sys.maxsize if item.strip() == 'max' else int(item) for item in value.split(',') if item.strip()]
+    except ValueError:
+        raise RuntimeError(f'Invalid {name} list: {value}')
+    if not values or min(values) < 1:
+        raise RuntimeError(f'{name} values must be positive: {value}')
+    return values
+
+def rss_mib() -> float:
+    """Resident memory of this process in MiB."""
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+def run_batched_round(pipe, prompt, images, isvideo, config, concurrency, first_id):
+    """
+    Submit `concurrency` requests at once to the continuous batching pipeline and step it until all finish.
+
+    Returns: (per-request (ttft, tpot, tokens) in ms, wall time in ms, peak RSS in MiB, max KV cache usage in %).
+    """
+    handles = []
+    start = time.perf_counter()
+    for request_id in range(first_id, first_id + concurrency):
+        if isvideo:
+            handles.append(pipe.add_request(request_id, prompt, [], images, config))
+        else:
+            handles.append(pipe.add_request(request_id, prompt, images, config))
+
+    first = [None] * concurrency
+    last = [None] * concurrency
+    tokens = [0] * concurrency
+    peak_rss = rss_mib()
+    max_cache = 0.0
+    while pipe.has_non_finished_requests():
+        pipe.step()
+        now = time.perf_counter()
+        for i, handle in enumerate(handles):
+            if handle.can_read():
+                generated = sum(len(output.generated_ids) for output in handle.read().values())
+                if generated:
+                    first[i] = first[i] or now
+                    last[i] = now
+                    tokens[i] += generated
+        peak_rss = max(peak_rss, rss_mib())
+        max_cache = max(max_cache, pipe.get_metrics().cache_usage)
+    wall = (time.perf_counter() - start) * 1000
+
+    results = []
+    for i in range(concurrency):
+        if first[i] is None:
+            continue
+        ttft = (first[i] - start) * 1000
+        tpot = (last[i] - first[i]) * 1000 / (tokens[i] - 1) if tokens[i] > 1 else None
+        results.append((ttft, tpot, tokens[i]))
+    return results, wall, peak_rss, max_cache
+
+def fmt_percentiles(values) -> str:
+    if not values:
+        return f"{'NA':>8} {'NA':>8} {'NA':>8}"
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return f"{p50:8.2f} {p90:8.2f} {p99:8.2f}"
+
+def run_concurrency_sweep(args, models_path, prompt, images, isvideo, config):
+    """Sweep concurrency x max_num_batched_tokens on the continuous batching pipeline."""
+    concurrencies = parse_list(args.concurrency, 'concurrency')
+    batched_tokens = parse_list(args.max_num_batched_tokens, 'max_num_batched_tokens')
+
+    rows = []
+    for max_tokens in batched_tokens:
+        scheduler_config = ov_genai.SchedulerConfig()
+        scheduler_config.enable_prefix_caching = False
+        scheduler_config.max_num_batched_tokens = max_tokens
+        start_time = time.perf_counter()
+        pipe = ov_genai.ContinuousBatchingPipeline(models_path, scheduler_config, args.device)
+        label = 'max' if max_tokens == sys.maxsize else str(max_tokens)
+        print(f"max_num_batched_tokens={label}: load time {(time.perf_counter() - start_time) * 1000:.2f} ms")
+
+        request_id = 0
+        for concurrency in concurrencies:
+            for _ in range(args.num_warmup):
+                run_batched_round(pipe, prompt, images, isvideo, config, concurrency, request_id)
+                request_id += concurrency
+            results, wall, peak_rss, max_cache = [], 0.0, 0.0, 0.0
+            for _ in range(args.num_iter):
+                round_results, round_wall, round_rss, round_cache = run_batched_round(
+                    pipe, prompt, images, isvideo, config, concurrency, request_id)
+                request_id += concurrency
+                results += round_results
+                wall += round_wall
+                peak_rss = max(peak_rss, round_rss)
+                max_cache = max(max_cache, round_cache)
+            total_tokens = sum(tokens for _, _, tokens in results)
+            rows.append((label, concurrency, len(results), total_tokens * 1000 / wall, len(results) * 1000 / wall,
+                         [ttft for ttft, _, _ in results], [tpot for _, tpot, _ in results if tpot is not None],
+                         max_cache, peak_rss))
+            print(f"  concurrency {concurrency}: {len(results)} requests, {total_tokens * 1000 / wall:.2f} tokens/s")
+        del pipe
+
+    print()
+    print(f"{'BatchedTok':>10} {'Conc':>5} {'Reqs':>5} {'Tokens/s':>9} {'Req/s':>7} "
+          f"{'TTFT p50':>8} {'p90':>8} {'p99':>8} {'TPOT p50':>8} {'p90':>8} {'p99':>8} {'KV max%':>8} {'RSS MiB':>8}")
+    for label, concurrency, requests, tokens_s, requests_s, ttfts, tpots, max_cache, peak_rss in rows:
+        print(f"{label:>10} {concurrency:>5} {requests:>5} {tokens_s:9.2f} {requests_s:7.2f} "
+              f"{fmt_percentiles(ttfts)} {fmt_percentiles(tpots)} {max_cache:8.1f} {peak_rss:8.0f}")
+    print("TTFT/TPOT in ms; KV max% is the peak KV cache usage, RSS MiB the peak resident memory of the process")
 
 def main():
     parser = argparse.ArgumentParser(description="Help command")
@@ -78,6 +239,14 @@ def main():
     parser.add_argument("-n", "--num_iter", type=int, default=2, help="Number of iterations")
     parser.add_argument("-mt", "--max_new_tokens", type=int, default=20, help="Maximal number of new tokens")
     parser.add_argument("-d", "--device", type=str, default="CPU", help="Device")
+    parser.add_argument("-nf", "--num_frames", type=int, default=8, help="Number of frames sampled from a video")
+    parser.add_argument("-fi", "--frame_interval", type=float, default=None,
+                        help="Sample a video frame every N seconds (at most --num_frames frames) instead of spreading them over the clip")
+    parser.add_argument("-fc", "--frame_cache", type=str, default=None, help="Directory caching sampled video frames across runs")
+    parser.add_argument("-c", "--concurrency", type=str, default=None,
+                        help="Comma-separated concurrent request counts; runs the continuous batching sweep, e.g. 1,2,4,8")
+    parser.add_argument("-bt", "--max_num_batched_tokens", type=str, default="max",
+                        help="Comma-separated scheduler max_num_batched_tokens values for the sweep ('max' = unlimited)")
 
     args = parser.parse_args()
 
@@ -91,6 +260,8 @@ def main():
             prompt = 'What is on the image?' if args.prompt is None else args.prompt
     if len(prompt) == 0:
         raise RuntimeError(f'Prompt is empty!')
+    if args.num_frames < 1 or (args.frame_interval is not None and args.frame_interval <= 0):
+        raise RuntimeError('Number of frames and frame interval must be positive!')
 
     print(f'openvino runtime version: {get_version()}, genai version: {ov_genai.__version__}')
 
@@ -101,7 +272,7 @@ def main():
     image_lower = args.image.lower()
     isvideo = image_lower.endswith('.mp4') or image_lower.endswith('.avi') or image_lower.endswith('.mov')
     if isvideo:
-        images = read_videos(args.image)
+        images = read_videos(args.image, args.num_frames, args.frame_interval, args.frame_cache)
     else:
         images = read_images(args.image)
     device = args.device
@@ -111,6 +282,13 @@ def main():
     config = ov_genai.GenerationConfig()
     config.max_new_tokens = args.max_new_tokens
 
+    if args.concurrency is not None:
+        if device == "NPU":
+            raise RuntimeError('Concurrency sweep needs the continuous batching pipeline, which NPU does not support')
+        print(f"Number of images:{len(images)}")
+        run_concurrency_sweep(args, models_path, prompt, images, isvideo, config)
+        return
+
     if device == "NPU":
         pipe = ov_genai.VLMPipeline(models_path, device)
     else:
@@ -3,9 +3,21 @@ import requests
 import json
 import sys
 import argparse
+import asyncio
+import base64
+import hashlib
+import io
+import mimetypes
 import os
+import random
 import numpy as np
 
+# 并发压测模式 (--load) 依赖 aiohttp, 单用户模式不需要
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 # 终端色彩
 class Colors:
     HEADER = '\033[95m'
@@ -17,24 +29,93 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
-def run_vlm_benchmark(args):
-    url = f"http://{args.host}:{args.port}/v1/chat/completions"
-    
-    stats = {
-        "ttft": [],
-        "tpot": [],
-        "total_time": [],
-        "token_counts": [],
-        "throughput": []
+IMAGE_EXTS = {'.jpg', '.jpeg', '.png', '.bmp', '.webp'}
+VIDEO_EXTS = {'.mp4', '.avi', '.mkv', '.mov', '.webm'}
+
+def media_part(url, media_type):
+    return {"type": media_type, media_type: {"url": url}}
+
+def data_url(data, mime):
+    return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+def jpeg_url(image):
+    """PIL 图像编码为 JPEG data URL"""
+    buffer = io.BytesIO()
+    image.convert("RGB").save(buffer, format="JPEG", quality=90)
+    return data_url(buffer.getvalue(), "image/jpeg")
+
+def encode_image(path, max_side):
+    if not max_side:
+        with open(path, "rb") as f:
+            return [media_part(data_url(f.read(), mimetypes.guess_type(path)[0] or "image/jpeg"), "image_url")]
+    from PIL import Image
+    image = Image.open(path)
+    image.thumbnail((max_side, max_side))
+    return [media_part(jpeg_url(image), "image_url")]
+
+def encode_video(path, num_frames, max_side):
+    if not num_frames:
+        with open(path, "rb") as f:
+            return [media_part(data_url(f.read(), mimetypes.guess_type(path)[0] or "video/mp4"), "video_url")]
+    # 均匀抽取 num_frames 帧, 以多图方式发送
+    import cv2
+    from PIL import Image
+    cap = cv2.VideoCapture(path)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    parts = []
+    for idx in np.linspace(0, max(total - 1, 0), num_frames, dtype=int):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, int(idx))
+        ret, frame = cap.read()
+        if not ret:
+            continue
+        image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if max_side:
+            image.thumbnail((max_side, max_side))
+        parts.append(media_part(jpeg_url(image), "image_url"))
+    cap.release()
+    if not parts:
+        raise ValueError(f"无法读取视频帧: {path}")
+    return parts
+
+def encode_media(path, args):
+    """本地文件预编码为 base64 data URL 内容块, 设置 --payload-cache 时按文件与编码参数缓存到磁盘"""
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|{args.max_side}|{args.video_frames}"
+    cache_file = None
+    if args.payload_cache:
+        cache_file = os.path.join(args.payload_cache, hashlib.sha256(key.encode('utf-8')).hexdigest() + ".json")
+        if os.path.exists(cache_file):
+            with open(cache_file) as f:
+                return json.load(f), True
+
+    if os.path.splitext(path)[1].lower() in VIDEO_EXTS:
+        parts = encode_video(path, args.video_frames, args.max_side)
+    else:
+        parts = encode_image(path, args.max_side)
+
+    if cache_file:
+        os.makedirs(args.payload_cache, exist_ok=True)
+        with open(cache_file + ".tmp", "w") as f:
+            json.dump(parts, f)
+        os.replace(cache_file + ".tmp", cache_file)
+    return parts, False
+
+def build_payload(args, parts):
+    """OpenAI 兼容的流式 chat completion 请求体"""
+    return {
+        "model": args.model,
+        "messages": [{"role": "user", "content": [{"type": "text", "text": args.prompt}, *parts]}],
+        "max_tokens": args.max_tokens,
+        "stream": True,
+        "stream_options": {"include_usage": True}
     }
 
-    print(f"\n{Colors.BOLD}{Colors.OKBLUE}>>> 启动 VLM 性能测试程序 {Colors.ENDC}")
-    print(f"{Colors.OKCYAN}模型: {args.model}")
-    print(f"参数: {args.rounds} 轮次 | Max Tokens: {args.max_tokens} | Host: {args.host}:{args.port}{Colors.ENDC}\n")
+def prepare_payloads(args):
+    """准备请求体列表 [(输入名, JSON bytes)], 压测时按请求序号循环使用
 
-    for i in range(args.rounds):
-        print(f"{Colors.HEADER}[轮次 {i+1:02d}/{args.rounds:02d}]{Colors.ENDC}", end=" ", flush=True)
-        
+    --input-dir 下的文件只编码、序列化一次, 请求计时中不包含编码开销
+    """
+    if not args.input_dir:
         # 根据输入文件格式动态调整type
         input_lower = args.input.lower()
         if input_lower.endswith('.jpg') or input_lower.endswith('.jpeg'):
@@ -43,106 +124,291 @@ def run_vlm_benchmark(args):
             media_type = "video_url"
         else:
             media_type = "image_url"  # 默认仍为image_url
+        return [(args.input, json.dumps(build_payload(args, [media_part(args.input, media_type)])).encode('utf-8'))]
 
-        payload = {
-            "model": args.model,
-            "messages": [{"role": "user", "content": [
-                {"type": "text", "text": args.prompt},
-                {"type": media_type, media_type: {"url": args.input}},
-                # {"fps": 1} if media_type == "video_url" else {}
-            ]}],
-            "max_tokens": args.max_tokens,
-            "stream": True,
-            "stream_options": {"include_usage": True}
-        }
-
-        start_time = time.perf_counter()
-        ttft = None
-        first_token_time = 0
-        tokens_timestamps = []
-        total_tokens = 0
+    files = sorted(
+        os.path.join(args.input_dir, name) for name in os.listdir(args.input_dir)
+        if os.path.splitext(name)[1].lower() in IMAGE_EXTS | VIDEO_EXTS
+    )
+    if not files:
+        raise ValueError(f"{args.input_dir} 中没有图片或视频文件")
+    payloads = []
+    hits = 0
+    begin = time.perf_counter()
+    for path in files:
+        parts, cached = encode_media(path, args)
+        hits += cached
+        payloads.append((os.path.basename(path), json.dumps(build_payload(args, parts)).encode('utf-8')))
+    size = sum(len(body) for _, body in payloads) / 1024 / 1024
+    print(f"{Colors.OKCYAN}预编码 {len(files)} 个输入 (磁盘缓存命中 {hits}) | 请求体共 {size:.1f} MiB | 耗时 {time.perf_counter() - begin:.2f} s{Colors.ENDC}")
+    return payloads
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def new_record(index, name, arrival=None):
+    """单个请求的原始计时记录, 时间基于 perf_counter (秒)
+
+    arrival 为开环模式下请求的计划到达时间; 从到达到实际发送之间的排队时间计入 TTFT / E2E
+    """
+    start = time.perf_counter()
+    arrival = start if arrival is None else min(arrival, start)
+    return {"id": index, "input": name, "arrival": arrival, "queue": start - arrival, "start": start,
+            "chunk_offsets": [], "tokens": 0, "error": None}
+
+def consume_sse_line(record, line):
+    """处理一行 SSE 数据, 记录每个内容 chunk 的到达时间; 返回 False 表示流结束"""
+    line = line.strip()
+    if not line.startswith("data: "):
+        return True
+    data_str = line[6:]
+    if data_str == "[DONE]":
+        return False
+    chunk = json.loads(data_str)
+    if chunk.get("usage"):
+        record["tokens"] = chunk["usage"].get("completion_tokens", 0)
+    choices = chunk.get("choices")
+    if choices and choices[0].get("delta", {}).get("content"):
+        record["chunk_offsets"].append(time.perf_counter() - record["start"])
+    return True
+
+def finish_record(record):
+    """由 chunk 到达时间拆分 prefill (首 token) 与 decode (其余 token) 阶段"""
+    record["e2e"] = record["queue"] + time.perf_counter() - record["start"]
+    offsets = record["chunk_offsets"]
+    if not offsets and record["error"] is None:
+        record["error"] = "未收到任何输出 token"
+    # 服务端未返回 usage 时按内容 chunk 数估算 token 数
+    record["tokens"] = record["tokens"] or len(offsets)
+    record["ttft"] = record["queue"] + offsets[0] if offsets else None
+    record["decode"] = offsets[-1] - offsets[0] if offsets else None
+    record["itl"] = np.diff(offsets).tolist()
+    # TPOT 不含首 token: decode 阶段时长 / 首 token 之后的 token 数
+    record["tpot"] = record["decode"] / (record["tokens"] - 1) if offsets and record["tokens"] > 1 else None
+    return record
+
+def write_trace(path, records, run_start):
+    """逐请求导出原始计时 (JSONL, 单位 ms), 供离线分析"""
+    def ms(value):
+        return None if value is None else round(value * 1000, 3)
+
+    with open(path, "w") as f:
+        for r in sorted(records, key=lambda r: r["id"]):
+            f.write(json.dumps({
+                "id": r["id"],
+                "input": r["input"],
+                "arrival_ms": ms(r["arrival"] - run_start),
+                "queue_ms": ms(r["queue"]),
+                "ttft_ms": ms(r["ttft"]),
+                "decode_ms": ms(r["decode"]),
+                "tpot_ms": ms(r["tpot"]),
+                "e2e_ms": ms(r["e2e"]),
+                "tokens": r["tokens"],
+                "chunks": len(r["chunk_offsets"]),
+                "itl_ms": [ms(gap) for gap in r["itl"]],
+                "error": r["error"],
+            }) + "\n")
+    print(f"{Colors.OKCYAN}逐请求计时已导出: {path}{Colors.ENDC}")
+
+def run_vlm_benchmark(args, payloads):
+    url = f"http://{args.host}:{args.port}/v1/chat/completions"
+    records = []
+
+    print(f"\n{Colors.BOLD}{Colors.OKBLUE}>>> 启动 VLM 性能测试程序 {Colors.ENDC}")
+    print(f"{Colors.OKCYAN}模型: {args.model}")
+    print(f"参数: {args.rounds} 轮次 | Max Tokens: {args.max_tokens} | Host: {args.host}:{args.port}{Colors.ENDC}\n")
+
+    run_start = time.perf_counter()
+    for i in range(args.rounds):
+        print(f"{Colors.HEADER}[轮次 {i+1:02d}/{args.rounds:02d}]{Colors.ENDC}", end=" ", flush=True)
 
+        name, body = payloads[i % len(payloads)]
+        record = new_record(i, name)
         try:
-            response = requests.post(url, json=payload, stream=True, timeout=args.timeout)
+            response = requests.post(url, data=body, headers=JSON_HEADERS, stream=True, timeout=args.timeout)
             response.raise_for_status()
-            
             for line in response.iter_lines():
-                if line:
-                    line_data = line.decode('utf-8')
-                    if line_data.startswith("data: "):
-                        data_str = line_data[6:]
-                        if data_str == "[DONE]": break
-                        
-                        chunk = json.loads(data_str)
-                        if "usage" in chunk and chunk["usage"] is not None:
-                            total_tokens = chunk["usage"]["completion_tokens"]
-                            continue
-
-                        content = chunk['choices'][0]['delta'].get('content', '')
-                        if content:
-                            if ttft is None:
-                                first_token_time = time.perf_counter()
-                                ttft = first_token_time - start_time
-                            else:
-                                tokens_timestamps.append(time.perf_counter())
-                            if total_tokens == 0: total_tokens += 1 
-            
-            end_time = time.perf_counter()
-            
-            # 核心性能计算
-            total_duration = end_time - start_time
-            generation_duration = end_time - first_token_time
-            
-            current_tpot = generation_duration / total_tokens if total_tokens > 1 else 0
-            current_throughput = total_tokens / generation_duration if generation_duration > 0 else 0
-            
-            stats["ttft"].append(ttft)
-            stats["tpot"].append(current_tpot)
-            stats["total_time"].append(total_duration)
-            stats["token_counts"].append(total_tokens)
-            stats["throughput"].append(current_throughput)
-            
-            print(f"✅ 完成 | TTFT: {ttft:.3f}s | TPS: {current_throughput:.2f} tok/s")
-
-        except Exception as e:
-            print(f"❌ {Colors.FAIL}错误: {e}{Colors.ENDC}")
-
-    # --- 最终性能报告输出 ---
+                if line and not consume_sse_line(record, line.decode('utf-8')):
+                    break
+        except (requests.RequestException, ValueError) as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+        records.append(finish_record(record))
+
+        if record["error"]:
+            print(f"❌ {Colors.FAIL}错误: {record['error']}{Colors.ENDC}")
+        elif record["tpot"]:
+            print(f"✅ 完成 | TTFT: {record['ttft']:.3f}s | TPOT: {record['tpot']*1000:.2f} ms | Decode: {1 / record['tpot']:.2f} tok/s")
+        else:
+            print(f"✅ 完成 | TTFT: {record['ttft']:.3f}s | Tokens: {record['tokens']}")
+    elapsed = time.perf_counter() - run_start
+
+    if args.trace:
+        write_trace(args.trace, records, run_start)
+    print_report(args, "📊 Intel Arc GPU 性能测试报告汇总", records, elapsed)
+    return 0 if any(r["error"] is None for r in records) else 1
+
+async def stream_request(session, url, payloads, index, arrival=None):
+    """发送一个流式请求, 返回该请求的计时记录"""
+    name, body = payloads[index % len(payloads)]
+    record = new_record(index, name, arrival)
+    try:
+        async with session.post(url, data=body, headers=JSON_HEADERS) as response:
+            if response.status != 200:
+                record["error"] = f"HTTP {response.status}: {(await response.text())[:200]}"
+            else:
+                async for raw in response.content:
+                    if not consume_sse_line(record, raw.decode('utf-8')):
+                        break
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return finish_record(record)
+
+def arrival_gaps(args):
+    """请求到达间隔: poisson 为指数分布, constant 为固定间隔"""
+    rng = random.Random(args.seed)  # nosec B311
+    while True:
+        if args.arrival == "poisson":
+            yield rng.expovariate(args.request_rate)
+        else:
+            yield 1.0 / args.request_rate
+
+async def run_load(args, payloads):
+    url = f"http://{args.host}:{args.port}/v1/chat/completions"
+    records = []
+    deadline = time.perf_counter() + args.duration if args.duration else None
+
+    def budget_left(issued):
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        return issued < args.rounds
+
+    # 连接池大小与并发数一致, 所有请求复用同一个 session
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        start = time.perf_counter()
+        if args.request_rate == float('inf'):
+            # 闭环: concurrency 个 worker 各自连续发送请求
+            issued = 0
+
+            async def worker():
+                nonlocal issued
+                while budget_left(issued):
+                    issued += 1
+                    records.append(await stream_request(session, url, payloads, issued - 1))
+
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        else:
+            # 开环: 按到达过程发送, 在途请求数不超过 concurrency
+            semaphore = asyncio.Semaphore(args.concurrency)
+            tasks = []
+
+            # 计划到达时间在获取信号量之前确定, 服务跟不上时的排队时间计入延迟 (避免 coordinated omission)
+            async def limited(index, arrival):
+                async with semaphore:
+                    records.append(await stream_request(session, url, payloads, index, arrival))
+
+            arrival = start
+            for gap in arrival_gaps(args):
+                if not budget_left(len(tasks)):
+                    break
+                tasks.append(asyncio.create_task(limited(len(tasks), arrival)))
+                arrival += gap
+                await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+            await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+    return records, start, elapsed
+
+def meets_slo(record, args):
+    checks = [
+        (args.slo_ttft, record["ttft"]),
+        (args.slo_tpot, record["tpot"]),
+        (args.slo_e2e, record["e2e"]),
+    ]
+    return all(value is not None and value * 1000 <= limit for limit, value in checks if limit is not None)
+
+def offered_rate(records):
+    """按计划到达时间统计的实际发起速率 (req/s)"""
+    arrivals = sorted(r["arrival"] for r in records)
+    if len(arrivals) < 2 or arrivals[-1] <= arrivals[0]:
+        return None
+    return (len(arrivals) - 1) / (arrivals[-1] - arrivals[0])
+
+def print_report(args, title, records, elapsed, open_loop=False):
+    ok = [r for r in records if r["error"] is None]
+    failed = [r for r in records if r["error"] is not None]
+    good = [r for r in ok if meets_slo(r, args)]
+    output_tokens = sum(r["tokens"] for r in ok)
+
     print(f"\n{Colors.OKGREEN}{'='*65}{Colors.ENDC}")
-    print(f"{Colors.BOLD}📊 Intel Arc GPU 性能测试报告汇总{Colors.ENDC}")
+    print(f"{Colors.BOLD}{title}{Colors.ENDC}")
     print(f"{Colors.OKGREEN}{'-'*65}{Colors.ENDC}")
-    
-    row_fmt = "{:<28} {:<18} {:<15}"
-    print(row_fmt.format("Metric", "Average", "Std Dev"))
+    print(f"成功请求: {len(ok)} | 失败请求: {len(failed)} | 耗时: {elapsed:.2f} s")
+    if failed:
+        print(f"{Colors.FAIL}首个错误: {failed[0]['error']}{Colors.ENDC}")
+    if not ok:
+        print(f"{Colors.OKGREEN}{'='*65}{Colors.ENDC}\n")
+        return
+    if open_loop:
+        offered = offered_rate(records)
+        offered = "NA" if offered is None else f"{offered:.2f} req/s"
+        print(f"发起速率 (offered): {offered} | 完成速率 (achieved): {len(ok) / elapsed:.2f} req/s")
+    print(f"请求吞吐: {len(ok) / elapsed:.2f} req/s | 输出吞吐: {Colors.BOLD}{output_tokens / elapsed:.2f} tokens/s{Colors.ENDC}"
+          f" | 平均输出: {output_tokens / len(ok):.1f} tokens/请求")
+    slo = [f"{name} <= {limit:g} ms" for name, limit in
+           (("TTFT", args.slo_ttft), ("TPOT", args.slo_tpot), ("E2E", args.slo_e2e)) if limit is not None]
+    if slo:
+        print(f"Goodput ({', '.join(slo)}): {len(good) / elapsed:.2f} req/s ({len(good) / len(records) * 100:.1f}% 请求达标)")
+    if open_loop:
+        print("开环模式: TTFT / E2E 自计划到达时间起算, 包含等待并发名额的排队时间 (Queue)")
     print(f"{'-'*65}")
-    
-    results_list = [
-        ("TTFT (Prefill Latency)", "ttft", "s"),
-        ("TPOT (Decode Latency)", "tpot", "ms"),
-        ("Throughput (Generation)", "throughput", "tokens/s"),
-        ("Total Latency (End-to-End)", "total_time", "s"),
-        ("Tokens per Request", "token_counts", "tokens")
-    ]
-
-    for label, key, unit in results_list:
-        avg_val = np.mean(stats[key])
-        std_val = np.std(stats[key])
-        
-        if key == "tpot":
-            print(row_fmt.format(label, f"{avg_val*1000:.2f} ms", f"{std_val*1000:.2f} ms"))
-        elif key == "throughput":
-            print(row_fmt.format(label, f"{Colors.BOLD}{avg_val:.2f} {unit}{Colors.ENDC}", f"{std_val:.2f}"))
-        else:
-            print(row_fmt.format(label, f"{avg_val:.3f} {unit}", f"{std_val:.3f}"))
 
+    row_fmt = "{:<16} {:>11} {:>11} {:>11} {:>11}"
+    print(row_fmt.format("Metric (ms)", "Mean", "P50", "P90", "P99"))
+    print(f"{'-'*65}")
+    series = [("Queue", [r["queue"] for r in ok])] if open_loop else []
+    series += [
+        ("TTFT (Prefill)", [r["ttft"] for r in ok]),
+        ("Decode", [r["decode"] for r in ok]),
+        ("TPOT", [r["tpot"] for r in ok if r["tpot"] is not None]),
+        ("ITL", [gap for r in ok for gap in r["itl"]]),
+        ("E2E", [r["e2e"] for r in ok]),
+    ]
+    for label, values in series:
+        if not values:
+            print(row_fmt.format(label, "NA", "NA", "NA", "NA"))
+            continue
+        values = np.array(values) * 1000
+        p50, p90, p99 = np.percentile(values, [50, 90, 99])
+        print(row_fmt.format(label, f"{values.mean():.2f}", f"{p50:.2f}", f"{p90:.2f}", f"{p99:.2f}"))
     print(f"{Colors.OKGREEN}{'='*65}{Colors.ENDC}\n")
 
+def run_load_benchmark(args, payloads):
+    if aiohttp is None:
+        print(f"{Colors.FAIL}错误: --load 模式需要 aiohttp (pip install aiohttp){Colors.ENDC}")
+        return 1
+    budget = f"{args.duration} 秒" if args.duration else f"{args.rounds} 个请求"
+    print(f"\n{Colors.BOLD}{Colors.OKBLUE}>>> 启动 VLM 并发压测 {Colors.ENDC}")
+    print(f"{Colors.OKCYAN}模型: {args.model}")
+    print(f"参数: {budget} | 并发: {args.concurrency} | Max Tokens: {args.max_tokens} | Host: {args.host}:{args.port}{Colors.ENDC}")
+    records, run_start, elapsed = asyncio.run(run_load(args, payloads))
+    if args.trace:
+        write_trace(args.trace, records, run_start)
+    rate = "inf" if args.request_rate == float('inf') else f"{args.request_rate:g} req/s ({args.arrival})"
+    print_report(args, f"📊 并发压测报告 (concurrency {args.concurrency}, rate {rate})", records, elapsed,
+                 open_loop=args.request_rate != float('inf'))
+    return 0 if any(r["error"] is None for r in records) else 1
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="VLM API 性能基准测试工具 (vLLM/OpenAI 兼容)")
     
     # 模型与路径参数
     parser.add_argument("-m", "--model", type=str, default="Qwen2.5-VL-7B-Instruct", help="模型名称")
-    parser.add_argument("-i", "--input", type=str, required=True, help="测试图片/视频的 URL 或本地路径 (file:/llm/models/test/test.jpg)")
+    inputs = parser.add_mutually_exclusive_group(required=True)
+    inputs.add_argument("-i", "--input", type=str, help="测试图片/视频的 URL 或本地路径 (file:/llm/models/test/test.jpg)")
+    inputs.add_argument("--input-dir", type=str, help="图片/视频目录, 预编码为 base64 data URL 后按请求循环使用")
+    parser.add_argument("--max-side", type=int, default=None, help="--input-dir 图片/抽帧的最长边缩放到该像素 (需要 Pillow)")
+    parser.add_argument("--video-frames", type=int, default=None, help="--input-dir 视频均匀抽取的帧数, 以多图发送 (需要 opencv-python)")
+    parser.add_argument("--payload-cache", type=str, default=None, help="预编码结果的磁盘缓存目录, 按文件与编码参数复用")
     parser.add_argument("-p", "--prompt", type=str, default="What is this", help="推理提示词")
     
     # 测试配置参数
@@ -153,7 +419,34 @@ if __name__ == "__main__":
     parser.add_argument("--host", type=str, default="localhost", help="API 服务地址")
     parser.add_argument("--port", type=int, default=8000, help="API 服务端口")
     parser.add_argument("--timeout", type=int, default=120, help="请求超时时间(秒)")
+    parser.add_argument("--trace", type=str, default=None, help="逐请求原始计时导出路径 (JSONL)")
+
+    # 并发压测参数
+    parser.add_argument("--load", action="store_true", help="并发压测模式 (asyncio + aiohttp), -n 为请求总数")
+    parser.add_argument("-c", "--concurrency", type=int, default=1, help="最大在途请求数")
+    parser.add_argument("--request-rate", type=float, default=float('inf'), help="请求到达率 (req/s), 默认 inf 即闭环满并发")
+    parser.add_argument("--arrival", choices=["poisson", "constant"], default="poisson", help="到达过程 (有限到达率时生效)")
+    parser.add_argument("--duration", type=float, default=None, help="按时长压测(秒), 替代 -n 请求数")
+    parser.add_argument("--slo-ttft", type=float, default=None, help="Goodput 的 TTFT 上限(ms)")
+    parser.add_argument("--slo-tpot", type=float, default=None, help="Goodput 的 TPOT 上限(ms)")
+    parser.add_argument("--slo-e2e", type=float, default=None, help="Goodput 的端到端延迟上限(ms)")
+    parser.add_argument("--seed", type=int, default=0, help="Poisson 到达的随机种子")
 
     args = parser.parse_args()
-    
-    run_vlm_benchmark(args)
\ No newline at end of file
+    if args.concurrency < 1 or args.rounds < 1 or args.request_rate <= 0 or (args.duration is not None and args.duration <= 0):
+        parser.error("concurrency, rounds, request-rate 和 duration 必须为正数")
+    if (args.max_side is not None and args.max_side < 1) or (args.video_frames is not None and args.video_frames < 1):
+        parser.error("max-side 和 video-frames 必须为正数")
+
+    try:
+        payloads = prepare_payloads(args)
+    except ImportError as e:
+        print(f"{Colors.FAIL}错误: 预编码需要 Pillow / opencv-python ({e}){Colors.ENDC}")
+        sys.exit(1)
+    except (OSError, ValueError) as e:
+        print(f"{Colors.FAIL}错误: {e}{Colors.ENDC}")
+        sys.exit(1)
+
+    if args.load:
+        sys.exit(run_load_benchmark(args, payloads))
+    sys.exit(run_vlm_benchmark(args, payloads))
\ No newline at end of file
@@ -0,0 +1,77 @@
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 本地 OpenAI 兼容 SSE 桩服务: 不加载模型, 按固定的 TTFT / ITL 流式返回 token,
+# 用于在没有 vLLM 服务时验证 benchmark_vllm_vl.py 的计时与并发逻辑
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # 默认 backlog 为 5, 并发建连超出时会触发 1s 的 SYN 重传, 污染 TTFT
+    request_queue_size = 128
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def handle(self):
+        # 压测结束时客户端直接关闭 keep-alive 连接, 不视为错误
+        try:
+            super().handle()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+
+    def send_chunk(self, data):
+        body = f"data: {data}\n\n".encode('utf-8')
+        self.wfile.write(f"{len(body):x}\r\n".encode('ascii') + body + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        if self.path != "/v1/chat/completions":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        config = self.server.config
+        tokens = min(request.get("max_tokens") or config.tokens, config.tokens)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        time.sleep(config.ttft / 1000)
+        for i in range(tokens):
+            if i:
+                time.sleep(config.itl / 1000)
+            chunk = {"choices": [{"index": 0, "delta": {"content": f" tok{i}"}, "finish_reason": None}]}
+            self.send_chunk(json.dumps(chunk))
+        if (request.get("stream_options") or {}).get("include_usage"):
+            usage = {"prompt_tokens": 1, "completion_tokens": tokens, "total_tokens": tokens + 1}
+            self.send_chunk(json.dumps({"choices": [], "usage": usage}))
+        self.send_chunk("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI 兼容的 SSE 桩服务 (benchmark_vllm_vl.py 自测用)")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8000, help="监听端口")
+    parser.add_argument("--ttft", type=float, default=200, help="首 token 延迟(ms)")
+    parser.add_argument("--itl", type=float, default=20, help="token 间隔(ms)")
+    parser.add_argument("--tokens", type=int, default=64, help="每个请求最多返回的 token 数")
+    args = parser.parse_args()
+
+    server = StubServer((args.host, args.port), StubHandler)
+    server.config = args
+    print(f"SSE stub 监听 http://{args.host}:{args.port}/v1/chat/completions (TTFT {args.ttft} ms, ITL {args.itl} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -41,12 +41,16 @@ NUM_STREAMS=1
 NUM_PROCESSES=1
 USER_SET_PROCESSES=false
 PROCESS_SWEEP=""
+STREAM_SWEEP=""
 DEVICE="GPU.0"
 VIDEO_FILE="/home/dlstreamer/work/media-downloader/media/hevc/apple_720p25_loop30.h265"
 # VIDEO_FILE="/home/dlstreamer/work/media-downloader/media/h264/1280x720_25fps.h264"
 AUTO_TUNE=false
 TUNE_THRESHOLD=25.0
 TUNE_SHORT_DURATION=30
+EARLY_STOP=false
+EARLY_STOP_REASON=""
+EARLY_STOP_CLOCK=""
 
 # Color output
 GREEN='\033[0;32m'
@@ -109,16 +113,19 @@ Common options:
   -v <video>         Video file path (.h264, .h265, .mp4)
   -n <num_streams>   Number of decode streams (default: 1)
   -P <num_processes> Number of processes (default: 1)
-  -P-sweep <list>    Test multiple process counts (e.g., "1,2,4,8")
+  -P-sweep <list>    Find the best process count among a list (e.g., "1,2,4,8")
+  -n-sweep <list>    Stream counts of the process sweep (default: -n)
   -d <device>        GPU device: GPU.0-GPU.3 (default: GPU.0)
   -i <duration>      Test duration in seconds (default: 120)
   -T                 Enable auto-tune mode
+  -E                 Stop early once FPS converges (or is clearly below -t)
   -h                 Show this help message
 
 Examples:
   ./run_decode_benchmark.sh -n 200 -P 4 -d GPU.0 -i 120
   ./run_decode_benchmark.sh -n 200 -d GPU.0 -T
   ./run_decode_benchmark.sh -n 200 -P-sweep "1,2,4,8" -d GPU.0 -i 120
+  ./run_decode_benchmark.sh -n-sweep "100,150,200,250" -P-sweep "1,2,4,8" -d GPU.0 -i 60
 
 For detailed documentation, see: README.md
 
@@ -144,60 +151,275 @@ while [[ $# -gt 0 ]]; do
             fi
             ;;
         -P-sweep) PROCESS_SWEEP="$2"; shift 2 ;;
+        -n-sweep) STREAM_SWEEP="$2"; shift 2 ;;
         -d) DEVICE="$2"; shift 2 ;;
         -g) GPU_CARD="$2"; shift 2 ;;
         -i) DURATION="$2"; shift 2 ;;
         -t) TARGET_FPS="$2"; shift 2 ;;
         -s) TUNE_THRESHOLD="$2"; shift 2 ;;
         -T) AUTO_TUNE=true; shift ;;
+        -E) EARLY_STOP=true; shift ;;
         -h) usage ;;
         *) echo "Unknown option: $1"; usage ;;
     esac
 done
 
-# Auto-tune mode function - Progressive tuning inspired by tune_local_streams.sh
-run_auto_tune() {
-    local current_streams=$NUM_STREAMS
-    local max_streams=0
-    local max_streams_fps=0
-    local max_streams_total=0
-    local max_streams_dir=""
-    local step_size=10
-    local test_duration=$TUNE_SHORT_DURATION
-    local initial_step_size=10
+# Start the benchmark container (idle; pipelines are started with docker exec)
+start_container() {
+    docker run -d \
+        --name "${CONTAINER_NAME}" \
+        --device="${CARD_DEV}" \
+        --device="${RENDER_DEV}" \
+        -v "${MOUNT_DIR}":/home/dlstreamer/work \
+        -u root \
+        "${IMAGE}" tail -f /dev/null >/dev/null
+}
+
+stop_container() {
+    docker rm -f "${CONTAINER_NAME}" >/dev/null 2>&1 || true
+}
+
+# Follow the process logs live (-E) and stop the pipelines once the FPS has
+# converged or is clearly below the target. Sets EARLY_STOP_REASON and EARLY_STOP_CLOCK.
+monitor_early_stop() {
+    local monitor="$(cd "$(dirname "$0")/../../utils" && pwd)/fps_monitor.py"
+    if ! command -v python3 >/dev/null 2>&1 || [[ ! -f "${monitor}" ]]; then
+        echo -e "${YELLOW}[WARNING]${NC} FPS monitor not available, running the full ${DURATION}s"
+        return 0
+    fi
+    
+    local pid_args=()
+    for pid in "${PROCESS_PIDS[@]}"; do
+        pid_args+=(--pid "${pid}")
+    done
     
+    local result verdict clock
+    result=$(python3 "${monitor}" --streams "${NUM_STREAMS}" --target "${TARGET_FPS}" \
+        "${pid_args[@]}" "${PROCESS_LOGS[@]}") || true
+    read -r verdict clock _ <<< "${result}"
+    
+    if [[ "${verdict}" == "converged" || "${verdict}" == "below" ]]; then
+        EARLY_STOP_REASON="${verdict}"
+        EARLY_STOP_CLOCK="${clock}"
+        echo -e "${YELLOW}[INFO]${NC} Early stop (${verdict}) after ${clock}s of averaging, stopping pipelines..."
+        docker exec "${CONTAINER_NAME}" pkill -INT -f gst-launch-1.0 >/dev/null 2>&1 || true
+    fi
+}
+
+stream_fps_summary() {
+    local analytics="$(cd "$(dirname "$0")/../../utils" && pwd)/fps_analytics.py"
+    if ! command -v python3 >/dev/null 2>&1 || [[ ! -f "${analytics}" ]]; then
+        return 0
+    fi
+    python3 "${analytics}" --summary --target "${TARGET_FPS}" \
+        --json "${RESULTS_DIR}/stream_fps.json" --series-csv "${RESULTS_DIR}/stream_fps_series.csv" \
+        "${PROCESS_LOGS[@]}" 2>/dev/null || true
+    echo ""
+}
+
+RESULTS_STORE_TOOL="$(cd "$(dirname "$0")/../../utils" && pwd)/results_store.py"
+
+# Append the run to the shared results store (utils/results_store.py, results/results.jsonl)
+record_results() {
+    if ! command -v python3 >/dev/null 2>&1 || [[ ! -f "${RESULTS_STORE_TOOL}" ]]; then
+        return 0
+    fi
+    local tag run_id
+    local args=(
+        run.timestamp="${TIMESTAMP}"
+        run.duration_s="${DURATION}"
+        config.codec="${CODEC}"
+        config.card="${CARD_DEV}"
+        config.processes="${NUM_PROCESSES}"
+        config.target_fps="${TARGET_FPS}"
+        config.early_stop="${EARLY_STOP_REASON}"
+        config.pipelines+="${PIPELINE}"
+        throughput.total_fps="${THROUGHPUT}"
+        throughput.per_stream_fps="${THROUGHPUT_PER_STREAM}"
+        throughput.streams="${NUM_STREAMS}"
+        throughput.theoretical_streams="${THEORETICAL_STREAMS}"
+        telemetry.results_dir="${RESULTS_DIR}"
+        telemetry.log="${LOG_FILE}"
+        telemetry.summary="${SUMMARY_FILE}"
+    )
+    while read -r tag; do
+        args+=( "config.${tag}" )
+    done < <(sweep_tags)
+    [[ -s "${RESULTS_DIR}/stream_fps_series.csv" ]] && args+=( throughput.series="${RESULTS_DIR}/stream_fps_series.csv" )
+    
+    if run_id=$(python3 "${RESULTS_STORE_TOOL}" record --driver decode \
+            --stream-fps "${RESULTS_DIR}/stream_fps.json" --gpu-metrics "${GPU_MONITOR_CSV}" "${args[@]}"); then
+        echo -e "${GREEN}[ Info ]${NC} Recorded run ${run_id} in the results store"
+    else
+        echo -e "${YELLOW}[WARNING]${NC} Could not record the run in the results store"
+    fi
+}
+
+# Fields of the run recorded for a results directory: stored_result <results dir> <field> [<field> ...]
+stored_result() {
+    local dir="$1"
+    shift
+    python3 "${RESULTS_STORE_TOOL}" get --driver decode --where telemetry.results_dir="${dir}" "$@" 2>/dev/null
+}
+
+log_tune() {
+    echo -e "${YELLOW}[TUNE]${NC} $*"
+}
+
+PROCESS_OPTIMIZER="$(cd "$(dirname "$0")/../../utils" && pwd)/process_optimizer.py"
+
+# Settings a process sweep is valid for (tags of process_sweep.json, matched by -T)
+sweep_tags() {
+    echo "device=${DEVICE}"
+    echo "video=${VIDEO_FILE}"
+}
+
+# Newest process sweep of the current settings in the working directory (PROCESS_MAP overrides)
+find_process_map() {
+    if [[ -n "${PROCESS_MAP}" ]]; then
+        echo "${PROCESS_MAP}"
+        return 0
+    fi
+    local maps=( ./decode_process_sweep_*/process_sweep.json )
+    [[ -f "${maps[0]}" ]] && command -v python3 >/dev/null 2>&1 || return 1
+    local match=() tag
+    while read -r tag; do
+        match+=(--match "${tag}")
+    done < <(sweep_tags)
+    python3 "${PROCESS_OPTIMIZER}" select "${match[@]}" "${maps[@]}"
+}
+
+# Process count for a stream count: -P, the process map of run_auto_tune, else about 50 streams per process
+processes_for() {
+    if [[ "${USER_SET_PROCESSES}" == true ]]; then
+        echo "${NUM_PROCESSES}"
+        return 0
+    fi
+    if [[ -n "${process_map}" ]] && python3 "${PROCESS_OPTIMIZER}" lookup "${process_map}" "$1" 2>/dev/null; then
+        return 0
+    fi
+    echo $(( ($1 + 49) / 50 ))
+}
+
+# Process sweep (-P-sweep, -n-sweep): utils/process_optimizer.py probes (streams, processes)
+# points in one warm container, skips process counts that are dominated and stream counts past
+# the first one below the threshold, and writes the best process count per stream count to
+# process_sweep.json, which -T picks up when it runs with the same settings.
+run_process_sweep() {
+    local streams="${STREAM_SWEEP:-${NUM_STREAMS}}"
+    streams="${streams// /}"
+    local sweep_dir="./decode_process_sweep_${streams//,/-}streams_${CODEC_SHORT}_$(date +%Y%m%d_%H%M%S)"
+    local optimizer_args=(
+        sweep
+        --container "${CONTAINER_NAME}"
+        --pipeline "${PIPELINE}"
+        --threshold "${TUNE_THRESHOLD}"
+        --streams "${streams}"
+        --processes "${PROCESS_SWEEP// /}"
+        --duration "${DURATION}"
+        --log-dir "${sweep_dir}"
+        --output "${sweep_dir}/process_sweep.json"
+        --report "${sweep_dir}/sweep_summary.txt"
+    )
+    # Full-length probes unless -E
+    [[ "${EARLY_STOP}" == true ]] || optimizer_args+=(--min-seconds "${DURATION}")
+    [[ "${SWEEP_SEARCH:-climb}" == "grid" ]] && optimizer_args+=(--grid)
+    local tag
+    while read -r tag; do
+        optimizer_args+=(--tag "${tag}")
+    done < <(sweep_tags)
+
     echo -e "${GREEN}========================================${NC}"
-    echo -e "${GREEN}Auto-Tune Mode: Finding Maximum Decode Streams${NC}"
+    echo -e "${GREEN}Process Sweep Mode (Decode)${NC}"
     echo -e "${GREEN}========================================${NC}"
+    echo "Stream counts: ${streams}"
+    echo "Process counts: ${PROCESS_SWEEP}"
+    echo "Device: ${DEVICE}"
     echo "Video: ${VIDEO_FILE}"
-    echo "Starting streams: ${current_streams}"
-    echo "Initial step size: ${initial_step_size}"
+    echo "Codec: ${CODEC_SHORT}"
     echo "FPS threshold: ${TUNE_THRESHOLD}"
-    echo "Quick test duration: ${test_duration}s"
-    echo "Final test duration: 120s"
-    echo "Device: ${DEVICE}"
+    echo "Duration: up to ${DURATION}s per probe"
     echo ""
-    
-    log_tune() {
-        echo -e "${YELLOW}[TUNE]${NC} $*"
-    }
+
+    mkdir -p "${sweep_dir}"
+    cleanup_existing_decode_containers
+    echo -e "${YELLOW}[SWEEP]${NC} Starting warm container ${CONTAINER_NAME} for all probes..."
+    start_container
+    trap stop_container EXIT
+    trap 'stop_container; exit 130' INT TERM
+
+    local status=0
+    python3 "${PROCESS_OPTIMIZER}" "${optimizer_args[@]}" >/dev/null || status=$?
+
+    stop_container
+    trap - EXIT INT TERM
+
+    echo ""
+    echo -e "${GREEN}========================================${NC}"
+    echo -e "${GREEN}Decode Process Sweep Complete${NC}"
+    echo -e "${GREEN}========================================${NC}"
+    echo "Results saved to: ${sweep_dir}"
+    echo "Process map (used by -T with the same settings): ${sweep_dir}/process_sweep.json"
+    echo ""
+    exit ${status}
+}
+
+# Binary-search tuning: stream_density_tuner.py brackets exponentially from -n,
+# bisects, and stops each probe early once the per-stream FPS is clearly above
+# or below the threshold. All probes share one warm container.
+# Sets max_streams, max_streams_fps, max_streams_total, max_streams_dir and iteration of run_auto_tune.
+tune_bisect() {
+    local tuner="$1"
+    local tune_dir="./decode_tune_${CODEC_SHORT}_$(date +%Y%m%d_%H%M%S)"
+    local tuner_args=(
+        --container "${CONTAINER_NAME}"
+        --pipeline "${PIPELINE}"
+        --threshold "${TUNE_THRESHOLD}"
+        --start "${NUM_STREAMS}"
+        --max-streams 1000
+        --duration "${test_duration}"
+        --log-dir "${tune_dir}"
+    )
+    if [[ "${USER_SET_PROCESSES}" == true ]]; then
+        tuner_args+=(--processes "${NUM_PROCESSES}")
+    elif [[ -n "${process_map}" ]]; then
+        tuner_args+=(--process-map "${process_map}")
+    else
+        tuner_args+=(--streams-per-process 50)
+    fi
+
+    cleanup_existing_decode_containers
+    log_tune "Starting warm container ${CONTAINER_NAME} for all probes..."
+    start_container
+    trap stop_container EXIT
+    trap 'stop_container; exit 130' INT TERM
+
+    local result
+    result=$(python3 "${tuner}" "${tuner_args[@]}") || true
+
+    stop_container
+    trap - EXIT INT TERM
+
+    read -r max_streams max_streams_fps max_streams_total iteration _ <<< "${result}"
+    [[ "${max_streams}" =~ ^[0-9]+$ ]] || max_streams=0
+    max_streams_dir="${tune_dir}"
+}
+
+# Progressive tuning inspired by tune_local_streams.sh (TUNE_SEARCH=legacy):
+# steps by 10, then by 1, re-running the whole script for every probe
+tune_step_search() {
+    local current_streams=$NUM_STREAMS
+    local step_size=$initial_step_size
     
     # Progressive tuning loop
     log_tune "Starting progressive tuning from ${current_streams} streams..."
-    local iteration=0
     local max_iterations=50  # Safety limit
     
     while [[ $iteration -lt $max_iterations ]]; do
         iteration=$((iteration + 1))
         
-        # Calculate processes for current stream count
-        local processes
-        if [[ "${USER_SET_PROCESSES}" == true ]]; then
-            processes=$NUM_PROCESSES
-        else
-            processes=$(( (current_streams + 49) / 50 ))
-            [[ $processes -lt 1 ]] && processes=1
-        fi
+        # Calculate processes for current stream count (-P, process map, or about 50 streams per process)
+        local processes=$(processes_for "${current_streams}")
         
         log_tune "[$iteration] Testing ${current_streams} streams (${processes} processes, step size: ${step_size})..."
         
@@ -253,11 +475,11 @@ run_auto_tune() {
             continue
         fi
         
-        # Extract metrics from summary.txt
-        local per_stream_fps=$(grep "Per-Stream Average:" "$result_dir/summary.txt" | grep -oP '\K[0-9.]+(?= fps/stream)')
-        local total_throughput=$(grep "Total Decode Throughput:" "$result_dir/summary.txt" | grep -oP '\K[0-9.]+(?= fps)')
+        # Metrics of the run from the results store
+        local per_stream_fps="" total_throughput=""
+        read -r per_stream_fps total_throughput < <(stored_result "$result_dir" throughput.per_stream_fps throughput.total_fps) || true
         
-        if [[ -z "$per_stream_fps" ]]; then
+        if [[ -z "$per_stream_fps" || "$per_stream_fps" == "NA" ]]; then
             log_tune "✗ Failed to parse FPS from results"
             
             if [[ $step_size -gt 1 ]]; then
@@ -313,6 +535,53 @@ run_auto_tune() {
     if [[ $iteration -ge $max_iterations ]]; then
         log_tune "Reached maximum iterations (${max_iterations}), stopping"
     fi
+}
+
+# Auto-tune mode function
+run_auto_tune() {
+    local max_streams=0
+    local max_streams_fps=0
+    local max_streams_total=0
+    local max_streams_dir=""
+    local iteration=0
+    local test_duration=$TUNE_SHORT_DURATION
+    local initial_step_size=10
+    local process_map=""
+    local tuner="$(cd "$(dirname "$0")/../../utils" && pwd)/stream_density_tuner.py"
+    local search="bisect"
+    if [[ "${TUNE_SEARCH:-bisect}" == "legacy" ]] || ! command -v python3 >/dev/null 2>&1 || [[ ! -f "${tuner}" ]]; then
+        search="legacy"
+    fi
+    
+    echo -e "${GREEN}========================================${NC}"
+    echo -e "${GREEN}Auto-Tune Mode: Finding Maximum Decode Streams${NC}"
+    echo -e "${GREEN}========================================${NC}"
+    echo "Video: ${VIDEO_FILE}"
+    echo "Starting streams: ${NUM_STREAMS}"
+    if [[ "${search}" == "legacy" ]]; then
+        echo "Initial step size: ${initial_step_size}"
+    else
+        echo "Search: exponential bracket + bisection (early-stopping probes)"
+    fi
+    if [[ "${USER_SET_PROCESSES}" == true ]]; then
+        echo "Processes: ${NUM_PROCESSES} (-P)"
+    elif process_map=$(find_process_map 2>/dev/null); then
+        echo "Process counts: ${process_map}"
+    else
+        process_map=""
+        echo "Process counts: about 50 streams per process"
+    fi
+    echo "FPS threshold: ${TUNE_THRESHOLD}"
+    echo "Quick test duration: ${test_duration}s"
+    echo "Final test duration: 120s"
+    echo "Device: ${DEVICE}"
+    echo ""
+    
+    if [[ "${search}" == "legacy" ]]; then
+        tune_step_search
+    else
+        tune_bisect "${tuner}"
+    fi
     
     # Check if we found any valid configuration
     if [[ $max_streams -eq 0 ]]; then
@@ -335,13 +604,7 @@ run_auto_tune() {
     echo ""
     log_tune "Running final verification with ${max_streams} streams (120s)..."
     
-    local final_processes
-    if [[ "${USER_SET_PROCESSES}" == true ]]; then
-        final_processes=$NUM_PROCESSES
-    else
-        final_processes=$(( (max_streams + 49) / 50 ))
-        [[ $final_processes -lt 1 ]] && final_processes=1
-    fi
+    local final_processes=$(processes_for "${max_streams}")
     
     AUTO_TUNE=false DURATION=120 NUM_STREAMS=$max_streams NUM_PROCESSES=$final_processes \
         bash "$0" -v "$VIDEO_FILE" -n $max_streams -P $final_processes \
@@ -352,9 +615,11 @@ run_auto_tune() {
     local final_fps=$max_streams_fps
     local final_total=$max_streams_total
     
-    if [[ -n "$final_dir" && -f "$final_dir/summary.txt" ]]; then
-        final_fps=$(grep "Per-Stream Average:" "$final_dir/summary.txt" | grep -oP '\K[0-9.]+(?= fps/stream)' || echo "$max_streams_fps")
-        final_total=$(grep "Total Decode Throughput:" "$final_dir/summary.txt" | grep -oP '\K[0-9.]+(?= fps)' || echo "$max_streams_total")
+    if [[ -n "$final_dir" ]]; then
+        local stored_fps="" stored_total=""
+        read -r stored_fps stored_total < <(stored_result "$final_dir" throughput.per_stream_fps throughput.total_fps) || true
+        [[ -n "$stored_fps" && "$stored_fps" != "NA" ]] && final_fps=$stored_fps
+        [[ -n "$stored_total" && "$stored_total" != "NA" ]] && final_total=$stored_total
     fi
     
     # Display final results
@@ -368,7 +633,11 @@ run_auto_tune() {
     echo ""
     echo "Tuning Process:"
     echo "  Starting Streams: ${NUM_STREAMS}"
-    echo "  Initial Step Size: ${initial_step_size}"
+    if [[ "${search}" == "legacy" ]]; then
+        echo "  Initial Step Size: ${initial_step_size}"
+    else
+        echo "  Search: exponential bracket + bisection"
+    fi
     echo "  Iterations: ${iteration}"
     echo ""
     echo "Optimal Configuration:"
@@ -412,164 +681,40 @@ else
     exit 1
 fi
 
-# Process sweep mode - test multiple process counts
+# Build decode-only pipeline
+PIPELINE="multifilesrc location=${VIDEO_FILE} loop=true ! ${PARSER} ! ${DECODER} ! vapostproc ! \"video/x-raw(memory:VAMemory)\" ! queue ! gvafpscounter starting-frame=100 ! fakesink sync=false async=false"
+
+# Detect GPU card and render device
+if [[ -z "${GPU_CARD}" ]]; then
+    # Auto-detect based on device parameter
+    if [[ "${DEVICE}" == "GPU.0" ]]; then
+        CARD_DEV="/dev/dri/card0"
+        RENDER_DEV="/dev/dri/renderD128"
+    elif [[ "${DEVICE}" == "GPU.1" ]]; then
+        CARD_DEV="/dev/dri/card1"
+        RENDER_DEV="/dev/dri/renderD129"
+    elif [[ "${DEVICE}" == "GPU.2" ]]; then
+        CARD_DEV="/dev/dri/card2"
+        RENDER_DEV="/dev/dri/renderD130"
+    elif [[ "${DEVICE}" == "GPU.3" ]]; then
+        CARD_DEV="/dev/dri/card3"
+        RENDER_DEV="/dev/dri/renderD131"
+    else
+        echo -e "${RED}[ERROR]${NC} Invalid device: ${DEVICE}"
+        echo "Valid devices: GPU.0, GPU.1, GPU.2, GPU.3"
+        exit 1
+    fi
+else
+    CARD_DEV="/dev/dri/${GPU_CARD}"
+    # Calculate render device based on card number
+    CARD_NUM="${GPU_CARD//[!0-9]/}"
+    RENDER_NUM=$((128 + CARD_NUM))
+    RENDER_DEV="/dev/dri/renderD${RENDER_NUM}"
+fi
+
+# Check if process sweep mode is enabled
 if [[ -n "${PROCESS_SWEEP}" ]]; then
-    echo -e "${GREEN}========================================${NC}"
-    echo -e "${GREEN}Process Sweep Mode (Decode)${NC}"
-    echo -e "${GREEN}========================================${NC}"
-    echo "Testing process counts: ${PROCESS_SWEEP}"
-    echo "Streams: ${NUM_STREAMS}"
-    echo "Device: ${DEVICE}"
-    echo "Video: ${VIDEO_FILE}"
-    echo "Codec: ${CODEC_SHORT}"
-    echo "Duration: ${DURATION}s"
-    echo ""
-    
-    # Parse process counts
-    IFS=',' read -ra PROCESS_COUNTS <<< "${PROCESS_SWEEP}"
-    
-    # Create sweep results directory
-    SWEEP_TIMESTAMP=$(date +%Y%m%d_%H%M%S)
-    SWEEP_DIR="./decode_process_sweep_${NUM_STREAMS}streams_${CODEC_SHORT}_${SWEEP_TIMESTAMP}"
-    mkdir -p "${SWEEP_DIR}"
-    
-    SWEEP_SUMMARY="${SWEEP_DIR}/sweep_summary.txt"
-    
-    # Write sweep header
-    {
-        echo "======================================"
-        echo "Decode Process Sweep Test Summary"
-        echo "======================================"
-        echo "Timestamp: ${SWEEP_TIMESTAMP}"
-        echo "Total Streams: ${NUM_STREAMS}"
-        echo "Device: ${DEVICE}"
-        echo "Video: ${VIDEO_FILE}"
-        echo "Duration: ${DURATION}s per test"
-        echo "Process Counts Tested: ${PROCESS_SWEEP}"
-        echo ""
-        echo "======================================"
-        echo "Individual Test Results"
-        echo "======================================"
-        echo ""
-    } > "${SWEEP_SUMMARY}"
-    
-    declare -a SWEEP_RESULTS
-    
-    # Run tests for each process count
-    for proc_count in "${PROCESS_COUNTS[@]}"; do
-        # Trim whitespace
-        proc_count=$(echo "${proc_count}" | xargs)
-        
-        if [[ ! "${proc_count}" =~ ^[0-9]+$ ]] || [[ ${proc_count} -lt 1 ]]; then
-            echo -e "${RED}[ERROR]${NC} Invalid process count: ${proc_count}"
-            continue
-        fi
-        
-        echo -e "${YELLOW}[SWEEP]${NC} Testing with ${proc_count} process(es)..."
-        echo ""
-        
-        # Build command arguments (exclude -P-sweep to avoid recursion)
-        TEST_ARGS="-v ${VIDEO_FILE} -n ${NUM_STREAMS} -P ${proc_count} -d ${DEVICE} -i ${DURATION}"
-        [[ -n "${GPU_CARD}" ]] && TEST_ARGS="${TEST_ARGS} -g ${GPU_CARD}"
-        [[ -n "${TARGET_FPS}" ]] && TEST_ARGS="${TEST_ARGS} -t ${TARGET_FPS}"
-        
-        # Run the test (call script recursively without -P-sweep)
-        if bash "$0" ${TEST_ARGS} 2>&1 | tee "${SWEEP_DIR}/test_${proc_count}proc.log"; then
-            # Find the most recent decode_results directory
-            RESULT_DIR=$(ls -td decode_results_${NUM_STREAMS}streams_${proc_count}proc_* 2>/dev/null | head -1)
-            
-            if [[ -n "${RESULT_DIR}" && -f "${RESULT_DIR}/summary.txt" ]]; then
-                # Extract metrics
-                PER_STREAM_FPS=$(grep "Per-Stream Average:" "${RESULT_DIR}/summary.txt" | grep -oP '\K[0-9.]+(?= fps/stream)')
-                TOTAL_FPS=$(grep "Total Decode Throughput:" "${RESULT_DIR}/summary.txt" | grep -oP '\K[0-9.]+(?= fps)')
-                
-                if [[ -n "${PER_STREAM_FPS}" && -n "${TOTAL_FPS}" ]]; then
-                    SWEEP_RESULTS+=("${proc_count}:${PER_STREAM_FPS}:${TOTAL_FPS}")
-                    
-                    echo ""
-                    echo -e "${GREEN}[SWEEP]${NC} Result: ${proc_count} proc -> ${PER_STREAM_FPS} fps/stream (Total: ${TOTAL_FPS} fps)"
-                    
-                    # Append to summary
-                    {
-                        echo "Process Count: ${proc_count}"
-                        echo "  FPS per Stream: ${PER_STREAM_FPS}"
-                        echo "  Total Throughput: ${TOTAL_FPS} fps"
-                        echo ""
-                    } >> "${SWEEP_SUMMARY}"
-                else
-                    echo -e "${RED}[SWEEP]${NC} Failed to parse results for ${proc_count} process(es)"
-                    {
-                        echo "Process Count: ${proc_count}"
-                        echo "  Status: PARSE_FAILED"
-                        echo ""
-                    } >> "${SWEEP_SUMMARY}"
-                fi
-            else
-                echo -e "${RED}[SWEEP]${NC} Results not found for ${proc_count} process(es)"
-                {
-                    echo "Process Count: ${proc_count}"
-                    echo "  Status: RESULTS_NOT_FOUND"
-                    echo ""
-                } >> "${SWEEP_SUMMARY}"
-            fi
-        else
-            echo -e "${RED}[SWEEP]${NC} Test failed for ${proc_count} process(es)"
-            {
-                echo "Process Count: ${proc_count}"
-                echo "  Status: TEST_FAILED"
-                echo ""
-            } >> "${SWEEP_SUMMARY}"
-        fi
-        
-        echo ""
-        echo -e "${YELLOW}[SWEEP]${NC} Waiting 5 seconds before next test..."
-        sleep 5
-    done
-    
-    # Write comparison summary
-    {
-        echo "======================================"
-        echo "Comparison Summary"
-        echo "======================================"
-        printf "%-12s %-18s %-18s\n" "Processes" "FPS/Stream" "Total FPS"
-        echo "--------------------------------------"
-    } >> "${SWEEP_SUMMARY}"
-    
-    # Find best result
-    BEST_FPS=0
-    BEST_PROC=0
-    
-    for result in "${SWEEP_RESULTS[@]}"; do
-        IFS=':' read -r proc fps total <<< "${result}"
-        printf "%-12s %-18s %-18s\n" "${proc}" "${fps}" "${total}" >> "${SWEEP_SUMMARY}"
-        
-        # Check if this is the best
-        IS_BEST=$(LC_ALL=C awk -v total="${total}" -v best="${BEST_FPS}" \
-            'BEGIN { print (total > best) ? 1 : 0 }')
-        if [[ ${IS_BEST} -eq 1 ]]; then
-            BEST_FPS="${total}"
-            BEST_PROC="${proc}"
-        fi
-    done
-    
-    {
-        echo ""
-        echo "Best Configuration:"
-        echo "  Process Count: ${BEST_PROC}"
-        echo "  Total Throughput: ${BEST_FPS} fps"
-        echo ""
-        echo "Results saved to: ${SWEEP_DIR}"
-        echo ""
-    } >> "${SWEEP_SUMMARY}"
-    
-    # Display summary
-    echo ""
-    echo -e "${GREEN}========================================${NC}"
-    echo -e "${GREEN}Decode Process Sweep Complete${NC}"
-    echo -e "${GREEN}========================================${NC}"
-    cat "${SWEEP_SUMMARY}"
-    
-    exit 0
+    run_process_sweep
 fi
 
 # Check if auto-tune mode is enabled
@@ -606,34 +751,6 @@ echo "Target FPS: ${TARGET_FPS}"
 echo "Results: ${RESULTS_DIR}"
 echo ""
 
-# Detect GPU card and render device
-if [[ -z "${GPU_CARD}" ]]; then
-    # Auto-detect based on device parameter
-    if [[ "${DEVICE}" == "GPU.0" ]]; then
-        CARD_DEV="/dev/dri/card0"
-        RENDER_DEV="/dev/dri/renderD128"
-    elif [[ "${DEVICE}" == "GPU.1" ]]; then
-        CARD_DEV="/dev/dri/card1"
-        RENDER_DEV="/dev/dri/renderD129"
-    elif [[ "${DEVICE}" == "GPU.2" ]]; then
-        CARD_DEV="/dev/dri/card2"
-        RENDER_DEV="/dev/dri/renderD130"
-    elif [[ "${DEVICE}" == "GPU.3" ]]; then
-        CARD_DEV="/dev/dri/card3"
-        RENDER_DEV="/dev/dri/renderD131"
-    else
-        echo -e "${RED}[ERROR]${NC} Invalid device: ${DEVICE}"
-        echo "Valid devices: GPU.0, GPU.1, GPU.2, GPU.3"
-        exit 1
-    fi
-else
-    CARD_DEV="/dev/dri/${GPU_CARD}"
-    # Calculate render device based on card number
-    CARD_NUM="${GPU_CARD//[!0-9]/}"
-    RENDER_NUM=$((128 + CARD_NUM))
-    RENDER_DEV="/dev/dri/renderD${RENDER_NUM}"
-fi
-
 echo "GPU Card: ${CARD_DEV}"
 echo "Render Device: ${RENDER_DEV}"
 echo ""
@@ -657,13 +774,7 @@ echo ""
 
 # Start container
 echo -e "${YELLOW}[INFO]${NC} Creating container: ${CONTAINER_NAME}"
-docker run -d \
-    --name "${CONTAINER_NAME}" \
-    --device="${CARD_DEV}" \
-    --device="${RENDER_DEV}" \
-    -v "${MOUNT_DIR}":/home/dlstreamer/work \
-    -u root \
-    "${IMAGE}" tail -f /dev/null >/dev/null
+start_container
 
 echo -e "${YELLOW}[INFO]${NC} Container created successfully"
 echo ""
@@ -677,9 +788,6 @@ if [[ "${CODEC}" == "MP4 (H.265)" ]]; then
 fi
 echo ""
 
-# Build decode-only pipeline
-PIPELINE="multifilesrc location=${VIDEO_FILE} loop=true ! ${PARSER} ! ${DECODER} ! vapostproc ! \"video/x-raw(memory:VAMemory)\" ! queue ! gvafpscounter starting-frame=100 ! fakesink sync=false async=false"
-
 # Calculate streams per process
 STREAMS_PER_PROCESS=$(( (NUM_STREAMS + NUM_PROCESSES - 1) / NUM_PROCESSES ))
 
@@ -772,6 +880,10 @@ for proc_id in $(seq 1 "${NUM_PROCESSES}"); do
     sleep 0.5
 done
 
+if [[ "${EARLY_STOP}" == true ]]; then
+    monitor_early_stop
+fi
+
 echo -e "${YELLOW}[INFO]${NC} Waiting for all decode processes to complete..."
 
 # Wait for all processes to complete
@@ -821,6 +933,10 @@ if [[ -f "${LOG_FILE}" ]]; then
         else
             MIN_DURATION=$(LC_ALL=C awk -v d="${DURATION}" 'BEGIN { printf("%.0f", d * 0.9) }')
         fi
+        if [[ -n "${EARLY_STOP_REASON}" ]]; then
+            # Stopped early: processes only had to reach the monitor's decision point
+            MIN_DURATION=$(LC_ALL=C awk -v c="${EARLY_STOP_CLOCK}" 'BEGIN { printf("%d", c) }')
+        fi
         FAILED_PROCESSES=()
         
         for i in "${!PROCESS_LOGS[@]}"; do
@@ -919,6 +1035,10 @@ if [[ -f "${LOG_FILE}" ]]; then
         else
             MIN_DURATION=$(LC_ALL=C awk -v d="${DURATION}" 'BEGIN { printf("%.0f", d * 0.9) }')
         fi
+        if [[ -n "${EARLY_STOP_REASON}" ]]; then
+            # Stopped early: processes only had to reach the monitor's decision point
+            MIN_DURATION=$(LC_ALL=C awk -v c="${EARLY_STOP_CLOCK}" 'BEGIN { printf("%d", c) }')
+        fi
         
         if [[ -z "${PROC_RUNTIME}" ]]; then
             echo -e "${RED}[ERROR]${NC} No FPS data found in log"
@@ -969,6 +1089,9 @@ if [[ -f "${LOG_FILE}" ]]; then
             echo "Number of Streams: ${NUM_STREAMS}"
             echo "Number of Processes: ${NUM_PROCESSES}"
             echo "Duration: ${DURATION}s"
+            if [[ -n "${EARLY_STOP_REASON}" ]]; then
+                echo "Early Stop: ${EARLY_STOP_REASON} after ${EARLY_STOP_CLOCK}s of averaging"
+            fi
             echo "Target FPS: ${TARGET_FPS}"
             echo ""
             echo "Results:"
@@ -977,6 +1100,7 @@ if [[ -f "${LOG_FILE}" ]]; then
             echo "Per-Stream Average: ${THROUGHPUT_PER_STREAM} fps/stream"
             echo "Theoretical Stream Density: ${THEORETICAL_STREAMS} streams"
             echo ""
+            stream_fps_summary
             echo "Pipeline:"
             echo "${PIPELINE}"
             echo ""
@@ -1012,6 +1136,8 @@ except Exception as e:
             fi
         fi
         
+        record_results
+        
         echo ""
         echo -e "${GREEN}[SUCCESS]${NC} Results saved to: ${RESULTS_DIR}"
         echo "  - Summary: ${SUMMARY_FILE}"
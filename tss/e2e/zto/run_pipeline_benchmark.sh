@@ -43,6 +43,7 @@ TARGET_FPS=25
 NUM_STREAMS=1
 NUM_PROCESSES=1
 PROCESS_SWEEP=""
+STREAM_SWEEP=""
 DEVICE="GPU.0"
 VIDEO_FILE="/home/dlstreamer/work/media-downloader/media/hevc/apple_720p25_loop30.h265"
 MODEL_PATH_INT8="/home/dlstreamer/work/model-conversion/models/yolo11n/yolo11n_int8.xml"
@@ -55,6 +56,11 @@ PYTHON_MODULE="/home/dlstreamer/add_data.py"  # Default: enable metadata process
 AUTO_TUNE=false
 TUNE_THRESHOLD=25.0
 TUNE_SHORT_DURATION=20
+EARLY_STOP=false
+EARLY_STOP_REASON=""
+EARLY_STOP_CLOCK=""
+MODEL_CACHE=false  # -C: reuse compiled models from results/.model_cache
+MODEL_CACHE_STATE=""
 
 # Color output
 GREEN='\033[0;32m'
@@ -141,6 +147,131 @@ ensure_mqtt_broker() {
     fi
 }
 
+# Start the benchmark container and make the metadata module available in it
+start_container() {
+    docker run -d \
+        --name "${CONTAINER_NAME}" \
+        --device="${CARD_DEV}" \
+        --device="${RENDER_DEV}" \
+        --net=host \
+        -v "${MOUNT_DIR}":/home/dlstreamer/work \
+        -e PYTHONPATH="/opt/intel/dlstreamer/gstreamer/lib/python3/dist-packages:/opt/intel/dlstreamer/python" \
+        -u root \
+        "${IMAGE}" tail -f /dev/null >/dev/null
+
+    echo -e "${YELLOW}[INFO]${NC} Container created successfully"
+
+    # Copy add_data.py if it exists and AI is enabled
+    if [[ "${ENABLE_AI}" == true ]]; then
+        # Check if Python module is already accessible via mounted volume
+        if [[ "${PYTHON_MODULE}" == /home/dlstreamer/work/* ]]; then
+            echo -e "${GREEN}[INFO]${NC} Python module accessible via mounted volume: ${PYTHON_MODULE}"
+        else
+            # Need to copy the file to container
+            SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+            LOCAL_PYTHON_FILE="${SCRIPT_DIR}/add_data.py"
+            
+            if [[ -f "${LOCAL_PYTHON_FILE}" ]]; then
+                echo -e "${YELLOW}[INFO]${NC} Copying Python module to container..."
+                docker cp "${LOCAL_PYTHON_FILE}" "${CONTAINER_NAME}:${PYTHON_MODULE}" >/dev/null 2>&1
+                
+                if [[ $? -eq 0 ]]; then
+                    echo -e "${GREEN}[INFO]${NC} Python module copied to ${PYTHON_MODULE}"
+                else
+                    echo -e "${RED}[ERROR]${NC} Failed to copy Python module"
+                    echo -e "${RED}[ERROR]${NC} Python module is required for AI pipeline"
+                    exit 1
+                fi
+            else
+                echo -e "${RED}[ERROR]${NC} add_data.py not found at ${LOCAL_PYTHON_FILE}"
+                echo -e "${RED}[ERROR]${NC} Python module is required for AI pipeline"
+                exit 1
+            fi
+        fi
+    fi
+}
+
+# Follow the process logs live (-E) and stop the pipelines once the FPS has
+# converged or is clearly below the target. Sets EARLY_STOP_REASON and EARLY_STOP_CLOCK.
+monitor_early_stop() {
+    local monitor="$(cd "$(dirname "$0")/../../../utils" && pwd)/fps_monitor.py"
+    if ! command -v python3 >/dev/null 2>&1 || [[ ! -f "${monitor}" ]]; then
+        echo -e "${YELLOW}[WARNING]${NC} FPS monitor not available, running the full ${DURATION}s"
+        return 0
+    fi
+    
+    local pid_args=()
+    for pid in "${PROCESS_PIDS[@]}"; do
+        pid_args+=(--pid "${pid}")
+    done
+    
+    local result verdict clock
+    result=$(python3 "${monitor}" --streams "${NUM_STREAMS}" --target "${TARGET_FPS}" \
+        "${pid_args[@]}" "${PROCESS_LOGS[@]}") || true
+    read -r verdict clock _ <<< "${result}"
+    
+    if [[ "${verdict}" == "converged" || "${verdict}" == "below" ]]; then
+        EARLY_STOP_REASON="${verdict}"
+        EARLY_STOP_CLOCK="${clock}"
+        echo -e "${YELLOW}[INFO]${NC} Early stop (${verdict}) after ${clock}s of averaging, stopping pipelines..."
+        docker exec "${CONTAINER_NAME}" pkill -INT -f gst-launch-1.0 >/dev/null 2>&1 || true
+    fi
+}
+
+stream_fps_summary() {
+    local analytics="$(cd "$(dirname "$0")/../../../utils" && pwd)/fps_analytics.py"
+    if ! command -v python3 >/dev/null 2>&1 || [[ ! -f "${analytics}" ]]; then
+        return 0
+    fi
+    python3 "${analytics}" --summary --target "${TARGET_FPS}" \
+        --json "${RESULTS_DIR}/stream_fps.json" --series-csv "${RESULTS_DIR}/stream_fps_series.csv" \
+        "${PROCESS_LOGS[@]}" 2>/dev/null || true
+    echo ""
+}
+
+RESULTS_STORE_TOOL="$(cd "$(dirname "$0")/../../../utils" && pwd)/results_store.py"
+
+# Append the run to the shared results store (utils/results_store.py, results/results.jsonl)
+record_results() {
+    if ! command -v python3 >/dev/null 2>&1 || [[ ! -f "${RESULTS_STORE_TOOL}" ]]; then
+        return 0
+    fi
+    local tag run_id
+    local args=(
+        run.timestamp="${TIMESTAMP}"
+        run.duration_s="${DURATION}"
+        config.card="${CARD_DEV}"
+        config.processes="${NUM_PROCESSES}"
+        config.target_fps="${TARGET_FPS}"
+        config.early_stop="${EARLY_STOP_REASON}"
+        config.model_cache="${MODEL_CACHE_STATE}"
+        config.pipelines+="${PIPELINE}"
+        throughput.total_fps="${THROUGHPUT}"
+        throughput.per_stream_fps="${THROUGHPUT_PER_STREAM}"
+        throughput.streams="${NUM_STREAMS}"
+        throughput.theoretical_streams="${THEORETICAL_STREAMS}"
+        power.avg_w="${AVG_GPU_POWER}"
+        telemetry.results_dir="${RESULTS_DIR}"
+        telemetry.log="${LOG_FILE}"
+        telemetry.summary="${SUMMARY_FILE}"
+    )
+    while read -r tag; do
+        args+=( "config.${tag}" )
+    done < <(sweep_tags)
+    if [[ "${ENABLE_AI}" == true && -n "${AI_AVG}" ]]; then
+        # Batch processing time derived from the per-stream throughput
+        args+=( latency.unit=ms latency.mean="${AI_AVG}" latency.median="${AI_MEDIAN}" latency.min="${AI_MIN}" latency.max="${AI_MAX}" )
+    fi
+    [[ -s "${RESULTS_DIR}/stream_fps_series.csv" ]] && args+=( throughput.series="${RESULTS_DIR}/stream_fps_series.csv" )
+    
+    if run_id=$(python3 "${RESULTS_STORE_TOOL}" record --driver zto-pipeline \
+            --stream-fps "${RESULTS_DIR}/stream_fps.json" --gpu-metrics "${MONITOR_CSV}" "${args[@]}"); then
+        echo -e "${GREEN}[ Info ]${NC} Recorded run ${run_id} in the results store"
+    else
+        echo -e "${YELLOW}[WARNING]${NC} Could not record the run in the results store"
+    fi
+}
+
 # Usage
 usage() {
     cat << EOF
@@ -151,13 +282,16 @@ Usage: $0 [OPTIONS]
 Common options:
   -n <num_streams>   Number of AI streams (default: 1)
   -P <num_processes> Number of processes (default: 1)
-  -P-sweep <list>    Test multiple process counts (e.g., "1,2,4,8")
+  -P-sweep <list>    Find the best process count among a list (e.g., "1,2,4,8")
+  -n-sweep <list>    Stream counts of the process sweep (default: -n)
   -d <device>        GPU device: GPU.0, GPU.1 (default: GPU.0)
   -b <batch_size>    Inference batch size (default: 1)
   -i <duration>      Test duration in seconds (default: 120)
   -a                 Enable AI inference (required for AI pipeline)
   -int8              Use INT8 model (default: FP32)
   -T                 Enable auto-tune mode
+  -E                 Stop early once FPS converges (or is clearly below -t)
+  -C                 Reuse the compiled detection model from results/.model_cache
   -h                 Show this help message
 
 Examples:
@@ -165,6 +299,7 @@ Examples:
   ./run_pipeline_benchmark.sh -n 48 -P 6 -d GPU.0 -b 32 -a -int8 -i 120
   ./run_pipeline_benchmark.sh -n 40 -d GPU.0 -b 32 -a -T
   ./run_pipeline_benchmark.sh -n 32 -P-sweep "1,2,4,8" -d GPU.0 -b 32 -a -i 120
+  ./run_pipeline_benchmark.sh -n-sweep "16,32,48,64" -P-sweep "1,2,4,8" -d GPU.0 -b 32 -a -i 60
 
 For detailed documentation, see: README.md
 
@@ -204,6 +339,10 @@ while [[ $# -gt 0 ]]; do
             PROCESS_SWEEP="$2"
             shift 2
             ;;
+        -n-sweep)
+            STREAM_SWEEP="$2"
+            shift 2
+            ;;
         -d)
             DEVICE="$2"
             shift 2
@@ -244,6 +383,14 @@ while [[ $# -gt 0 ]]; do
             AUTO_TUNE=true
             shift
             ;;
+        -E)
+            EARLY_STOP=true
+            shift
+            ;;
+        -C)
+            MODEL_CACHE=true
+            shift
+            ;;
         -h)
             usage
             ;;
@@ -264,182 +411,214 @@ if [[ -n "${MODEL_OVERRIDE}" ]]; then
     MODEL_PATH="${MODEL_OVERRIDE}"
 fi
 
-# Process sweep mode - test multiple process counts
-if [[ -n "${PROCESS_SWEEP}" ]]; then
+# Build GStreamer pipeline
+# Choose between decode-only or full AI pipeline
+if [[ "${ENABLE_AI}" == true ]]; then
+    # Full AI pipeline with detection, tracking, metadata processing, and MQTT publishing
+    # Compiled model cache entry (see utils/model_cache.py), keyed on the host model content
+    DETECT_CACHE=""
+    if [[ "${MODEL_CACHE}" == true ]]; then
+        MODEL_CACHE_ROOT="${MOUNT_DIR}/results/.model_cache"
+        CACHE_KEY=$(python3 "${MOUNT_DIR}/utils/model_cache.py" key "${MODEL_CACHE_ROOT}" \
+            "${MOUNT_DIR}${MODEL_PATH#/home/dlstreamer/work}" --device "${DEVICE}" --batch "${BATCH_SIZE}") || {
+            echo -e "${RED}[ERROR]${NC} Could not create the model cache entry"
+            exit 1
+        }
+        DETECT_CACHE=" ie-config=CACHE_DIR=/home/dlstreamer/work/results/.model_cache/${CACHE_KEY}"
+    fi
+    AI_PIPELINE="gvadetect model=${MODEL_PATH} device=${DEVICE} pre-process-backend=vaapi-surface-sharing model-instance-id=inf0 batch-size=${BATCH_SIZE}${DETECT_CACHE} ! gvatrack tracking-type=zero-term-imageless ! gvametaconvert add-empty-results=true json-indent=-1 timestamp-utc=true timestamp-microseconds=true ! gvapython module=${PYTHON_MODULE} ! queue ! gvametapublish method=mqtt address=${MQTT_ADDRESS} topic=dlstreamer async-handling=true"
+    
+    PIPELINE="multifilesrc location=${VIDEO_FILE} loop=true ! h265parse ! vah265dec ! vapostproc ! \"video/x-raw(memory:VAMemory)\" ! ${AI_PIPELINE} ! gvafpscounter starting-frame=100 ! fakesink sync=false async=false"
+else
+    # Decode-only pipeline for pure throughput testing
+    PIPELINE="multifilesrc location=${VIDEO_FILE} loop=true ! h265parse ! vah265dec ! vapostproc ! \"video/x-raw(memory:VAMemory)\" ! queue ! gvafpscounter starting-frame=100 ! fakesink sync=false async=false"
+fi
+
+# Detect GPU card and render device
+if [[ -z "${GPU_CARD}" ]]; then
+    # Auto-detect based on device parameter
+    if [[ "${DEVICE}" == "GPU.0" ]]; then
+        CARD_DEV="/dev/dri/card1"
+        RENDER_DEV="/dev/dri/renderD128"
+    elif [[ "${DEVICE}" == "GPU.1" ]]; then
+        CARD_DEV="/dev/dri/card1"
+        RENDER_DEV="/dev/dri/renderD129"
+    else
+        CARD_DEV="/dev/dri/card0"
+        RENDER_DEV="/dev/dri/renderD128"
+    fi
+else
+    CARD_DEV="/dev/dri/${GPU_CARD}"
+    # Calculate render device based on card number
+    CARD_NUM="${GPU_CARD//[!0-9]/}"
+    RENDER_NUM=$((128 + CARD_NUM))
+    RENDER_DEV="/dev/dri/renderD${RENDER_NUM}"
+fi
+
+log_tune() {
+    echo -e "${YELLOW}[TUNE]${NC} $*"
+}
+
+stop_container() {
+    docker rm -f "${CONTAINER_NAME}" >/dev/null 2>&1 || true
+}
+
+PROCESS_OPTIMIZER="$(cd "$(dirname "$0")/../../../utils" && pwd)/process_optimizer.py"
+
+# Settings a process sweep is valid for (tags of process_sweep.json, matched by -T)
+sweep_tags() {
+    echo "device=${DEVICE}"
+    echo "batch=${BATCH_SIZE}"
+    echo "precision=$([ "${USE_INT8}" = true ] && echo "int8" || echo "fp32")"
+    echo "ai=${ENABLE_AI}"
+    [[ "${ENABLE_AI}" == true ]] && echo "model=${MODEL_PATH}"
+    echo "video=${VIDEO_FILE}"
+}
+
+# Newest process sweep of the current settings in the working directory (PROCESS_MAP overrides)
+find_process_map() {
+    if [[ -n "${PROCESS_MAP}" ]]; then
+        echo "${PROCESS_MAP}"
+        return 0
+    fi
+    local maps=( ./process_sweep_*/process_sweep.json )
+    [[ -f "${maps[0]}" ]] && command -v python3 >/dev/null 2>&1 || return 1
+    local match=() tag
+    while read -r tag; do
+        match+=(--match "${tag}")
+    done < <(sweep_tags)
+    python3 "${PROCESS_OPTIMIZER}" select "${match[@]}" "${maps[@]}"
+}
+
+# Process count for a stream count: from the process map of run_auto_tune, else about 8 streams per process
+processes_for() {
+    if [[ -n "${process_map}" ]] && python3 "${PROCESS_OPTIMIZER}" lookup "${process_map}" "$1" 2>/dev/null; then
+        return 0
+    fi
+    echo $(( ($1 + 7) / 8 ))
+}
+
+# Process sweep (-P-sweep, -n-sweep): utils/process_optimizer.py probes (streams, processes)
+# points in one warm container, skips process counts that are dominated and stream counts past
+# the first one below the threshold, and writes the best process count per stream count to
+# process_sweep.json, which -T picks up when it runs with the same settings.
+run_process_sweep() {
+    local precision=$([ "${USE_INT8}" = true ] && echo "int8" || echo "fp32")
+    local streams="${STREAM_SWEEP:-${NUM_STREAMS}}"
+    streams="${streams// /}"
+    local sweep_dir="./process_sweep_${streams//,/-}streams_bs${BATCH_SIZE}_${precision}_$(date +%Y%m%d_%H%M%S)"
+    local optimizer_args=(
+        sweep
+        --container "${CONTAINER_NAME}"
+        --pipeline "${PIPELINE}"
+        --threshold "${TUNE_THRESHOLD}"
+        --streams "${streams}"
+        --processes "${PROCESS_SWEEP// /}"
+        --duration "${DURATION}"
+        --log-dir "${sweep_dir}"
+        --output "${sweep_dir}/process_sweep.json"
+        --report "${sweep_dir}/sweep_summary.txt"
+    )
+    # Full-length probes unless -E
+    [[ "${EARLY_STOP}" == true ]] || optimizer_args+=(--min-seconds "${DURATION}")
+    [[ "${SWEEP_SEARCH:-climb}" == "grid" ]] && optimizer_args+=(--grid)
+    local tag
+    while read -r tag; do
+        optimizer_args+=(--tag "${tag}")
+    done < <(sweep_tags)
+
     echo -e "${GREEN}========================================${NC}"
     echo -e "${GREEN}Process Sweep Mode${NC}"
     echo -e "${GREEN}========================================${NC}"
-    echo "Testing process counts: ${PROCESS_SWEEP}"
-    echo "Streams: ${NUM_STREAMS}"
+    echo "Stream counts: ${streams}"
+    echo "Process counts: ${PROCESS_SWEEP}"
     echo "Device: ${DEVICE}"
     echo "Batch Size: ${BATCH_SIZE}"
-    echo "Duration: ${DURATION}s"
-    echo "Model Precision: $([ "${USE_INT8}" = true ] && echo "INT8" || echo "FP32")"
+    echo "Model Precision: ${precision}"
+    echo "FPS threshold: ${TUNE_THRESHOLD}"
+    echo "Duration: up to ${DURATION}s per probe"
     echo ""
-    
-    # Parse process counts
-    IFS=',' read -ra PROCESS_COUNTS <<< "${PROCESS_SWEEP}"
-    
-    # Create sweep results directory
-    SWEEP_TIMESTAMP=$(date +%Y%m%d_%H%M%S)
-    SWEEP_PRECISION=$([ "${USE_INT8}" = true ] && echo "int8" || echo "fp32")
-    SWEEP_DIR="./process_sweep_${NUM_STREAMS}streams_bs${BATCH_SIZE}_${SWEEP_PRECISION}_${SWEEP_TIMESTAMP}"
-    mkdir -p "${SWEEP_DIR}"
-    
-    SWEEP_SUMMARY="${SWEEP_DIR}/sweep_summary.txt"
-    
-    # Write sweep header
-    {
-        echo "======================================"
-        echo "Process Sweep Test Summary"
-        echo "======================================"
-        echo "Timestamp: ${SWEEP_TIMESTAMP}"
-        echo "Total Streams: ${NUM_STREAMS}"
-        echo "Device: ${DEVICE}"
-        echo "Batch Size: ${BATCH_SIZE}"
-        echo "Duration: ${DURATION}s per test"
-        echo "Model Precision: ${SWEEP_PRECISION}"
-        echo "Process Counts Tested: ${PROCESS_SWEEP}"
-        echo ""
-        echo "======================================"
-        echo "Individual Test Results"
-        echo "======================================"
-        echo ""
-    } > "${SWEEP_SUMMARY}"
-    
-    declare -a SWEEP_RESULTS
-    
-    # Run tests for each process count
-    for proc_count in "${PROCESS_COUNTS[@]}"; do
-        # Trim whitespace
-        proc_count=$(echo "${proc_count}" | xargs)
-        
-        if [[ ! "${proc_count}" =~ ^[0-9]+$ ]] || [[ ${proc_count} -lt 1 ]]; then
-            echo -e "${RED}[ERROR]${NC} Invalid process count: ${proc_count}"
-            continue
-        fi
-        
-        echo -e "${YELLOW}[SWEEP]${NC} Testing with ${proc_count} process(es)..."
-        echo ""
-        
-        # Build command arguments (exclude -P-sweep to avoid recursion)
-        TEST_ARGS="-n ${NUM_STREAMS} -P ${proc_count} -d ${DEVICE} -b ${BATCH_SIZE} -i ${DURATION}"
-        [[ "${ENABLE_AI}" == true ]] && TEST_ARGS="${TEST_ARGS} -a"
-        [[ "${USE_INT8}" == true ]] && TEST_ARGS="${TEST_ARGS} -int8"
-        [[ -n "${VIDEO_FILE}" ]] && TEST_ARGS="${TEST_ARGS} -v ${VIDEO_FILE}"
-        [[ -n "${MODEL_OVERRIDE}" ]] && TEST_ARGS="${TEST_ARGS} -m ${MODEL_OVERRIDE}"
-        [[ -n "${PYTHON_MODULE}" ]] && TEST_ARGS="${TEST_ARGS} -p ${PYTHON_MODULE}"
-        [[ -n "${MQTT_ADDRESS}" ]] && TEST_ARGS="${TEST_ARGS} -q ${MQTT_ADDRESS}"
-        
-        # Run the test (call script recursively without -P-sweep)
-        if bash "$0" ${TEST_ARGS} 2>&1 | tee "${SWEEP_DIR}/test_${proc_count}proc.log"; then
-            # Extract throughput per stream from the last line of output
-            RESULT_FPS=$(tail -n 1 "${SWEEP_DIR}/test_${proc_count}proc.log")
-            
-            if [[ "${RESULT_FPS}" =~ ^[0-9]+([.][0-9]+)?$ ]]; then
-                TOTAL_FPS=$(LC_ALL=C awk -v fps="${RESULT_FPS}" -v streams="${NUM_STREAMS}" \
-                    'BEGIN { printf("%.2f", fps * streams) }')
-                
-                SWEEP_RESULTS+=("${proc_count}:${RESULT_FPS}:${TOTAL_FPS}")
-                
-                echo ""
-                echo -e "${GREEN}[SWEEP]${NC} Result: ${proc_count} proc -> ${RESULT_FPS} fps/stream (Total: ${TOTAL_FPS} fps)"
-                
-                # Append to summary
-                {
-                    echo "Process Count: ${proc_count}"
-                    echo "  FPS per Stream: ${RESULT_FPS}"
-                    echo "  Total Throughput: ${TOTAL_FPS} fps"
-                    echo ""
-                } >> "${SWEEP_SUMMARY}"
-            else
-                echo -e "${RED}[SWEEP]${NC} Failed to get valid result for ${proc_count} process(es)"
-                {
-                    echo "Process Count: ${proc_count}"
-                    echo "  Status: FAILED"
-                    echo ""
-                } >> "${SWEEP_SUMMARY}"
-            fi
-        else
-            echo -e "${RED}[SWEEP]${NC} Test failed for ${proc_count} process(es)"
-            {
-                echo "Process Count: ${proc_count}"
-                echo "  Status: ERROR"
-                echo ""
-            } >> "${SWEEP_SUMMARY}"
-        fi
-        
-        echo ""
-        echo -e "${YELLOW}[SWEEP]${NC} Waiting 5 seconds before next test..."
-        sleep 5
-    done
-    
-    # Write comparison summary
-    {
-        echo "======================================"
-        echo "Comparison Summary"
-        echo "======================================"
-        printf "%-12s %-18s %-18s\n" "Processes" "FPS/Stream" "Total FPS"
-        echo "--------------------------------------"
-    } >> "${SWEEP_SUMMARY}"
-    
-    # Find best result
-    BEST_FPS=0
-    BEST_PROC=0
-    
-    for result in "${SWEEP_RESULTS[@]}"; do
-        IFS=':' read -r proc fps total <<< "${result}"
-        printf "%-12s %-18s %-18s\n" "${proc}" "${fps}" "${total}" >> "${SWEEP_SUMMARY}"
-        
-        # Check if this is the best
-        IS_BEST=$(LC_ALL=C awk -v total="${total}" -v best="${BEST_FPS}" \
-            'BEGIN { print (total > best) ? 1 : 0 }')
-        if [[ ${IS_BEST} -eq 1 ]]; then
-            BEST_FPS="${total}"
-            BEST_PROC="${proc}"
-        fi
-    done
-    
-    {
-        echo ""
-        echo "Best Configuration:"
-        echo "  Process Count: ${BEST_PROC}"
-        echo "  Total Throughput: ${BEST_FPS} fps"
-        echo ""
-        echo "Results saved to: ${SWEEP_DIR}"
-        echo ""
-    } >> "${SWEEP_SUMMARY}"
-    
-    # Display summary
+
+    mkdir -p "${sweep_dir}"
+    cleanup_existing_benchmark_containers
+    if [[ "${ENABLE_AI}" == true ]]; then
+        ensure_mqtt_broker
+    fi
+    echo -e "${YELLOW}[SWEEP]${NC} Starting warm container ${CONTAINER_NAME} for all probes..."
+    start_container
+    trap stop_container EXIT
+    trap 'stop_container; exit 130' INT TERM
+
+    local status=0
+    python3 "${PROCESS_OPTIMIZER}" "${optimizer_args[@]}" >/dev/null || status=$?
+
+    stop_container
+    trap - EXIT INT TERM
+
     echo ""
     echo -e "${GREEN}========================================${NC}"
     echo -e "${GREEN}Process Sweep Complete${NC}"
     echo -e "${GREEN}========================================${NC}"
-    cat "${SWEEP_SUMMARY}"
-    
-    exit 0
-fi
+    echo "Results saved to: ${sweep_dir}"
+    echo "Process map (used by -T with the same settings): ${sweep_dir}/process_sweep.json"
+    echo ""
+    exit ${status}
+}
 
-# Auto-tune mode function
-run_auto_tune() {
+# Binary-search tuning: stream_density_tuner.py brackets exponentially from -n,
+# bisects, and stops each probe early once the per-stream FPS is clearly above
+# or below the threshold. All probes share one warm container.
+# Sets max_streams, max_streams_fps, max_streams_total and probes of run_auto_tune.
+tune_bisect() {
+    local tuner="$1"
+    local tune_precision=$([ "${USE_INT8}" = true ] && echo "int8" || echo "fp32")
+    local tune_dir="./benchmark_tune_bs${BATCH_SIZE}_${tune_precision}_$(date +%Y%m%d_%H%M%S)"
+    local tuner_args=(
+        --container "${CONTAINER_NAME}"
+        --pipeline "${PIPELINE}"
+        --threshold "${TUNE_THRESHOLD}"
+        --start "${NUM_STREAMS}"
+        --max-streams 200
+        --duration "${test_duration}"
+        --log-dir "${tune_dir}"
+    )
+    if [[ -n "${process_map}" ]]; then
+        tuner_args+=(--process-map "${process_map}")
+    else
+        tuner_args+=(--streams-per-process 8)
+    fi
+
+    cleanup_existing_benchmark_containers
+    if [[ "${ENABLE_AI}" == true ]]; then
+        ensure_mqtt_broker
+    fi
+    log_tune "Starting warm container ${CONTAINER_NAME} for all probes..."
+    start_container
+    trap stop_container EXIT
+    trap 'stop_container; exit 130' INT TERM
+
+    local result
+    result=$(python3 "${tuner}" "${tuner_args[@]}") || true
+
+    stop_container
+    trap - EXIT INT TERM
+
+    read -r max_streams max_streams_fps max_streams_total probes _ <<< "${result}"
+    [[ "${max_streams}" =~ ^[0-9]+$ ]] || max_streams=0
+    echo -e "${YELLOW}[TUNE]${NC} Probe logs: ${tune_dir}"
+}
+
+# Step search (TUNE_SEARCH=legacy): +10 streams per pass, then +2 after the
+# first failure, re-running the whole script for every probe
+tune_step_search() {
     local current_streams=$NUM_STREAMS
-    local max_streams=0
-    local max_streams_fps=0
     local step_size=10
-    local test_duration=$TUNE_SHORT_DURATION
-    
-    echo -e "${GREEN}========================================${NC}"
-    echo -e "${GREEN}Auto-Tune Mode: Finding Maximum Streams${NC}"
-    echo -e "${GREEN}========================================${NC}"
-    echo "Starting streams: ${current_streams}"
-    echo "FPS threshold: ${TUNE_THRESHOLD}"
-    echo "Test duration: ${test_duration}s per iteration"
-    echo "Device: ${DEVICE}"
-    echo ""
     
     while true; do
-        # Calculate processes for current streams (about 8 streams per process)
-        local processes=$(( (current_streams + 7) / 8 ))
+        probes=$((probes + 1))
+
+        # Processes for current streams (process map, or about 8 streams per process)
+        local processes=$(processes_for "${current_streams}")
         
         echo -e "${YELLOW}[TUNE]${NC} Testing ${current_streams} streams with ${processes} processes..."
         
@@ -448,6 +627,7 @@ run_auto_tune() {
             bash "$0" -v "$VIDEO_FILE" -m "$MODEL_PATH" -n $current_streams -P $processes \
             -d "$DEVICE" -b "$BATCH_SIZE" -i $test_duration -t "$TARGET_FPS" \
             $([ "$ENABLE_AI" = true ] && echo "-a") \
+            $([ "$MODEL_CACHE" = true ] && echo "-C") \
             $([ -n "$PYTHON_MODULE" ] && echo "-p $PYTHON_MODULE") \
             $([ -n "$MQTT_ADDRESS" ] && echo "-q $MQTT_ADDRESS") \
             2>/dev/null | tail -1)
@@ -489,6 +669,46 @@ run_auto_tune() {
         
         echo ""
     done
+    max_streams_total=$(LC_ALL=C awk -v s="$max_streams" -v f="$max_streams_fps" 'BEGIN { printf("%.2f", s * f) }')
+}
+
+# Auto-tune mode function
+run_auto_tune() {
+    local max_streams=0
+    local max_streams_fps=0
+    local max_streams_total=0
+    local probes=0
+    local test_duration=$TUNE_SHORT_DURATION
+    local process_map=""
+    local tuner="$(cd "$(dirname "$0")/../../../utils" && pwd)/stream_density_tuner.py"
+    local search="bisect"
+    if [[ "${TUNE_SEARCH:-bisect}" == "legacy" ]] || ! command -v python3 >/dev/null 2>&1 || [[ ! -f "${tuner}" ]]; then
+        search="legacy"
+    fi
+    
+    echo -e "${GREEN}========================================${NC}"
+    echo -e "${GREEN}Auto-Tune Mode: Finding Maximum Streams${NC}"
+    echo -e "${GREEN}========================================${NC}"
+    echo "Starting streams: ${NUM_STREAMS}"
+    if [[ "${search}" == "bisect" ]]; then
+        echo "Search: exponential bracket + bisection (early-stopping probes)"
+    fi
+    if process_map=$(find_process_map 2>/dev/null); then
+        echo "Process counts: ${process_map}"
+    else
+        process_map=""
+        echo "Process counts: about 8 streams per process"
+    fi
+    echo "FPS threshold: ${TUNE_THRESHOLD}"
+    echo "Test duration: ${test_duration}s per iteration"
+    echo "Device: ${DEVICE}"
+    echo ""
+    
+    if [[ "${search}" == "legacy" ]]; then
+        tune_step_search
+    else
+        tune_bisect "${tuner}"
+    fi
     
     echo ""
     echo -e "${GREEN}========================================${NC}"
@@ -496,16 +716,22 @@ run_auto_tune() {
     echo -e "${GREEN}========================================${NC}"
     echo "Maximum Streams: ${max_streams}"
     echo "FPS per Stream: ${max_streams_fps}"
-    echo "Total Throughput: $(LC_ALL=C awk -v s="$max_streams" -v f="$max_streams_fps" 'BEGIN { printf("%.2f", s * f) }') fps"
+    echo "Total Throughput: ${max_streams_total} fps"
     echo "FPS Threshold: ${TUNE_THRESHOLD}"
+    echo "Probes: ${probes}"
     echo ""
     echo "To verify with full duration test:"
-    echo "  $0 -v \"$VIDEO_FILE\" -n ${max_streams} -P $(( (max_streams + 7) / 8 )) -d \"$DEVICE\" -b ${BATCH_SIZE} -i 120 $([ "$ENABLE_AI" = true ] && echo "-a -m \"$MODEL_PATH\"")"
+    echo "  $0 -v \"$VIDEO_FILE\" -n ${max_streams} -P $(processes_for "${max_streams}") -d \"$DEVICE\" -b ${BATCH_SIZE} -i 120 $([ "$ENABLE_AI" = true ] && echo "-a -m \"$MODEL_PATH\"")"
     echo ""
     
     exit 0
 }
 
+# Check if process sweep mode is enabled
+if [[ -n "${PROCESS_SWEEP}" ]]; then
+    run_process_sweep
+fi
+
 # Check if auto-tune mode is enabled
 if [[ "${AUTO_TUNE}" == true ]]; then
     run_auto_tune
@@ -553,31 +779,14 @@ if [[ "${ENABLE_AI}" == true ]]; then
     echo "Model: ${MODEL_PATH}"
     echo "Python Module: ${PYTHON_MODULE}"
     echo "MQTT: ${MQTT_ADDRESS}"
+    if [[ -n "${CACHE_KEY}" ]]; then
+        MODEL_CACHE_STATE=$(python3 "${MOUNT_DIR}/utils/model_cache.py" check "${MODEL_CACHE_ROOT}" "${CACHE_KEY}") || MODEL_CACHE_STATE="NA"
+        echo "Model Cache: ${MODEL_CACHE_STATE}"
+    fi
 fi
 echo "Results: ${RESULTS_DIR}"
 echo ""
 
-# Detect GPU card and render device
-if [[ -z "${GPU_CARD}" ]]; then
-    # Auto-detect based on device parameter
-    if [[ "${DEVICE}" == "GPU.0" ]]; then
-        CARD_DEV="/dev/dri/card1"
-        RENDER_DEV="/dev/dri/renderD128"
-    elif [[ "${DEVICE}" == "GPU.1" ]]; then
-        CARD_DEV="/dev/dri/card1"
-        RENDER_DEV="/dev/dri/renderD129"
-    else
-        CARD_DEV="/dev/dri/card0"
-        RENDER_DEV="/dev/dri/renderD128"
-    fi
-else
-    CARD_DEV="/dev/dri/${GPU_CARD}"
-    # Calculate render device based on card number
-    CARD_NUM="${GPU_CARD//[!0-9]/}"
-    RENDER_NUM=$((128 + CARD_NUM))
-    RENDER_DEV="/dev/dri/renderD${RENDER_NUM}"
-fi
-
 echo "GPU Card: ${CARD_DEV}"
 echo "Render Device: ${RENDER_DEV}"
 echo ""
@@ -604,46 +813,7 @@ trap cleanup EXIT INT TERM
 
 # Start container
 echo -e "${YELLOW}[INFO]${NC} Creating container: ${CONTAINER_NAME}"
-docker run -d \
-    --name "${CONTAINER_NAME}" \
-    --device="${CARD_DEV}" \
-    --device="${RENDER_DEV}" \
-    --net=host \
-    -v "${MOUNT_DIR}":/home/dlstreamer/work \
-    -e PYTHONPATH="/opt/intel/dlstreamer/gstreamer/lib/python3/dist-packages:/opt/intel/dlstreamer/python" \
-    -u root \
-    "${IMAGE}" tail -f /dev/null >/dev/null
-
-echo -e "${YELLOW}[INFO]${NC} Container created successfully"
-
-# Copy add_data.py if it exists and AI is enabled
-if [[ "${ENABLE_AI}" == true ]]; then
-    # Check if Python module is already accessible via mounted volume
-    if [[ "${PYTHON_MODULE}" == /home/dlstreamer/work/* ]]; then
-        echo -e "${GREEN}[INFO]${NC} Python module accessible via mounted volume: ${PYTHON_MODULE}"
-    else
-        # Need to copy the file to container
-        SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
-        LOCAL_PYTHON_FILE="${SCRIPT_DIR}/add_data.py"
-        
-        if [[ -f "${LOCAL_PYTHON_FILE}" ]]; then
-            echo -e "${YELLOW}[INFO]${NC} Copying Python module to container..."
-            docker cp "${LOCAL_PYTHON_FILE}" "${CONTAINER_NAME}:${PYTHON_MODULE}" >/dev/null 2>&1
-            
-            if [[ $? -eq 0 ]]; then
-                echo -e "${GREEN}[INFO]${NC} Python module copied to ${PYTHON_MODULE}"
-            else
-                echo -e "${RED}[ERROR]${NC} Failed to copy Python module"
-                echo -e "${RED}[ERROR]${NC} Python module is required for AI pipeline"
-                exit 1
-            fi
-        else
-            echo -e "${RED}[ERROR]${NC} add_data.py not found at ${LOCAL_PYTHON_FILE}"
-            echo -e "${RED}[ERROR]${NC} Python module is required for AI pipeline"
-            exit 1
-        fi
-    fi
-fi
+start_container
 
 echo ""
 
@@ -732,18 +902,6 @@ fi
 
 echo ""
 
-# Build GStreamer pipeline
-# Choose between decode-only or full AI pipeline
-if [[ "${ENABLE_AI}" == true ]]; then
-    # Full AI pipeline with detection, tracking, metadata processing, and MQTT publishing
-    AI_PIPELINE="gvadetect model=${MODEL_PATH} device=${DEVICE} pre-process-backend=vaapi-surface-sharing model-instance-id=inf0 batch-size=${BATCH_SIZE} ! gvatrack tracking-type=zero-term-imageless ! gvametaconvert add-empty-results=true json-indent=-1 timestamp-utc=true timestamp-microseconds=true ! gvapython module=${PYTHON_MODULE} ! queue ! gvametapublish method=mqtt address=${MQTT_ADDRESS} topic=dlstreamer async-handling=true"
-    
-    PIPELINE="multifilesrc location=${VIDEO_FILE} loop=true ! h265parse ! vah265dec ! vapostproc ! \"video/x-raw(memory:VAMemory)\" ! ${AI_PIPELINE} ! gvafpscounter starting-frame=100 ! fakesink sync=false async=false"
-else
-    # Decode-only pipeline for pure throughput testing
-    PIPELINE="multifilesrc location=${VIDEO_FILE} loop=true ! h265parse ! vah265dec ! vapostproc ! \"video/x-raw(memory:VAMemory)\" ! queue ! gvafpscounter starting-frame=100 ! fakesink sync=false async=false"
-fi
-
 # Build complete command with multiple streams
 # Calculate streams per process
 STREAMS_PER_PROCESS=$(( (NUM_STREAMS + NUM_PROCESSES - 1) / NUM_PROCESSES ))
@@ -808,6 +966,10 @@ for proc_id in $(seq 1 "${NUM_PROCESSES}"); do
     sleep 0.5
 done
 
+if [[ "${EARLY_STOP}" == true ]]; then
+    monitor_early_stop
+fi
+
 echo -e "${YELLOW}[INFO]${NC} Waiting for all processes to complete..."
 
 # Wait for all processes to complete
@@ -847,6 +1009,10 @@ if [[ -f "${LOG_FILE}" ]]; then
         
         # First pass: validate all processes ran for sufficient duration
         MIN_DURATION=$(LC_ALL=C awk -v d="${DURATION}" 'BEGIN { printf("%.0f", d * 0.9) }')
+        if [[ -n "${EARLY_STOP_REASON}" ]]; then
+            # Stopped early: processes only had to reach the monitor's decision point
+            MIN_DURATION=$(LC_ALL=C awk -v c="${EARLY_STOP_CLOCK}" 'BEGIN { printf("%d", c) }')
+        fi
         FAILED_PROCESSES=()
         
         for i in "${!PROCESS_LOGS[@]}"; do
@@ -945,6 +1111,10 @@ if [[ -f "${LOG_FILE}" ]]; then
         # Extract runtime from last FpsCounter line
         PROC_RUNTIME=$(grep 'FpsCounter' "${LOG_FILE}" | grep 'average' | tail -n1 | sed -n 's/.*average \([0-9.]*\)sec.*/\1/p')
         MIN_DURATION=$(LC_ALL=C awk -v d="${DURATION}" 'BEGIN { printf("%.0f", d * 0.9) }')
+        if [[ -n "${EARLY_STOP_REASON}" ]]; then
+            # Stopped early: processes only had to reach the monitor's decision point
+            MIN_DURATION=$(LC_ALL=C awk -v c="${EARLY_STOP_CLOCK}" 'BEGIN { printf("%d", c) }')
+        fi
         
         if [[ -z "${PROC_RUNTIME}" ]]; then
             echo -e "${RED}[ERROR]${NC} No FPS data found in log"
@@ -1055,12 +1225,18 @@ if [[ -f "${LOG_FILE}" ]]; then
             echo "Number of Streams: ${NUM_STREAMS}"
             echo "Number of Processes: ${NUM_PROCESSES}"
             echo "Duration: ${DURATION}s"
+            if [[ -n "${EARLY_STOP_REASON}" ]]; then
+                echo "Early Stop: ${EARLY_STOP_REASON} after ${EARLY_STOP_CLOCK}s of averaging"
+            fi
             echo "Batch Size: ${BATCH_SIZE}"
             echo "Target FPS: ${TARGET_FPS}"
             echo "Video File: ${VIDEO_FILE}"
             echo "AI Enabled: ${ENABLE_AI}"
             if [[ "${ENABLE_AI}" == true ]]; then
                 echo "Model Path: ${MODEL_PATH}"
+                if [[ -n "${MODEL_CACHE_STATE}" ]]; then
+                    echo "Model Cache: ${MODEL_CACHE_STATE}"
+                fi
                 if [[ -n "${PYTHON_MODULE}" ]]; then
                     echo "Python Module: ${PYTHON_MODULE}"
                     echo "MQTT Address: ${MQTT_ADDRESS}"
@@ -1073,6 +1249,7 @@ if [[ -f "${LOG_FILE}" ]]; then
             echo "Throughput per Stream: ${THROUGHPUT_PER_STREAM} fps/stream"
             echo "Theoretical Stream Density: ${THEORETICAL_STREAMS}"
             echo ""
+            stream_fps_summary
             
             # Add latency information to summary if available
             if [[ "${ENABLE_AI}" == true && -n "${AI_AVG}" ]]; then
@@ -1154,6 +1331,8 @@ if [[ -f "${LOG_FILE}" ]]; then
             fi
         fi
         
+        record_results
+        
         echo ""
         echo -e "${GREEN}[SUCCESS]${NC} Results saved to: ${RESULTS_DIR}"
         
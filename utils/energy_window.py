@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: (C) 2024 - 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Energy Accounting over the FPS Measurement Window
+Usage: python3 energy_window.py <power_series_csv> <pipeline_log> [<pipeline_log> ...] --streams N
+
+gvafpscounter only starts averaging once `starting-frame` is reached, and its
+last "FpsCounter(average Xsec): total=F fps" line covers the X seconds before
+the log stopped growing. This script rebuilds that window for every log,
+integrates the timestamped power series written by package_power.py --csv over
+it, and prints one whitespace-separated line for the benchmark driver:
+
+  <energy J> <window s> <avg power W> <frames> <J/frame> <J/stream-hour>
+
+Fields that cannot be computed are printed as NA. A series that covers only part
+of the window yields the average power of the samples inside it, with the
+energy fields NA.
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+
+FPS_AVERAGE_PATTERN = re.compile(r'FpsCounter.*average\s+([0-9.]+)\s*sec.*?total=([0-9.]+)')
+
+# The power series has to span the FPS window for energy to be reported;
+# it is not extrapolated over gaps (tolerance for rounding)
+MIN_COVERAGE = 0.99
+
+
+def fps_window(log_file):
+    """Return (start, end, frames) of the final gvafpscounter average, or None."""
+    last = None
+    try:
+        with open(log_file, 'r', errors='replace') as f:
+            for line in f:
+                match = FPS_AVERAGE_PATTERN.search(line)
+                if match:
+                    last = match
+        end = os.path.getmtime(log_file)
+    except OSError:
+        return None
+    if last is None:
+        return None
+    seconds, fps = float(last.group(1)), float(last.group(2))
+    if seconds <= 0:
+        return None
+    return end - seconds, end, fps * seconds
+
+
+def read_power_series(csv_file):
+    """Return [(start, end, total power W)] intervals from a package_power.py CSV."""
+    intervals = []
+    previous_elapsed = 0.0
+    with open(csv_file, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            try:
+                end = float(row['Timestamp (s)'])
+                elapsed = float(row['Elapsed (s)'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            span = elapsed - previous_elapsed
+            previous_elapsed = elapsed
+            power = row.get('Total Power (W)')
+            if not power or span <= 0:
+                continue
+            intervals.append((end - span, end, float(power)))
+    return intervals
+
+
+def integrate(intervals, start, end):
+    """Energy (J) and covered seconds of the power series within [start, end]."""
+    energy = covered = 0.0
+    for seg_start, seg_end, power in intervals:
+        overlap = min(seg_end, end) - max(seg_start, start)
+        if overlap > 0:
+            energy += power * overlap
+            covered += overlap
+    return energy, covered
+
+
+def account(power_csv, logs, streams):
+    windows = [w for w in (fps_window(log) for log in logs) if w is not None]
+    if not windows:
+        return None
+    # Concurrent parts are summed: frames add up, the window spans all parts
+    start = min(w[0] for w in windows)
+    end = max(w[1] for w in windows)
+    frames = sum(w[2] for w in windows)
+    window = end - start
+
+    try:
+        intervals = read_power_series(power_csv)
+    except OSError:
+        return None
+    energy, covered = integrate(intervals, start, end)
+    if window <= 0 or covered <= 0:
+        return None
+
+    avg_power = energy / covered
+    if covered < window * MIN_COVERAGE:
+        return {
+            'energy_j': None,
+            'window_s': window,
+            'avg_power_w': avg_power,
+            'frames': frames,
+            'j_per_frame': None,
+            'j_per_stream_hour': None,
+        }
+    return {
+        'energy_j': energy,
+        'window_s': window,
+        'avg_power_w': avg_power,
+        'frames': frames,
+        'j_per_frame': energy / frames if frames > 0 else None,
+        'j_per_stream_hour': avg_power * 3600 / streams if streams > 0 else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Integrate power over the gvafpscounter averaging window")
+    parser.add_argument('power_csv', help="Timestamped power series from package_power.py --csv")
+    parser.add_argument('logs', nargs='+', help="Pipeline log(s) containing FpsCounter output")
+    parser.add_argument('--streams', type=int, required=True, help="Number of streams in the run")
+    args = parser.parse_args()
+
+    result = account(args.power_csv, args.logs, args.streams)
+    if result is None:
+        print("NA NA NA NA NA NA")
+        return 1
+
+    def fmt(value, digits):
+        return 'NA' if value is None else f"{value:.{digits}f}"
+
+    print(' '.join([
+        fmt(result['energy_j'], 2),
+        fmt(result['window_s'], 2),
+        fmt(result['avg_power_w'], 2),
+        fmt(result['frames'], 0),
+        fmt(result['j_per_frame'], 4),
+        fmt(result['j_per_stream_hour'], 0),
+    ]))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
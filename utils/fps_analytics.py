@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: (C) 2024 - 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Per-Stream FPS Analytics for gvafpscounter Logs
+Usage: python3 fps_analytics.py [--target FPS] [--summary] [--json FILE] [--series-csv FILE] <log> [<log> ...]
+
+The drivers only keep `total=` of the last "average" line, so one starved
+stream hides behind a healthy total. This parses every FpsCounter line of
+every log (one log per gst-launch process) into a per-stream time series:
+
+  FpsCounter(last 1.00sec): total=119.6 fps, number-streams=4, per-stream=29.9 fps (30.1, 29.8, 29.9, 29.8)
+  FpsCounter(average 20.00sec): total=119.8 fps, number-streams=4, per-stream=29.95 fps (30.0, 29.9, 30.0, 29.9)
+
+Only intervals after the first "average" line (i.e. after starting-frame)
+are used. Each stream's FPS is the one of the final average line, or the
+time-weighted mean of its "last" intervals when no list is printed.
+
+Reported over all streams: min / p5 / median / p95 FPS, the streams running
+below STARVATION_RATIO of the median (starved), and with --target the time
+each stream spent below target.
+
+Default output is one whitespace-separated line for the benchmark drivers:
+  <min> <p5> <median> <p95> <starved streams> <max s below target>
+--summary prints a block for summary.txt instead. Unavailable fields are NA.
+"""
+
+import argparse
+import json
+import sys
+
+from fps_monitor import parse_fps_line
+
+# A stream running below this share of the median stream is flagged as starved
+STARVATION_RATIO = 0.8
+
+
+def percentile(sorted_values, q):
+    """Linear-interpolated percentile (q in 0..100) of an already sorted list."""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def read_log(path, log_index):
+    """Return the streams of one log: [{'id', 'samples': [(elapsed, interval, fps)], 'fps'}]."""
+    samples = {}
+    final = None
+    elapsed = 0.0
+    averaging = False
+    try:
+        with open(path, 'r', errors='replace') as f:
+            for line in f:
+                reading = parse_fps_line(line)
+                if reading is None:
+                    continue
+                if reading['kind'] == 'average':
+                    averaging = True
+                    final = reading
+                    continue
+                if not averaging:
+                    continue  # still before starting-frame
+                values = reading['stream_fps']
+                if not values and reading['per_stream'] is not None and reading['streams']:
+                    values = [reading['per_stream']] * reading['streams']
+                elapsed += reading['seconds']
+                for index, fps in enumerate(values):
+                    samples.setdefault(index, []).append((elapsed, reading['seconds'], fps))
+    except OSError:
+        return []
+    if final is None:
+        return []
+
+    final_values = final['stream_fps']
+    count = final['streams'] or len(final_values) or len(samples)
+    streams = []
+    for index in range(count):
+        series = samples.get(index, [])
+        if len(final_values) == count:
+            fps = final_values[index]
+        elif series:
+            fps = sum(interval * value for _, interval, value in series) / sum(interval for _, interval, _ in series)
+        elif final['per_stream'] is not None:
+            fps = final['per_stream']
+        else:
+            fps = final['total'] / count
+        streams.append({'id': f"log{log_index + 1}#{index + 1}", 'samples': series, 'fps': fps})
+    return streams
+
+
+def analyze(logs, target=None, starvation_ratio=STARVATION_RATIO):
+    streams = []
+    for log_index, path in enumerate(logs):
+        streams.extend(read_log(path, log_index))
+    if not streams:
+        return None
+
+    values = sorted(stream['fps'] for stream in streams)
+    median = percentile(values, 50)
+    worst = min(streams, key=lambda s: s['fps'])
+    starved = [s['id'] for s in streams if s['fps'] < starvation_ratio * median]
+
+    result = {
+        'streams': len(streams),
+        'min': values[0],
+        'p5': percentile(values, 5),
+        'median': median,
+        'p95': percentile(values, 95),
+        'max': values[-1],
+        'worst_stream': worst['id'],
+        'starvation_ratio': starvation_ratio,
+        'starved': starved,
+        'target': target,
+        'window_s': max((s['samples'][-1][0] for s in streams if s['samples']), default=None),
+        'below_target_s': None,
+        'max_below_target_s': None,
+        'max_below_target_stream': None,
+        'per_stream': {s['id']: round(s['fps'], 2) for s in streams},
+    }
+    if target is not None and any(s['samples'] for s in streams):
+        below = {s['id']: sum(interval for _, interval, fps in s['samples'] if fps < target) for s in streams}
+        longest = max(below, key=below.get)
+        result['below_target_s'] = {sid: round(seconds, 2) for sid, seconds in below.items()}
+        result['max_below_target_s'] = below[longest]
+        result['max_below_target_stream'] = longest
+    return result
+
+
+def write_series_csv(path, logs):
+    with open(path, 'w') as out:
+        out.write('Log,Stream,Elapsed (s),FPS\n')
+        for log_index, log in enumerate(logs):
+            for stream in read_log(log, log_index):
+                for elapsed, _, fps in stream['samples']:
+                    out.write(f"{log},{stream['id']},{elapsed:.2f},{fps:.2f}\n")
+
+
+def fmt(value, digits=2):
+    return 'NA' if value is None else f"{value:.{digits}f}"
+
+
+def print_summary(result):
+    print("Per-Stream FPS:")
+    print("--------------------------------------")
+    if result is None:
+        print("No per-stream FPS data found")
+        return
+    print(f"Streams Analyzed: {result['streams']}")
+    print(f"Min / P5 / Median / P95: {fmt(result['min'])} / {fmt(result['p5'])} / "
+          f"{fmt(result['median'])} / {fmt(result['p95'])} fps")
+    print(f"Worst Stream: {result['worst_stream']} ({fmt(result['min'])} fps)")
+    print(f"Starved Streams: {len(result['starved'])} (below {result['starvation_ratio']:.0%} of the median)"
+          + (f": {', '.join(result['starved'])}" if result['starved'] else ""))
+    if result['max_below_target_s'] is not None:
+        window = result['window_s'] or 0
+        share = f" ({result['max_below_target_s'] / window:.0%} of {window:.0f}s)" if window else ""
+        print(f"Max Time Below Target ({result['target']:g} fps): {result['max_below_target_s']:.1f}s{share} "
+              f"in {result['max_below_target_stream']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stream FPS statistics from gvafpscounter logs")
+    parser.add_argument('logs', nargs='+', help="Pipeline log(s), one per gst-launch process")
+    parser.add_argument('--target', type=float, help="Per-stream FPS target for the time-below-target figures")
+    parser.add_argument('--starvation-ratio', type=float, default=STARVATION_RATIO,
+                        help=f"Share of the median FPS below which a stream is starved (default: {STARVATION_RATIO})")
+    parser.add_argument('--summary', action='store_true', help="Print a summary.txt block instead of the driver line")
+    parser.add_argument('--json', help="Write the full analysis to this JSON file")
+    parser.add_argument('--series-csv', help="Write the per-stream FPS time series to this CSV")
+    args = parser.parse_args()
+
+    result = analyze(args.logs, args.target, args.starvation_ratio)
+    if args.json and result is not None:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+    if args.series_csv and result is not None:
+        write_series_csv(args.series_csv, args.logs)
+
+    if args.summary:
+        print_summary(result)
+    elif result is None:
+        print("NA NA NA NA NA NA")
+    else:
+        print(' '.join([
+            fmt(result['min']),
+            fmt(result['p5']),
+            fmt(result['median']),
+            fmt(result['p95']),
+            str(len(result['starved'])),
+            fmt(result['max_below_target_s'], 1),
+        ]))
+    return 0 if result is not None else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
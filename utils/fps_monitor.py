@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: (C) 2024 - 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Live FPS Monitor with Early Termination
+Usage: python3 fps_monitor.py --streams N [options] <log> [<log> ...]
+       python3 fps_monitor.py --streams N --replay <recorded log> [--speed X] [options]
+
+Follows the gvafpscounter output of one or more growing pipeline logs and
+tracks the total and per-stream FPS of the run while it is in progress:
+
+  FpsCounter(last 1.00sec): total=120.00 fps, number-streams=4, per-stream=30.00 fps (...)
+  FpsCounter(average 12.00sec): total=119.80 fps, number-streams=4, per-stream=29.95 fps (...)
+
+The run is declared finished as soon as either
+  - converged: the running average total FPS moved less than --tolerance
+    (relative) over the last --window seconds, or
+  - below target: with --target, every per-stream reading of the last
+    --window seconds is more than --margin below the target.
+Both need at least --min-seconds of averaging. Decisions use the pipeline
+clock of the "average" lines, so a recorded log replayed with --speed gives
+the same verdict as the live run.
+
+The monitor only decides; the calling driver stops the pipelines. Without a
+decision it returns once every --pid has exited (or after --max-seconds).
+
+Progress is logged on stderr. The last stdout line is machine readable:
+  <verdict> <pipeline s> <wall s> <total fps> <per-stream fps>
+with verdict converged (exit 0), below (exit 3), complete (exit 4), or
+nodata (exit 1).
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+FPS_LINE_PATTERN = re.compile(
+    r'FpsCounter\((last|average)\s+([0-9.]+)\s*sec\):\s*total=([0-9.]+)\s*fps'
+    r'(?:,\s*number-streams=(\d+))?'
+    r'(?:,\s*per-stream=([0-9.]+)\s*fps(?:\s*\(([^)]*)\))?)?')
+
+EXIT_CODES = {'converged': 0, 'nodata': 1, 'below': 3, 'complete': 4}
+
+# Pipeline seconds between two progress lines on stderr
+PROGRESS_EVERY = 10.0
+
+
+def parse_fps_line(line):
+    """Parse one gvafpscounter line into a dict, or None for any other line."""
+    match = FPS_LINE_PATTERN.search(line)
+    if not match:
+        return None
+    kind, seconds, total, streams, per_stream, stream_list = match.groups()
+    stream_fps = []
+    if stream_list:
+        try:
+            stream_fps = [float(value) for value in stream_list.split(',') if value.strip()]
+        except ValueError:
+            stream_fps = []
+    return {
+        'kind': kind,
+        'seconds': float(seconds),
+        'total': float(total),
+        'streams': int(streams) if streams else None,
+        'per_stream': float(per_stream) if per_stream else None,
+        'stream_fps': stream_fps,
+    }
+
+
+class LogFollower:
+    """Incrementally read a log that is still being written and keep its latest FPS readings."""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.partial = ''
+        self.last = None
+        self.average = None
+
+    def poll(self):
+        """Consume new complete lines; returns the number of FPS readings seen."""
+        try:
+            with open(self.path, 'r', errors='replace') as f:
+                f.seek(self.offset)
+                chunk = f.read()
+                self.offset = f.tell()
+        except OSError:
+            return 0
+        if not chunk:
+            return 0
+        lines = (self.partial + chunk).split('\n')
+        self.partial = lines.pop()
+        readings = 0
+        for line in lines:
+            reading = parse_fps_line(line)
+            if reading is None:
+                continue
+            readings += 1
+            if reading['kind'] == 'average':
+                self.average = reading
+            else:
+                self.last = reading
+        return readings
+
+
+class FpsMonitor:
+    """Aggregate the average FPS of several logs and decide when the run can stop."""
+
+    def __init__(self, paths, streams, target=None, tolerance=0.01, window=10.0, min_seconds=20.0, margin=0.1):
+        self.followers = [LogFollower(path) for path in paths]
+        self.streams = streams
+        self.target = target
+        self.tolerance = tolerance
+        self.window = window
+        self.min_seconds = min_seconds
+        self.margin = margin
+        self.history = []   # (pipeline seconds, total average fps), one entry per clock advance
+
+    def poll(self):
+        """Read new output; returns True when the aggregate average advanced."""
+        for follower in self.followers:
+            follower.poll()
+        if any(follower.average is None for follower in self.followers):
+            return False
+        # Concurrent logs: the slowest clock bounds the common averaging window
+        clock = min(follower.average['seconds'] for follower in self.followers)
+        total = sum(follower.average['total'] for follower in self.followers)
+        if self.history and clock <= self.history[-1][0]:
+            return False
+        self.history.append((clock, total))
+        return True
+
+    @property
+    def clock(self):
+        return self.history[-1][0] if self.history else 0.0
+
+    @property
+    def total_fps(self):
+        return self.history[-1][1] if self.history else None
+
+    @property
+    def per_stream_fps(self):
+        total = self.total_fps
+        return total / self.streams if total is not None else None
+
+    def stream_fps(self):
+        """Latest per-stream FPS of every stream across all logs (empty if not printed)."""
+        values = []
+        for follower in self.followers:
+            if follower.average:
+                values.extend(follower.average['stream_fps'])
+        return values
+
+    def _window_values(self):
+        """Totals of the trailing window, or None until the history spans a full window."""
+        clock = self.clock
+        if not self.history or self.history[0][0] > clock - self.window:
+            return None
+        return [total for seconds, total in self.history if seconds >= clock - self.window]
+
+    def decide(self):
+        """Return 'converged', 'below' or None."""
+        if self.clock < self.min_seconds:
+            return None
+        values = self._window_values()
+        if not values:
+            return None
+        if self.target:
+            floor = self.target * (1 - self.margin) * self.streams
+            if all(total < floor for total in values):
+                return 'below'
+        mean = sum(values) / len(values)
+        if mean > 0 and (max(values) - min(values)) / mean <= self.tolerance:
+            return 'converged'
+        return None
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def replay(source, destination, speed, done):
+    """Copy a recorded log into destination, pacing it by the pipeline clock of its average lines."""
+    start = time.monotonic()
+    try:
+        with open(source, 'r', errors='replace') as src, open(destination, 'w') as dst:
+            for line in src:
+                reading = parse_fps_line(line)
+                if reading and reading['kind'] == 'average':
+                    delay = start + reading['seconds'] / speed - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                dst.write(line)
+                dst.flush()
+    finally:
+        done.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Follow gvafpscounter output and stop runs early")
+    parser.add_argument('logs', nargs='*', help="Pipeline log(s) being written by the run")
+    parser.add_argument('--streams', type=int, required=True, help="Total number of streams in the run")
+    parser.add_argument('--target', type=float, help="Per-stream FPS target; stop early when clearly below it")
+    parser.add_argument('--tolerance', type=float, default=0.01,
+                        help="Relative spread of the running average that counts as converged (default: 0.01)")
+    parser.add_argument('--window', type=float, default=10.0, help="Seconds the spread is measured over (default: 10)")
+    parser.add_argument('--min-seconds', type=float, default=20.0,
+                        help="Seconds of averaging before any decision (default: 20)")
+    parser.add_argument('--margin', type=float, default=0.1,
+                        help="Relative distance below --target that counts as clearly below (default: 0.1)")
+    parser.add_argument('--pid', type=int, action='append', default=[],
+                        help="Writer process to watch; return once all have exited (repeatable)")
+    parser.add_argument('--max-seconds', type=float, help="Return after this many wall-clock seconds")
+    parser.add_argument('--interval', type=float, default=0.5, help="Polling interval in seconds (default: 0.5)")
+    parser.add_argument('--replay', help="Replay a recorded log instead of following live ones (testing)")
+    parser.add_argument('--speed', type=float, default=10.0, help="Replay speed-up factor (default: 10)")
+    args = parser.parse_args()
+
+    if args.streams < 1 or args.window <= 0 or args.interval <= 0 or args.speed <= 0:
+        parser.error("streams, window, interval and speed must be positive")
+    if bool(args.logs) == bool(args.replay):
+        parser.error("give either log files or --replay")
+
+    replay_done = None
+    logs = args.logs
+    if args.replay:
+        fd, replay_log = tempfile.mkstemp(prefix='fps_replay_', suffix='.log')
+        os.close(fd)
+        logs = [replay_log]
+        replay_done = threading.Event()
+        threading.Thread(target=replay, args=(args.replay, replay_log, args.speed, replay_done), daemon=True).start()
+
+    monitor = FpsMonitor(logs, args.streams, args.target, args.tolerance, args.window, args.min_seconds, args.margin)
+    start = time.monotonic()
+    next_progress = PROGRESS_EVERY
+    verdict = None
+    try:
+        while verdict is None:
+            time.sleep(args.interval)
+            writers_done = (replay_done.is_set() if replay_done else
+                            bool(args.pid) and not any(pid_alive(pid) for pid in args.pid))
+            if monitor.poll():
+                if monitor.clock >= next_progress:
+                    next_progress = monitor.clock + PROGRESS_EVERY
+                    print(f"[ Info ] FPS monitor: {monitor.clock:.0f}s total={monitor.total_fps:.2f} fps "
+                          f"({monitor.per_stream_fps:.2f} fps/stream)", file=sys.stderr, flush=True)
+                verdict = monitor.decide()
+            if verdict is None and (writers_done or
+                                    (args.max_seconds and time.monotonic() - start >= args.max_seconds)):
+                monitor.poll()
+                verdict = 'complete' if monitor.history else 'nodata'
+    except KeyboardInterrupt:
+        verdict = 'complete' if monitor.history else 'nodata'
+    finally:
+        if args.replay:
+            os.unlink(logs[0])
+
+    wall = time.monotonic() - start
+    if verdict == 'converged':
+        print(f"[ Info ] FPS converged within {args.tolerance:.1%} after {monitor.clock:.0f}s, stopping early",
+              file=sys.stderr)
+    elif verdict == 'below':
+        print(f"[ Info ] FPS clearly below {args.target:g} fps/stream after {monitor.clock:.0f}s, stopping early",
+              file=sys.stderr)
+    if monitor.history:
+        print(f"{verdict} {monitor.clock:.2f} {wall:.2f} {monitor.total_fps:.2f} {monitor.per_stream_fps:.2f}")
+    else:
+        print(f"{verdict} NA {wall:.2f} NA NA")
+    return EXIT_CODES[verdict]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,6 +13,7 @@ DRM_ROOT="/sys/class/drm"
 Interval=1
 Duration=60
 Delay=0
+SeriesCsv=""
 
 # Help message
 usage()
@@ -26,6 +27,7 @@ Options:
   -s <seconds>    Sampling interval in seconds (default: 1)
   -i <seconds>    Total duration in seconds (default: 60)
   -d <seconds>    Start Delay in seconds (default: 0)
+  -o <file>       Write the timestamped power series to a CSV (Python collector only)
 
 Output Format:
   [source] card# (driver @ pci): power W
@@ -35,7 +37,7 @@ EOF
 # Command line argument parser
 argparse()
 {
-while getopts "hs:i:d:" arg; do
+while getopts "hs:i:d:o:" arg; do
     case $arg in
         s)
         Interval=${OPTARG}
@@ -46,6 +48,9 @@ while getopts "hs:i:d:" arg; do
         d)
         Delay=${OPTARG}
         ;;
+        o)
+        SeriesCsv=${OPTARG}
+        ;;
         h)
         usage; exit 0
         ;;
@@ -88,6 +93,15 @@ if ! check_permissions; then
     exit 2
 fi
 
+# Prefer the single-sweep Python collector (all counters read once per sample);
+# POWER_COLLECTOR=legacy keeps the shell loop below
+COLLECTOR_SCRIPT="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/package_power.py"
+if [[ "${POWER_COLLECTOR:-python}" != "legacy" ]] && command -v python3 >/dev/null 2>&1 && [[ -f "${COLLECTOR_SCRIPT}" ]]; then
+    CollectorArgs=(-s "${Interval}" -i "${Duration}" -d "${Delay}")
+    [[ -n "${SeriesCsv}" ]] && CollectorArgs+=(--csv "${SeriesCsv}")
+    exec python3 "${COLLECTOR_SCRIPT}" "${CollectorArgs[@]}"
+fi
+
 shopt -s nullglob
 
 lower_strip()
@@ -15,11 +15,22 @@ if [[ -z "$OUTPUT_FILE" ]] || [[ -z "$DEVICE_ID" ]]; then
     exit 1
 fi
 
-# Plot script path
+# Plot and resident sampler script paths
 PLOT_SCRIPT="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/plot_gpu_metrics.py"
+SAMPLER_SCRIPT="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/gpu_sampler.py"
+
+# Telemetry backend: xpu-smi (default), qmassa, sysfs, or legacy (one xpu-smi fork per sample)
+MONITOR_BACKEND="${GPU_MONITOR_BACKEND:-xpu-smi}"
+SAMPLER_PID=""
 
 # Cleanup and plot generation on exit
 cleanup_and_plot() {
+    if [[ -n "${SAMPLER_PID}" ]]; then
+        kill "${SAMPLER_PID}" 2>/dev/null || true
+        wait "${SAMPLER_PID}" 2>/dev/null || true
+        SAMPLER_PID=""
+    fi
+
     echo ""
     echo "[GPU Monitor] Monitoring stopped, generating plots..."
     
@@ -72,6 +83,25 @@ trap cleanup_and_plot EXIT INT TERM
 # Metrics to collect (for xpu-smi)
 METRICS="0,1,2,3,4,18,22,24,25,26,27,36"
 
+# Run the resident Python sampler: one long-lived process instead of
+# several forks per sample, and sub-second intervals are supported
+if [[ "${MONITOR_BACKEND}" != "legacy" ]] && command -v python3 >/dev/null 2>&1 && [[ -f "$SAMPLER_SCRIPT" ]]; then
+    SAMPLER_ARGS=(--interval "$INTERVAL" --backend "$MONITOR_BACKEND" --model-name "$MODEL_NAME" --batch-size "$BATCH_SIZE")
+    if [[ "${MONITOR_BACKEND}" == "qmassa" ]]; then
+        SAMPLER_ARGS+=(--qmassa-json "${GPU_MONITOR_QMASSA_JSON:-${OUTPUT_DIR}/gpu_metrics_raw.json}")
+    fi
+
+    echo "[GPU Monitor] Starting resident ${MONITOR_BACKEND} sampler..."
+    python3 "$SAMPLER_SCRIPT" "$OUTPUT_FILE" "$DEVICE_ID" "${SAMPLER_ARGS[@]}" &
+    SAMPLER_PID=$!
+    if wait "$SAMPLER_PID"; then
+        SAMPLER_PID=""
+        exit 0
+    fi
+    SAMPLER_PID=""
+    echo "[GPU Monitor] ⚠ Sampler failed, falling back to xpu-smi polling loop"
+fi
+
 # Initialize CSV with header if it doesn't exist
 # Detect GPU type by checking xpu-smi header output
 if [[ ! -f "$OUTPUT_FILE" ]]; then
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+
+"""
+Resident GPU Telemetry Sampler
+Usage: python3 gpu_sampler.py <output_csv> <device_id> [--interval S] [--backend xpu-smi|qmassa|sysfs]
+
+Replaces the fork-per-sample xpu-smi loop in gpu_monitor.sh with a single
+long-lived process. Rows are appended to the same CSV schema that
+plot_gpu_metrics.py consumes: "Model Name,Batch Size,<backend header>".
+
+Backends:
+  xpu-smi  One continuous `xpu-smi dump` child; its output is streamed into the CSV.
+           --transcript replays a recorded xpu-smi dump instead (for testing).
+  qmassa   Tails a qmassa JSON dump (--qmassa-json) incrementally.
+  sysfs    Reads hwmon energy/temperature and GT frequency files directly.
+           --sysfs-root points at an alternative (fake) /sys tree.
+"""
+
+import argparse
+import glob
+import os
+import signal
+# Runs the xpu-smi/qmassa sampler
+import subprocess  # nosec B404
+import sys
+import time
+from datetime import datetime
+
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Metrics requested from xpu-smi (same set as the legacy gpu_monitor.sh loop)
+XPU_SMI_METRICS = "0,1,2,3,4,18,22,24,25,26,27,36"
+
+# Header used by the backends that do not get one from xpu-smi.
+# Column names match xpu-smi so plot_gpu_metrics.py picks them up unchanged.
+COMMON_HEADER = [
+    'Timestamp',
+    'DeviceId',
+    'GPU Utilization (%)',
+    'GPU Power (W)',
+    'GPU Frequency (MHz)',
+    'GPU Core Temperature (Celsius Degree)',
+    'GPU Memory Temperature (Celsius Degree)',
+    'GPU Memory Used (MiB)',
+    'Compute Engine (%)',
+    'Decoder Engine 0 (%)',
+    'Decoder Engine 1 (%)',
+    'Encoder Engine 0 (%)',
+    'Encoder Engine 1 (%)',
+    'Copy Engine (%)',
+    'Media Enhancement Engine 0 (%)',
+    'Media Enhancement Engine 1 (%)',
+    'Media Engine Frequency (MHz)',
+]
+
+# parse_qmassa metric keys in COMMON_HEADER order (after Timestamp/DeviceId)
+QMASSA_KEYS = [
+    'gpu_util', 'gpu_power', 'gpu_freq', 'gpu_temp', 'mem_temp', 'mem_used',
+    'compute_util', 'decoder0', 'decoder1', 'encoder0', 'encoder1', 'copy_eng',
+    'media_enh0', 'media_enh1', 'media_freq',
+]
+
+ENERGY_WRAP = 1 << 32
+
+
+def now_timestamp():
+    """Wall-clock timestamp in xpu-smi's HH:MM:SS.fff format."""
+    return datetime.now().strftime('%H:%M:%S.%f')[:-3]
+
+
+def format_value(value, digits=2):
+    """Format a metric for the CSV, leaving unknown values empty."""
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        return f"{value:.{digits}f}"
+    return str(value)
+
+
+def paced_ticks(interval, stop):
+    """Yield at a fixed cadence, skipping ticks that were missed while busy."""
+    next_tick = time.monotonic()
+    while not stop():
+        yield
+        next_tick += interval
+        delay = next_tick - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            # Fell behind: realign instead of bursting to catch up
+            next_tick = time.monotonic()
+
+
+class XpuSmiBackend:
+    """Stream rows from a single continuous `xpu-smi dump` (or a recorded transcript)."""
+
+    def __init__(self, device_id, interval, transcript=None, use_sudo=True):
+        self.device_id = device_id
+        self.interval = interval
+        self.transcript = transcript
+        self.use_sudo = use_sudo
+        self.proc = None
+        self._header = None
+        self._lines = self._open()
+
+    def _command(self):
+        cmd = ['xpu-smi', 'dump', '-d', str(self.device_id), '-m', XPU_SMI_METRICS]
+        if self.interval < 1:
+            cmd += ['--ims', str(max(int(self.interval * 1000), 10))]
+        else:
+            cmd += ['-i', str(int(round(self.interval)))]
+        if self.use_sudo and os.geteuid() != 0:
+            cmd = ['sudo'] + cmd
+        return cmd
+
+    def _open(self):
+        if self.transcript:
+            return self._replay(self.transcript)
+        command = self._command()
+        # Fixed sampler argv, no shell
+        self.proc = subprocess.Popen(command, stdout=subprocess.PIPE,  # nosec B603
+                                     stderr=subprocess.DEVNULL, text=True, bufsize=1)
+        return iter(self.proc.stdout)
+
+    def _replay(self, path):
+        with open(path, 'r') as f:
+            for line in f:
+                yield line
+                if self.interval > 0 and line.strip() and 'Timestamp' not in line:
+                    time.sleep(self.interval)
+
+    @staticmethod
+    def _split(line):
+        return [field.strip() for field in line.strip().split(',')]
+
+    def header(self):
+        """Read ahead until the xpu-smi header line is seen."""
+        while self._header is None:
+            line = next(self._lines, None)
+            if line is None:
+                return None
+            if 'Timestamp' in line:
+                self._header = self._split(line)
+        return self._header
+
+    def rows(self, stop):
+        for line in self._lines:
+            if stop():
+                break
+            if not line.strip() or 'Timestamp' in line:
+                continue
+            yield self._split(line)
+
+    def close(self):
+        if self.proc and self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+
+
+class QmassaBackend:
+    """Tail a qmassa JSON dump and emit one row per newly appended state."""
+
+    def __init__(self, json_file, device_id, interval):
+        # Imported here so the other backends do not need parse_qmassa's NumPy dependency
+        sys.path.insert(0, UTILS_DIR)
+        from parse_qmassa import QmassaTailReader, extract_metrics
+        self.extract_metrics = extract_metrics
+        self.reader = QmassaTailReader(json_file)
+        self.device_id = device_id
+        self.dev_index = int(device_id) if str(device_id).isdigit() else 0
+        self.interval = interval
+
+    def header(self):
+        return COMMON_HEADER
+
+    def rows(self, stop):
+        for _ in paced_ticks(self.interval, stop):
+            for state in self.reader.iter_new_states():
+                metrics = self.extract_metrics(state, self.dev_index)
+                if not metrics:
+                    continue
+                yield [now_timestamp(), str(self.device_id)] + \
+                    [format_value(metrics.get(key)) for key in QMASSA_KEYS]
+
+    def close(self):
+        pass
+
+
+class SysfsBackend:
+    """Sample hwmon energy/temperatures and GT frequencies straight from sysfs.
+
+    All attribute files are opened once and re-read with pread(), so a sample
+    costs a handful of syscalls and no process spawns. Utilization and memory
+    counters are not exposed through sysfs and are left empty.
+    """
+
+    def __init__(self, device_id, interval, sysfs_root='/sys'):
+        self.device_id = device_id
+        self.interval = interval
+        self.sysfs_root = sysfs_root
+        self.fds = []
+        card = self._find_card(sysfs_root, int(device_id) if str(device_id).isdigit() else 0)
+        if card is None:
+            raise RuntimeError(f"No i915/xe DRM device {device_id} under {sysfs_root}")
+
+        hwmon_dirs = sorted(glob.glob(os.path.join(card, 'device', 'hwmon', 'hwmon*')))
+        self.energy_fd = self._open_first(self._labelled(hwmon_dirs, 'energy', ('card', 'package', 'pkg'))
+                                          + [os.path.join(d, 'energy1_input') for d in hwmon_dirs])
+        self.power_fd = None
+        if self.energy_fd is None:
+            self.power_fd = self._open_first(self._labelled(hwmon_dirs, 'power', ('card', 'package', 'pkg'))
+                                             + [os.path.join(d, 'power1_input') for d in hwmon_dirs])
+        self.gpu_temp_fd = self._open_first(self._labelled(hwmon_dirs, 'temp', ('pkg', 'package', 'gpu', 'card'))
+                                            + [os.path.join(d, 'temp1_input') for d in hwmon_dirs])
+        self.mem_temp_fd = self._open_first(self._labelled(hwmon_dirs, 'temp', ('vram', 'mem')))
+
+        # i915 exposes gt_act_freq_mhz, xe exposes per-GT freq0/act_freq
+        self.gt_freq_fd = self._open_first([
+            os.path.join(card, 'gt_act_freq_mhz'),
+            os.path.join(card, 'gt', 'gt0', 'rps_act_freq_mhz'),
+            *sorted(glob.glob(os.path.join(card, 'device', 'tile0', 'gt0', 'freq0', 'act_freq'))),
+        ])
+        self.media_freq_fd = self._open_first([
+            os.path.join(card, 'gt', 'gt1', 'rps_act_freq_mhz'),
+            *sorted(glob.glob(os.path.join(card, 'device', 'tile0', 'gt1', 'freq0', 'act_freq'))),
+        ])
+        self._last_energy = None
+
+    @staticmethod
+    def _find_card(sysfs_root, index):
+        cards = []
+        for card in sorted(glob.glob(os.path.join(sysfs_root, 'class', 'drm', 'card[0-9]*'))):
+            if '-' in os.path.basename(card):
+                continue  # connectors such as card0-DP-1
+            driver = os.path.basename(os.path.realpath(os.path.join(card, 'device', 'driver')))
+            if driver in ('i915', 'xe'):
+                cards.append(card)
+        return cards[index] if index < len(cards) else None
+
+    @staticmethod
+    def _labelled(hwmon_dirs, prefix, labels):
+        """Input files whose <sensor>_label matches one of labels."""
+        matches = []
+        for hwmon_dir in hwmon_dirs:
+            for label_file in sorted(glob.glob(os.path.join(hwmon_dir, f'{prefix}*_label'))):
+                try:
+                    with open(label_file, 'r') as f:
+                        label = f.read().strip().lower().replace(' ', '')
+                except OSError:
+                    continue
+                if any(label.startswith(want) for want in labels):
+                    matches.append(label_file[:-len('_label')] + '_input')
+        return matches
+
+    def _open_first(self, candidates):
+        for path in candidates:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue
+            self.fds.append(fd)
+            return fd
+        return None
+
+    @staticmethod
+    def _read(fd):
+        if fd is None:
+            return None
+        try:
+            return int(os.pread(fd, 64, 0).split()[0])
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def header(self):
+        return COMMON_HEADER
+
+    def _power(self, now):
+        if self.energy_fd is None:
+            power_uw = self._read(self.power_fd)
+            return power_uw / 1e6 if power_uw is not None else None
+        energy = self._read(self.energy_fd)
+        if energy is None:
+            return None
+        last = self._last_energy
+        self._last_energy = (now, energy)
+        if last is None or now <= last[0]:
+            return None
+        diff = energy - last[1]
+        if diff < 0:
+            diff += ENERGY_WRAP
+        return (diff / 1e6) / (now - last[0])
+
+    def rows(self, stop):
+        for _ in paced_ticks(self.interval, stop):
+            now = time.monotonic()
+            power = self._power(now)
+            gpu_temp = self._read(self.gpu_temp_fd)
+            mem_temp = self._read(self.mem_temp_fd)
+            values = {
+                'GPU Power (W)': power,
+                'GPU Frequency (MHz)': self._read(self.gt_freq_fd),
+                'GPU Core Temperature (Celsius Degree)': gpu_temp / 1000 if gpu_temp is not None else None,
+                'GPU Memory Temperature (Celsius Degree)': mem_temp / 1000 if mem_temp is not None else None,
+                'Media Engine Frequency (MHz)': self._read(self.media_freq_fd),
+            }
+            yield [now_timestamp(), str(self.device_id)] + \
+                [format_value(values.get(col)) for col in COMMON_HEADER[2:]]
+
+    def close(self):
+        for fd in self.fds:
+            os.close(fd)
+        self.fds = []
+
+
+def run_sampler(backend, output_file, model_name, batch_size, stop, max_samples=None):
+    """Append backend rows to the CSV until stop() is true.
+
+    Returns the number of rows written, or None if the backend produced no header.
+    """
+    header = backend.header()
+    if header is None:
+        print("[GPU Sampler] ⚠ Backend produced no header", file=sys.stderr)
+        return None
+
+    new_file = not os.path.exists(output_file) or os.path.getsize(output_file) == 0
+    written = 0
+    with open(output_file, 'a', buffering=1) as out:
+        if new_file:
+            out.write(f"Model Name,Batch Size,{', '.join(header)}\n")
+        for row in backend.rows(stop):
+            out.write(f"{model_name},{batch_size},{', '.join(row)}\n")
+            written += 1
+            if max_samples is not None and written >= max_samples:
+                break
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident GPU telemetry sampler (gpu_monitor.sh CSV schema)")
+    parser.add_argument('output_csv', help="CSV file to append to")
+    parser.add_argument('device_id', help="GPU device index (xpu-smi id / N-th i915/xe card)")
+    parser.add_argument('--interval', type=float, default=1.0, help="Sampling interval in seconds (default: 1, sub-second allowed)")
+    parser.add_argument('--backend', choices=['xpu-smi', 'qmassa', 'sysfs'], default='xpu-smi', help="Telemetry source (default: xpu-smi)")
+    parser.add_argument('--model-name', default='unknown', help="Value for the 'Model Name' column")
+    parser.add_argument('--batch-size', default='0', help="Value for the 'Batch Size' column")
+    parser.add_argument('--samples', type=int, default=None, help="Stop after N samples (default: run until signalled)")
+    parser.add_argument('--transcript', default=None, help="xpu-smi backend: replay a recorded `xpu-smi dump` output file")
+    parser.add_argument('--qmassa-json', default=None, help="qmassa backend: JSON dump being written by qmassa")
+    parser.add_argument('--sysfs-root', default='/sys', help="sysfs backend: root of the sysfs tree (default: /sys)")
+    args = parser.parse_args()
+
+    if args.interval <= 0:
+        parser.error("--interval must be positive")
+
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        # Unblock a pending read on the xpu-smi pipe
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, request_stop)
+
+    try:
+        if args.backend == 'xpu-smi':
+            backend = XpuSmiBackend(args.device_id, args.interval, transcript=args.transcript)
+        elif args.backend == 'qmassa':
+            if not args.qmassa_json:
+                parser.error("--qmassa-json is required for the qmassa backend")
+            backend = QmassaBackend(args.qmassa_json, args.device_id, args.interval)
+        else:
+            backend = SysfsBackend(args.device_id, args.interval, args.sysfs_root)
+    except (OSError, RuntimeError, ImportError) as e:
+        print(f"[GPU Sampler] ⚠ Failed to start {args.backend} backend: {e}", file=sys.stderr)
+        return 1
+
+    print(f"[GPU Sampler] Sampling device {args.device_id} every {args.interval}s via {args.backend}", file=sys.stderr)
+    written = 0
+    try:
+        written = run_sampler(backend, args.output_csv, args.model_name, args.batch_size,
+                              lambda: stopping, args.samples)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        backend.close()
+    print("[GPU Sampler] Stopped", file=sys.stderr)
+    return 1 if written is None else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -120,3 +120,21 @@ validate_assets() {
     fi
     return 0
 }
+
+# Print the docker options exposing a device node directory (/dev/dri, /dev/accel),
+# one per line: the directory itself and a --group-add for each distinct node group
+docker_device_args() {
+    local dir="$1" pattern="$2" node gid
+    [[ -e "${dir}" ]] || return 0
+    printf '%s\n' --device "${dir}"
+    declare -A seen=()
+    if compgen -G "${dir}/${pattern}" >/dev/null; then
+        for node in "${dir}"/${pattern}; do
+            gid="$(stat -c '%g' "${node}" 2>/dev/null || true)"
+            if [[ -n "${gid}" && -z "${seen[$gid]:-}" ]]; then
+                printf '%s\n' --group-add "${gid}"
+                seen["$gid"]=1
+            fi
+        done
+    fi
+}
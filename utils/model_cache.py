@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: (C) 2024 - 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Content-Addressed OpenVINO Model Compile Cache
+Usage: python3 model_cache.py key <cache root> <model.xml> --device D --batch B [--config STR]
+       python3 model_cache.py check [--no-record] <cache root> <key> [<key> ...]
+       python3 model_cache.py status <cache root>
+       python3 model_cache.py prune <cache root> --days N
+
+Every inference element gets its own OpenVINO CACHE_DIR, <cache root>/<key>,
+where the key hashes the model content (.xml and .bin), the device, the batch
+size and the inference config (nireq, ie-config, ...). A changed model or
+config therefore never loads a stale blob, and identical elements share one
+compiled blob across runs, drivers and containers. The root is mounted into
+the container; pipeline_constructor.sh calls `key` for each gvadetect and
+gvaclassify when MODEL_CACHE_HOST/MODEL_CACHE_DIR are set.
+
+key     creates the entry (model.json) and prints the key
+check   reports per entry whether a compiled blob is present (hit) or the run
+        will compile (miss); details on stderr, overall hit|miss|partial on stdout
+status  lists the entries with blob size and hit/miss counts
+prune   removes entries not used for --days days
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+META_FILE = 'model.json'
+DIGEST_INDEX = '.digests.json'
+KEY_LENGTH = 16
+
+
+def file_digest(path, index):
+    """sha256 of a file, memoised in the index by (size, mtime) so large .bin files are hashed once."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return f"missing:{os.path.abspath(path)}"
+    entry = index.get(path)
+    if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+        return entry[2]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    index[path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+    return index[path][2]
+
+
+def load_json(path, default):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def model_key(root, model, device, batch, config=''):
+    """Create (if needed) and return the cache entry of one inference element."""
+    index_path = os.path.join(root, DIGEST_INDEX)
+    index = load_json(index_path, {})
+    weights = os.path.splitext(model)[0] + '.bin'
+    digests = [file_digest(model, index), file_digest(weights, index)]
+    if digests[0].startswith('missing:'):
+        print(f"[ Warning ] Model not found on the host, keying by path: {model}", file=sys.stderr)
+    identity = '|'.join([*digests, device, str(batch), ' '.join(config.split())])
+    key = hashlib.sha256(identity.encode()).hexdigest()[:KEY_LENGTH]
+
+    entry = os.path.join(root, key)
+    os.makedirs(entry, exist_ok=True)
+    save_json(index_path, index)
+    meta_path = os.path.join(entry, META_FILE)
+    if not os.path.exists(meta_path):
+        save_json(meta_path, {
+            'model': os.path.abspath(model),
+            'model_sha256': digests[0],
+            'device': device,
+            'batch': str(batch),
+            'config': ' '.join(config.split()),
+            'created': time.strftime('%Y%m%d-%H%M%S'),
+            'hits': 0,
+            'misses': 0,
+        })
+    return key
+
+
+def blob_bytes(entry):
+    """Size of the compiled blobs of an entry (everything but the metadata)."""
+    total = 0
+    for dirpath, _, files in os.walk(entry):
+        for name in files:
+            if name != META_FILE:
+                total += os.path.getsize(os.path.join(dirpath, name))
+    return total
+
+
+def describe(meta):
+    return f"{os.path.basename(meta.get('model', '?'))} {meta.get('device', '?')} bs{meta.get('batch', '?')}"
+
+
+def check(root, keys, record=True):
+    hits = misses = 0
+    for key in dict.fromkeys(keys):
+        entry = os.path.join(root, key)
+        meta_path = os.path.join(entry, META_FILE)
+        meta = load_json(meta_path, {})
+        hit = os.path.isdir(entry) and blob_bytes(entry) > 0
+        hits += hit
+        misses += not hit
+        if meta and record:
+            meta['hits' if hit else 'misses'] = meta.get('hits' if hit else 'misses', 0) + 1
+            meta['last_used'] = time.strftime('%Y%m%d-%H%M%S')
+            save_json(meta_path, meta)
+        state = 'hit' if hit else 'miss (compiles this run)'
+        print(f"[ Info ] Model cache {state}: {describe(meta)} ({key})", file=sys.stderr)
+    if not hits and not misses:
+        return 'NA'
+    return 'hit' if not misses else 'miss' if not hits else 'partial'
+
+
+def entries(root):
+    for key in sorted(os.listdir(root)):
+        entry = os.path.join(root, key)
+        if os.path.isdir(entry) and os.path.exists(os.path.join(entry, META_FILE)):
+            yield key, entry, load_json(os.path.join(entry, META_FILE), {})
+
+
+def status(root):
+    print(f"{'Key':<17} {'Model':<28} {'Device':<8} {'Batch':>5} {'Blob MB':>8} {'Hits':>5} {'Misses':>6}  Last Used")
+    total = 0
+    count = 0
+    for key, entry, meta in entries(root):
+        size = blob_bytes(entry)
+        total += size
+        count += 1
+        print(f"{key:<17} {os.path.basename(meta.get('model', '?')):<28} {meta.get('device', '?'):<8} "
+              f"{meta.get('batch', '?'):>5} {size / 1e6:>8.1f} {meta.get('hits', 0):>5} {meta.get('misses', 0):>6}  "
+              f"{meta.get('last_used', meta.get('created', ''))}")
+    print(f"{count} entries, {total / 1e6:.1f} MB of compiled blobs in {root}")
+
+
+def prune(root, days):
+    cutoff = time.time() - days * 86400
+    removed = 0
+    for key, entry, meta in list(entries(root)):
+        stamp = meta.get('last_used', meta.get('created', ''))
+        try:
+            used = time.mktime(time.strptime(stamp, '%Y%m%d-%H%M%S'))
+        except ValueError:
+            used = 0
+        if used < cutoff:
+            shutil.rmtree(entry, ignore_errors=True)
+            removed += 1
+    print(f"Removed {removed} entries unused for {days:g} days")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-addressed OpenVINO model compile cache")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    key_parser = sub.add_parser('key', help="Create the entry of one inference element and print its key")
+    key_parser.add_argument('root', help="Cache root on the host")
+    key_parser.add_argument('model', help="Model .xml on the host")
+    key_parser.add_argument('--device', required=True, help="Inference device (CPU, GPU, GPU.1, NPU)")
+    key_parser.add_argument('--batch', default='1', help="Inference batch size (default: 1)")
+    key_parser.add_argument('--config', default='', help="Element inference options (nireq, ie-config, ...)")
+
+    check_parser = sub.add_parser('check', help="Report cache hits and misses of a run's entries")
+    check_parser.add_argument('--no-record', action='store_true',
+                              help="Do not count the check as a run (hit/miss statistics)")
+    check_parser.add_argument('root', help="Cache root on the host")
+    check_parser.add_argument('keys', nargs='*', help="Entry keys used by the run")
+
+    status_parser = sub.add_parser('status', help="List the cache entries")
+    status_parser.add_argument('root', help="Cache root on the host")
+
+    prune_parser = sub.add_parser('prune', help="Remove entries that were not used recently")
+    prune_parser.add_argument('root', help="Cache root on the host")
+    prune_parser.add_argument('--days', type=float, required=True, help="Remove entries unused for this many days")
+    args = parser.parse_args()
+
+    os.makedirs(args.root, exist_ok=True)
+    if args.command == 'key':
+        print(model_key(args.root, args.model, args.device, args.batch, args.config))
+    elif args.command == 'check':
+        print(check(args.root, args.keys, not args.no_record))
+    elif args.command == 'status':
+        status(args.root)
+    else:
+        prune(args.root, args.days)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
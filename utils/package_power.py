@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: (C) 2024 - 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Single-Sweep Package Power Collector
+Usage: python3 package_power.py -s <interval> -i <duration> -d <delay> [--sysfs-root DIR] [--csv FILE]
+
+Drop-in replacement for the sampling loop in get_package_power.sh. Every hwmon
+energy/power counter of the i915/xe cards and every top-level RAPL package
+domain is opened once; each sample is a single timestamped sweep over all of
+them, so N GPUs no longer stretch one sample to N intervals and no helper
+processes are spawned.
+
+stdout keeps the get_package_power.sh format, one line per device per sample:
+  [source] card# (driver @ pci): power W
+Per-counter and total-platform energy / average power are reported on stderr
+at the end and, with --csv, written as a time series.
+
+Note: Requires root to read /sys/class/drm/*/hwmon/* and /sys/class/powercap/*
+"""
+
+import argparse
+import glob
+import os
+import signal
+import sys
+import time
+
+# hwmon energy counters are exposed as 32-bit microjoule values
+HWMON_ENERGY_WRAP = 1 << 32
+PACKAGE_LABELS = ('card', 'package', 'pkg')
+
+
+def lower_strip(value):
+    return ''.join(value.lower().split())
+
+
+def read_text(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+class Counter:
+    """One opened sysfs counter (energy in uJ or instantaneous power in uW)."""
+
+    def __init__(self, name, source, path, kind, wrap=HWMON_ENERGY_WRAP):
+        self.name = name
+        self.source = source
+        self.path = path
+        self.kind = kind
+        self.wrap = wrap
+        self.fd = os.open(path, os.O_RDONLY)
+        self.energy_j = 0.0
+        self.power_w = None
+
+    def read(self):
+        try:
+            return int(os.pread(self.fd, 64, 0).split()[0])
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def update(self, previous, current, elapsed):
+        """Accumulate energy between two raw readings; returns the interval power in W."""
+        if previous is None or current is None or elapsed <= 0:
+            self.power_w = None
+            return None
+        if self.kind == 'energy':
+            diff = current - previous
+            if diff < 0:
+                diff += self.wrap
+            joules = diff / 1e6
+            self.power_w = joules / elapsed
+        else:
+            # Instantaneous power: integrate as constant over the interval
+            self.power_w = current / 1e6
+            joules = self.power_w * elapsed
+        self.energy_j += joules
+        return self.power_w
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PackagePowerCollector:
+    """Discover GPU hwmon and RAPL counters under a sysfs root and sample them in one sweep."""
+
+    def __init__(self, sysfs_root='/sys'):
+        self.sysfs_root = sysfs_root
+        self.devices = []   # dicts: card, driver, pci_slot, counter (None if unavailable)
+        self.counters = []  # distinct counters, in sweep order
+        self.rapl = self._open_rapl()
+        self._discover_cards()
+        self._last = None
+        self.start_time = None
+        self.elapsed = 0.0
+        self.series = []    # (wall time, elapsed, [power_w per counter], total_power_w)
+
+    def _add(self, counter):
+        self.counters.append(counter)
+        return counter
+
+    def _open_rapl(self):
+        """Top-level RAPL package domains (intel-rapl:N named package*).
+
+        psys (platform) is skipped: it already contains the packages, so adding it
+        would count their power twice.
+        """
+        domains = []
+        for domain in sorted(glob.glob(os.path.join(self.sysfs_root, 'class', 'powercap', 'intel-rapl:*'))):
+            if os.path.basename(domain).count(':') != 1:
+                continue  # subzones (core/uncore/dram) are already part of the package
+            energy = os.path.join(domain, 'energy_uj')
+            if not os.path.isfile(energy):
+                continue
+            name = lower_strip(read_text(os.path.join(domain, 'name')) or '')
+            if name and not name.startswith('package'):
+                continue
+            max_range = read_text(os.path.join(domain, 'max_energy_range_uj'))
+            wrap = int(max_range) + 1 if max_range and max_range.isdigit() else HWMON_ENERGY_WRAP
+            try:
+                counter = Counter(f"rapl:{name or os.path.basename(domain)}", 'rapl', energy, 'energy', wrap)
+            except OSError:
+                continue
+            domains.append(self._add(counter))
+        return domains
+
+    def _hwmon_counter(self, card_name, device_dir):
+        for hwmon_dir in sorted(glob.glob(os.path.join(device_dir, 'hwmon', 'hwmon*'))):
+            label_files = sorted(glob.glob(os.path.join(hwmon_dir, 'power*_label'))) + \
+                sorted(glob.glob(os.path.join(hwmon_dir, 'energy*_label')))
+            for label_file in label_files:
+                if lower_strip(read_text(label_file) or '') not in PACKAGE_LABELS:
+                    continue
+                base = label_file[:-len('_label')]
+                kind = 'energy' if os.path.basename(base).startswith('energy') else 'power'
+                for suffix in ('_input', '_average'):
+                    if os.path.isfile(base + suffix):
+                        try:
+                            return Counter(card_name, 'hwmon', base + suffix, kind)
+                        except OSError:
+                            break
+
+            # fallback: single power sensor without labels
+            power_files = glob.glob(os.path.join(hwmon_dir, 'power*_input')) + \
+                glob.glob(os.path.join(hwmon_dir, 'power*_average'))
+            if len(power_files) == 1:
+                try:
+                    return Counter(card_name, 'hwmon', power_files[0], 'power')
+                except OSError:
+                    continue
+        return None
+
+    def _discover_cards(self):
+        for card_path in sorted(glob.glob(os.path.join(self.sysfs_root, 'class', 'drm', 'card[0-9]*'))):
+            card_name = os.path.basename(card_path)
+            if '-' in card_name:
+                continue  # connectors such as card0-DP-1
+            driver = os.path.basename(os.path.realpath(os.path.join(card_path, 'device', 'driver')))
+            if driver not in ('i915', 'xe'):
+                continue
+
+            pci_slot = ''
+            uevent = read_text(os.path.join(card_path, 'device', 'uevent')) or ''
+            for line in uevent.splitlines():
+                if line.startswith('PCI_SLOT_NAME='):
+                    pci_slot = line.split('=', 1)[1]
+                    break
+            if not pci_slot:
+                pci_slot = os.path.basename(os.path.realpath(os.path.join(card_path, 'device')))
+
+            counter = self._hwmon_counter(card_name, os.path.join(card_path, 'device'))
+            if counter is not None:
+                self._add(counter)
+            elif self.rapl:
+                # Integrated GPU without its own sensor: report the package it lives in
+                counter = self.rapl[0]
+            self.devices.append({'card': card_name, 'driver': driver, 'pci_slot': pci_slot, 'counter': counter})
+
+    def sweep(self):
+        """Read every counter back to back; returns (monotonic time, raw values)."""
+        now = time.monotonic()
+        return now, [counter.read() for counter in self.counters]
+
+    def sample(self):
+        """Take a sweep and account energy since the previous one. Returns the total power in W."""
+        now, values = self.sweep()
+        if self._last is None:
+            self.start_time = now
+            self._last = (now, values)
+            return None
+        last_time, last_values = self._last
+        elapsed = now - last_time
+        powers = [counter.update(prev, cur, elapsed)
+                  for counter, prev, cur in zip(self.counters, last_values, values)]
+        self._last = (now, values)
+        self.elapsed = now - self.start_time
+        known = [p for p in powers if p is not None]
+        total = sum(known) if known else None
+        # Wall-clock end of the interval, so the series can be aligned with other logs
+        self.series.append((time.time(), self.elapsed, powers, total))
+        return total
+
+    @property
+    def total_energy_j(self):
+        return sum(counter.energy_j for counter in self.counters)
+
+    def device_lines(self):
+        """Per-device lines in get_package_power.sh format for the latest sample."""
+        for device in self.devices:
+            counter = device['counter']
+            if counter is None or counter.power_w is None:
+                source = counter.source if counter else 'unavailable'
+                yield False, f"[{source}] {device['card']} ({device['driver']} @ {device['pci_slot']}): power unavailable"
+            else:
+                yield True, f"[{counter.source}] {device['card']} ({device['driver']} @ {device['pci_slot']}): {counter.power_w:.2f} W"
+
+    def write_csv(self, path):
+        columns = ['Timestamp (s)', 'Elapsed (s)'] + [f"{c.name} Power (W)" for c in self.counters] + ['Total Power (W)']
+        with open(path, 'w') as out:
+            out.write(','.join(columns) + '\n')
+            for wall, elapsed, powers, total in self.series:
+                fields = [f"{wall:.3f}", f"{elapsed:.3f}"] + [f"{p:.3f}" if p is not None else '' for p in powers]
+                fields.append(f"{total:.3f}" if total is not None else '')
+                out.write(','.join(fields) + '\n')
+
+    def close(self):
+        for counter in self.counters:
+            counter.close()
+        self.counters = []
+
+
+def print_summary(collector):
+    if collector.elapsed <= 0:
+        return
+    # Keep "(W):" so these lines do not match the "<value> W" per-sample pattern
+    for counter in collector.counters:
+        print(f"[ Info ] {counter.source} {counter.name} energy (J): {counter.energy_j:.2f}, "
+              f"average power (W): {counter.energy_j / collector.elapsed:.2f}", file=sys.stderr)
+    total = collector.total_energy_j
+    print(f"[ Info ] Platform energy (J): {total:.2f}, average power (W): "
+          f"{total / collector.elapsed:.2f} over {collector.elapsed:.1f}s", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-sweep GPU/package power collector")
+    parser.add_argument('-s', dest='interval', type=float, default=1.0, help="Sampling interval in seconds (default: 1)")
+    parser.add_argument('-i', dest='duration', type=float, default=60.0, help="Total duration in seconds (default: 60)")
+    parser.add_argument('-d', dest='delay', type=float, default=0.0, help="Start delay in seconds (default: 0)")
+    parser.add_argument('--sysfs-root', default='/sys', help="Root of the sysfs tree (default: /sys)")
+    parser.add_argument('--csv', default=None, help="Write the per-counter power time series to this CSV")
+    args = parser.parse_args()
+
+    if args.interval <= 0 or args.duration <= 0 or args.delay < 0:
+        parser.error("interval and duration must be positive, delay non-negative")
+
+    collector = PackagePowerCollector(args.sysfs_root)
+    if not collector.devices:
+        print("[ Error ] No i915/xe DRM devices found.", file=sys.stderr)
+        collector.close()
+        return 1
+    if not collector.counters:
+        print("[ Warning ] Cannot read power sensors. Skipping power measurements.", file=sys.stderr)
+        print("[ Info ] Run with sudo to enable power monitoring.", file=sys.stderr)
+        return 2
+
+    def request_stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, request_stop)
+
+    samples = max(int(args.duration // args.interval), 1)
+    print(f"[ Info ] Monitoring for {args.duration:g}s after a {args.delay:g}s delay", file=sys.stderr)
+    print("", file=sys.stderr)
+
+    try:
+        time.sleep(args.delay)
+        collector.sample()
+        start = time.monotonic()
+        for i in range(1, samples + 1):
+            # Fixed cadence against the start time so sweeps do not drift
+            delay = start + i * args.interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            collector.sample()
+            for ok, line in collector.device_lines():
+                print(line, file=sys.stdout if ok else sys.stderr, flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("", file=sys.stderr)
+        print("[ Info ] Monitoring complete", file=sys.stderr)
+        print_summary(collector)
+        if args.csv:
+            collector.write_csv(args.csv)
+        collector.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,126 +1,516 @@
 #!/usr/bin/env python3
 """Parse qmassa JSON output and extract metrics for CSV."""
 
+import argparse
 import json
+import math
+import os
+import re
 import sys
 
+import numpy as np
+
+# Incremental (tail-seeking) parsing of growing qmassa dumps
+CHECKPOINT_SUFFIX = '.ckpt'
+READ_CHUNK_SIZE = 1 << 20  # 1 MiB per read
+STATES_KEY_PATTERN = re.compile(rb'"states"\s*:\s*\[')
+
+
+class QmassaTailReader:
+    """Decode only the states appended to a qmassa JSON dump since the last poll.
+
+    The reader remembers the byte offset just past the last fully decoded
+    element of the top-level "states" array. Each poll seeks to that offset,
+    so the cost depends on the amount of new data rather than the file size,
+    and only one state (plus one partially written state) is held in memory.
+    """
+
+    def __init__(self, json_file, checkpoint_file=None):
+        self.json_file = json_file
+        self.checkpoint_file = checkpoint_file
+        self.offset = None      # Byte offset of the next undecoded state
+        self.file_id = None     # (st_dev, st_ino) to detect file replacement
+        self.done = False       # Closing ']' of the states array seen
+        self.last_state = None  # Most recent decoded state
+        self._decoder = json.JSONDecoder()
+
+        if checkpoint_file:
+            self.load_checkpoint()
+
+    def reset(self):
+        """Forget the current position and start from the beginning of the file."""
+        self.offset = None
+        self.file_id = None
+        self.done = False
+        self.last_state = None
+
+    def load_checkpoint(self):
+        """Restore position from the checkpoint file, if present and valid."""
+        try:
+            with open(self.checkpoint_file, 'r') as f:
+                ckpt = json.load(f)
+            self.offset = ckpt['offset']
+            self.file_id = tuple(ckpt['file_id']) if ckpt.get('file_id') else None
+            self.done = ckpt.get('done', False)
+            self.last_state = ckpt.get('last_state')
+        except (OSError, ValueError, KeyError, TypeError):
+            self.reset()
+
+    def save_checkpoint(self):
+        """Atomically persist the current position next to the dump."""
+        if not self.checkpoint_file:
+            return
+        ckpt = {
+            'offset': self.offset,
+            'file_id': list(self.file_id) if self.file_id else None,
+            'done': self.done,
+            'last_state': self.last_state,
+        }
+        tmp_file = f"{self.checkpoint_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(ckpt, f)
+        os.replace(tmp_file, self.checkpoint_file)
+
+    def _find_states_start(self, fh):
+        """Return the byte offset just after the opening '[' of "states", or None."""
+        fh.seek(0)
+        base = 0
+        tail = b''
+        while True:
+            chunk = fh.read(READ_CHUNK_SIZE)
+            if not chunk:
+                return None
+            data = tail + chunk
+            match = STATES_KEY_PATTERN.search(data)
+            if match:
+                return base - len(tail) + match.end()
+            # Keep an overlap so a key split across chunks is still found
+            tail = data[-64:]
+            base += len(chunk)
+
+    def iter_new_states(self):
+        """Yield states appended since the last call, advancing the offset."""
+        try:
+            st = os.stat(self.json_file)
+        except OSError:
+            return
+
+        file_id = (st.st_dev, st.st_ino)
+        if self.file_id != file_id or (self.offset is not None and st.st_size < self.offset):
+            # New or truncated file: start over
+            self.reset()
+            self.file_id = file_id
+
+        if self.done:
+            return
+
+        with open(self.json_file, 'rb') as fh:
+            if self.offset is None:
+                self.offset = self._find_states_start(fh)
+                if self.offset is None:
+                    return
+
+            fh.seek(self.offset)
+            # surrogateescape keeps a 1:1 mapping back to bytes for offset tracking
+            text = ''
+            eof = False
+            while True:
+                pos = 0
+                length = len(text)
+                while pos < length and text[pos] in ' \t\r\n,':
+                    pos += 1
+
+                if pos < length and text[pos] == ']':
+                    self.offset += len(text[:pos + 1].encode('utf-8', 'surrogateescape'))
+                    self.done = True
+                    return
+
+                state = None
+                if pos < length:
+                    try:
+                        state, end = self._decoder.raw_decode(text, pos)
+                    except ValueError:
+                        state = None
+
+                if state is not None:
+                    self.offset += len(text[:end].encode('utf-8', 'surrogateescape'))
+                    text = text[end:]
+                    self.last_state = state
+                    yield state
+                    continue
+
+                # Incomplete state at the end of the buffer: read more or stop
+                if eof:
+                    return
+                chunk = fh.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    eof = True
+                    # Allow one more decode attempt on what we have
+                    if pos >= length:
+                        return
+                    continue
+                text += chunk.decode('utf-8', 'surrogateescape')
+
+    def poll(self):
+        """Consume all new states and return the latest one (or the previous one)."""
+        for _ in self.iter_new_states():
+            pass
+        self.save_checkpoint()
+        return self.last_state
+
+
+def extract_metrics(state, dev_index=0):
+    """Extract CSV metrics for one device (first by default) from a single qmassa state."""
+    devs_state = state.get('devs_state', [])
+
+    if len(devs_state) <= dev_index:
+        return None
+
+    dev = devs_state[dev_index]
+    dev_stats = dev.get('dev_stats', {})
+
+    # Extract metrics
+    metrics = {}
+
+    # Power (average of latest samples)
+    power_data = dev_stats.get('power', [])
+    if power_data:
+        latest_power = power_data[-1]
+        metrics['gpu_power'] = latest_power.get('gpu_cur_power', 0)
+    else:
+        metrics['gpu_power'] = 0
+
+    # Frequency (gt0 compute, gt1 media)
+    freqs_data = dev_stats.get('freqs', [])
+    if freqs_data and freqs_data[-1]:
+        latest_freqs = freqs_data[-1]
+        if len(latest_freqs) > 0:
+            metrics['gpu_freq'] = latest_freqs[0].get('act_freq', 0)
+        if len(latest_freqs) > 1:
+            metrics['media_freq'] = latest_freqs[1].get('act_freq', 0)
+    else:
+        metrics['gpu_freq'] = 0
+        metrics['media_freq'] = 0
+
+    # Memory
+    mem_info = dev_stats.get('mem_info', [])
+    if mem_info:
+        latest_mem = mem_info[-1]
+        vram_used_bytes = latest_mem.get('vram_used', 0)
+        metrics['mem_used'] = vram_used_bytes / (1024 * 1024)  # Convert to MiB
+    else:
+        metrics['mem_used'] = 0
+
+    # Engine usage (average of latest samples)
+    eng_usage = dev_stats.get('eng_usage', {})
+
+    # VCS (video codec - decoder)
+    vcs_usage = eng_usage.get('vcs', [])
+    if vcs_usage:
+        # qmassa may have multiple VCS engines, use first two
+        metrics['decoder0'] = vcs_usage[0] if len(vcs_usage) > 0 else 0
+        metrics['decoder1'] = vcs_usage[1] if len(vcs_usage) > 1 else 0
+    else:
+        metrics['decoder0'] = 0
+        metrics['decoder1'] = 0
+
+    # CCS (compute)
+    ccs_usage = eng_usage.get('ccs', [])
+    metrics['compute_util'] = ccs_usage[-1] if ccs_usage else 0
+
+    # VECS (video enhancement)
+    vecs_usage = eng_usage.get('vecs', [])
+    if vecs_usage:
+        metrics['media_enh0'] = vecs_usage[0] if len(vecs_usage) > 0 else 0
+        metrics['media_enh1'] = vecs_usage[1] if len(vecs_usage) > 1 else 0
+    else:
+        metrics['media_enh0'] = 0
+        metrics['media_enh1'] = 0
+
+    # BCS (copy engine)
+    bcs_usage = eng_usage.get('bcs', [])
+    metrics['copy_eng'] = bcs_usage[-1] if bcs_usage else 0
+
+    # RCS (render/encoder - approximation)
+    rcs_usage = eng_usage.get('rcs', [])
+    if rcs_usage:
+        metrics['encoder0'] = rcs_usage[0] if len(rcs_usage) > 0 else 0
+        metrics['encoder1'] = rcs_usage[1] if len(rcs_usage) > 1 else 0
+    else:
+        metrics['encoder0'] = 0
+        metrics['encoder1'] = 0
+
+    # GPU utilization (approximate from engine usage)
+    all_engines = []
+    for eng in [vcs_usage, ccs_usage, vecs_usage, bcs_usage, rcs_usage]:
+        if eng:
+            all_engines.extend([e for e in eng if isinstance(e, (int, float))])
+    metrics['gpu_util'] = max(all_engines) if all_engines else 0
+
+    # Temperatures (if available)
+    temps = dev_stats.get('temps', [])
+    gpu_temp, mem_temp = split_temps(temps[-1] if temps else [])
+    metrics['gpu_temp'] = gpu_temp if gpu_temp is not None else 0
+    metrics['mem_temp'] = mem_temp if mem_temp is not None else 0
+
+    return metrics
+
+
+def split_temps(sensors):
+    """Pick GPU and memory temperatures from one qmassa temps sample.
+
+    Returns (gpu_temp, mem_temp); either is None when no matching sensor exists.
+    """
+    gpu_temps = []
+    mem_temps = []
+    for sensor in sensors or []:
+        if not isinstance(sensor, dict):
+            continue
+        temp = sensor.get('temp')
+        if not isinstance(temp, (int, float)):
+            continue
+        name = str(sensor.get('name', '')).lower()
+        if 'vram' in name or 'mem' in name:
+            mem_temps.append(temp)
+        else:
+            gpu_temps.append(temp)
+    return (max(gpu_temps) if gpu_temps else None,
+            max(mem_temps) if mem_temps else None)
+
+
+def _latest(samples):
+    """Return the most recent sample of a qmassa series, or None."""
+    if isinstance(samples, list) and samples:
+        return samples[-1]
+    return None
+
+
+def _number(value):
+    """Coerce a qmassa value to float, mapping anything else to NaN."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return math.nan
+    return float(value)
+
+
+def state_columns(dev_stats):
+    """Flatten the latest sample of every dev_stats series into named columns."""
+    row = {}
+
+    power = _latest(dev_stats.get('power'))
+    if isinstance(power, dict):
+        for key, name in (('gpu_cur_power', 'gpu_power'), ('gpu_max_power', 'gpu_max_power'),
+                          ('pkg_cur_power', 'pkg_power'), ('pkg_max_power', 'pkg_max_power')):
+            if key in power:
+                row[name] = _number(power.get(key))
+
+    freqs = _latest(dev_stats.get('freqs'))
+    if isinstance(freqs, list):
+        for gt_idx, gt in enumerate(freqs):
+            if not isinstance(gt, dict):
+                continue
+            for key in ('act_freq', 'cur_freq', 'min_freq', 'max_freq'):
+                if key in gt:
+                    row[f'gt{gt_idx}_{key}'] = _number(gt.get(key))
+
+    mem = _latest(dev_stats.get('mem_info'))
+    if isinstance(mem, dict):
+        for key in ('vram_used', 'vram_total', 'smem_used', 'smem_total'):
+            if key in mem:
+                row[f'{key}_mib'] = _number(mem.get(key)) / (1024 * 1024)
+
+    eng_usage = dev_stats.get('eng_usage', {})
+    engine_values = []
+    if isinstance(eng_usage, dict):
+        # One column per engine instance, matching decoder0/decoder1 in the CSV
+        for eng_name, usage in eng_usage.items():
+            instances = usage if isinstance(usage, list) else [usage]
+            for inst_idx, inst_value in enumerate(instances):
+                value = _number(inst_value)
+                row[f'eng_{eng_name}{inst_idx}'] = value
+                if not math.isnan(value):
+                    engine_values.append(value)
+    row['gpu_util'] = max(engine_values) if engine_values else math.nan
+
+    temps = _latest(dev_stats.get('temps'))
+    if isinstance(temps, list):
+        for sensor in temps:
+            if isinstance(sensor, dict) and 'name' in sensor:
+                row[f"temp_{sensor['name']}"] = _number(sensor.get('temp'))
+        gpu_temp, mem_temp = split_temps(temps)
+        row['gpu_temp'] = gpu_temp if gpu_temp is not None else math.nan
+        row['mem_temp'] = mem_temp if mem_temp is not None else math.nan
+
+    return row
+
+
+class QmassaSeries:
+    """Columnar NumPy time series for every device in a qmassa dump.
+
+    Each qmassa state becomes one row per device, taking the latest sample of
+    every dev_stats series (the same sample the CSV extraction reports).
+    Columns that appear mid-run are NaN-padded, so all columns of a device
+    share the device's row count.
+    """
+
+    REDUCTIONS = ('mean', 'p50', 'p95', 'max')
+
+    def __init__(self):
+        self.timestamps = {}  # device -> list of state timestamps
+        self._columns = {}    # device -> {column: list of float}
+        self._rows = {}       # device -> number of rows
+        self._arrays = None
+
+    @classmethod
+    def from_states(cls, states):
+        """Build a series from an iterable of qmassa states."""
+        series = cls()
+        for idx, state in enumerate(states):
+            series.append_state(state, idx)
+        return series
+
+    @classmethod
+    def from_file(cls, json_file):
+        """Stream every state of a dump into a series without loading the whole file."""
+        return cls.from_states(QmassaTailReader(json_file).iter_new_states())
+
+    def append_state(self, state, index=None):
+        """Add one row per device from a single qmassa state."""
+        timestamp = _latest(state.get('timestamps'))
+        if not isinstance(timestamp, (int, float)):
+            timestamp = index if index is not None else sum(self._rows.values())
+
+        for dev_idx, dev in enumerate(state.get('devs_state', []) or []):
+            device = str(dev.get('pci_dev') or dev_idx)
+            row = state_columns(dev.get('dev_stats', {}) or {})
+            columns = self._columns.setdefault(device, {})
+            nrows = self._rows.get(device, 0)
+
+            for name, value in row.items():
+                if name not in columns:
+                    columns[name] = [math.nan] * nrows
+                columns[name].append(value)
+            for name, values in columns.items():
+                if len(values) == nrows:
+                    values.append(math.nan)
+
+            self.timestamps.setdefault(device, []).append(float(timestamp))
+            self._rows[device] = nrows + 1
+        self._arrays = None
+
+    @property
+    def devices(self):
+        """Device identifiers (PCI slot when qmassa reports it)."""
+        return list(self._columns)
+
+    def arrays(self):
+        """Return {device: {column: np.ndarray}} with float64 columns."""
+        if self._arrays is None:
+            self._arrays = {
+                device: {name: np.asarray(values, dtype=np.float64)
+                         for name, values in columns.items()}
+                for device, columns in self._columns.items()
+            }
+        return self._arrays
+
+    def columns(self, device):
+        """Column names available for a device."""
+        return list(self._columns.get(device, {}))
+
+    def column(self, device, name):
+        """Return a single column as a NumPy array."""
+        return self.arrays()[device][name]
+
+    def reduce(self, device=None):
+        """Vectorized mean/p50/p95/max over all columns.
+
+        Returns {device: {column: {stat: value}}}; NaN samples are ignored and
+        all-NaN columns reduce to None.
+        """
+        devices = [device] if device is not None else self.devices
+        summary = {}
+        for dev in devices:
+            cols = self.arrays().get(dev, {})
+            if not cols:
+                summary[dev] = {}
+                continue
+            names = list(cols)
+            matrix = np.column_stack([cols[n] for n in names])
+            valid = ~np.all(np.isnan(matrix), axis=0)
+            stats = {key: np.full(len(names), np.nan) for key in self.REDUCTIONS}
+            if valid.any():
+                sub = matrix[:, valid]
+                stats['mean'][valid] = np.nanmean(sub, axis=0)
+                p50, p95 = np.nanpercentile(sub, [50, 95], axis=0)
+                stats['p50'][valid] = p50
+                stats['p95'][valid] = p95
+                stats['max'][valid] = np.nanmax(sub, axis=0)
+            summary[dev] = {
+                name: {key: (None if np.isnan(stats[key][i]) else round(float(stats[key][i]), 3))
+                       for key in self.REDUCTIONS}
+                for i, name in enumerate(names)
+            }
+        return summary
+
+
 def parse_qmassa_json(json_file):
     """Extract latest metrics from qmassa JSON."""
     try:
         with open(json_file, 'r') as f:
             data = json.load(f)
-        
+
         # Get the latest state (last item in states array)
         states = data.get('states', [])
         if not states:
             return None
-        
-        latest_state = states[-1]
-        devs_state = latest_state.get('devs_state', [])
-        
-        if not devs_state:
+
+        return extract_metrics(states[-1])
+
+    except Exception as e:
+        print(f"Error parsing JSON: {e}", file=sys.stderr)
+        return None
+
+
+def parse_qmassa_json_incremental(json_file, checkpoint_file=None):
+    """Extract latest metrics, decoding only states appended since the last call.
+
+    The byte-offset checkpoint is kept in ``<json_file>.ckpt`` by default so
+    repeated invocations from a polling loop stay O(new data).
+    """
+    if checkpoint_file is None:
+        checkpoint_file = json_file + CHECKPOINT_SUFFIX
+    try:
+        state = QmassaTailReader(json_file, checkpoint_file).poll()
+        if not state:
             return None
-        
-        # Get first device stats
-        dev = devs_state[0]
-        dev_stats = dev.get('dev_stats', {})
-        
-        # Extract metrics
-        metrics = {}
-        
-        # Power (average of latest samples)
-        power_data = dev_stats.get('power', [])
-        if power_data:
-            latest_power = power_data[-1]
-            metrics['gpu_power'] = latest_power.get('gpu_cur_power', 0)
-        else:
-            metrics['gpu_power'] = 0
-        
-        # Frequency (gt0 compute, gt1 media)
-        freqs_data = dev_stats.get('freqs', [])
-        if freqs_data and freqs_data[-1]:
-            latest_freqs = freqs_data[-1]
-            if len(latest_freqs) > 0:
-                metrics['gpu_freq'] = latest_freqs[0].get('act_freq', 0)
-            if len(latest_freqs) > 1:
-                metrics['media_freq'] = latest_freqs[1].get('act_freq', 0)
-        else:
-            metrics['gpu_freq'] = 0
-            metrics['media_freq'] = 0
-        
-        # Memory
-        mem_info = dev_stats.get('mem_info', [])
-        if mem_info:
-            latest_mem = mem_info[-1]
-            vram_used_bytes = latest_mem.get('vram_used', 0)
-            metrics['mem_used'] = vram_used_bytes / (1024 * 1024)  # Convert to MiB
-        else:
-            metrics['mem_used'] = 0
-        
-        # Engine usage (average of latest samples)
-        eng_usage = dev_stats.get('eng_usage', {})
-        
-        # VCS (video codec - decoder)
-        vcs_usage = eng_usage.get('vcs', [])
-        if vcs_usage:
-            # qmassa may have multiple VCS engines, use first two
-            metrics['decoder0'] = vcs_usage[0] if len(vcs_usage) > 0 else 0
-            metrics['decoder1'] = vcs_usage[1] if len(vcs_usage) > 1 else 0
-        else:
-            metrics['decoder0'] = 0
-            metrics['decoder1'] = 0
-        
-        # CCS (compute)
-        ccs_usage = eng_usage.get('ccs', [])
-        metrics['compute_util'] = ccs_usage[-1] if ccs_usage else 0
-        
-        # VECS (video enhancement)
-        vecs_usage = eng_usage.get('vecs', [])
-        if vecs_usage:
-            metrics['media_enh0'] = vecs_usage[0] if len(vecs_usage) > 0 else 0
-            metrics['media_enh1'] = vecs_usage[1] if len(vecs_usage) > 1 else 0
-        else:
-            metrics['media_enh0'] = 0
-            metrics['media_enh1'] = 0
-        
-        # BCS (copy engine)
-        bcs_usage = eng_usage.get('bcs', [])
-        metrics['copy_eng'] = bcs_usage[-1] if bcs_usage else 0
-        
-        # RCS (render/encoder - approximation)
-        rcs_usage = eng_usage.get('rcs', [])
-        if rcs_usage:
-            metrics['encoder0'] = rcs_usage[0] if len(rcs_usage) > 0 else 0
-            metrics['encoder1'] = rcs_usage[1] if len(rcs_usage) > 1 else 0
-        else:
-            metrics['encoder0'] = 0
-            metrics['encoder1'] = 0
-        
-        # GPU utilization (approximate from engine usage)
-        all_engines = []
-        for eng in [vcs_usage, ccs_usage, vecs_usage, bcs_usage, rcs_usage]:
-            if eng:
-                all_engines.extend([e for e in eng if isinstance(e, (int, float))])
-        metrics['gpu_util'] = max(all_engines) if all_engines else 0
-        
-        # Temperatures (if available)
-        temps = dev_stats.get('temps', [])
-        metrics['gpu_temp'] = 0
-        metrics['mem_temp'] = 0
-        
-        return metrics
-        
+        return extract_metrics(state)
     except Exception as e:
         print(f"Error parsing JSON: {e}", file=sys.stderr)
         return None
 
+
 if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print("Usage: parse_qmassa.py <json_file>", file=sys.stderr)
-        sys.exit(1)
-    
-    metrics = parse_qmassa_json(sys.argv[1])
-    
+    parser = argparse.ArgumentParser(description="Parse qmassa JSON output and extract metrics for CSV.")
+    parser.add_argument('json_file', help="qmassa JSON dump")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--incremental', action='store_true',
+                      help="Only decode states appended since the last call (checkpoint in <json_file>.ckpt)")
+    mode.add_argument('--summary', action='store_true',
+                      help="Print run-level mean/p50/p95/max of every metric for every device as JSON")
+    args = parser.parse_args()
+
+    if args.summary:
+        try:
+            print(json.dumps(QmassaSeries.from_file(args.json_file).reduce(), indent=2))
+        except Exception as e:
+            print(f"Error parsing JSON: {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+
+    if args.incremental:
+        metrics = parse_qmassa_json_incremental(args.json_file)
+    else:
+        metrics = parse_qmassa_json(args.json_file)
+
     if metrics:
         # Output in CSV-friendly format
         print(f"{metrics['gpu_util']},{metrics['gpu_power']},{metrics['gpu_freq']},"
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: (C) 2024 - 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+GStreamer Pipeline Builder for the Edge Pipelines
+Usage: python3 pipeline_builder.py launch -p CONFIG -d DEVICE -c DEVICE [-b BATCH] [-n STREAMS] [--shared-decode] [--set [DEV.]KEY=VALUE ...]
+       python3 pipeline_builder.py decode|detect|classify -p CONFIG [-d DEVICE] [-b BATCH] [--set ...]
+       python3 pipeline_builder.py profiles
+
+Renders gst-launch descriptions from declarative pipeline profiles (video,
+detection and classification models of light/medium/heavy) and per-device
+inference settings, instead of concatenating strings in shell:
+
+  launch    the full description for -n streams: N copies of the pipeline
+            (one decoder per stream), or with --shared-decode one decoder
+            feeding N branches through a tee
+  decode, detect, classify
+            one stage, for the construct_* functions of pipeline_constructor.sh
+  profiles  the profiles and device defaults
+
+--set overrides a device setting, for every device (nireq=4) or one device
+family or device (GPU.nireq=4, GPU.1.num-streams=1, NPU.batch=1). Settings:
+nireq, num-streams (OpenVINO NUM_STREAMS), inference-interval, batch (fixes
+the batch size of the device) and queue-size (max-size-buffers of the queues).
+
+With MODEL_CACHE_DIR (the model cache root in the container) set, every
+inference element gets an OpenVINO CACHE_DIR; with MODEL_CACHE_HOST (the same
+root on the host) each element its own entry from model_cache.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from dataclasses import dataclass, field, fields, replace
+
+from model_cache import model_key
+
+PIPE_ROOT = "/home/dlstreamer/pipelines"
+PIPE_HOST_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pipelines")
+
+
+@dataclass(frozen=True)
+class Model:
+    path: str
+    instance_id: str
+    proc: str | None = None
+
+
+@dataclass(frozen=True)
+class Profile:
+    video: str
+    detection: Model
+    classification: tuple[Model, ...]
+
+
+@dataclass
+class DeviceSettings:
+    preprocess: str
+    nireq: int | None = None
+    num_streams: int | None = None
+    batch: int | None = None          # fixed batch size of the device, None: the -b value
+    inference_interval: int = 3
+    queue_size: int | None = None
+
+
+@dataclass
+class Element:
+    factory: str
+    props: dict = field(default_factory=dict)
+
+    def render(self) -> str:
+        return ' '.join([self.factory] + [f"{k}={v}" for k, v in self.props.items() if v is not None])
+
+
+def _classifier(config: str, name: str, xml: str, proc: str, instance_id: str) -> Model:
+    base = f"{PIPE_ROOT}/{config}/classification/{name}"
+    return Model(f"{base}/INT8/{xml}", instance_id, f"{base}/{proc}")
+
+
+def _resnet(config: str) -> Model:
+    return _classifier(config, "resnet-v1-50-tf", "resnet-v1-50-tf.xml", "resnet-50.json", "resnet50")
+
+
+def _mobilenet(config: str) -> Model:
+    return _classifier(config, "mobilenet-v2-1.0-224-tf", "mobilenet-v2-1.0-224.xml", "mobilenet-v2.json", "mobilenetv2")
+
+
+PROFILES = {
+    "light": Profile(
+        video=f"{PIPE_ROOT}/light/video/bears.h265",
+        detection=Model(f"{PIPE_ROOT}/light/detection/yolov11n_640x640/INT8/yolo11n.xml", "yolov11n"),
+        classification=(_resnet("light"),),
+    ),
+    "medium": Profile(
+        video=f"{PIPE_ROOT}/medium/video/apple.h265",
+        detection=Model(f"{PIPE_ROOT}/medium/detection/yolov5m_640x640/INT8/yolov5m-640_INT8.xml", "yolov5m",
+                        f"{PIPE_ROOT}/medium/detection/yolov5m_640x640/yolo-v5.json"),
+        classification=(_resnet("medium"), _mobilenet("medium")),
+    ),
+    "heavy": Profile(
+        video=f"{PIPE_ROOT}/heavy/video/bears.h265",
+        detection=Model(f"{PIPE_ROOT}/heavy/detection/yolov11m_640x640/INT8/yolo11m.xml", "yolov11m"),
+        classification=(_resnet("heavy"), _mobilenet("heavy")),
+    ),
+}
+
+DEVICE_DEFAULTS = {
+    "CPU": DeviceSettings(preprocess="opencv"),
+    "GPU": DeviceSettings(preprocess="va-surface-sharing", nireq=2, num_streams=2),
+    "NPU": DeviceSettings(preprocess="opencv", nireq=4, batch=1),
+}
+
+TUNABLE = ('nireq', 'num_streams', 'inference_interval', 'batch', 'queue_size')
+TRACKER = Element("gvatrack", {"tracking-type": 1, "config": "tracking_per_class=false"})
+FPS_COUNTER = Element("gvafpscounter", {"starting-frame": 2000})
+SINK = Element("fakesink", {"sync": "false", "async": "false"})
+
+
+def device_family(device: str) -> str:
+    family = device.split('.')[0]
+    if family not in DEVICE_DEFAULTS or (family != "GPU" and family != device):
+        raise ValueError(f"unknown device {device}")
+    return family
+
+
+def parse_overrides(items: list[str]) -> dict[str, dict[str, int]]:
+    """[DEV.]KEY=VALUE items -> {scope: {setting: value}}, scope '*' for every device."""
+    overrides: dict[str, dict[str, int]] = {}
+    for item in items:
+        name, sep, value = item.partition('=')
+        scope, _, key = name.rpartition('.')
+        key = key.replace('-', '_')
+        if not sep or key not in TUNABLE:
+            raise ValueError(f"invalid setting {item} (expected [DEVICE.]KEY=VALUE, KEY one of "
+                             f"{', '.join(k.replace('_', '-') for k in TUNABLE)})")
+        try:
+            number = int(value)
+        except ValueError:
+            raise ValueError(f"invalid value in {item} (expected an integer)") from None
+        if number < (0 if key == 'queue_size' else 1):
+            raise ValueError(f"invalid value in {item}")
+        overrides.setdefault(scope or '*', {})[key] = number
+    return overrides
+
+
+def device_settings(device: str, overrides: dict[str, dict[str, int]]) -> DeviceSettings:
+    """Device defaults with the overrides of every device, the family and the device applied in that order."""
+    family = device_family(device)
+    settings = replace(DEVICE_DEFAULTS[family])
+    for scope in dict.fromkeys(('*', family, device)):
+        for key, value in overrides.get(scope, {}).items():
+            setattr(settings, key, value)
+    return settings
+
+
+def queue(settings: DeviceSettings | None = None) -> Element:
+    size = settings.queue_size if settings else None
+    return Element("queue", {"max-size-buffers": size})
+
+
+def inference_config(model: Model, device: str, batch: int, settings: DeviceSettings) -> dict:
+    """nireq/ie-config properties of an element, with its model cache entry when enabled."""
+    ie_config = [f"NUM_STREAMS={settings.num_streams}"] if settings.num_streams else []
+    props = {"nireq": settings.nireq, "ie-config": ','.join(ie_config) or None}
+    cache_dir = os.environ.get('MODEL_CACHE_DIR')
+    if cache_dir:
+        host_root = os.environ.get('MODEL_CACHE_HOST')
+        if host_root:
+            # Keyed on the element config before the cache is added (same key as a plain nireq/ie-config run)
+            config = ' '.join(f"{k}={v}" for k, v in props.items() if v is not None)
+            host_model = PIPE_HOST_ROOT + model.path[len(PIPE_ROOT):] if model.path.startswith(PIPE_ROOT) else model.path
+            cache_dir = f"{cache_dir}/{model_key(host_root, host_model, device, batch, config)}"
+        props["ie-config"] = ','.join([f"CACHE_DIR={cache_dir}"] + ie_config)
+    return props
+
+
+def inference_element(factory: str, model: Model, device: str, batch: int, settings: DeviceSettings,
+                      extra: dict) -> Element:
+    props = {
+        "model": model.path,
+        "model-proc": model.proc,
+        "device": device,
+        "pre-process-backend": settings.preprocess,
+        **inference_config(model, device, batch, settings),
+        "batch-size": batch,
+        "inference-interval": settings.inference_interval,
+        **extra,
+        "model-instance-id": model.instance_id,
+    }
+    return Element(factory, props)
+
+
+def decode(profile: Profile) -> list[Element]:
+    return [
+        Element("filesrc", {"location": profile.video}),
+        Element("h265parse"),
+        Element("vah265dec"),
+        Element("capsfilter", {"caps": '"video/x-raw(memory:VAMemory)"'}),
+    ]
+
+
+def detection(profile: Profile, device: str, batch: int, overrides: dict) -> list[Element]:
+    settings = device_settings(device, overrides)
+    batch = settings.batch or batch
+    return [inference_element("gvadetect", profile.detection, device, batch, settings, {"threshold": 0.5})]
+
+
+def classification(profile: Profile, device: str, batch: int, overrides: dict) -> list[Element]:
+    settings = device_settings(device, overrides)
+    batch = settings.batch or batch
+    elements: list[Element] = []
+    for model in profile.classification:
+        if elements:
+            elements.append(queue(settings))
+        elements.append(inference_element("gvaclassify", model, device, batch, settings, {"inference-region": 1}))
+    return elements
+
+
+def analytics(profile: Profile, detect: str, classify: str, batch: int, overrides: dict) -> list[Element]:
+    """Everything after the decoder of one stream."""
+    detect_settings = device_settings(detect, overrides)
+    classify_settings = device_settings(classify, overrides)
+    return [
+        queue(detect_settings), *detection(profile, detect, batch, overrides),
+        queue(detect_settings), TRACKER,
+        queue(classify_settings), *classification(profile, classify, batch, overrides),
+        queue(classify_settings), FPS_COUNTER, SINK,
+    ]
+
+
+def render(elements: list[Element]) -> str:
+    return ' ! '.join(element.render() for element in elements)
+
+
+def launch(profile: Profile, detect: str, classify: str, batch: int, streams: int = 1,
+           shared_decode: bool = False, overrides: dict | None = None) -> str:
+    overrides = overrides or {}
+    branch = analytics(profile, detect, classify, batch, overrides)
+    if not shared_decode:
+        return ' '.join([render(decode(profile) + branch)] * streams)
+    # One decoder, one tee branch per stream; each branch keeps its own fpscounter stream
+    tee = render(decode(profile) + [Element("tee", {"name": "t"})])
+    return ' '.join([tee] + [f"t. ! {render(branch)}"] * streams)
+
+
+def describe_profiles() -> None:
+    for name, profile in PROFILES.items():
+        print(f"{name}: {os.path.basename(profile.video)}, detect {os.path.basename(profile.detection.path)}, "
+              f"classify {' + '.join(os.path.basename(m.path) for m in profile.classification)}")
+    for family, settings in DEVICE_DEFAULTS.items():
+        values = ', '.join(f"{f.name.replace('_', '-')}={getattr(settings, f.name)}" for f in fields(settings))
+        print(f"{family}: {values}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render gst-launch descriptions of the edge pipelines")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('-p', '--config', default='light', help="Pipeline config: light, medium or heavy (default: light)")
+    common.add_argument('-b', '--batch', type=int, default=1, help="Inference batch size (default: 1)")
+    common.add_argument('--set', action='append', default=[], metavar='[DEV.]KEY=VALUE',
+                        help="Override a device setting (repeatable)")
+
+    sub.add_parser('decode', parents=[common], help="Decode stage")
+    for stage in ('detect', 'classify'):
+        stage_parser = sub.add_parser(stage, parents=[common], help=f"{stage.capitalize()} stage")
+        stage_parser.add_argument('-d', '--device', default='CPU', help="Inference device (default: CPU)")
+    launch_parser = sub.add_parser('launch', parents=[common], help="Full gst-launch description")
+    launch_parser.add_argument('-d', '--detect', default='CPU', help="Detection device (default: CPU)")
+    launch_parser.add_argument('-c', '--classify', default='CPU', help="Classification device (default: CPU)")
+    launch_parser.add_argument('-n', '--streams', type=int, default=1, help="Number of streams (default: 1)")
+    launch_parser.add_argument('--shared-decode', action='store_true',
+                               help="Decode once and feed every stream through a tee")
+    sub.add_parser('profiles', help="List the pipeline profiles and device defaults")
+    args = parser.parse_args()
+
+    if args.command == 'profiles':
+        describe_profiles()
+        return 0
+
+    profile = PROFILES.get(args.config)
+    if profile is None:
+        print(f"[ Error ] pipeline_builder: unknown config {args.config}", file=sys.stderr)
+        return 1
+    try:
+        overrides = parse_overrides(args.set)
+        if args.command == 'decode':
+            print(render(decode(profile)))
+        elif args.command == 'detect':
+            print(render(detection(profile, args.device, args.batch, overrides)))
+        elif args.command == 'classify':
+            print(render(classification(profile, args.device, args.batch, overrides)))
+        else:
+            if args.streams < 1:
+                raise ValueError("-n must be a positive integer")
+            print(launch(profile, args.detect, args.classify, args.batch, args.streams,
+                         args.shared_decode, overrides))
+    except ValueError as e:
+        print(f"[ Error ] pipeline_builder: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,22 +3,70 @@
 """
 GPU Metrics Plotting Script
 Usage: python3 plot_gpu_metrics.py <gpu_monitor.csv> [output_dir]
+       python3 plot_gpu_metrics.py <a.csv> <b.csv> ... [-o output_dir] [-j jobs]
+
+Long captures are decimated to the plot's pixel width with a min/max-preserving
+filter before drawing, so spikes stay visible while an 8-hour 10 Hz capture draws
+a few thousand points instead of hundreds of thousands. Statistics are always
+computed on the full-resolution data. Several CSVs are rendered in parallel.
 """
 
+import argparse
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # headless, and faster than an interactive backend
 import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from datetime import datetime
 
-def plot_gpu_metrics(csv_file, output_dir=None):
+# Plot DPI and the per-point marker cut-off
+DEFAULT_DPI = 150
+MARKER_MAX_POINTS = 200
+
+
+def decimate_minmax(x, y, buckets):
+    """
+    Reduce (x, y) to at most 2*buckets points, keeping the min and max of every bucket
+    
+    Args:
+        x, y: 1-D numpy arrays of equal length (y may contain NaN)
+        buckets: Number of buckets, typically the plot width in pixels
+    """
+    n = len(y)
+    if buckets <= 0 or n <= 2 * buckets:
+        return x, y
+    size = -(-n // buckets)  # ceil
+    pad = size * buckets - n
+    rows = np.concatenate([y, np.full(pad, np.nan)]).reshape(buckets, size)
+    nan = np.isnan(rows)
+    # NaN/padding never wins; an all-NaN bucket falls back to its first sample
+    imin = np.where(nan, np.inf, rows).argmin(axis=1)
+    imax = np.where(nan, -np.inf, rows).argmax(axis=1)
+    base = np.arange(buckets) * size
+    idx = np.sort(np.stack([base + imin, base + imax], axis=1), axis=1).ravel()
+    idx = np.unique(np.minimum(idx, n - 1))
+    return x[idx], y[idx]
+
+
+def plot_series(ax, x, y, color, pixels):
+    """Draw one metric, decimated to the axes width, with markers only for short series"""
+    xs, ys = decimate_minmax(x, y, pixels)
+    if len(ys) <= MARKER_MAX_POINTS:
+        ax.plot(xs, ys, linewidth=1.5, color=color, marker='o', markersize=3)
+    else:
+        ax.plot(xs, ys, linewidth=1.0, color=color)
+
+
+def plot_gpu_metrics(csv_file, output_dir=None, dpi=DEFAULT_DPI):
     """
     Plot GPU monitoring metrics from CSV file
     
     Args:
         csv_file: Path to gpu_monitor.csv file
         output_dir: Directory to save plots (default: same as CSV file)
+        dpi: Resolution of the saved PNGs
     """
     
     # Read CSV file
@@ -31,7 +79,7 @@ def plot_gpu_metrics(csv_file, output_dir=None):
     
     # Set output directory
     if output_dir is None:
-        output_dir = os.path.dirname(csv_file)
+        output_dir = os.path.dirname(csv_file) or '.'
     os.makedirs(output_dir, exist_ok=True)
     
     # Parse timestamp
@@ -65,10 +113,10 @@ def plot_gpu_metrics(csv_file, output_dir=None):
     # Calculate relative time in seconds from start for better plotting
     if use_time_axis and isinstance(df['Time'].iloc[0], pd.Timestamp):
         df['Time_seconds'] = (df['Time'] - df['Time'].iloc[0]).dt.total_seconds()
-        x_axis_data = df['Time_seconds']
+        x_axis_data = df['Time_seconds'].to_numpy(dtype=float)
         x_label = 'Time (seconds from start)'
     else:
-        x_axis_data = df.index
+        x_axis_data = np.arange(len(df), dtype=float)
         x_label = 'Sample Index'
     
     # Get model info for title
@@ -132,6 +180,14 @@ def plot_gpu_metrics(csv_file, output_dir=None):
             else:
                 engine_metrics[col] = {'ylabel': 'Utilization (%)', 'ylim': [0, 100]}
     
+    # Convert every metric column to numeric once; plots and summaries reuse these arrays
+    metric_columns = [c for c in available_columns if c not in ('Timestamp', 'Time', 'Time_seconds', 'Model Name', 'Batch Size', 'DeviceId')]
+    values = {col: pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float) for col in metric_columns}
+    stats = {}
+    for col, arr in values.items():
+        valid = arr[~np.isnan(arr)]
+        stats[col] = (valid.mean(), valid.max(), valid.min()) if len(valid) else (np.nan, np.nan, np.nan)
+    
     # Plot 1: Main GPU Metrics (dynamic grid based on number of metrics)
     num_main_metrics = len(metrics)
     if num_main_metrics > 0:
@@ -147,12 +203,12 @@ def plot_gpu_metrics(csv_file, output_dir=None):
         else:
             axes1_flat = axes1.flatten()
         
+        # Roughly one decimation bucket per horizontal pixel of each subplot
+        pixels = int(20 / ncols * dpi)
         for idx, (metric, config) in enumerate(metrics.items()):
             ax = axes1_flat[idx]
-            if metric in df.columns:
-                # Convert to numeric, replacing any non-numeric values with NaN
-                data = pd.to_numeric(df[metric], errors='coerce')
-                ax.plot(x_axis_data, data, linewidth=1.5, color='#2E86AB', marker='o', markersize=3)
+            if metric in values:
+                plot_series(ax, x_axis_data, values[metric], '#2E86AB', pixels)
                 ax.set_xlabel(x_label)
                 ax.set_ylabel(config['ylabel'])
                 ax.set_title(metric, fontweight='bold')
@@ -162,9 +218,7 @@ def plot_gpu_metrics(csv_file, output_dir=None):
                     ax.set_ylim(config['ylim'])
                 
                 # Add statistics
-                mean_val = data.mean()
-                max_val = data.max()
-                min_val = data.min()
+                mean_val, max_val, min_val = stats[metric]
                 
                 stats_text = f'Avg: {mean_val:.2f}\nMax: {max_val:.2f}\nMin: {min_val:.2f}'
                 ax.text(0.02, 0.98, stats_text, transform=ax.transAxes,
@@ -177,7 +231,7 @@ def plot_gpu_metrics(csv_file, output_dir=None):
         
         plt.tight_layout()
         output_file1 = os.path.join(output_dir, 'gpu_metrics_main.png')
-        plt.savefig(output_file1, dpi=150, bbox_inches='tight')
+        plt.savefig(output_file1, dpi=dpi, bbox_inches='tight')
         plt.close(fig1)
         print(f"Saved main metrics plot to {output_file1}")
     else:
@@ -198,11 +252,11 @@ def plot_gpu_metrics(csv_file, output_dir=None):
         else:
             axes2_flat = axes2.flatten()
         
+        pixels = int(16 / ncols * dpi)
         for idx, (metric, config) in enumerate(engine_metrics.items()):
             ax = axes2_flat[idx]
-            if metric in df.columns:
-                data = pd.to_numeric(df[metric], errors='coerce')
-                ax.plot(x_axis_data, data, linewidth=1.5, color='#A23B72', marker='o', markersize=3)
+            if metric in values:
+                plot_series(ax, x_axis_data, values[metric], '#A23B72', pixels)
                 ax.set_xlabel(x_label)
                 ax.set_ylabel(config['ylabel'])
                 ax.set_title(metric, fontweight='bold')
@@ -212,8 +266,7 @@ def plot_gpu_metrics(csv_file, output_dir=None):
                     ax.set_ylim(config['ylim'])
                 
                 # Add statistics
-                mean_val = data.mean()
-                max_val = data.max()
+                mean_val, max_val, _ = stats[metric]
                 
                 if 'Frequency' in metric:
                     stats_text = f'Avg: {mean_val:.0f}\nMax: {max_val:.0f}'
@@ -229,7 +282,7 @@ def plot_gpu_metrics(csv_file, output_dir=None):
         
         plt.tight_layout()
         output_file2 = os.path.join(output_dir, 'gpu_metrics_engines.png')
-        plt.savefig(output_file2, dpi=150, bbox_inches='tight')
+        plt.savefig(output_file2, dpi=dpi, bbox_inches='tight')
         plt.close(fig2)
         print(f"Saved engine metrics plot to {output_file2}")
     else:
@@ -253,54 +306,93 @@ def plot_gpu_metrics(csv_file, output_dir=None):
         'GPU Memory Used (MiB)'
     ]
     
+    def print_stats(col):
+        mean_val, max_val, min_val = stats[col]
+        print(f"{col:45s}: Avg={mean_val:7.2f}, Max={max_val:7.2f}, Min={min_val:7.2f}")
+    
     for metric in key_metrics:
-        if metric in df.columns:
-            data = pd.to_numeric(df[metric], errors='coerce')
-            print(f"{metric:45s}: Avg={data.mean():7.2f}, Max={data.max():7.2f}, Min={data.min():7.2f}")
+        if metric in stats:
+            print_stats(metric)
     
     # Print all compute engines
     for col in sorted(available_columns):
         if 'Compute Engine' in col and col not in key_metrics:
-            data = pd.to_numeric(df[col], errors='coerce')
-            print(f"{col:45s}: Avg={data.mean():7.2f}, Max={data.max():7.2f}, Min={data.min():7.2f}")
+            print_stats(col)
     
     # Print decoder engines
     for col in sorted(available_columns):
         if 'Decoder Engine' in col:
-            data = pd.to_numeric(df[col], errors='coerce')
-            print(f"{col:45s}: Avg={data.mean():7.2f}, Max={data.max():7.2f}, Min={data.min():7.2f}")
+            print_stats(col)
     
     # Print encoder engines
     for col in sorted(available_columns):
         if 'Encoder Engine' in col:
-            data = pd.to_numeric(df[col], errors='coerce')
-            print(f"{col:45s}: Avg={data.mean():7.2f}, Max={data.max():7.2f}, Min={data.min():7.2f}")
+            print_stats(col)
     
     # Print media enhancement engines
     for col in sorted(available_columns):
         if 'Media Enhancement Engine' in col:
-            data = pd.to_numeric(df[col], errors='coerce')
-            print(f"{col:45s}: Avg={data.mean():7.2f}, Max={data.max():7.2f}, Min={data.min():7.2f}")
+            print_stats(col)
     
     print("="*60)
     print(f"\nPlots saved to: {output_dir}")
 
+def _plot_job(job):
+    csv_file, output_dir, dpi = job
+    plot_gpu_metrics(csv_file, output_dir, dpi)
+    return csv_file
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python3 plot_gpu_metrics.py <gpu_monitor.csv> [output_dir]")
-        print("\nExample:")
-        print("  python3 plot_gpu_metrics.py ./benchmark_results/gpu_monitor.csv")
-        print("  python3 plot_gpu_metrics.py ./benchmark_results/gpu_monitor.csv ./plots")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Plot GPU monitoring metrics from one or more gpu_monitor CSV files",
+        epilog="Example:\n"
+               "  python3 plot_gpu_metrics.py ./benchmark_results/gpu_monitor.csv\n"
+               "  python3 plot_gpu_metrics.py ./benchmark_results/gpu_monitor.csv ./plots\n"
+               "  python3 plot_gpu_metrics.py results/*/gpu_monitor.csv -j 8\n"
+               "  python3 plot_gpu_metrics.py results/*/gpu_monitor.csv -j 8 -o ./plots",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+', help="CSV file(s); a single CSV may be followed by an output directory")
+    parser.add_argument('-o', '--output-dir', default=None, help="Directory to save plots (default: next to each CSV)")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="Parallel render processes for multiple CSVs (default: CPU count)")
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI, help=f"PNG resolution (default: {DEFAULT_DPI})")
+    args = parser.parse_args()
     
-    csv_file = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    csv_files = args.paths
+    output_dir = args.output_dir
+    # Backwards compatible form: <gpu_monitor.csv> [output_dir]
+    if len(csv_files) == 2 and output_dir is None and not csv_files[1].endswith('.csv'):
+        csv_files, output_dir = csv_files[:1], csv_files[1]
     
-    if not os.path.exists(csv_file):
-        print(f"Error: CSV file not found: {csv_file}")
-        sys.exit(1)
+    for csv_file in csv_files:
+        if not os.path.exists(csv_file):
+            print(f"Error: CSV file not found: {csv_file}")
+            sys.exit(1)
     
-    plot_gpu_metrics(csv_file, output_dir)
+    if len(csv_files) == 1:
+        plot_gpu_metrics(csv_files[0], output_dir, args.dpi)
+    else:
+        # Every CSV gets its own directory so the fixed PNG names do not collide;
+        # under -o it mirrors the CSV's path below the inputs' common parent
+        # (results/*/gpu_monitor.csv -> <output_dir>/<run>/gpu_monitor)
+        parent = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in csv_files])
+        jobs = []
+        targets = {}
+        for csv_file in csv_files:
+            if output_dir:
+                relative = os.path.relpath(os.path.splitext(os.path.abspath(csv_file))[0], parent)
+                target = os.path.join(output_dir, relative)
+            else:
+                target = None
+            resolved = os.path.abspath(target or os.path.dirname(csv_file) or '.')
+            if resolved in targets:
+                print(f"Error: {targets[resolved]} and {csv_file} would both write plots to {resolved}")
+                sys.exit(1)
+            targets[resolved] = csv_file
+            jobs.append((csv_file, target, args.dpi))
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            for csv_file in pool.map(_plot_job, jobs):
+                print(f"Finished {csv_file}")
     print("\nDone!")
 
 if __name__ == '__main__':
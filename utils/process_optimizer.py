@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: (C) 2024 - 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Process-Count Optimizer over (streams, processes)
+Usage: python3 process_optimizer.py sweep --container NAME --pipeline "<single-stream pipeline>" --threshold FPS
+                                          --streams 16,32,64 [--processes 1,2,4,8] [options]
+       python3 process_optimizer.py sweep --simulate CAPACITY --threshold FPS --streams 16,32,64 [options]
+       python3 process_optimizer.py select [--match KEY=VALUE ...] process_sweep.json [...]
+       python3 process_optimizer.py lookup process_sweep.json STREAMS
+
+sweep finds the best process count for every stream density of the grid.
+The total throughput of one density is modelled as unimodal in the process
+count (more processes add parallelism until context and memory overhead
+win), so each row is a hill climb: it starts at the streams-per-process
+ratio that was best for the previous density and only probes neighbouring
+counts while they are clearly better (--tolerance). Counts past the first
+non-improving neighbour are dominated and never run. The per-stream FPS
+only falls with the stream count, so once the best process count of a
+density misses the threshold, all larger densities are pruned as well.
+--grid probes every point instead.
+
+The chosen process count of a density is its Pareto-best point over (total
+throughput, processes): the fewest processes within --tolerance of the
+highest total throughput. Densities are also marked when they are on the
+Pareto front of (streams, per-stream FPS).
+
+Probes use stream_density_tuner.py: gst-launch-1.0 runs through docker exec
+in one container that stays up for the whole sweep (started by the calling
+script), split into the probed number of processes. --simulate replaces the
+container with the throughput model of the tuner, extended by a per-process
+ceiling (--process-fps) and a per-process capacity loss (--process-cost).
+
+--output writes the machine-readable result (process_sweep.json) that the
+auto-tuners read through stream_density_tuner.py --process-map; select picks
+the newest sweep whose --tag values match, lookup prints the process count
+for a stream count. The last stdout line of sweep is:
+  <max streams> <processes> <per-stream fps> <total fps> <probes> <seconds spent>
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+from stream_density_tuner import ContainerProbe, ProcessMap, SimulatedProbe
+
+SCHEMA_VERSION = 1
+
+
+class PackedContainerProbe:
+    """ContainerProbe with the process count chosen per probe."""
+
+    def __init__(self, container, pipeline, threshold, duration, min_seconds=10.0, margin=0.1, confirm=3,
+                 log_dir=None):
+        self.container = container
+        self.pipeline = pipeline
+        self.threshold = threshold
+        self.duration = duration
+        self.min_seconds = min_seconds
+        self.margin = margin
+        self.confirm = confirm
+        self.log_dir = log_dir
+
+    def __call__(self, streams, processes):
+        log_dir = None
+        if self.log_dir:
+            log_dir = os.path.join(self.log_dir, f"{processes}proc")
+            os.makedirs(log_dir, exist_ok=True)
+        probe = ContainerProbe(self.container, self.pipeline, self.threshold, self.duration, processes, None,
+                               self.min_seconds, self.margin, self.confirm, log_dir)
+        return probe(streams)
+
+
+class SimulatedPackingProbe(SimulatedProbe):
+    """Tuner throughput model with capacity * (1 - process_cost * (processes - 1)), capped at processes * process_fps."""
+
+    def __init__(self, capacity, threshold, duration, process_fps=None, process_cost=0.0, **kwargs):
+        super().__init__(capacity, threshold, duration, **kwargs)
+        self.process_fps = process_fps
+        self.process_cost = process_cost
+
+    def __call__(self, streams, processes):
+        total = self.capacity * max(0.0, 1 - self.process_cost * (processes - 1)) / (1 + self.overhead * streams)
+        if self.process_fps:
+            total = min(total, processes * self.process_fps)
+        return self.reading(streams, processes, total)
+
+
+def total_fps(result):
+    """Total FPS of a probe, None when the pipelines died or never reported."""
+    if result is None or result['verdict'] == 'error':
+        return None
+    return result['total_fps']
+
+
+def pareto_front(results):
+    """Probes of one density that no probe with fewer processes matches in total FPS."""
+    front, top = [], None
+    for result in sorted(results, key=lambda r: r['processes']):
+        total = total_fps(result)
+        if total is not None and (top is None or total > top):
+            front.append(result)
+            top = total
+    return front
+
+
+def select_best(results, tolerance):
+    """Fewest processes within tolerance of the highest total FPS of one density."""
+    front = pareto_front(results)
+    if not front:
+        return None
+    top = total_fps(front[-1])
+    return next(r for r in front if total_fps(r) >= top * (1 - tolerance))
+
+
+def optimize(probe, densities, counts, tolerance=0.03, grid=False, log=None):
+    """Best process count per stream density.
+
+    Returns ({streams: best probe result or None}, {(streams, processes): probe result},
+    [pruned densities]).
+    """
+    results = {}
+
+    def measure(streams, processes):
+        if (streams, processes) not in results:
+            results[(streams, processes)] = probe(streams, processes)
+            if log:
+                log(results[(streams, processes)])
+        return total_fps(results[(streams, processes)])
+
+    best, pruned, ratio = {}, [], None
+    for index, streams in enumerate(densities):
+        candidates = [count for count in counts if count <= streams]
+        if not candidates:
+            continue
+        if grid:
+            for count in candidates:
+                measure(streams, count)
+        else:
+            # Start where the previous density's streams-per-process ratio lands
+            current = 0
+            if ratio:
+                current = min(range(len(candidates)), key=lambda i: abs(math.log(candidates[i] * ratio / streams)))
+
+            def clearly_better(i, j):
+                a, b = measure(streams, candidates[i]), measure(streams, candidates[j])
+                return a is not None and (b is None or a > b * (1 + tolerance))
+
+            measure(streams, candidates[current])
+            for step in (1, -1):
+                moved = False
+                while 0 <= current + step < len(candidates) and clearly_better(current + step, current):
+                    current += step
+                    moved = True
+                if moved:
+                    break
+
+        choice = select_best([results[(streams, count)] for count in candidates if (streams, count) in results],
+                             tolerance)
+        best[streams] = choice
+        if choice:
+            ratio = streams / choice['processes']
+        if not grid and (choice is None or not choice['passed']):
+            pruned = densities[index + 1:]
+            break
+    return best, results, pruned
+
+
+def density_front(best):
+    """Densities whose best point no other density beats in both streams and per-stream FPS."""
+    points = [(s, r['per_stream_fps']) for s, r in best.items() if total_fps(r) is not None]
+    return {s for s, fps in points
+            if not any(s2 >= s and fps2 >= fps and (s2, fps2) != (s, fps) for s2, fps2 in points)}
+
+
+def log_probe(result):
+    if total_fps(result) is None:
+        detail = "no FPS data"
+    else:
+        detail = f"{result['total_fps']:.2f} fps total ({result['per_stream_fps']:.2f} fps/stream)"
+    mark = '+' if result['passed'] else 'X'
+    print(f"[SWEEP] {mark} {result['streams']} streams in {result['processes']} proc: {detail}, "
+          f"{result['seconds']:.0f}s", file=sys.stderr, flush=True)
+
+
+def report(args, counts, densities, best, results, pruned, front):
+    cell = max(9, max(len(str(count)) for count in counts) + 2)
+    lines = [
+        "======================================",
+        "Process Sweep Summary",
+        "======================================",
+        f"Threshold: {args.threshold:g} fps/stream, tolerance: {args.tolerance * 100:g}%, "
+        f"search: {'grid' if args.grid else 'hill climb'}",
+    ]
+    lines += [f"{key}: {value}" for key, value in args.tags.items()]
+    lines += [
+        "",
+        "Total FPS per (streams, processes); * = chosen, - = not probed (dominated or pruned)",
+        f"{'Streams':>8} " + ''.join(f"{f'P={count}':>{cell}}" for count in counts),
+    ]
+    for streams in densities:
+        row = f"{streams:>8} "
+        for count in counts:
+            result = results.get((streams, count))
+            if count > streams:
+                text = ''
+            elif result is None:
+                text = '-'
+            elif total_fps(result) is None:
+                text = 'ERR'
+            else:
+                text = f"{result['total_fps']:.1f}" + ('*' if result is best.get(streams) else '')
+            row += f"{text:>{cell}}"
+        lines.append(row)
+
+    lines += ["", "Best process count per stream density:"]
+    for streams in densities:
+        if streams in pruned:
+            lines.append(f"  {streams} streams: pruned (a smaller density is below the threshold)")
+            continue
+        result = best.get(streams)
+        if result is None:
+            reason = "no successful probe" if streams in best else "no process count within the density"
+            lines.append(f"  {streams} streams: {reason}")
+            continue
+        status = "PASS" if result['passed'] else "BELOW THRESHOLD"
+        pareto = ", Pareto front" if streams in front else ""
+        processes = f"{result['processes']} process{'' if result['processes'] == 1 else 'es'}"
+        lines.append(f"  {streams} streams: {processes}, {result['total_fps']:.2f} fps total, "
+                     f"{result['per_stream_fps']:.2f} fps/stream, {status}{pareto}")
+
+    passing = [s for s, r in best.items() if r and r['passed']]
+    lines.append("")
+    if passing:
+        top = best[max(passing)]
+        lines.append(f"Maximum streams at threshold: {top['streams']} with {top['processes']} "
+                     f"process{'' if top['processes'] == 1 else 'es'}")
+    else:
+        lines.append("Maximum streams at threshold: none")
+    grid_size = sum(1 for s in densities for count in counts if count <= s)
+    spent = sum(r['seconds'] for r in results.values())
+    lines.append(f"Probed {len(results)} of {grid_size} grid points, {spent:.0f}s of probing")
+    return lines
+
+
+def write_result(path, args, counts, densities, best, results, pruned, front):
+    def entry(result):
+        return {key: result[key] for key in
+                ('streams', 'processes', 'verdict', 'passed', 'per_stream_fps', 'total_fps', 'seconds')}
+
+    passing = [s for s, r in best.items() if r and r['passed']]
+    data = {
+        'version': SCHEMA_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'tags': args.tags,
+        'threshold': args.threshold,
+        'tolerance': args.tolerance,
+        'search': 'grid' if args.grid else 'hill-climb',
+        'streams': densities,
+        'processes': counts,
+        'pruned': pruned,
+        'max_streams': max(passing) if passing else 0,
+        'best': [],
+        'probes': [entry(results[key]) for key in sorted(results)],
+    }
+    for streams in densities:
+        result = best.get(streams)
+        if result is None:
+            continue
+        row = entry(result)
+        row['front'] = [r['processes'] for r in pareto_front(
+            [results[(streams, count)] for count in counts if (streams, count) in results])]
+        row['pareto'] = streams in front
+        data['best'].append(row)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+
+def int_list(text):
+    values = sorted({int(value) for value in text.split(',') if value.strip()})
+    if not values or values[0] < 1:
+        raise argparse.ArgumentTypeError(f"expected comma-separated positive integers: {text}")
+    return values
+
+
+def key_value(text):
+    key, sep, value = text.partition('=')
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE: {text}")
+    return key, value
+
+
+def sweep(args, parser):
+    if args.threshold <= 0 or args.duration <= 0 or not 0 <= args.tolerance < 1:
+        parser.error("threshold and duration must be positive, tolerance within [0, 1)")
+    if args.container and not args.pipeline:
+        parser.error("--pipeline is required with --container")
+    args.tags = dict(args.tag)
+    densities, counts = args.streams, args.processes
+
+    if args.simulate:
+        probe = SimulatedPackingProbe(args.simulate, args.threshold, args.duration, args.process_fps,
+                                      args.process_cost, source_fps=args.source_fps, overhead=args.overhead,
+                                      noise=args.noise, min_seconds=args.min_seconds, margin=args.margin,
+                                      seed=args.seed)
+    else:
+        probe = PackedContainerProbe(args.container, args.pipeline, args.threshold, args.duration,
+                                     args.min_seconds, args.margin, args.confirm, args.log_dir)
+
+    print(f"[SWEEP] Streams {','.join(map(str, densities))} x processes {','.join(map(str, counts))}, "
+          f"threshold {args.threshold:g} fps/stream", file=sys.stderr, flush=True)
+    try:
+        best, results, pruned = optimize(probe, densities, counts, args.tolerance, args.grid, log_probe)
+    except KeyboardInterrupt:
+        print("[SWEEP] Interrupted", file=sys.stderr)
+        return 130
+
+    front = density_front(best)
+    lines = report(args, counts, densities, best, results, pruned, front)
+    print('\n'.join(lines), file=sys.stderr, flush=True)
+    if args.report:
+        with open(args.report, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+    if args.output:
+        write_result(args.output, args, counts, densities, best, results, pruned, front)
+        print(f"[SWEEP] Process map: {args.output}", file=sys.stderr, flush=True)
+
+    spent = sum(r['seconds'] for r in results.values())
+    passing = [s for s, r in best.items() if r and r['passed']]
+    if not passing:
+        print(f"0 NA NA NA {len(results)} {spent:.0f}")
+        return 1
+    top = best[max(passing)]
+    print(f"{top['streams']} {top['processes']} {top['per_stream_fps']:.2f} {top['total_fps']:.2f} "
+          f"{len(results)} {spent:.0f}")
+    return 0
+
+
+def select(args):
+    wanted = dict(args.match)
+    newest = None
+    for path in args.files:
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        tags = data.get('tags', {})
+        if data.get('version') != SCHEMA_VERSION or not data.get('best'):
+            continue
+        if any(tags.get(key) != value for key, value in wanted.items()):
+            continue
+        if newest is None or data.get('created', '') > newest[0]:
+            newest = (data.get('created', ''), path)
+    if newest is None:
+        return 1
+    print(newest[1])
+    return 0
+
+
+def lookup(args):
+    try:
+        print(ProcessMap(args.file)(args.streams))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[ Error ] process_optimizer: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Best process count per stream density over a (streams, processes) grid")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('sweep', help="Probe the grid and write the process map")
+    target = run.add_mutually_exclusive_group(required=True)
+    target.add_argument('--container', help="Running container to probe with docker exec")
+    target.add_argument('--simulate', type=float, metavar='CAPACITY',
+                        help="Use the throughput model with this total capacity (fps) instead of a container")
+    run.add_argument('--pipeline', help="Single-stream gst-launch pipeline (repeated per stream)")
+    run.add_argument('--threshold', type=float, required=True, help="Per-stream FPS a stream density has to sustain")
+    run.add_argument('--streams', type=int_list, required=True, help="Comma-separated stream densities")
+    run.add_argument('--processes', type=int_list, default=int_list('1,2,4,8'),
+                     help="Comma-separated process counts (default: 1,2,4,8; counts above a density are skipped)")
+    run.add_argument('--tolerance', type=float, default=0.03,
+                     help="Relative total FPS difference treated as equal (default: 0.03)")
+    run.add_argument('--grid', action='store_true', help="Probe every grid point (no pruning)")
+    run.add_argument('--duration', type=float, default=30.0, help="Longest probe in seconds (default: 30)")
+    run.add_argument('--min-seconds', type=float, default=10.0,
+                     help="Earliest a probe may stop (default: 10; equal to --duration for full-length probes)")
+    run.add_argument('--margin', type=float, default=0.1,
+                     help="Relative distance from the threshold that counts as clear (default: 0.1)")
+    run.add_argument('--confirm', type=int, default=3, help="Consecutive clear readings to stop early (default: 3)")
+    run.add_argument('--log-dir', help="Keep the gst-launch output of every probe here (one directory per process count)")
+    run.add_argument('--output', help="Write the process map (JSON) here")
+    run.add_argument('--report', help="Write the text summary here")
+    run.add_argument('--tag', type=key_value, action='append', default=[], metavar='KEY=VALUE',
+                     help="Setting the sweep is valid for, matched by select (repeatable)")
+    run.add_argument('--source-fps', type=float, help="Simulation: per-stream FPS ceiling (source frame rate)")
+    run.add_argument('--overhead', type=float, default=0.0, help="Simulation: capacity loss per added stream")
+    run.add_argument('--process-fps', type=float, help="Simulation: total FPS ceiling of one process")
+    run.add_argument('--process-cost', type=float, default=0.0, help="Simulation: capacity loss per added process")
+    run.add_argument('--noise', type=float, default=0.0, help="Simulation: relative stddev of a probe reading")
+    run.add_argument('--seed', type=int, default=0, help="Simulation: random seed (default: 0)")
+
+    pick = commands.add_parser('select', help="Print the newest process map whose tags match")
+    pick.add_argument('--match', type=key_value, action='append', default=[], metavar='KEY=VALUE',
+                      help="Required tag value (repeatable)")
+    pick.add_argument('files', nargs='+', help="process_sweep.json files")
+
+    find = commands.add_parser('lookup', help="Print the process count of a process map for a stream count")
+    find.add_argument('file', help="process_sweep.json")
+    find.add_argument('streams', type=int, help="Stream count")
+
+    args = parser.parse_args()
+    if args.command == 'sweep':
+        return sweep(args, parser)
+    if args.command == 'select':
+        return select(args)
+    if args.streams < 1:
+        parser.error("streams must be positive")
+    return lookup(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: (C) 2024 - 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Streams-per-Process Sweep for the Edge Pipeline
+Usage: python3 process_packing_sweep.py -p CONFIG -d DEVICE -c DEVICE -n STREAMS [-P 1,2,4,8] [options] [-- <driver options>]
+
+Runs the same stream count through benchmark_edge_pipelines.sh -P for each
+process count. Streams of one gst-launch process share the inference
+instances (model-instance-id) and batch across each other; separate
+processes each load the models and submit their own requests. The report
+shows how the total throughput, the worst stream and the peak resident
+memory of the gst-launch processes change with the streams-per-process
+ratio, relative to the first process count.
+
+Output: results/process_packing_<timestamp>.txt (also printed) and the
+usual per-run CSVs and logs of the driver.
+"""
+
+import argparse
+import os
+# Runs benchmark_edge_pipelines.sh
+import subprocess  # nosec B404
+import sys
+import time
+
+import results_store
+
+BASEDIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DRIVER = os.path.join(BASEDIR, 'benchmark_edge_pipelines.sh')
+RESULTS = os.path.join(BASEDIR, 'results')
+
+
+def number(record, key):
+    value = results_store.get_field(record, key)
+    return float(value) if value is not None else None
+
+
+def fmt(value, digits=1, suffix=''):
+    return 'NA' if value is None else f"{value:.{digits}f}{suffix}"
+
+
+def relative(value, base):
+    if value is None or not base:
+        return 'NA'
+    return f"{(value / base - 1) * 100:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and memory of the edge pipeline per streams-per-process ratio")
+    parser.add_argument('-p', '--config', required=True, choices=['light', 'medium', 'heavy'], help="Pipeline config")
+    parser.add_argument('-d', '--detect', default='GPU', help="Detection device (default: GPU)")
+    parser.add_argument('-c', '--classify', default='GPU', help="Classification device (default: GPU)")
+    parser.add_argument('-n', '--streams', type=int, required=True, help="Total number of streams")
+    parser.add_argument('-b', '--batch', type=int, default=1, help="Inference batch size (default: 1)")
+    parser.add_argument('-P', '--processes', default='1,2,4,8',
+                        help="Comma-separated process counts (default: 1,2,4,8; counts above -n are skipped)")
+    parser.add_argument('-i', '--duration', type=int, default=120, help="Duration of each run in seconds (default: 120)")
+    parser.add_argument('-t', '--taskset', default='none', help="Core pinning, as the driver's -t")
+    parser.add_argument('-s', '--cooldown', type=int, default=10, help="Seconds between runs (default: 10)")
+    parser.add_argument('driver_args', nargs=argparse.REMAINDER, help="Options passed to every driver run, after --")
+    args = parser.parse_args()
+
+    try:
+        counts = sorted({int(value) for value in args.processes.split(',') if value.strip()})
+    except ValueError:
+        parser.error(f"invalid process list: {args.processes}")
+    if args.streams < 1 or args.duration < 1 or not counts or counts[0] < 1:
+        parser.error("streams, duration and process counts must be positive")
+    skipped = [count for count in counts if count > args.streams]
+    counts = [count for count in counts if count <= args.streams]
+    if skipped:
+        print(f"[ Warning ] Skipping process counts above {args.streams} streams: {', '.join(map(str, skipped))}")
+    extra = args.driver_args[1:] if args.driver_args[:1] == ['--'] else args.driver_args
+
+    timestamp = time.strftime('%Y%m%d-%H%M%S')
+    results = []
+    for index, count in enumerate(counts):
+        print(f"[ Info ] [{index + 1}/{len(counts)}] {args.streams} streams in {count} processes")
+        offset = results_store.store_size()
+        command = [DRIVER, '-p', args.config, '-n', str(args.streams), '-b', str(args.batch),
+                   '-d', args.detect, '-c', args.classify, '-i', str(args.duration), '-t', args.taskset,
+                   '-P', str(count), *extra]
+        # Repo driver with a fixed argv, no shell
+        status = subprocess.call(command)  # nosec B603
+        # The run's record is appended to the results store after the offset
+        created = results_store.read(offset=offset, driver='edge-pipeline')
+        row = created[-1] if created else {}
+        if status != 0 or not row:
+            print(f"[ Error ] Run with {count} processes failed (exit {status})")
+        results.append((count, row))
+        if args.cooldown > 0 and index < len(counts) - 1:
+            print(f"[ Info ] Sleeping for {args.cooldown} seconds to prevent thermal throttling.")
+            time.sleep(args.cooldown)
+
+    base_fps = base_memory = None
+    lines = [
+        f"Process Packing Sweep {timestamp}",
+        f"Config: {args.config}, Detect: {args.detect}, Classify: {args.classify}, Batch: {args.batch}, "
+        f"Streams: {args.streams}, Duration: {args.duration}s",
+        "",
+        f"{'Procs':>5} {'Str/Proc':>8} {'Total FPS':>10} {'vs First':>9} {'FPS/Str':>8} {'Min Str':>8} "
+        f"{'Peak MiB':>9} {'vs First':>9} {'MiB/Str':>8}",
+    ]
+    best = None
+    for count, row in results:
+        fps = number(row, 'throughput.total_fps')
+        memory = number(row, 'memory.peak_mib')
+        if base_fps is None and base_memory is None:
+            base_fps, base_memory = fps, memory
+        if fps is not None and (best is None or fps > best[1]):
+            best = (count, fps)
+        lines.append(
+            f"{count:>5} {args.streams / count:>8.1f} {fmt(fps, 2):>10} {relative(fps, base_fps):>9} "
+            f"{fmt(number(row, 'throughput.per_stream_fps'), 2):>8} {fmt(number(row, 'throughput.min_stream_fps'), 2):>8} "
+            f"{fmt(memory):>9} {relative(memory, base_memory):>9} "
+            f"{fmt(memory / args.streams if memory is not None else None):>8}")
+    lines.append("")
+    if best:
+        lines.append(f"Highest throughput: {best[0]} processes ({args.streams / best[0]:.1f} streams/process), "
+                     f"{best[1]:.2f} fps")
+
+    os.makedirs(RESULTS, exist_ok=True)
+    report = os.path.join(RESULTS, f"process_packing_{timestamp}.txt")
+    with open(report, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    print('')
+    print('\n'.join(lines))
+    print('')
+    print(f"[ Info ] Sweep report: {report}")
+    return 0 if all(row for _, row in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
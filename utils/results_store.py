@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: (C) 2024 - 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Structured Benchmark Results Store
+Usage: python3 results_store.py record --driver NAME [--store FILE] [--csv FILE] [--stream-fps JSON]
+                                       [--gpu-metrics CSV] SECTION.FIELD=VALUE [SECTION.FIELD+=VALUE ...]
+       python3 results_store.py get [--store FILE] [--driver NAME] [--where SECTION.FIELD=VALUE ...] FIELD [FIELD ...]
+       python3 results_store.py show [--store FILE] [--driver NAME] [--last N]
+       python3 results_store.py export [--store FILE] [--driver NAME] OUTPUT.csv|OUTPUT.parquet
+
+Every benchmark driver appends one JSON record per run to a shared JSONL store
+(default: results/results.jsonl, or $RESULTS_STORE). A record carries the
+schema version and these sections:
+
+run         id, driver, timestamp, recorded, system, host, duration_s, status
+config      free-form run configuration (device, batch, streams, processes, ...)
+throughput  total_fps, per_stream_fps, streams, theoretical_streams, the per-stream
+            distribution (min/p5/median/p95, starved streams, time below target)
+            and the path of the per-stream FPS series
+latency     unit and mean/median/min/max/p90/p99
+power       avg_w, energy_j, energy per frame and per stream-hour, efficiency
+            and the path of the power series
+memory      peak_mib (host processes), peak_vram_mib (GPU)
+telemetry   paths of the logs and monitor files of the run
+
+Values of NA, N/A or empty are left out. Numbers are stored as numbers, paths
+relative to the store directory when they are inside it. FIELD+=VALUE appends
+to a list (e.g. config.pipelines). Records are appended with one locked write,
+so concurrent drivers do not interleave lines.
+
+record   validates and appends a record and prints its run id; --csv also writes
+         the one-row CSV of benchmark_edge_pipelines.sh, --stream-fps imports the
+         per-stream figures of fps_analytics.py --json and --gpu-metrics the peak
+         GPU memory of a gpu_monitor.sh CSV
+get      prints the fields of the newest matching record (NA if missing)
+show     lists the newest records
+export   writes the records flattened to CSV, or to Parquet (needs pyarrow)
+"""
+
+import argparse
+import csv
+import fcntl
+import json
+import math
+import os
+import re
+import socket
+import sys
+import time
+import uuid
+
+SCHEMA_VERSION = 1
+BASEDIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_STORE = os.path.join(BASEDIR, 'results', 'results.jsonl')
+
+NUMBER = 'number'
+TEXT = 'text'
+PATH = 'path'
+AUTO = 'auto'
+
+# Section -> {field: kind}, or a single kind for free-form sections
+SCHEMA = {
+    'run': {
+        'id': TEXT, 'driver': TEXT, 'timestamp': TEXT, 'recorded': TEXT,
+        'system': TEXT, 'host': TEXT, 'duration_s': NUMBER, 'status': TEXT,
+    },
+    'config': AUTO,
+    'throughput': {
+        'total_fps': NUMBER, 'per_stream_fps': NUMBER, 'streams': NUMBER, 'theoretical_streams': NUMBER,
+        'min_stream_fps': NUMBER, 'p5_stream_fps': NUMBER, 'median_stream_fps': NUMBER,
+        'p95_stream_fps': NUMBER, 'starved_streams': NUMBER, 'time_below_target_s': NUMBER,
+        'series': PATH,
+    },
+    'latency': {
+        'unit': TEXT, 'mean': NUMBER, 'median': NUMBER, 'min': NUMBER, 'max': NUMBER,
+        'p90': NUMBER, 'p99': NUMBER,
+    },
+    'power': {
+        'avg_w': NUMBER, 'energy_j': NUMBER, 'energy_per_frame_j': NUMBER,
+        'energy_per_stream_hour_j': NUMBER, 'efficiency_fps_per_w': NUMBER, 'series': PATH,
+    },
+    'memory': {'peak_mib': NUMBER, 'peak_vram_mib': NUMBER},
+    'telemetry': PATH,
+}
+
+MISSING = {'', 'NA', 'N/A', 'NAN'}
+INTEGER = re.compile(r'^[+-]?\d+$')
+DECIMAL = re.compile(r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$')
+
+# One-row CSV of benchmark_edge_pipelines.sh: (column, record field); {target_fps} is filled from config
+EDGE_CSV_COLUMNS = [
+    ("Timestamp", 'run.timestamp'),
+    ("System", 'run.system'),
+    ("Duration (s)", 'run.duration_s'),
+    ("Cores Pinned", 'config.cores'),
+    ("Pipeline Config", 'config.profile'),
+    ("Detect Device", 'config.detect'),
+    ("Classify Device", 'config.classify'),
+    ("Batch", 'config.batch'),
+    ("Throughput (fps)", 'throughput.total_fps'),
+    ("Throughput per Stream (fps/#)", 'throughput.per_stream_fps'),
+    ("Theoretical Stream Density (@{target_fps}fps±5%)", 'throughput.theoretical_streams'),
+    ("Measured Stream Density (#)", 'throughput.streams'),
+    ("Concurrent Mode", 'config.concurrent'),
+    ("Device Configuration", 'config.device_config'),
+    ("Avg Power (W)", 'power.avg_w'),
+    ("Efficiency (FPS/W)", 'power.efficiency_fps_per_w'),
+    ("Energy (J)", 'power.energy_j'),
+    ("Energy per Frame (J)", 'power.energy_per_frame_j'),
+    ("Energy per Stream-Hour (J)", 'power.energy_per_stream_hour_j'),
+    ("Min Stream FPS", 'throughput.min_stream_fps'),
+    ("P5 Stream FPS", 'throughput.p5_stream_fps'),
+    ("Median Stream FPS", 'throughput.median_stream_fps'),
+    ("P95 Stream FPS", 'throughput.p95_stream_fps'),
+    ("Starved Streams (#)", 'throughput.starved_streams'),
+    ("Max Time Below Target (s)", 'throughput.time_below_target_s'),
+    ("Model Cache", 'config.model_cache'),
+    ("Processes", 'config.processes'),
+    ("Peak Memory (MiB)", 'memory.peak_mib'),
+    ("Early Stop", 'config.early_stop'),
+]
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def default_store():
+    return os.environ.get('RESULTS_STORE') or DEFAULT_STORE
+
+
+def field_kind(key):
+    section, _, name = key.partition('.')
+    kinds = SCHEMA.get(section)
+    if kinds is None or not name:
+        raise SchemaError(f"unknown field: {key}")
+    if isinstance(kinds, str):
+        return kinds
+    if name not in kinds:
+        raise SchemaError(f"unknown field: {key}")
+    return kinds[name]
+
+
+def parse_number(text):
+    if INTEGER.match(text):
+        return int(text)
+    if DECIMAL.match(text):
+        return float(text)
+    return None
+
+
+def coerce(value, kind, base=None):
+    """Value of a field of the given kind, or None for missing values."""
+    if value is None or (isinstance(value, float) and not math.isfinite(value)):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if value.upper() in MISSING:
+            return None
+    if kind == NUMBER:
+        if isinstance(value, bool):
+            raise SchemaError(f"not a number: {value}")
+        number = value if isinstance(value, (int, float)) else parse_number(value)
+        if number is None:
+            raise SchemaError(f"not a number: {value}")
+        return number
+    if kind == PATH:
+        path = os.path.abspath(str(value))
+        if base:
+            relative = os.path.relpath(path, base)
+            if not relative.startswith(os.pardir):
+                return relative
+        return path
+    if kind == AUTO and isinstance(value, str):
+        if value.lower() in ('true', 'false'):
+            return value.lower() == 'true'
+        number = parse_number(value)
+        return value if number is None else number
+    return value if kind == AUTO else str(value)
+
+
+def new_record(driver):
+    record = {'schema': SCHEMA_VERSION, 'run': {}}
+    set_field(record, 'run.driver', driver)
+    set_field(record, 'run.recorded', time.strftime('%Y-%m-%dT%H:%M:%S%z'))
+    set_field(record, 'run.host', socket.gethostname())
+    return record
+
+
+def set_field(record, key, value, append=False, base=None):
+    """Set (or append to) SECTION.FIELD after coercing the value to the schema kind."""
+    value = coerce(value, field_kind(key), base)
+    if value is None:
+        return
+    section, _, name = key.partition('.')
+    target = record.setdefault(section, {})
+    if append:
+        target.setdefault(name, []).append(value)
+    else:
+        target[name] = value
+
+
+def get_field(record, key):
+    section, _, name = key.partition('.')
+    return record.get(section, {}).get(name)
+
+
+def validate(record):
+    if record.get('schema') != SCHEMA_VERSION:
+        raise SchemaError(f"unsupported schema version: {record.get('schema')}")
+    for section, values in record.items():
+        if section == 'schema':
+            continue
+        if not isinstance(values, dict):
+            raise SchemaError(f"section {section} is not an object")
+        for name in values:
+            field_kind(f"{section}.{name}")
+    if not get_field(record, 'run.driver'):
+        raise SchemaError("run.driver is required")
+
+
+def finalize(record):
+    run = record['run']
+    run.setdefault('timestamp', time.strftime('%Y%m%d-%H%M%S'))
+    run.setdefault('status', 'ok')
+    if 'id' not in run:
+        record['run'] = {'id': f"{run['driver']}-{run['timestamp']}-{uuid.uuid4().hex[:6]}", **run}
+    validate(record)
+    # Sections in schema order, whatever order the fields were set in
+    ordered = {section: record[section] for section in ['schema', *SCHEMA] if section in record}
+    record.clear()
+    record.update(ordered)
+    return record
+
+
+def append(record, store=None):
+    """Append one record to the store with a single locked write; returns the run id."""
+    store = store or default_store()
+    finalize(record)
+    os.makedirs(os.path.dirname(os.path.abspath(store)), exist_ok=True)
+    line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+    with open(store, 'a', encoding='utf-8') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.write(line)
+        f.flush()
+    return record['run']['id']
+
+
+def store_size(store=None):
+    try:
+        return os.path.getsize(store or default_store())
+    except OSError:
+        return 0
+
+
+def scan(store=None, driver=None, offset=0):
+    """Records of the store from byte offset on, and the offset after the last complete line.
+
+    An unterminated last line (a write in progress) is left for the next scan.
+    """
+    store = store or default_store()
+    if not os.path.exists(store):
+        return [], offset
+    records = []
+    end = offset
+    with open(store, 'rb') as f:
+        f.seek(offset)
+        for number, line in enumerate(f, start=1):
+            if not line.endswith(b'\n'):
+                break
+            end += len(line)
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Interrupted write, joined with the next appended record
+                print(f"[ Warning ] results_store: skipping unreadable record in {store} (line {number} after offset {offset})",
+                      file=sys.stderr)
+                continue
+            if record.get('schema') != SCHEMA_VERSION:
+                print(f"[ Warning ] results_store: skipping record with schema {record.get('schema')}", file=sys.stderr)
+                continue
+            if driver and get_field(record, 'run.driver') != driver:
+                continue
+            records.append(record)
+    return records, end
+
+
+def read(store=None, driver=None, offset=0):
+    """Records of the store (from byte offset on), oldest first."""
+    return scan(store, driver, offset)[0]
+
+
+def resolve_path(store, value):
+    """Absolute path of a path field of a record read from the store."""
+    if not value:
+        return value
+    return os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(store or default_store())), value))
+
+
+def stream_fps_fields(path):
+    """throughput fields from the JSON of fps_analytics.py --json."""
+    with open(path, 'r') as f:
+        result = json.load(f)
+    return {
+        'throughput.min_stream_fps': result.get('min'),
+        'throughput.p5_stream_fps': result.get('p5'),
+        'throughput.median_stream_fps': result.get('median'),
+        'throughput.p95_stream_fps': result.get('p95'),
+        'throughput.starved_streams': len(result.get('starved') or []),
+        'throughput.time_below_target_s': result.get('max_below_target_s'),
+    }
+
+
+def peak_gpu_memory(path):
+    """Peak of the memory-used column of a gpu_monitor.sh / gpu_sampler.py CSV (MiB), or None."""
+    peak = None
+    with open(path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        columns = [i for i, name in enumerate(header)
+                   if 'memory used' in name.strip().lower() or 'vram' in name.strip().lower()]
+        if not columns:
+            return None
+        for row in reader:
+            try:
+                value = float(row[columns[0]])
+            except (IndexError, ValueError):
+                continue
+            peak = value if peak is None else max(peak, value)
+    return peak
+
+
+def csv_value(value):
+    if value is None:
+        return 'NA'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def write_edge_csv(record, path):
+    """One-row CSV of benchmark_edge_pipelines.sh, rendered from the record."""
+    target = csv_value(get_field(record, 'config.target_fps'))
+    pipelines = get_field(record, 'config.pipelines') or ['']
+    labels = [label.format(target_fps=target) for label, _ in EDGE_CSV_COLUMNS]
+    labels += ['Pipeline'] if len(pipelines) == 1 else [f"Pipeline{i + 1}" for i in range(len(pipelines))]
+    row = [csv_value(get_field(record, key)) for _, key in EDGE_CSV_COLUMNS] + [str(p) for p in pipelines]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        f.write(','.join(labels) + '\n')
+        csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator='\n').writerow(row)
+
+
+def parse_assignment(text):
+    match = re.match(r'^([a-z_]+\.[A-Za-z0-9_]+)(\+?=)(.*)$', text, re.DOTALL)
+    if not match:
+        raise SchemaError(f"expected SECTION.FIELD=VALUE: {text}")
+    return match.group(1), match.group(2) == '+=', match.group(3)
+
+
+def matches(record, conditions, base):
+    for key, value in conditions:
+        stored = get_field(record, key)
+        wanted = coerce(value, field_kind(key), base)
+        if stored != wanted and not (isinstance(stored, list) and wanted in stored):
+            return False
+    return True
+
+
+def flatten(record):
+    row = {'schema': record.get('schema')}
+    for section, values in record.items():
+        if isinstance(values, dict):
+            for name, value in values.items():
+                row[f"{section}.{name}"] = ' | '.join(map(str, value)) if isinstance(value, list) else value
+    return row
+
+
+def export(records, output):
+    rows = [flatten(record) for record in records]
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    if output.endswith('.parquet'):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            print("[ Error ] results_store: Parquet export needs pyarrow (pip install pyarrow)")
+            return 1
+        data = {}
+        for column in columns:
+            values = [row.get(column) for row in rows]
+            # Free-form config fields may mix types across drivers; keep those as text
+            kinds = {type(v) for v in values if v is not None}
+            if not kinds <= {int, float} and not kinds <= {bool}:
+                values = [None if v is None else str(v) for v in values]
+            elif kinds == {int, float}:
+                values = [None if v is None else float(v) for v in values]
+            data[column] = values
+        pyarrow.parquet.write_table(pyarrow.table(data), output)
+    else:
+        with open(output, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, restval='', lineterminator='\n')
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({key: csv_value(value) for key, value in row.items()})
+    print(f"[ Info ] Exported {len(rows)} records to {output}")
+    return 0
+
+
+def show(records):
+    print(f"{'Run':<44} {'Timestamp':<16} {'Total FPS':>10} {'FPS/Str':>8} {'Streams':>7} "
+          f"{'Lat Med':>8} {'Power W':>8}")
+    for record in records:
+        values = [get_field(record, key) for key in ('throughput.total_fps', 'throughput.per_stream_fps',
+                                                      'throughput.streams', 'latency.median', 'power.avg_w')]
+        cells = ['NA' if v is None else (f"{v:.2f}" if isinstance(v, float) else str(v)) for v in values]
+        print(f"{get_field(record, 'run.id'):<44} {get_field(record, 'run.timestamp') or 'NA':<16} "
+              f"{cells[0]:>10} {cells[1]:>8} {cells[2]:>7} {cells[3]:>8} {cells[4]:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Structured benchmark results store (JSONL)")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--store', default=None, help="Store file (default: $RESULTS_STORE or results/results.jsonl)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = sub.add_parser('record', parents=[common], help="Append the record of one run and print its run id")
+    record_parser.add_argument('--driver', required=True, help="Driver name (edge-pipeline, zto-pipeline, decode, cv-model, ...)")
+    record_parser.add_argument('--csv', help="Also write the one-row edge pipeline CSV to this file")
+    record_parser.add_argument('--stream-fps', help="Per-stream FPS figures from this fps_analytics.py --json file")
+    record_parser.add_argument('--gpu-metrics', help="Peak GPU memory from this gpu_monitor.sh CSV")
+    record_parser.add_argument('fields', nargs='*', help="SECTION.FIELD=VALUE or SECTION.FIELD+=VALUE")
+
+    get_parser = sub.add_parser('get', parents=[common], help="Print fields of the newest matching record")
+    get_parser.add_argument('--driver', help="Only records of this driver")
+    get_parser.add_argument('--where', action='append', default=[], metavar='SECTION.FIELD=VALUE',
+                            help="Only records with this value (repeatable)")
+    get_parser.add_argument('keys', nargs='+', help="Fields to print (SECTION.FIELD)")
+
+    show_parser = sub.add_parser('show', parents=[common], help="List the newest records")
+    show_parser.add_argument('--driver', help="Only records of this driver")
+    show_parser.add_argument('--last', type=int, default=20, help="Number of records (default: 20)")
+
+    export_parser = sub.add_parser('export', parents=[common], help="Write the records flattened to CSV or Parquet")
+    export_parser.add_argument('--driver', help="Only records of this driver")
+    export_parser.add_argument('output', help="Output file (.csv or .parquet)")
+    args = parser.parse_args()
+
+    store = args.store or default_store()
+    base = os.path.dirname(os.path.abspath(store))
+    try:
+        if args.command == 'record':
+            record = new_record(args.driver)
+            assignments = [parse_assignment(text) for text in args.fields]
+            given = {key for key, _, _ in assignments}
+            if args.stream_fps and os.path.isfile(args.stream_fps):
+                for key, value in stream_fps_fields(args.stream_fps).items():
+                    if key not in given:
+                        set_field(record, key, value)
+                set_field(record, 'telemetry.stream_fps', args.stream_fps, base=base)
+            if args.gpu_metrics and os.path.isfile(args.gpu_metrics):
+                if 'memory.peak_vram_mib' not in given:
+                    set_field(record, 'memory.peak_vram_mib', peak_gpu_memory(args.gpu_metrics))
+                set_field(record, 'telemetry.gpu_metrics', args.gpu_metrics, base=base)
+            for key, append_value, value in assignments:
+                set_field(record, key, value, append=append_value, base=base)
+            if args.csv:
+                # The report skips CSVs rendered from store records by this field
+                set_field(record, 'telemetry.csv', args.csv, base=base)
+            run_id = append(record, store)
+            if args.csv:
+                write_edge_csv(record, args.csv)
+            print(run_id)
+            return 0
+
+        records = read(store, args.driver)
+        if args.command == 'get':
+            conditions = [parse_assignment(text) for text in args.where]
+            if any(append_value for _, append_value, _ in conditions):
+                raise SchemaError("--where takes SECTION.FIELD=VALUE")
+            conditions = [(key, value) for key, _, value in conditions]
+            for key in args.keys:
+                field_kind(key)
+            found = next((r for r in reversed(records) if matches(r, conditions, base)), None)
+            if found is None:
+                return 1
+            print(' '.join(csv_value(get_field(found, key)) for key in args.keys))
+            return 0
+        if args.command == 'show':
+            show(records[-args.last:] if args.last > 0 else records)
+            return 0
+        return export(records, args.output)
+    except (SchemaError, OSError) as e:
+        print(f"[ Error ] results_store: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: (C) 2024 - 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Stream Density Auto-Tuner
+Usage: python3 stream_density_tuner.py --container NAME --pipeline "<single-stream pipeline>" --threshold FPS [options]
+       python3 stream_density_tuner.py --simulate CAPACITY --threshold FPS [options]
+
+Finds the largest stream count whose per-stream FPS stays at or above the
+threshold. The search brackets exponentially from --start (doubling while
+probes pass, halving while they fail) and then bisects the bracket, so 200+
+streams are resolved in ~log2(N) probes instead of tens of step-by-10 runs.
+
+Every probe runs `gst-launch-1.0` through `docker exec` in one container that
+stays up for the whole search (started by the calling script), and follows the
+gvafpscounter output live. A probe stops as soon as the running per-stream
+average is clearly above or below the threshold (--margin) for --confirm
+consecutive readings; only borderline probes run the full --duration.
+
+--process-map takes the process count of every probe from a process sweep
+(utils/process_optimizer.py) instead of a fixed --streams-per-process ratio.
+
+--simulate replaces the container with a throughput model (total capacity in
+fps, optional per-stream overhead and noise) to exercise the search offline.
+
+Progress is logged on stderr. The last stdout line is machine readable:
+  <max streams> <per-stream fps> <total fps> <probes> <seconds spent>
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+# Probes run gst-launch-1.0 through docker exec
+import subprocess  # nosec B404
+import sys
+import threading
+import time
+
+FPS_AVERAGE_PATTERN = re.compile(r'FpsCounter.*average\s+([0-9.]+)\s*sec.*?total=([0-9.]+)')
+
+# Seconds between two looks at the running averages of a probe
+POLL_INTERVAL = 1.0
+
+
+def split_streams(streams, processes):
+    """Per-process stream counts, split the way the benchmark scripts do."""
+    per_process = -(-streams // processes)
+    counts = []
+    for proc_id in range(processes):
+        count = min(per_process, streams - proc_id * per_process)
+        if count > 0:
+            counts.append(count)
+    return counts
+
+
+def classify(per_stream_fps, threshold, margin):
+    """'pass' / 'fail' when the reading is clearly on one side of the threshold, else None."""
+    if per_stream_fps >= threshold * (1 + margin):
+        return 'pass'
+    if per_stream_fps < threshold * (1 - margin):
+        return 'fail'
+    return None
+
+
+class ProcessMap:
+    """Process count per stream density from a process_optimizer.py sweep (process_sweep.json)."""
+
+    def __init__(self, path):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        self.points = sorted((row['streams'], row['processes']) for row in data.get('best', []) if row.get('processes'))
+        if not self.points:
+            raise ValueError(f"{path}: no stream density with a measured process count")
+        # Swept --processes values; only these counts were ever measured
+        self.counts = sorted(set(data.get('processes') or [processes for _, processes in self.points]))
+
+    def __call__(self, streams):
+        # Between measured densities, use the best count of the next lower one
+        # (the lowest one below the grid); a count is never extrapolated
+        lower = [point for point in self.points if point[0] <= streams]
+        processes = lower[-1][1] if lower else self.points[0][1]
+        if processes > streams:
+            processes = max((count for count in self.counts if count <= streams), default=1)
+        return processes
+
+
+class ContainerProbe:
+    """Run one stream count in an already running container and follow gvafpscounter."""
+
+    def __init__(self, container, pipeline, threshold, duration, processes=None, streams_per_process=None,
+                 min_seconds=10.0, margin=0.1, confirm=3, log_dir=None, process_map=None):
+        self.container = container
+        self.pipeline = pipeline
+        self.threshold = threshold
+        self.duration = duration
+        self.processes = processes
+        self.streams_per_process = streams_per_process
+        self.min_seconds = min_seconds
+        self.margin = margin
+        self.confirm = confirm
+        self.log_dir = log_dir
+        self.process_map = process_map
+
+    def process_count(self, streams):
+        if self.process_map:
+            return min(self.process_map(streams), streams)
+        if self.processes:
+            return min(self.processes, streams)
+        return max(1, -(-streams // self.streams_per_process))
+
+    def _follow(self, proc, index, averages, log_path):
+        log = open(log_path, 'w') if log_path else None
+        try:
+            for line in proc.stdout:
+                if log:
+                    log.write(line)
+                match = FPS_AVERAGE_PATTERN.search(line)
+                if match:
+                    averages[index] = (float(match.group(1)), float(match.group(2)))
+        finally:
+            if log:
+                log.close()
+
+    def _stop(self, procs):
+        for proc in procs:
+            if proc.poll() is None:
+                proc.terminate()
+        # Killing the docker exec client leaves gst-launch running in the container
+        # docker from PATH with a fixed argv, no shell
+        subprocess.run(['docker', 'exec', self.container, 'pkill', '-INT', '-f', 'gst-launch-1.0'],  # nosec B603 B607
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        for proc in procs:
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+        # Give the decoder/GPU context time to tear down before the next probe
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            # docker from PATH with a fixed argv, no shell
+            busy = subprocess.run(['docker', 'exec', self.container, 'pgrep', '-f', 'gst-launch-1.0'],  # nosec B603 B607
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+            if busy.returncode != 0:
+                break
+            time.sleep(0.5)
+
+    def __call__(self, streams):
+        counts = split_streams(streams, self.process_count(streams))
+        averages = [None] * len(counts)
+        procs, readers = [], []
+        start = time.monotonic()
+        try:
+            for index, count in enumerate(counts):
+                command = 'gst-launch-1.0 ' + ' '.join([self.pipeline] * count)
+                # docker from PATH, no local shell; the tuner-built pipeline runs in the container
+                proc = subprocess.Popen(['docker', 'exec', self.container, 'bash', '-c', command],  # nosec B603 B607
+                                        stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                        text=True, errors='replace', bufsize=1)
+                log_path = None
+                if self.log_dir:
+                    log_path = os.path.join(self.log_dir, f"probe_{streams}streams_process_{index + 1}.log")
+                reader = threading.Thread(target=self._follow, args=(proc, index, averages, log_path), daemon=True)
+                reader.start()
+                procs.append(proc)
+                readers.append(reader)
+                time.sleep(0.5)
+
+            verdict, streak, per_stream, total, early = None, 0, None, None, False
+            while True:
+                time.sleep(POLL_INTERVAL)
+                elapsed = time.monotonic() - start
+                if any(proc.poll() is not None for proc in procs):
+                    verdict = 'error'  # a pipeline died (usually resource exhaustion)
+                    break
+                if all(avg is not None for avg in averages):
+                    total = sum(avg[1] for avg in averages)
+                    per_stream = total / streams
+                    reading = classify(per_stream, self.threshold, self.margin)
+                    if elapsed >= self.min_seconds and reading is not None:
+                        streak = streak + 1 if reading == verdict else 1
+                        verdict = reading
+                        if streak >= self.confirm:
+                            early = elapsed < self.duration
+                            break
+                    else:
+                        verdict, streak = None, 0
+                if elapsed >= self.duration:
+                    if per_stream is None:
+                        verdict = 'error'  # no FpsCounter average within the probe
+                    else:
+                        verdict = 'pass' if per_stream >= self.threshold else 'fail'
+                    break
+        finally:
+            self._stop(procs)
+            for reader in readers:
+                reader.join(timeout=5)
+
+        return {
+            'streams': streams,
+            'processes': len(counts),
+            'passed': verdict == 'pass',
+            'verdict': verdict,
+            'per_stream_fps': per_stream,
+            'total_fps': total,
+            'seconds': time.monotonic() - start,
+            'early': early,
+        }
+
+
+class SimulatedProbe:
+    """Throughput model: total = capacity / (1 + overhead * streams), capped per stream at source_fps."""
+
+    def __init__(self, capacity, threshold, duration, source_fps=None, overhead=0.0, noise=0.0,
+                 min_seconds=10.0, margin=0.1, seed=0):
+        self.capacity = capacity
+        self.threshold = threshold
+        self.duration = duration
+        self.source_fps = source_fps
+        self.overhead = overhead
+        self.noise = noise
+        self.min_seconds = min_seconds
+        self.margin = margin
+        self.rng = random.Random(seed)  # nosec B311
+
+    def __call__(self, streams):
+        return self.reading(streams, 1, self.capacity / (1 + self.overhead * streams))
+
+    def reading(self, streams, processes, total):
+        """Probe result for a modelled total throughput."""
+        per_stream = total / streams
+        if self.source_fps:
+            per_stream = min(per_stream, self.source_fps)
+        if self.noise:
+            per_stream *= max(0.0, self.rng.gauss(1.0, self.noise))
+        total = per_stream * streams
+        verdict = classify(per_stream, self.threshold, self.margin)
+        early = verdict is not None and self.min_seconds < self.duration
+        if verdict is None:
+            verdict = 'pass' if per_stream >= self.threshold else 'fail'
+        return {
+            'streams': streams,
+            'processes': processes,
+            'passed': verdict == 'pass',
+            'verdict': verdict,
+            'per_stream_fps': per_stream,
+            'total_fps': total,
+            'seconds': self.min_seconds if early else self.duration,
+            'early': early,
+        }
+
+
+def find_max_streams(probe, start, max_streams, resolution=1, log=None):
+    """Exponential bracket then bisection over a monotonic pass/fail probe.
+
+    Returns (largest passing stream count or 0, {streams: probe result}).
+    """
+    results = {}
+
+    def passes(streams):
+        if streams not in results:
+            results[streams] = probe(streams)
+            if log:
+                log(results[streams])
+        return results[streams]['passed']
+
+    lo, hi = 0, None
+    streams = min(max(start, 1), max_streams)
+    if passes(streams):
+        lo = streams
+        while hi is None and lo < max_streams:
+            streams = min(lo * 2, max_streams)
+            if passes(streams):
+                lo = streams
+            else:
+                hi = streams
+    else:
+        hi = streams
+        while lo == 0 and hi > 1:
+            streams = hi // 2
+            if passes(streams):
+                lo = streams
+            else:
+                hi = streams
+
+    if hi is not None:
+        while hi - lo > resolution:
+            streams = (lo + hi) // 2
+            if passes(streams):
+                lo = streams
+            else:
+                hi = streams
+    return lo, results
+
+
+def log_probe(result):
+    if result['per_stream_fps'] is None:
+        detail = "no FPS data"
+    else:
+        detail = f"{result['per_stream_fps']:.2f} fps/stream ({result['total_fps']:.2f} fps total)"
+    mark = '+' if result['passed'] else 'X'
+    status = "ERROR" if result['verdict'] == 'error' else "PASSED" if result['passed'] else "FAILED"
+    stop = "early stop" if result['early'] else "full run"
+    print(f"[TUNE] {mark} {result['streams']} streams ({result['processes']} proc) {status}: "
+          f"{detail}, {result['seconds']:.0f}s {stop}", file=sys.stderr, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Binary-search stream density auto-tuner")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--container', help="Running container to probe with docker exec")
+    target.add_argument('--simulate', type=float, metavar='CAPACITY',
+                        help="Use the throughput model with this total capacity (fps) instead of a container")
+    parser.add_argument('--pipeline', help="Single-stream gst-launch pipeline (repeated per stream)")
+    parser.add_argument('--threshold', type=float, required=True, help="Per-stream FPS a stream count has to sustain")
+    parser.add_argument('--start', type=int, default=1, help="First stream count to probe (default: 1)")
+    parser.add_argument('--max-streams', type=int, default=1000, help="Safety limit (default: 1000)")
+    parser.add_argument('--resolution', type=int, default=1, help="Stop bisecting at this bracket width (default: 1)")
+    parser.add_argument('--duration', type=float, default=30.0, help="Longest probe in seconds (default: 30)")
+    parser.add_argument('--min-seconds', type=float, default=10.0,
+                        help="Earliest a probe may stop (default: 10, covers the starting-frame warm-up)")
+    parser.add_argument('--margin', type=float, default=0.1,
+                        help="Relative distance from the threshold that counts as clear (default: 0.1)")
+    parser.add_argument('--confirm', type=int, default=3, help="Consecutive clear readings to stop early (default: 3)")
+    processes = parser.add_mutually_exclusive_group()
+    processes.add_argument('--processes', type=int, help="Fixed number of gst-launch processes per probe")
+    processes.add_argument('--streams-per-process', type=int, default=8,
+                           help="Streams per gst-launch process when --processes is not set (default: 8)")
+    processes.add_argument('--process-map', metavar='JSON',
+                           help="Process count per stream density from a process_optimizer.py sweep")
+    parser.add_argument('--log-dir', help="Keep the gst-launch output of every probe here")
+    parser.add_argument('--source-fps', type=float, help="Simulation: per-stream FPS ceiling (source frame rate)")
+    parser.add_argument('--overhead', type=float, default=0.0, help="Simulation: capacity loss per added stream")
+    parser.add_argument('--noise', type=float, default=0.0, help="Simulation: relative stddev of a probe reading")
+    parser.add_argument('--seed', type=int, default=0, help="Simulation: random seed (default: 0)")
+    args = parser.parse_args()
+
+    if args.threshold <= 0 or args.start < 1 or args.max_streams < 1 or args.resolution < 1:
+        parser.error("threshold, start, max-streams and resolution must be positive")
+    if args.container and not args.pipeline:
+        parser.error("--pipeline is required with --container")
+
+    if args.simulate:
+        probe = SimulatedProbe(args.simulate, args.threshold, args.duration, args.source_fps, args.overhead,
+                               args.noise, args.min_seconds, args.margin, args.seed)
+    else:
+        if args.log_dir:
+            os.makedirs(args.log_dir, exist_ok=True)
+        process_map = None
+        if args.process_map:
+            try:
+                process_map = ProcessMap(args.process_map)
+            except (OSError, ValueError, KeyError) as e:
+                parser.error(f"--process-map: {e}")
+        probe = ContainerProbe(args.container, args.pipeline, args.threshold, args.duration, args.processes,
+                               args.streams_per_process, args.min_seconds, args.margin, args.confirm, args.log_dir,
+                               process_map)
+
+    print(f"[TUNE] Bracketing from {args.start} streams (limit {args.max_streams}), "
+          f"threshold {args.threshold:g} fps/stream", file=sys.stderr, flush=True)
+    try:
+        best, results = find_max_streams(probe, args.start, args.max_streams, args.resolution, log_probe)
+    except KeyboardInterrupt:
+        print("[TUNE] Interrupted", file=sys.stderr)
+        return 130
+
+    spent = sum(r['seconds'] for r in results.values())
+    print(f"[TUNE] {len(results)} probes, {spent:.0f}s of probing", file=sys.stderr, flush=True)
+    if best == 0:
+        print(f"0 NA NA {len(results)} {spent:.0f}")
+        return 1
+    if best >= args.max_streams:
+        print(f"[TUNE] Reached safety limit of {args.max_streams} streams", file=sys.stderr)
+    result = results[best]
+    print(f"{best} {result['per_stream_fps']:.2f} {result['total_fps']:.2f} {len(results)} {spent:.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: (C) 2024 - 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Coverage Matrix Sweep Scheduler
+Usage: python3 sweep_scheduler.py [--matrix FILE] [--cores GROUP ...] [options] [-- <driver options>]
+
+Runs the config,detect,classify,batch,flag lines of a coverage matrix
+(default: utils/generate_benchmark_coverage.sh) through
+benchmark_edge_pipelines.sh, several at a time when they do not conflict.
+
+Resource model:
+  - inference devices: each GPU.N (/dev/dri/renderD*, "GPU" is GPU.0) and
+    the NPU (/dev/accel) serve one run at a time; CPU inference is covered by
+    the core group of the run
+  - CPU cores: every --cores group (a benchmark_edge_pipelines.sh -t value,
+    e.g. pcore, ecore or 0-3) serves one run at a time; groups must not overlap
+A run starts as soon as its devices and any core group are free, e.g. an
+NPU-only run pinned to the E-cores next to a GPU.1-only run on the P-cores.
+VA decode shares the GPU media engine across overlapping runs. Overlapping
+runs also share the package power, so power sampling is turned off (driver
+--no-power) unless --keep-power is given.
+
+Progress is checkpointed to --state after every change; an interrupted
+sweep resumes with the runs that had not finished (--restart starts over,
+--retry-failed runs failed ones again). Exit status: 0 all runs done or
+skipped, 1 some failed, 130 interrupted.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import signal
+# Launches the benchmark drivers
+import subprocess  # nosec B404
+import sys
+import time
+
+BASEDIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DRIVER = os.path.join(BASEDIR, 'benchmark_edge_pipelines.sh')
+COVERAGE = os.path.join(BASEDIR, 'utils', 'generate_benchmark_coverage.sh')
+HELPERS = os.path.join(BASEDIR, 'utils', 'helper_functions.sh')
+
+# The driver names its containers and result files after the second it starts
+LAUNCH_GAP = 1.5
+POLL_INTERVAL = 0.5
+STOP_TIMEOUT = 30
+
+
+def read_matrix(text):
+    """Parse coverage lines into jobs; comments, blanks and TOTAL_TESTS= are skipped."""
+    jobs = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#') or line.startswith('TOTAL_TESTS='):
+            continue
+        fields = [field.strip() for field in line.split(',')]
+        if len(fields) < 4:
+            raise ValueError(f"invalid coverage line: {line}")
+        config, detect, classify, batch = fields[:4]
+        flag = fields[4] if len(fields) > 4 else ''
+        jobs.append({
+            'id': f"{len(jobs) + 1:02d}:{line}",
+            'config': config,
+            'detect': detect,
+            'classify': classify,
+            'batch': batch,
+            'flag': flag,
+        })
+    return jobs
+
+
+def detect_devices():
+    """Inference devices present on this system."""
+    renders = sorted(glob.glob('/dev/dri/renderD*'))
+    devices = {f"GPU.{index}" for index in range(len(renders))}
+    if glob.glob('/dev/accel/accel*'):
+        devices.add('NPU')
+    return devices
+
+
+def normalize_device(device):
+    """Scheduling resource of an inference device; None for CPU (covered by the core group)."""
+    if device == 'CPU':
+        return None
+    if device == 'GPU':
+        return 'GPU.0'
+    return device
+
+
+def job_devices(job):
+    return {d for d in (normalize_device(job['detect']), normalize_device(job['classify'])) if d}
+
+
+def parse_cpu_list(text):
+    cpus = set()
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            low, high = part.split('-', 1)
+            cpus.update(range(int(low), int(high) + 1))
+        else:
+            cpus.add(int(part))
+    return frozenset(cpus)
+
+
+def resolve_core_group(spec):
+    """CPU set of a -t value, resolved by the driver's own parse_core_pinning (NO_PIN: all CPUs)."""
+    # Sources the driver helpers; the -t value is passed as $1, not interpolated
+    result = subprocess.run(['bash', '-c', f'. "{HELPERS}"; parse_core_pinning "$1"', '_', spec],  # nosec B603 B607
+                            capture_output=True, text=True, check=False)
+    cores = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else 'NO_PIN'
+    if cores == 'NO_PIN':
+        return frozenset(range(os.cpu_count() or 1))
+    return parse_cpu_list(cores)
+
+
+class Checkpoint:
+    """Sweep progress in a JSON file, rewritten atomically on every change."""
+
+    def __init__(self, path, signature):
+        self.path = path
+        self.signature = signature
+        self.jobs = {}
+
+    def load(self):
+        """Return False when no checkpoint exists; raise if it belongs to another sweep."""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        if data.get('signature') != self.signature:
+            raise ValueError(f"{self.path} belongs to a different sweep (matrix or options changed); "
+                             f"use --restart to discard it")
+        self.jobs = data.get('jobs', {})
+        return True
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'signature': self.signature, 'updated': time.strftime('%Y%m%d-%H%M%S'),
+                       'jobs': self.jobs}, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def status(self, job_id):
+        return self.jobs.get(job_id, {}).get('status', 'pending')
+
+    def update(self, job_id, **fields):
+        self.jobs.setdefault(job_id, {}).update(fields)
+        self.save()
+
+
+class Scheduler:
+    """Greedy list scheduling: in matrix order, start every job whose resources are free."""
+
+    def __init__(self, jobs, core_groups, checkpoint, command, log_dir, max_parallel):
+        self.pending = list(jobs)
+        self.core_groups = core_groups          # [(spec, cpu set)]
+        self.checkpoint = checkpoint
+        self.command = command                  # job, core spec -> argv
+        self.log_dir = log_dir
+        self.max_parallel = max_parallel
+        self.running = {}                       # job id -> (job, proc, group index, devices, start, log)
+        self.stopping = False
+        self.last_launch = 0.0
+        self.busy_seconds = 0.0
+
+    def free_group(self):
+        taken = {entry[2] for entry in self.running.values()}
+        for index in range(len(self.core_groups)):
+            if index not in taken:
+                return index
+        return None
+
+    def busy_devices(self):
+        busy = set()
+        for entry in self.running.values():
+            busy |= entry[3]
+        return busy
+
+    def launch(self, job, group):
+        spec = self.core_groups[group][0]
+        devices = job_devices(job)
+        safe = job['id'].replace(':', '_').replace(',', '_').replace('-', '').strip('_')
+        log = os.path.join(self.log_dir, f"{safe}.log")
+        argv = self.command(job, spec)
+        wait = self.last_launch + LAUNCH_GAP - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        with open(log, 'w') as out:
+            # Driver argv built from the coverage matrix, no shell
+            proc = subprocess.Popen(argv, stdout=out, stderr=subprocess.STDOUT, start_new_session=True)  # nosec B603
+        self.last_launch = time.monotonic()
+        self.running[job['id']] = (job, proc, group, devices, time.time(), log)
+        self.checkpoint.update(job['id'], status='running', cores=spec, log=log,
+                               started=time.strftime('%Y%m%d-%H%M%S'))
+        print(f"[ Info ] Start {describe(job)} on {', '.join(sorted(devices)) or 'CPU'} "
+              f"(cores: {spec}) [{len(self.running)} running]", flush=True)
+
+    def start_ready(self):
+        busy = self.busy_devices()
+        for job in list(self.pending):
+            if self.stopping or len(self.running) >= self.max_parallel:
+                return
+            devices = job_devices(job)
+            group = self.free_group()
+            if group is None:
+                return
+            if devices & busy:
+                continue
+            self.pending.remove(job)
+            self.launch(job, group)
+            busy |= devices
+
+    def reap(self):
+        for job_id, (job, proc, _, _, start, log) in list(self.running.items()):
+            code = proc.poll()
+            if code is None:
+                continue
+            del self.running[job_id]
+            wall = time.time() - start
+            self.busy_seconds += wall
+            if self.stopping:
+                self.checkpoint.update(job_id, status='pending', returncode=code)
+                continue
+            status = 'done' if code == 0 else 'failed'
+            self.checkpoint.update(job_id, status=status, returncode=code, wall_s=round(wall, 1),
+                                   finished=time.strftime('%Y%m%d-%H%M%S'))
+            level = 'Info' if code == 0 else 'Error'
+            print(f"[ {level} ] {status.capitalize()} {describe(job)} in {wall:.0f}s"
+                  + ("" if code == 0 else f" (exit {code}, log: {log})"), flush=True)
+
+    def stop(self):
+        """Terminate the running drivers (and their pipelines) and put their jobs back to pending."""
+        self.stopping = True
+        for _, proc, _, _, _, _ in self.running.values():
+            try:
+                os.killpg(proc.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + STOP_TIMEOUT
+        while self.running and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(POLL_INTERVAL)
+        for _, proc, _, _, _, _ in self.running.values():
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        for job_id, (_, proc, _, _, _, _) in list(self.running.items()):
+            proc.wait()
+            self.checkpoint.update(job_id, status='pending')
+        self.running.clear()
+
+    def run(self):
+        while (self.pending and not self.stopping) or self.running:
+            self.reap()
+            self.start_ready()
+            time.sleep(POLL_INTERVAL)
+
+
+def describe(job):
+    flag = f" {job['flag']}" if job['flag'] else ''
+    return f"cfg={job['config']} det={job['detect']} cls={job['classify']} batch={job['batch']}{flag}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark coverage matrix, in parallel where devices allow")
+    parser.add_argument('--matrix', help="Coverage matrix file (default: output of generate_benchmark_coverage.sh)")
+    parser.add_argument('--cores', action='append', default=[],
+                        help="Core group for one concurrent run, as the driver's -t (repeatable, default: nopin)")
+    parser.add_argument('-n', '--streams', type=int, default=8, help="Streams per run (default: 8)")
+    parser.add_argument('-i', '--duration', type=int, default=120, help="Duration of each run in seconds (default: 120)")
+    parser.add_argument('--max-parallel', type=int, default=0, help="Limit on concurrent runs (default: core groups)")
+    parser.add_argument('--devices', help="Comma-separated inference devices to schedule on (default: detected)")
+    parser.add_argument('--state', default=os.path.join(BASEDIR, 'results', 'sweep_state.json'),
+                        help="Checkpoint file (default: results/sweep_state.json)")
+    parser.add_argument('--log-dir', default=os.path.join(BASEDIR, 'results', 'sweep_logs'),
+                        help="Driver output of every run (default: results/sweep_logs)")
+    parser.add_argument('--restart', action='store_true', help="Discard the checkpoint and run the whole matrix")
+    parser.add_argument('--retry-failed', action='store_true', help="Run failed jobs of the checkpoint again")
+    parser.add_argument('--keep-power', action='store_true', help="Keep power sampling even when runs overlap")
+    parser.add_argument('--driver', default=DRIVER, help="Benchmark driver (default: benchmark_edge_pipelines.sh)")
+    parser.add_argument('driver_args', nargs=argparse.REMAINDER,
+                        help="Options passed to every driver run, after --")
+    args = parser.parse_args()
+
+    if args.streams < 1 or args.duration < 1 or args.max_parallel < 0:
+        parser.error("streams and duration must be positive, max-parallel non-negative")
+    extra = args.driver_args[1:] if args.driver_args[:1] == ['--'] else args.driver_args
+
+    if args.matrix:
+        with open(args.matrix, 'r') as f:
+            matrix = f.read()
+    else:
+        # Repo coverage-matrix script, no shell
+        matrix = subprocess.run([COVERAGE], capture_output=True, text=True, check=True).stdout  # nosec B603
+    try:
+        jobs = read_matrix(matrix)
+    except ValueError as e:
+        print(f"[ Error ] {e}", file=sys.stderr)
+        return 1
+    if not jobs:
+        print("[ Error ] Empty coverage matrix", file=sys.stderr)
+        return 1
+
+    core_groups = [(spec, resolve_core_group(spec)) for spec in (args.cores or ['nopin'])]
+    for i, (spec_a, cpus_a) in enumerate(core_groups):
+        for spec_b, cpus_b in core_groups[i + 1:]:
+            if cpus_a & cpus_b:
+                print(f"[ Error ] Core groups {spec_a} and {spec_b} overlap", file=sys.stderr)
+                return 1
+    max_parallel = min(args.max_parallel or len(core_groups), len(core_groups))
+    power_off = max_parallel > 1 and not args.keep_power
+    if power_off:
+        print("[ Info ] Runs may overlap: package power sampling is off (--keep-power to keep it)")
+
+    devices = set(args.devices.split(',')) if args.devices else detect_devices()
+    signature = hashlib.sha256(json.dumps(
+        [[job['id'] for job in jobs], args.streams, args.duration, extra]).encode()).hexdigest()[:16]
+    checkpoint = Checkpoint(args.state, signature)
+    if args.restart and os.path.exists(args.state):
+        os.unlink(args.state)
+    try:
+        resumed = checkpoint.load()
+    except (ValueError, json.JSONDecodeError) as e:
+        print(f"[ Error ] {e}", file=sys.stderr)
+        return 1
+
+    todo = []
+    for job in jobs:
+        status = checkpoint.status(job['id'])
+        if status == 'done' or (status == 'failed' and not args.retry_failed):
+            continue
+        missing = job_devices(job) - devices
+        if missing:
+            print(f"[ Info ] Skip {describe(job)}: {', '.join(sorted(missing))} not available")
+            checkpoint.update(job['id'], status='skipped')
+            continue
+        checkpoint.jobs.setdefault(job['id'], {})['status'] = 'pending'
+        todo.append(job)
+    checkpoint.save()
+    if resumed:
+        print(f"[ Info ] Resuming sweep from {args.state}: {len(jobs) - len(todo)} of {len(jobs)} runs finished")
+    print(f"[ Info ] Sweep: {len(todo)} runs, up to {max_parallel} at a time "
+          f"(cores: {', '.join(spec for spec, _ in core_groups)}; devices: {', '.join(sorted(devices)) or 'CPU'})")
+
+    def command(job, spec):
+        argv = [args.driver, '-p', job['config'], '-n', str(args.streams), '-b', job['batch'],
+                '-d', job['detect'], '-c', job['classify'], '-i', str(args.duration), '-t', spec]
+        if job['flag']:
+            argv.append(job['flag'])
+        if power_off:
+            argv.append('--no-power')
+        return argv + extra
+
+    os.makedirs(args.log_dir, exist_ok=True)
+    scheduler = Scheduler(todo, core_groups, checkpoint, command, args.log_dir, max_parallel)
+
+    def on_signal(signum, frame):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, on_signal)
+
+    start = time.monotonic()
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        print("\n[ Info ] Interrupted, stopping running benchmarks (rerun to resume)", flush=True)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        scheduler.stop()
+        return 130
+    makespan = time.monotonic() - start
+
+    statuses = [checkpoint.status(job['id']) for job in jobs]
+    failed = statuses.count('failed')
+    print("")
+    print(f"[ Info ] Sweep finished: {statuses.count('done')} done, {failed} failed, "
+          f"{statuses.count('skipped')} skipped")
+    if makespan > 0 and scheduler.busy_seconds > 0:
+        print(f"[ Info ] Wall clock: {makespan:.0f}s for {scheduler.busy_seconds:.0f}s of runs "
+              f"({scheduler.busy_seconds / makespan:.2f}x parallel)")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
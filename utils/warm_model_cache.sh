@@ -0,0 +1,151 @@
+#!/bin/bash
+
+# SPDX-FileCopyrightText: (C) 2024 - 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+# Precompile every inference element of the coverage matrix into the content-addressed
+# model cache (utils/model_cache.py) before a sweep: each distinct detection/classification
+# set is run once on a few frames, so every benchmark run of the sweep (--model-cache)
+# loads compiled blobs and no run pays model compilation inside its measurement.
+
+set -uo pipefail
+
+basedir="$(realpath "$(dirname -- "$0")/..")"
+. "${basedir}/utils/helper_functions.sh"
+. "${basedir}/utils/pipeline_constructor.sh"
+
+Image="intel/dlstreamer:latest"
+CacheMount="/home/dlstreamer/model_cache"
+WarmupFrames=30
+
+# Initialize parameters
+MatrixFile=""
+CacheDir="${basedir}/results/.model_cache"
+Timeout=600
+
+# Help message
+usage()
+{
+cat << 'EOF'
+
+Usage:
+  warm_model_cache.sh [-f <matrix>] [-c <cache dir>] [-w <seconds>]
+
+Options:
+  -f <file>       Coverage matrix (config,detect,classify,batch,flag lines);
+                  default: output of utils/generate_benchmark_coverage.sh
+  -c <dir>        Host directory of the model cache (default: results/.model_cache)
+  -w <seconds>    Timeout of one compile run (default: 600)
+
+Run benchmark_edge_pipelines.sh --model-cache[=<dir>] (or utils/warm_pool_sweep.sh -c <dir>)
+afterwards to load the compiled models; `python3 utils/model_cache.py status <dir>` lists them.
+EOF
+}
+
+# Command line argument parser
+argparse()
+{
+while getopts "hf:c:w:" arg; do
+    case $arg in
+        f)
+        MatrixFile=${OPTARG}
+        ;;
+        c)
+        CacheDir=${OPTARG}
+        ;;
+        w)
+        Timeout=${OPTARG}
+        ;;
+        h)
+        usage; exit 0
+        ;;
+        *)
+        usage; exit 1
+        ;;
+    esac
+done
+}
+
+argparse "$@"
+
+[[ "${Timeout}" =~ ^[1-9][0-9]*$ ]] || { echo "[ Error ] -w must be a positive integer (seconds)"; exit 1; }
+
+if [[ -n "${MatrixFile}" ]]; then
+    [[ -f "${MatrixFile}" ]] || { echo "[ Error ] Coverage matrix not found: ${MatrixFile}"; exit 1; }
+    Matrix="$(cat "${MatrixFile}")"
+else
+    Matrix="$("${basedir}/utils/generate_benchmark_coverage.sh")" || { echo "[ Error ] Coverage generation failed"; exit 1; }
+fi
+mapfile -t Runs < <(grep -v '^#' <<< "${Matrix}" | grep -v '^TOTAL_TESTS=' | grep -v '^[[:space:]]*$')
+[[ ${#Runs[@]} -gt 0 ]] || { echo "[ Error ] Empty coverage matrix"; exit 1; }
+
+mkdir -p "${CacheDir}"
+CacheDir="$(realpath "${CacheDir}")"
+export MODEL_CACHE_HOST="${CacheDir}" MODEL_CACHE_DIR="${CacheMount}"
+
+# Inference sets of the sweep: a concurrent run uses a detect+classify pipeline per device
+Sets=()
+Pipes=()
+declare -A Seen=()
+for line in "${Runs[@]}"; do
+    IFS=, read -r cfg det cls batch concurrent <<< "${line}"
+    validate_assets "${cfg}" "${basedir}/pipelines" >/dev/null || { echo "[ Error ] Validation failed for ${cfg}."; exit 1; }
+    if [[ -n "${concurrent}" ]]; then
+        pairs=("${det} ${det}" "${cls} ${cls}")
+    else
+        pairs=("${det} ${cls}")
+    fi
+    for pair in "${pairs[@]}"; do
+        read -r d c <<< "${pair}"
+        DetectPipe="$(construct_detection "${cfg}" "${d}" "${batch}")" || exit 1
+        ClassifyPipe="$(construct_classification "${cfg}" "${c}" "${batch}")" || exit 1
+        # NPU elements ignore the batch size, so different matrix lines can map to the same set
+        [[ -n "${Seen["${DetectPipe}${ClassifyPipe}"]:-}" ]] && continue
+        Seen["${DetectPipe}${ClassifyPipe}"]=1
+        Sets+=("${cfg},${d},${c},${batch}")
+        Pipes+=("$(construct_decode "${cfg}") ! identity eos-after=${WarmupFrames} ! queue ! ${DetectPipe} ! queue ! ${ClassifyPipe} ! fakesink sync=false")
+    done
+done
+
+cache_keys() { grep -o "CACHE_DIR=${CacheMount}/[0-9a-f]*" <<< "$1" | sed 's|.*/||' | sort -u; }
+
+DockerCommand=(
+    docker run --rm --init
+    -v "${basedir}/pipelines:/home/dlstreamer/pipelines"
+    -v "${CacheDir}:${CacheMount}"
+    --env ONEDNN_VERBOSE=0
+    --env OPENCV_OCL_RUNTIME=""
+)
+mapfile -t DeviceArgs < <(docker_device_args /dev/dri 'render*'; docker_device_args /dev/accel 'accel*')
+DockerCommand+=( "${DeviceArgs[@]}" )
+
+Total=${#Sets[@]}
+Compiled=0
+Failed=0
+echo "[ Info ] Warming model cache ${CacheDir}: ${Total} inference sets from ${#Runs[@]} matrix lines"
+for i in "${!Sets[@]}"; do
+    IFS=, read -r cfg d c batch <<< "${Sets[$i]}"
+    mapfile -t Keys < <(cache_keys "${Pipes[$i]}")
+    state="$(python3 "${MODEL_CACHE_TOOL}" check --no-record "${CacheDir}" "${Keys[@]}" 2>/dev/null)"
+    if [[ "${state}" == "hit" ]]; then
+        echo "[ Info ] [$((i + 1))/${Total}] cfg=${cfg} det=${d} cls=${c} batch=${batch}: already compiled"
+        continue
+    fi
+
+    echo "[ Info ] [$((i + 1))/${Total}] cfg=${cfg} det=${d} cls=${c} batch=${batch}: compiling"
+    start=$(date +%s)
+    if timeout --preserve-status "${Timeout}s" "${DockerCommand[@]}" "${Image}" \
+        bash -c "gst-launch-1.0 -q ${Pipes[$i]}" >/dev/null; then
+        Compiled=$((Compiled + 1))
+        echo "[ Info ]   compiled in $(( $(date +%s) - start ))s: $(python3 "${MODEL_CACHE_TOOL}" check --no-record "${CacheDir}" "${Keys[@]}" 2>/dev/null)"
+    else
+        Failed=$((Failed + 1))
+        echo "[ Warning ]   compile run failed after $(( $(date +%s) - start ))s (cfg=${cfg} det=${d} cls=${c} batch=${batch})"
+    fi
+done
+
+echo ""
+python3 "${MODEL_CACHE_TOOL}" status "${CacheDir}"
+echo ""
+echo "[ Info ] Model cache warm-up done: ${Compiled} compiled, $((Total - Compiled - Failed)) already cached, ${Failed} failed"
+[[ ${Failed} -eq 0 ]]
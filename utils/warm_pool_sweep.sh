@@ -0,0 +1,259 @@
+#!/bin/bash
+
+# SPDX-FileCopyrightText: (C) 2024 - 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+# Coverage sweep on warm containers: one long-lived intel/dlstreamer container per
+# device set runs every configuration through `docker exec` (benchmark_edge_pipelines.sh
+# --pool), and all containers share one OpenVINO model cache (CACHE_DIR), so the sweep
+# pays container start-up and model compilation once instead of once per configuration.
+
+set -uo pipefail
+
+basedir="$(realpath "$(dirname -- "$0")/..")"
+. "${basedir}/utils/helper_functions.sh"
+
+Timestamp="$(date "+%Y%m%d-%H%M%S")"
+Image="intel/dlstreamer:latest"
+CacheMount="/home/dlstreamer/model_cache"
+
+# Initialize parameters
+NumStreams=8
+Duration=120
+Taskset="none"
+MatrixFile=""
+CacheDir="${basedir}/results/.model_cache"
+Cooldown=0
+Keep=false
+ExtraArgs=()
+
+# Help message
+usage()
+{
+cat << 'EOF'
+
+Usage:
+  warm_pool_sweep.sh [-n <streams>] [-i <duration>] [-t <taskset>] [-f <matrix>] [-c <cache dir>] [-s <seconds>] [-k] [-- <driver options>]
+
+Options:
+  -n <streams>    Streams per run (default: 8)
+  -i <seconds>    Duration of each run (default: 120)
+  -t <taskset>    Core pinning of the pool containers, as benchmark_edge_pipelines.sh -t
+  -f <file>       Coverage matrix (config,detect,classify,batch,flag lines);
+                  default: output of utils/generate_benchmark_coverage.sh
+  -c <dir>        Host directory of the shared OpenVINO model cache
+                  (default: results/.model_cache)
+  -s <seconds>    Cool-down between runs (default: 0)
+  -k              Keep the pool containers running after the sweep
+  --              Pass the remaining options to every benchmark_edge_pipelines.sh run
+
+Output:
+  results/warm_pool_sweep_<timestamp>.txt with the per-run wall time, model cache
+  hit/miss and the wall-clock saved against a cold docker run per configuration
+EOF
+}
+
+# Command line argument parser
+argparse()
+{
+while getopts "hn:i:t:f:c:s:k" arg; do
+    case $arg in
+        n)
+        NumStreams=${OPTARG}
+        ;;
+        i)
+        Duration=${OPTARG}
+        ;;
+        t)
+        Taskset=${OPTARG}
+        ;;
+        f)
+        MatrixFile=${OPTARG}
+        ;;
+        c)
+        CacheDir=${OPTARG}
+        ;;
+        s)
+        Cooldown=${OPTARG}
+        ;;
+        k)
+        Keep=true
+        ;;
+        h)
+        usage; exit 0
+        ;;
+        *)
+        usage; exit 1
+        ;;
+    esac
+done
+shift $((OPTIND - 1))
+ExtraArgs=("$@")
+}
+
+argparse "$@"
+
+is_posint() { [[ "$1" =~ ^[1-9][0-9]*$ ]]; }
+is_nonneg() { [[ "$1" =~ ^[0-9][0-9]*$ ]]; }
+is_posint "${NumStreams}" || { echo "[ Error ] -n must be a positive integer"; exit 1; }
+is_posint "${Duration}"   || { echo "[ Error ] -i must be a positive integer (seconds)"; exit 1; }
+is_nonneg "${Cooldown}"   || { echo "[ Error ] -s must be a non-negative integer (seconds)"; exit 1; }
+
+if [[ -n "${MatrixFile}" ]]; then
+    [[ -f "${MatrixFile}" ]] || { echo "[ Error ] Coverage matrix not found: ${MatrixFile}"; exit 1; }
+    Matrix="$(cat "${MatrixFile}")"
+else
+    Matrix="$("${basedir}/utils/generate_benchmark_coverage.sh")" || { echo "[ Error ] Coverage generation failed"; exit 1; }
+fi
+mapfile -t Runs < <(grep -v '^#' <<< "${Matrix}" | grep -v '^TOTAL_TESTS=' | grep -v '^[[:space:]]*$')
+[[ ${#Runs[@]} -gt 0 ]] || { echo "[ Error ] Empty coverage matrix"; exit 1; }
+
+Cores="$(parse_core_pinning "${Taskset}")"
+mkdir -p "${CacheDir}"
+CacheDir="$(realpath "${CacheDir}")"
+SweepReport="${basedir}/results/warm_pool_sweep_${Timestamp}.txt"
+
+now() { date +%s.%N; }
+elapsed() { LC_ALL=C awk -v a="$1" -v b="$2" 'BEGIN { printf("%.1f", b - a) }'; }
+cache_entries() { find "${CacheDir}" -type f ! -name model.json ! -name '.digests.json*' 2>/dev/null | wc -l; }
+
+# Device set of a run: VA decode always needs /dev/dri, /dev/accel only for NPU runs
+device_set()
+{
+    local det="$1" cls="$2"
+    if [[ "${det}" == NPU* || "${cls}" == NPU* ]]; then
+        echo "dri-accel"
+    else
+        echo "dri"
+    fi
+}
+
+declare -A PoolName=()
+declare -A PoolStartup=()
+
+cleanup()
+{
+    if [[ "${Keep}" == true ]]; then
+        [[ ${#PoolName[@]} -gt 0 ]] && echo "[ Info ] Keeping pool containers: ${PoolName[*]}"
+        return
+    fi
+    for name in "${PoolName[@]}"; do
+        docker rm -f "${name}" >/dev/null 2>&1 || true
+    done
+}
+trap cleanup EXIT
+trap 'exit 130' INT TERM
+
+# Start the warm container of a device set and time it until GStreamer is usable
+# (plugin registry built), i.e. the cost a cold docker run pays on every configuration
+start_pool()
+{
+    local set="$1" name="edge-pool-$1-${Timestamp}-$$" start
+    local cmd=(
+        docker run -d --init --name "${name}"
+        -v "${basedir}/pipelines:/home/dlstreamer/pipelines"
+        -v "${CacheDir}:${CacheMount}"
+        --env ONEDNN_VERBOSE=0
+        --env OPENCV_OCL_RUNTIME=""
+    )
+    local device_args=()
+    mapfile -t device_args < <(
+        docker_device_args /dev/dri 'render*'
+        [[ "${set}" == *accel* ]] && docker_device_args /dev/accel 'accel*'
+    )
+    cmd+=( "${device_args[@]}" )
+    if [[ -n "${Cores}" && "${Cores}" != "NO_PIN" ]]; then
+        cmd+=( --cpuset-cpus "${Cores}" )
+    fi
+
+    start="$(now)"
+    "${cmd[@]}" "${Image}" sleep infinity >/dev/null || { echo "[ Error ] Could not start pool container ${name}"; return 1; }
+    PoolName["${set}"]="${name}"
+    docker exec "${name}" gst-inspect-1.0 gvadetect >/dev/null 2>&1 || true
+    PoolStartup["${set}"]="$(elapsed "${start}" "$(now)")"
+    echo "[ Info ] Pool container ${name} ready in ${PoolStartup[${set}]}s"
+}
+
+Total=${#Runs[@]}
+echo "[ Info ] Warm pool sweep: ${Total} runs, ${NumStreams} streams, ${Duration}s each"
+echo "[ Info ] Model cache: ${CacheDir} ($(cache_entries) entries)"
+{
+    echo "Warm Pool Sweep ${Timestamp}"
+    echo "Streams: ${NumStreams}, Duration: ${Duration}s, Cores: ${Cores}, Model cache: ${CacheDir}"
+    echo ""
+    printf '%-8s %-8s %-8s %-5s %-12s %-10s %-9s %s\n' "Config" "Detect" "Classify" "Batch" "Mode" "Pool" "Wall (s)" "Model Cache"
+} > "${SweepReport}"
+
+declare -A PoolRuns=()
+current=0
+for line in "${Runs[@]}"; do
+    IFS=, read -r cfg det cls batch concurrent <<< "${line}"
+    current=$((current + 1))
+    set_key="$(device_set "${det}" "${cls}")"
+    if [[ -z "${PoolName[${set_key}]:-}" ]]; then
+        start_pool "${set_key}" || exit 1
+    fi
+    PoolRuns["${set_key}"]=$(( ${PoolRuns[${set_key}]:-0} + 1 ))
+
+    mode_desc="$( [[ -n "${concurrent}" ]] && echo " (concurrent pipelines for each device)" || echo "" )"
+    echo "[ Info ] [${current}/${Total}] cfg=${cfg} det=${det} cls=${cls} batch=${batch} streams=${NumStreams} pool=${PoolName[${set_key}]}${mode_desc}"
+
+    cache_before="$(cache_entries)"
+    run_start="$(now)"
+    # shellcheck disable=SC2086
+    "${basedir}/benchmark_edge_pipelines.sh" -p "${cfg}" -n "${NumStreams}" -b "${batch}" \
+        -d "${det}" -c "${cls}" -i "${Duration}" -t "${Taskset}" ${concurrent} --pool "${PoolName[${set_key}]}" --model-cache="${CacheDir}" "${ExtraArgs[@]}" || {
+        echo "[ Error ] Benchmark run failed (cfg=${cfg} det=${det} cls=${cls} batch=${batch} ${concurrent})"
+        exit 1
+    }
+    wall="$(elapsed "${run_start}" "$(now)")"
+    cache_state="hit"
+    [[ "$(cache_entries)" -gt "${cache_before}" ]] && cache_state="miss"
+
+    printf '%-8s %-8s %-8s %-5s %-12s %-10s %-9s %s\n' "${cfg}" "${det}" "${cls}" "${batch}" \
+        "${concurrent:-single}" "${set_key}" "${wall}" "${cache_state}" >> "${SweepReport}"
+
+    if [[ "${Cooldown}" -gt 0 && ${current} -lt ${Total} ]]; then
+        echo "[ Info ] Sleeping for ${Cooldown} seconds to prevent thermal throttling."
+        sleep "${Cooldown}"
+    fi
+done
+
+# Wall clock saved:
+#  - start-up: every run after the first of a pool would have paid the measured cold start
+#  - compilation: a cache hit run saves the mean wall-time difference between the miss
+#    and hit runs of the same pipeline config (runs have a fixed duration otherwise)
+StartupSaved=0
+for set_key in "${!PoolRuns[@]}"; do
+    StartupSaved="$(LC_ALL=C awk -v s="${StartupSaved}" -v t="${PoolStartup[${set_key}]}" -v n="${PoolRuns[${set_key}]}" \
+        'BEGIN { printf("%.1f", s + t * (n - 1)) }')"
+done
+read -r Hits Misses CompileSaved < <(awk 'NR > 4 {
+        n[$1 FS $8]++; sum[$1 FS $8] += $7; runs[$8]++; cfgs[$1] = 1
+    }
+    END {
+        saved = 0
+        for (c in cfgs) {
+            hit = c FS "hit"; miss = c FS "miss"
+            if (n[hit] && n[miss]) {
+                delta = sum[miss] / n[miss] - sum[hit] / n[hit]
+                if (delta > 0) saved += delta * n[hit]
+            }
+        }
+        printf("%d %d %.1f\n", runs["hit"], runs["miss"], saved)
+    }' "${SweepReport}")
+
+{
+    echo ""
+    echo "Pools: ${#PoolName[@]} containers for ${Total} runs ($((Total - ${#PoolName[@]})) container starts avoided)"
+    for set_key in "${!PoolName[@]}"; do
+        echo "  ${PoolName[${set_key}]}: start-up ${PoolStartup[${set_key}]}s, ${PoolRuns[${set_key}]} runs"
+    done
+    echo "Model cache: ${Hits} hit / ${Misses} miss runs, $(cache_entries) entries"
+    echo "Wall clock saved: ~${StartupSaved}s container start-up + ~${CompileSaved}s model compilation (estimated)"
+} >> "${SweepReport}"
+
+echo ""
+cat "${SweepReport}"
+echo ""
+echo "[ Info ] Completed ${Total} benchmark runs. Sweep report: ${SweepReport}"